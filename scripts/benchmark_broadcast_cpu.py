@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Measure FastAPI CPU time per player broadcast, before and after frames.
+
+Replays one progressive fetch (snapshot, analysis and complete chunks) through
+``fast_api_app.pubsub.route_pubsub_message`` into a real ``ConnectionManager``
+with progressive, legacy and compact sockets attached, and reports the process
+CPU time the worker spends per broadcast until every socket has its frames.
+
+``raw`` publishes uncompressed chunks without a cached legacy frame, so the
+worker compresses every chunk and the full JSON payload itself, as it used
+to. ``frames`` publishes compressed chunks and reads the legacy frame written
+at cache time, so the worker only forwards bytes. The publisher-side cost of
+building those frames once is reported separately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import orjson
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "user",
+    "DB_PASSWORD": "pass",
+    "DB_NAME": "db",
+    "RANKINGS_DB_NAME": "db",
+}.items():
+    os.environ.setdefault(name, value)
+
+import fast_api_app.connections as conn_mod  # noqa: E402
+import fast_api_app.pubsub as pubsub_mod  # noqa: E402
+from celery_app.tasks import player_detail  # noqa: E402
+from shared_lib.constants import (  # noqa: E402
+    PLAYER_LATEST_COMPACT_REDIS_KEY,
+    PLAYER_LATEST_FRAME_REDIS_KEY,
+    PLAYER_LATEST_REDIS_KEY,
+)
+from shared_lib.payload_utils import encode_player_pubsub_message  # noqa: E402
+
+PLAYER_ID = "bench-player"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["raw", "frames"],
+        default=["raw", "frames"],
+    )
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--progressive", type=int, default=4)
+    parser.add_argument("--legacy", type=int, default=2)
+    parser.add_argument("--compact", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=50)
+    return parser.parse_args()
+
+
+class _MemoryRedis:
+    def __init__(self, kv: dict):
+        self.kv = kv
+
+    async def get(self, key):
+        return self.kv.get(key)
+
+
+class _NullWebSocket:
+    async def send_bytes(self, data):
+        return None
+
+    async def send_text(self, data):
+        return None
+
+
+def build_payload(rows: int) -> dict:
+    modes = ["Splat Zones", "Tower Control", "Rainmaker", "Clam Blitz"]
+    history = [
+        {
+            "mode": modes[index % 4],
+            "region": index % 2 == 0,
+            "season_number": 4 + index % 5,
+            "timestamp": f"2024-{1 + index % 12:02d}-{1 + index % 28:02d}"
+            f"T{index % 24:02d}:00:00+00:00",
+            "x_power": 2500.0 + (index * 7) % 700,
+            "weapon_id": 40 + index % 30,
+            "rank": 1 + index % 500,
+            "updated": index % 3 == 0,
+        }
+        for index in range(rows)
+    ]
+    payload = player_detail.merge_player_payload(
+        player_detail.build_empty_player_payload(),
+        player_detail.build_analysis_payload(history),
+    )
+    payload["aggregated_data"]["latest_data"] = history[-4:]
+    return payload
+
+
+def build_chunks(payload: dict) -> list[tuple[str, dict, str | None]]:
+    return [
+        (
+            "snapshot",
+            player_detail.build_snapshot_payload(
+                payload["aggregated_data"]["season_results"],
+                payload["aggregated_data"]["latest_data"],
+            ),
+            None,
+        ),
+        (
+            "analysis",
+            {
+                "player_data": payload["player_data"],
+                "aggregated_data": {
+                    key: payload["aggregated_data"][key]
+                    for key in (
+                        "aggregate_season_data",
+                        "weapon_counts",
+                        "weapon_winrate",
+                    )
+                },
+            },
+            None,
+        ),
+        ("complete", {}, f"{PLAYER_LATEST_REDIS_KEY}:{PLAYER_ID}"),
+    ]
+
+
+def publish(mode: str, chunks, payload: dict) -> tuple[list[bytes], dict]:
+    """Builds the pubsub messages and cache entries a publisher would."""
+    cached_raw = orjson.dumps(payload)
+    kv = {
+        f"{PLAYER_LATEST_REDIS_KEY}:{PLAYER_ID}": cached_raw,
+        f"{PLAYER_LATEST_COMPACT_REDIS_KEY}:{PLAYER_ID}": (
+            player_detail.build_compact_player_payload(payload)
+        ),
+    }
+    if mode == "frames":
+        kv[f"{PLAYER_LATEST_FRAME_REDIS_KEY}:{PLAYER_ID}"] = zlib.compress(
+            cached_raw
+        )
+    messages = []
+    for phase, chunk, cache_key in chunks:
+        message = {
+            "player_id": PLAYER_ID,
+            "type": "player_chunk",
+            "version": player_detail.PLAYER_CHUNK_VERSION,
+            "phase": phase,
+            "payload": chunk,
+        }
+        if cache_key:
+            message["key"] = cache_key
+        body = orjson.dumps(message)
+        if mode == "frames":
+            body = zlib.compress(body)
+        messages.append(
+            encode_player_pubsub_message(
+                PLAYER_ID,
+                phase,
+                body,
+                cache_key,
+                compressed=mode == "frames",
+            )
+        )
+    return messages, kv
+
+
+async def attach_sockets(manager, args) -> None:
+    kinds = (
+        [(True, False)] * args.progressive
+        + [(False, False)] * args.legacy
+        + [(False, True)] * args.compact
+    )
+    for index, (progressive, compact) in enumerate(kinds):
+        manager.active_connections.setdefault(PLAYER_ID, {})[str(index)] = {
+            "websocket": _NullWebSocket(),
+            "progressive": progressive,
+            "compact": compact,
+            "queue": asyncio.Queue(maxsize=64),
+            "writer": None,
+        }
+        manager._start_writer(PLAYER_ID, str(index))
+
+
+async def run_mode(mode: str, args, chunks, payload) -> dict:
+    messages, kv = publish(mode, chunks, payload)
+    manager = conn_mod.ConnectionManager()
+    pubsub_mod.connection_manager = manager
+    pubsub_mod.async_binary_redis_conn = _MemoryRedis(kv)
+    await attach_sockets(manager, args)
+    queues = [
+        connection["queue"]
+        for connection in manager.active_connections[PLAYER_ID].values()
+    ]
+
+    broadcasts = 0
+    started = time.process_time()
+    for _ in range(args.repeats):
+        for message in messages:
+            await pubsub_mod.route_pubsub_message(message)
+        broadcasts += len(messages)
+        while any(queue.qsize() for queue in queues):
+            await asyncio.sleep(0)
+    elapsed = time.process_time() - started
+
+    for connection in manager.active_connections[PLAYER_ID].values():
+        connection["writer"].cancel()
+    return {"cpu_per_broadcast": elapsed / broadcasts}
+
+
+def publisher_cost(chunks, payload, repeats: int) -> float:
+    """CPU the publisher spends building the frames once per fetch."""
+    bodies = [
+        orjson.dumps({"phase": phase, "payload": chunk})
+        for phase, chunk, _ in chunks
+    ]
+    cached_raw = orjson.dumps(payload)
+    started = time.process_time()
+    for _ in range(repeats):
+        for body in bodies:
+            zlib.compress(body)
+        zlib.compress(cached_raw)
+    return (time.process_time() - started) / (repeats * len(bodies))
+
+
+def main() -> None:
+    args = parse_args()
+    payload = build_payload(args.rows)
+    chunks = build_chunks(payload)
+    print(
+        f"rows={args.rows} sockets=progressive:{args.progressive} "
+        f"legacy:{args.legacy} compact:{args.compact} "
+        f"repeats={args.repeats} "
+        f"json_payload={len(orjson.dumps(payload)) / 1024:.0f}KB"
+    )
+    print(f"{'mode':>7} {'cpu ms/broadcast':>17}")
+    for mode in args.modes:
+        result = asyncio.run(run_mode(mode, args, chunks, payload))
+        print(f"{mode:>7} {result['cpu_per_broadcast'] * 1000:>17.3f}")
+    print(
+        "publisher cpu ms/broadcast, paid once per fetch: "
+        f"{publisher_cost(chunks, payload, args.repeats) * 1000:.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Load benchmark for sync vs async Redis clients on the FastAPI hot paths.
+
+Serves a leaderboard-style REST read and a player-detail-style websocket open
+(GET + TTL pipeline, then one binary frame) from a local uvicorn server, once
+per client mode, and drives both with concurrent traffic. The ``sync`` mode
+calls ``redis.Redis`` from async handlers as the service used to; ``async``
+awaits ``redis.asyncio`` over a blocking pool.
+
+Point ``--redis-url`` at a real Redis, or pass ``--simulated-rtt-ms`` to run
+without one: the stand-in clients sleep for one round trip per command
+(``time.sleep`` for sync, ``asyncio.sleep`` for async).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import threading
+import time
+from time import perf_counter
+
+import httpx
+import orjson
+import redis
+import redis.asyncio as aioredis
+import uvicorn
+import websockets
+from fastapi import FastAPI, HTTPException, WebSocket
+
+LEADERBOARD_KEY = "benchmark:leaderboard_data:Splat Zones:Tentatek"
+PLAYER_KEY_PREFIX = "benchmark:player_latest_data_v3"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["sync", "async"],
+        default=["sync", "async"],
+    )
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument(
+        "--simulated-rtt-ms",
+        type=float,
+        default=None,
+        help="Use in-process stand-in clients with this round trip.",
+    )
+    parser.add_argument("--rest-workers", type=int, default=64)
+    parser.add_argument("--websocket-workers", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=64)
+    return parser.parse_args()
+
+
+class _SimulatedPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def get(self, key):
+        self._ops.append(("get", key))
+        return self
+
+    def ttl(self, key):
+        self._ops.append(("ttl", key))
+        return self
+
+    def _results(self):
+        return [
+            self._client.kv.get(key) if op == "get" else 3600
+            for op, key in self._ops
+        ]
+
+
+class _SimulatedSyncRedis:
+    def __init__(self, kv: dict, rtt: float):
+        self.kv = kv
+        self.rtt = rtt
+
+    def get(self, key):
+        time.sleep(self.rtt)
+        return self.kv.get(key)
+
+    def set(self, key, value):
+        self.kv[key] = value
+
+    def pipeline(self):
+        client = self
+
+        class _Pipeline(_SimulatedPipeline):
+            def execute(self):
+                time.sleep(client.rtt)
+                return self._results()
+
+        return _Pipeline(self)
+
+
+class _SimulatedAsyncRedis(_SimulatedSyncRedis):
+    async def get(self, key):
+        await asyncio.sleep(self.rtt)
+        return self.kv.get(key)
+
+    def pipeline(self):
+        client = self
+
+        class _Pipeline(_SimulatedPipeline):
+            async def execute(self):
+                await asyncio.sleep(client.rtt)
+                return self._results()
+
+        return _Pipeline(self)
+
+
+def build_clients(mode: str, args: argparse.Namespace, kv: dict):
+    if args.simulated_rtt_ms is not None:
+        rtt = args.simulated_rtt_ms / 1000
+        if mode == "sync":
+            return _SimulatedSyncRedis(kv, rtt)
+        return _SimulatedAsyncRedis(kv, rtt)
+    if mode == "sync":
+        return redis.Redis(
+            connection_pool=redis.ConnectionPool.from_url(
+                args.redis_url, max_connections=10
+            )
+        )
+    return aioredis.Redis(
+        connection_pool=aioredis.BlockingConnectionPool.from_url(
+            args.redis_url, max_connections=args.pool_size, timeout=5
+        )
+    )
+
+
+def seed(args: argparse.Namespace, kv: dict) -> None:
+    leaderboard = orjson.dumps(
+        {
+            "players": {
+                "player_id": [f"p{i}" for i in range(500)],
+                "x_power": [3000.0 + i for i in range(500)],
+            }
+        }
+    )
+    player = bytes(range(256)) * 64
+    if args.simulated_rtt_ms is not None:
+        kv[LEADERBOARD_KEY] = leaderboard
+        for index in range(args.players):
+            kv[f"{PLAYER_KEY_PREFIX}:p{index}"] = player
+        return
+    client = redis.Redis.from_url(args.redis_url)
+    pipe = client.pipeline()
+    pipe.set(LEADERBOARD_KEY, leaderboard, ex=600)
+    for index in range(args.players):
+        pipe.set(f"{PLAYER_KEY_PREFIX}:p{index}", player, ex=600)
+    pipe.execute()
+    client.close()
+
+
+def build_app(mode: str, client) -> FastAPI:
+    app = FastAPI()
+
+    if mode == "sync":
+
+        @app.get("/api/leaderboard")
+        async def leaderboard():
+            raw = client.get(LEADERBOARD_KEY)
+            if raw is None:
+                raise HTTPException(status_code=503)
+            return orjson.loads(raw)
+
+        @app.websocket("/ws/player/{player_id}")
+        async def player(websocket: WebSocket, player_id: str):
+            await websocket.accept()
+            pipe = client.pipeline()
+            pipe.get(f"{PLAYER_KEY_PREFIX}:{player_id}")
+            pipe.ttl(f"{PLAYER_KEY_PREFIX}:{player_id}")
+            payload, _ = pipe.execute()
+            await websocket.send_bytes(payload or b"")
+            await websocket.close()
+
+    else:
+
+        @app.get("/api/leaderboard")
+        async def leaderboard():
+            raw = await client.get(LEADERBOARD_KEY)
+            if raw is None:
+                raise HTTPException(status_code=503)
+            return orjson.loads(raw)
+
+        @app.websocket("/ws/player/{player_id}")
+        async def player(websocket: WebSocket, player_id: str):
+            await websocket.accept()
+            pipe = client.pipeline()
+            pipe.get(f"{PLAYER_KEY_PREFIX}:{player_id}")
+            pipe.ttl(f"{PLAYER_KEY_PREFIX}:{player_id}")
+            payload, _ = await pipe.execute()
+            await websocket.send_bytes(payload or b"")
+            await websocket.close()
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app: FastAPI, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+            ws_max_size=1 << 20,
+        )
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def rest_worker(base: str, deadline: float, latencies: list[float]):
+    async with httpx.AsyncClient(base_url=base, timeout=30) as http:
+        while perf_counter() < deadline:
+            started = perf_counter()
+            response = await http.get("/api/leaderboard")
+            response.raise_for_status()
+            latencies.append(perf_counter() - started)
+
+
+async def websocket_worker(
+    base: str,
+    worker: int,
+    players: int,
+    deadline: float,
+    latencies: list[float],
+):
+    index = worker
+    while perf_counter() < deadline:
+        started = perf_counter()
+        async with websockets.connect(
+            f"{base}/ws/player/p{index % players}", max_size=None
+        ) as ws:
+            await ws.recv()
+        latencies.append(perf_counter() - started)
+        index += 1
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def drive(port: int, args: argparse.Namespace) -> dict[str, list]:
+    rest: list[float] = []
+    ws: list[float] = []
+    deadline = perf_counter() + args.duration
+    await asyncio.gather(
+        *(
+            rest_worker(f"http://127.0.0.1:{port}", deadline, rest)
+            for _ in range(args.rest_workers)
+        ),
+        *(
+            websocket_worker(
+                f"ws://127.0.0.1:{port}", worker, args.players, deadline, ws
+            )
+            for worker in range(args.websocket_workers)
+        ),
+    )
+    return {"rest": rest, "websocket": ws}
+
+
+def main() -> None:
+    args = parse_args()
+    kv: dict = {}
+    seed(args, kv)
+    print(
+        f"rest_workers={args.rest_workers} "
+        f"websocket_workers={args.websocket_workers} "
+        f"duration={args.duration}s "
+        + (
+            f"simulated_rtt={args.simulated_rtt_ms}ms"
+            if args.simulated_rtt_ms is not None
+            else f"redis={args.redis_url}"
+        )
+    )
+    print(
+        f"{'mode':>6} {'traffic':>10} {'requests':>9} {'rps':>8} "
+        f"{'p50 ms':>8} {'p99 ms':>8}"
+    )
+    for mode in args.modes:
+        port = free_port()
+        app = build_app(mode, build_clients(mode, args, kv))
+        server = start_server(app, port)
+        try:
+            results = asyncio.run(drive(port, args))
+        finally:
+            server.should_exit = True
+        for traffic, latencies in results.items():
+            print(
+                f"{mode:>6} {traffic:>10} {len(latencies):>9} "
+                f"{len(latencies) / args.duration:>8.0f} "
+                f"{percentile(latencies, 0.50) * 1000:>8.2f} "
+                f"{percentile(latencies, 0.99) * 1000:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Compare zlib frames with permessage-deflate for player detail streams.
+
+Encodes one progressive stream (snapshot, analysis and complete chunks, as
+``ConnectionManager.send_cached_player_payload`` replays them) plus the legacy
+full payload two ways:
+
+* ``zlib``: each frame compressed on its own, as the websocket layer does for
+  clients that do not opt in.
+* ``deflate``: plain text frames run through the permessage-deflate extension
+  uvicorn negotiates (``websockets``' server defaults, context takeover on),
+  so later chunks reuse the dictionary built by earlier ones.
+
+Pass ``--redis-url`` with ``--player-ids`` to measure cached payloads from a
+real Redis; otherwise synthetic payloads of ``--rows`` history rows are used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import orjson
+from websockets.extensions.permessage_deflate import (
+    ServerPerMessageDeflateFactory,
+)
+from websockets.frames import Frame, Opcode
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "user",
+    "DB_PASSWORD": "pass",
+    "DB_NAME": "db",
+    "RANKINGS_DB_NAME": "db",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fast_api_app.connections import (  # noqa: E402
+    PLAYER_CHUNK_VERSION,
+    ConnectionManager,
+)
+from shared_lib.constants import PLAYER_LATEST_REDIS_KEY  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", nargs="+", type=int, default=[300, 3000, 15000]
+    )
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--player-ids", nargs="*", default=[])
+    parser.add_argument("--repeats", type=int, default=20)
+    return parser.parse_args()
+
+
+def synthetic_payload(rows: int) -> bytes:
+    modes = ["Splat Zones", "Tower Control", "Rainmaker", "Clam Blitz"]
+    history = [
+        {
+            "mode": modes[index % 4],
+            "region": index % 2 == 0,
+            "season_number": 4 + index % 5,
+            "timestamp": f"2024-{1 + index % 12:02d}-{1 + index % 28:02d}"
+            f"T{index % 24:02d}:{index % 60:02d}:00+00:00",
+            "x_power": round(2500.0 + (index * 37) % 700 + index / 7, 1),
+            "weapon_id": 40 + (index * 13) % 90,
+            "rank": 1 + (index * 17) % 500,
+            "updated": index % 3 == 0,
+        }
+        for index in range(rows)
+    ]
+    seasons = sorted({row["season_number"] for row in history})
+    return orjson.dumps(
+        {
+            "player_data": history,
+            "aggregated_data": {
+                "weapon_counts": [
+                    {"mode": mode, "weapon_id": weapon, "count": 3}
+                    for mode in modes
+                    for weapon in range(40, 70)
+                ],
+                "weapon_winrate": [],
+                "season_results": [
+                    {"season_number": season, "rank": 10} for season in seasons
+                ],
+                "aggregate_season_data": [
+                    {"season_number": season, "mode": mode, "peak_x_power": 3e3}
+                    for season in seasons
+                    for mode in modes
+                ],
+                "latest_data": history[-4:],
+            },
+        }
+    )
+
+
+def progressive_frames(player_id: str, cached: bytes) -> list[bytes]:
+    payload = ConnectionManager._merge_player_payload(orjson.loads(cached))
+    chunk = {
+        "player_id": player_id,
+        "type": "player_chunk",
+        "version": PLAYER_CHUNK_VERSION,
+    }
+    return [
+        orjson.dumps(
+            {
+                **chunk,
+                "phase": "snapshot",
+                "payload": ConnectionManager._build_cached_snapshot_payload(
+                    payload
+                ),
+            }
+        ),
+        orjson.dumps(
+            {
+                **chunk,
+                "phase": "analysis",
+                "payload": ConnectionManager._build_cached_analysis_payload(
+                    payload
+                ),
+            }
+        ),
+        orjson.dumps(
+            {
+                **chunk,
+                "phase": "complete",
+                "payload": {},
+                "key": f"{PLAYER_LATEST_REDIS_KEY}:{player_id}",
+            }
+        ),
+    ]
+
+
+def zlib_bytes(frames: list[bytes]) -> int:
+    return sum(len(zlib.compress(frame)) for frame in frames)
+
+
+def deflate_bytes(frames: list[bytes]) -> int:
+    # One extension instance per connection, as negotiated at handshake.
+    _, extension = ServerPerMessageDeflateFactory().process_request_params(
+        [], []
+    )
+    return sum(
+        len(extension.encode(Frame(Opcode.TEXT, frame)).data)
+        for frame in frames
+    )
+
+
+def timed(fn, frames: list[bytes], repeats: int) -> tuple[int, float]:
+    started = time.process_time()
+    for _ in range(repeats):
+        size = fn(frames)
+    return size, (time.process_time() - started) / repeats
+
+
+def load_payloads(args) -> list[tuple[str, bytes]]:
+    if args.redis_url and args.player_ids:
+        import redis
+
+        client = redis.Redis.from_url(args.redis_url)
+        payloads = []
+        for player_id in args.player_ids:
+            cached = client.get(f"{PLAYER_LATEST_REDIS_KEY}:{player_id}")
+            if cached is not None:
+                payloads.append((player_id, cached))
+        return payloads
+    return [(f"rows={rows}", synthetic_payload(rows)) for rows in args.rows]
+
+
+def main() -> None:
+    args = parse_args()
+    print(
+        f"{'payload':>12} {'stream':>12} {'raw KB':>9} {'zlib KB':>9} "
+        f"{'deflate KB':>10} {'saved':>6} {'zlib ms':>8} {'deflate ms':>10}"
+    )
+    for label, cached in load_payloads(args):
+        frames = progressive_frames("bench", cached)
+        streams = {
+            "progressive": frames,
+            # A stale replay followed by the refreshed chunks.
+            "stale+fresh": frames + frames,
+            "legacy": [cached],
+        }
+        for stream, frames in streams.items():
+            zlib_size, zlib_cpu = timed(zlib_bytes, frames, args.repeats)
+            deflate_size, deflate_cpu = timed(
+                deflate_bytes, frames, args.repeats
+            )
+            raw = sum(len(frame) for frame in frames)
+            print(
+                f"{label:>12} {stream:>12} {raw / 1024:>9.1f} "
+                f"{zlib_size / 1024:>9.1f} {deflate_size / 1024:>10.1f} "
+                f"{1 - deflate_size / zlib_size:>6.1%} "
+                f"{zlib_cpu * 1000:>8.2f} {deflate_cpu * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark row-based vs columnar player history reduction/aggregation."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "user",
+    "DB_PASSWORD": "pass",
+    "DB_NAME": "db",
+}.items():
+    os.environ.setdefault(name, value)
+
+from celery_app.tasks.player_detail import (  # noqa: E402
+    aggregate_player_analysis,
+    reduce_player_history_rows,
+)
+from celery_app.tasks.player_history import (  # noqa: E402
+    PLAYER_HISTORY_COLUMNS,
+    aggregate_history_columns,
+    history_columns_from_rows,
+    history_rows_from_columns,
+    reduce_history_columns,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="Synthetic history lengths to benchmark.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per size; the best run is reported.",
+    )
+    return parser.parse_args()
+
+
+def iter_synthetic_rows(count: int, seed: int = 0) -> Iterator[tuple]:
+    rng = random.Random(seed)
+    timestamp = datetime(2022, 9, 1, tzinfo=timezone.utc)
+    modes = ["Splat Zones", "Tower Control", "Rainmaker", "Clam Blitz"]
+    x_power = 2500.0
+    for index in range(count):
+        # Rows arrive on the 10 minute scrape cadence, several modes at once.
+        timestamp += timedelta(minutes=rng.choice([0, 10, 10, 10]))
+        if rng.random() < 0.05:
+            x_power = round(x_power + rng.uniform(-25, 25), 1)
+        yield (
+            rng.choice(modes),
+            False,
+            1 + index // 5_000,
+            timestamp,
+            x_power,
+            rng.choice([10, 20, 30, 40]),
+            rng.randint(1, 500),
+            rng.random() < 0.05,
+        )
+
+
+def synthetic_rows(count: int, seed: int = 0) -> list[tuple]:
+    return list(iter_synthetic_rows(count, seed))
+
+
+def run_rows(rows: list[tuple]) -> tuple[list[dict], dict]:
+    # Mirrors the previous _fetch_player_data: dict per row, ISO every row.
+    player_data = [dict(zip(PLAYER_HISTORY_COLUMNS, row)) for row in rows]
+    for row in player_data:
+        row["timestamp"] = row["timestamp"].isoformat()
+    reduced = reduce_player_history_rows(player_data)
+    return reduced, aggregate_player_analysis(reduced)
+
+
+def run_columns(rows: list[tuple]) -> tuple[list[dict], dict]:
+    columns = history_columns_from_rows(rows)
+    mask = reduce_history_columns(columns)
+    return (
+        history_rows_from_columns(columns, mask),
+        aggregate_history_columns(columns, mask),
+    )
+
+
+def best_of(func, rows: list[tuple], repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = perf_counter()
+        result = func(rows)
+        best = min(best, perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    args = parse_args()
+    print(f"{'rows':>8} {'row-based':>12} {'columnar':>12} {'speedup':>8}")
+    for size in args.sizes:
+        rows = synthetic_rows(size)
+        row_seconds, row_result = best_of(run_rows, rows, args.repeat)
+        column_seconds, column_result = best_of(run_columns, rows, args.repeat)
+        if row_result != column_result:
+            raise SystemExit(f"Engines disagree for {size} rows")
+        print(
+            f"{size:>8} {row_seconds * 1000:>10.1f}ms "
+            f"{column_seconds * 1000:>10.1f}ms "
+            f"{row_seconds / column_seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Compare peak RSS of buffered vs streaming player history fetches.
+
+Each mode runs in a fresh interpreter against a synthetic player history so
+peak RSS (``ru_maxrss``) is not polluted by earlier runs. Rows are produced
+lazily to stand in for a server-side cursor; the buffered modes materialize
+them first, like ``.fetchall()`` does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import subprocess
+import sys
+
+MODES = ("buffered-rows", "buffered-columnar", "streaming")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=200_000,
+        help="Synthetic history length.",
+    )
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(mode: str, count: int) -> None:
+    from benchmark_player_history import iter_synthetic_rows
+
+    from celery_app.tasks.player_detail import (
+        reduce_player_history_rows,
+        reduce_player_history_stream,
+    )
+    from celery_app.tasks.player_history import (
+        PLAYER_HISTORY_COLUMNS,
+        history_columns_from_rows,
+        history_rows_from_columns,
+        reduce_history_columns,
+    )
+
+    def as_dicts(rows):
+        for row in rows:
+            player = dict(zip(PLAYER_HISTORY_COLUMNS, row))
+            player["timestamp"] = player["timestamp"].isoformat()
+            yield player
+
+    baseline = peak_rss_mb()
+    if mode == "buffered-rows":
+        rows = list(iter_synthetic_rows(count))
+        reduced = reduce_player_history_rows(list(as_dicts(rows)))
+    elif mode == "buffered-columnar":
+        rows = list(iter_synthetic_rows(count))
+        columns = history_columns_from_rows(rows)
+        reduced = history_rows_from_columns(
+            columns, reduce_history_columns(columns)
+        )
+    else:
+        reduced = reduce_player_history_stream(
+            as_dicts(iter_synthetic_rows(count))
+        )
+    print(f"{peak_rss_mb() - baseline:.1f} {len(reduced)}")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.child:
+        run_child(args.child, args.rows)
+        return
+
+    print(f"{args.rows} rows")
+    print(f"{'mode':>18} {'peak RSS growth':>16} {'kept rows':>10}")
+    for mode in MODES:
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--rows",
+                str(args.rows),
+                "--child",
+                mode,
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        print(f"{mode:>18} {float(output[0]):>14.1f}MB {int(output[1]):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""Time publishing the ripple player index, per-key writes vs pipelines.
+
+Builds a synthetic index of ``--players`` players (history and match impact
+rows included) and publishes it two ways:
+
+* ``sequential``: the old loop, four ``SET`` calls per player and four
+  ``DELETE`` calls per player that dropped out of the index.
+* ``pipelined``: ``ripple_snapshot._publish_player_index``, which writes a
+  new generation (one hash of sections per player, no full-payload copy)
+  in pipelined batches, flips the latest/meta pointer in one MULTI/EXEC and
+  expires the previous generation.
+* ``incremental``: a second pipelined publish on top of the first, where
+  only ``--changed`` players differ; the rest match their stored digest and
+  are copied server-side instead of re-serialized. Only the second publish
+  is timed.
+
+Stored size is the bytes written per layout: value lengths in simulated
+mode, the ``used_memory`` delta against a real Redis.
+
+Point ``--redis-url`` at a real Redis, or pass ``--simulated`` to use an
+in-process store that charges ``--rtt-ms`` per round trip.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from time import perf_counter
+
+import orjson
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "user",
+    "DB_PASSWORD": "pass",
+    "DB_NAME": "db",
+    "RANKINGS_DB_NAME": "db",
+}.items():
+    os.environ.setdefault(name, value)
+
+from celery_app.tasks import ripple_snapshot as snapshot_mod  # noqa: E402
+from shared_lib.constants import (  # noqa: E402
+    RIPPLE_PLAYER_INDEX_LATEST_KEY,
+    RIPPLE_PLAYER_INDEX_META_KEY,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["sequential", "pipelined", "incremental"],
+        default=["sequential", "pipelined", "incremental"],
+    )
+    parser.add_argument("--players", type=int, default=50_000)
+    parser.add_argument(
+        "--stale",
+        type=int,
+        default=2_000,
+        help="Players in the previous index that are not in the new one.",
+    )
+    parser.add_argument(
+        "--changed",
+        type=int,
+        default=2_500,
+        help="Players whose payload changes between incremental publishes.",
+    )
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--simulated", action="store_true")
+    parser.add_argument("--rtt-ms", type=float, default=0.2)
+    return parser.parse_args()
+
+
+class _SimulatedPipeline:
+    def __init__(self, store: "_SimulatedRedis"):
+        self.store = store
+        self.ops = []
+
+    def set(self, key, value):
+        self.ops.append(("set", key, value))
+        return self
+
+    def hset(self, key, mapping):
+        self.ops.append(("hset", key, mapping))
+        return self
+
+    def copy(self, source, destination, replace=False):
+        self.ops.append(("copy", source, destination))
+        return self
+
+    def expire(self, key, ttl):
+        self.ops.append(("expire", key, ttl))
+        return self
+
+    def execute(self):
+        self.store.round_trip()
+        out = []
+        for op, key, value in self.ops:
+            if op == "set":
+                self.store.kv[key] = value
+            elif op == "hset":
+                self.store.kv.setdefault(key, {}).update(value)
+            elif op == "copy":
+                if key in self.store.kv:
+                    self.store.kv[value] = dict(self.store.kv[key])
+                out.append(key in self.store.kv)
+                continue
+            elif key in self.store.kv:
+                self.store.ttls[key] = value
+            out.append(True)
+        self.ops.clear()
+        return out
+
+
+class _SimulatedRedis:
+    def __init__(self, rtt_ms: float):
+        self.rtt = rtt_ms / 1000
+        self.kv: dict = {}
+        self.ttls: dict = {}
+        self.round_trips = 0
+
+    def round_trip(self):
+        self.round_trips += 1
+        deadline = perf_counter() + self.rtt
+        while perf_counter() < deadline:
+            pass
+
+    def get(self, key):
+        self.round_trip()
+        return self.kv.get(key)
+
+    def set(self, key, value):
+        self.round_trip()
+        self.kv[key] = value
+
+    def delete(self, key):
+        self.round_trip()
+        self.kv.pop(key, None)
+
+    def expire(self, key, ttl):
+        self.round_trip()
+        if key in self.kv:
+            self.ttls[key] = ttl
+
+    def hgetall(self, key):
+        self.round_trip()
+        return dict(self.kv.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return _SimulatedPipeline(self)
+
+    def stored_bytes(self) -> int:
+        total = 0
+        for key, value in self.kv.items():
+            if isinstance(value, dict):
+                total += sum(len(f) + len(v) for f, v in value.items())
+            else:
+                total += len(value)
+            total += len(key)
+        return total
+
+
+def build_players(count: int, *, offset: int = 0) -> dict:
+    players = {}
+    for index in range(offset, offset + count):
+        player_id = f"player-{index}"
+        players[player_id] = {
+            "player_id": player_id,
+            "display_name": f"Player {index}",
+            "eligible": index % 3 != 0,
+            "stable_rank": index + 1,
+            "display_score": 150.0 + (index * 37) % 400 / 10,
+            "history_record_count": 10,
+            "tournament_history_ranked": [
+                {
+                    "tournament_id": 1_000 + row,
+                    "tournament_name": f"Cup {row}",
+                    "event_ms": 1_700_000_000_000 + row * 86_400_000,
+                    "wins": row % 4,
+                    "losses": row % 3,
+                }
+                for row in range(10)
+            ],
+            "match_loo_record_count": 5,
+            "match_loo_impacts": [
+                {"match_id": 50_000 + row, "impact": row / 10}
+                for row in range(5)
+            ],
+        }
+    return players
+
+
+def publish_sequential(players, index_payload, meta_payload, stale_ids):
+    """The publish loop as it was before pipelining."""
+    persist = snapshot_mod._persist_payload
+    for player_id, player_payload in players.items():
+        persist(snapshot_mod._player_index_key(player_id), player_payload)
+        persist(
+            snapshot_mod._player_index_summary_key(player_id),
+            snapshot_mod._build_player_summary_section(player_payload),
+        )
+        persist(
+            snapshot_mod._player_index_history_key(player_id),
+            snapshot_mod._build_player_history_section(player_payload),
+        )
+        persist(
+            snapshot_mod._player_index_results_key(player_id),
+            snapshot_mod._build_player_results_section(player_payload),
+        )
+    for player_id in stale_ids:
+        for key in snapshot_mod._player_index_storage_keys(player_id, None):
+            snapshot_mod.redis_conn.delete(key)
+    persist(RIPPLE_PLAYER_INDEX_LATEST_KEY, index_payload)
+    persist(RIPPLE_PLAYER_INDEX_META_KEY, meta_payload)
+
+
+def open_client(args):
+    if args.simulated:
+        return _SimulatedRedis(args.rtt_ms)
+    import redis
+
+    return redis.Redis.from_url(args.redis_url)
+
+
+def used_memory(client) -> int:
+    if isinstance(client, _SimulatedRedis):
+        return client.stored_bytes()
+    return int(client.info("memory")["used_memory"])
+
+
+def index_payloads(players, generated_at_ms: int) -> tuple[dict, dict]:
+    index_payload, meta_payload, _ = snapshot_mod._build_player_index_payload(
+        all_rows=[],
+        stable_rows=[],
+        danger_rows=[],
+        tournament_history_by_player={},
+        match_loo_impacts_by_player={},
+        delta_payload={},
+        generated_at_ms=generated_at_ms,
+        calculated_at_ms=generated_at_ms,
+        build_version="bench",
+    )
+    index_payload["player_ids"] = sorted(players)
+    return index_payload, meta_payload
+
+
+def publish_incremental(
+    players, changed: int, generated_at_ms: int
+) -> tuple[dict, str, dict]:
+    """Publishes a base generation, then times nothing but the next one."""
+    index_payload, meta_payload = index_payloads(players, generated_at_ms)
+    snapshot_mod._publish_player_index(
+        players,
+        index_payload=index_payload,
+        meta_payload=meta_payload,
+        previous_player_ids=set(),
+        previous_generation=None,
+    )
+    previous_generation = index_payload["generation"]
+    return (
+        {
+            player_id: (
+                {**payload, "display_score": payload["display_score"] + 1}
+                if index < changed
+                else payload
+            )
+            for index, (player_id, payload) in enumerate(players.items())
+        },
+        previous_generation,
+        snapshot_mod._load_player_index_digests(previous_generation),
+    )
+
+
+def run_mode(mode: str, args, players, stale_ids) -> tuple[float, int]:
+    client = open_client(args)
+    snapshot_mod.redis_conn = client
+    generated_at_ms = int(time.time() * 1000)
+    previous_generation = None
+    previous_digests = None
+    if mode == "incremental":
+        players, previous_generation, previous_digests = publish_incremental(
+            players, args.changed, generated_at_ms
+        )
+        generated_at_ms += 1
+    if isinstance(client, _SimulatedRedis):
+        client.round_trips = 0
+    memory_before = used_memory(client)
+    index_payload, meta_payload = index_payloads(players, generated_at_ms)
+    started = perf_counter()
+    if mode == "sequential":
+        publish_sequential(players, index_payload, meta_payload, stale_ids)
+    else:
+        snapshot_mod._publish_player_index(
+            players,
+            index_payload=index_payload,
+            meta_payload=meta_payload,
+            previous_player_ids=set(players) | set(stale_ids),
+            previous_generation=previous_generation,
+            previous_digests=previous_digests,
+        )
+    elapsed = perf_counter() - started
+    stored = used_memory(client) - memory_before
+    if not args.simulated:
+        client.flushdb()
+    return elapsed, stored
+
+
+def main() -> None:
+    args = parse_args()
+    players = build_players(args.players)
+    stale_ids = [f"stale-{index}" for index in range(args.stale)]
+    payload_mb = sum(len(orjson.dumps(p)) for p in players.values()) / 2**20
+    print(
+        f"players={args.players} stale={args.stale} "
+        f"changed={args.changed} "
+        f"player_payloads={payload_mb:.0f}MB "
+        f"batch={snapshot_mod.PLAYER_INDEX_PUBLISH_BATCH_SIZE} "
+        + (
+            f"simulated rtt={args.rtt_ms}ms"
+            if args.simulated
+            else f"redis={args.redis_url}"
+        )
+    )
+    print(f"{'mode':>10} {'seconds':>8} {'round trips':>11} {'stored MB':>9}")
+    for mode in args.modes:
+        elapsed, stored = run_mode(mode, args, players, stale_ids)
+        round_trips = getattr(snapshot_mod.redis_conn, "round_trips", None)
+        print(
+            f"{mode:>10} {elapsed:>8.2f} "
+            f"{round_trips if round_trips is not None else '-':>11} "
+            f"{stored / 2**20:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Time repeated rankings queries with and without prepared statement reuse.
+
+Runs ``fetch_ripple_page`` ``--repeats`` times per engine over one pooled
+connection against the rankings database, comparing an engine whose asyncpg
+prepared statement cache is disabled (``--cache-sizes 0``: every call is
+parsed and planned again) with the cache size the app engines use. The first
+call per engine is reported separately, since it always pays for the prepare.
+
+Point the usual ``DB_*`` / ``RANKINGS_DB_NAME`` / ``RANKINGS_DB_SCHEMA``
+variables at a Postgres holding a rankings schema.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from shared_lib.db import create_ranking_uri, ranking_connect_args  # noqa: E402
+from shared_lib.queries.ripple_queries import fetch_ripple_page  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--cache-sizes",
+        nargs="+",
+        type=int,
+        default=[
+            0,
+            ranking_connect_args()["prepared_statement_cache_size"],
+        ],
+    )
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100)
+    return parser.parse_args()
+
+
+async def run_cache_size(cache_size: int, args) -> dict:
+    engine = create_async_engine(
+        create_ranking_uri(),
+        connect_args={"prepared_statement_cache_size": cache_size},
+        pool_size=1,
+        max_overflow=0,
+    )
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    timings = []
+    try:
+        for _ in range(args.repeats + 1):
+            async with session_factory() as session:
+                started = perf_counter()
+                await fetch_ripple_page(session, limit=args.limit)
+                timings.append(perf_counter() - started)
+    finally:
+        await engine.dispose()
+    first, rest = timings[0], sorted(timings[1:])
+    return {
+        "first": first,
+        "p50": rest[len(rest) // 2],
+        "p99": rest[min(len(rest) - 1, int(len(rest) * 0.99))],
+        "mean": sum(rest) / len(rest),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    print(
+        f"schema={os.getenv('RANKINGS_DB_SCHEMA', 'comp_rankings')} "
+        f"limit={args.limit} repeats={args.repeats}"
+    )
+    print(
+        f"{'cache':>6} {'first ms':>9} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'mean ms':>8}"
+    )
+    for cache_size in args.cache_sizes:
+        result = asyncio.run(run_cache_size(cache_size, args))
+        print(
+            f"{cache_size:>6} {result['first'] * 1000:>9.2f} "
+            f"{result['p50'] * 1000:>8.2f} {result['p99'] * 1000:>8.2f} "
+            f"{result['mean'] * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
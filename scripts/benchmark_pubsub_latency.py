@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Benchmark end-to-end player chunk delivery through the pubsub listener.
+
+Compares the old listener, which polled ``get_message()`` every 10 ms and
+parsed each message with ``json.loads``, against the blocking async
+subscriber in ``fast_api_app.pubsub`` that routes on the message header.
+Latency is measured from publish to the websocket broadcast call; idle CPU is
+the process time the listener uses while no messages arrive.
+
+Point ``--redis-url`` at a real Redis, or pass ``--simulated`` to use an
+in-process broker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from time import perf_counter
+
+import orjson
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "user",
+    "DB_PASSWORD": "pass",
+    "DB_NAME": "db",
+    "RANKINGS_DB_NAME": "db",
+}.items():
+    os.environ.setdefault(name, value)
+
+import fast_api_app.pubsub as pubsub_mod  # noqa: E402
+from shared_lib.payload_utils import encode_player_pubsub_message  # noqa: E402
+
+CHANNEL = "benchmark:player_updates"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["polling", "blocking"],
+        default=["polling", "blocking"],
+    )
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--simulated", action="store_true")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument(
+        "--interval-ms",
+        type=float,
+        default=7.0,
+        help="Gap between published chunks.",
+    )
+    parser.add_argument("--payload-kb", type=int, default=128)
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    return parser.parse_args()
+
+
+class _MemoryBroker:
+    def __init__(self):
+        self.queues: list[deque] = []
+        self.waiters: list[asyncio.Event] = []
+
+    def publish(self, channel, message):
+        for queue, waiter in zip(self.queues, self.waiters):
+            queue.append({"type": "message", "data": message})
+            waiter.set()
+
+    def subscribe(self) -> tuple[deque, asyncio.Event]:
+        queue, waiter = deque(), asyncio.Event()
+        self.queues.append(queue)
+        self.waiters.append(waiter)
+        return queue, waiter
+
+
+class _PollingPubSub:
+    def __init__(self, broker: _MemoryBroker):
+        self.queue, _ = broker.subscribe()
+
+    def get_message(self):
+        return self.queue.popleft() if self.queue else None
+
+
+class _BlockingPubSub:
+    def __init__(self, broker: _MemoryBroker):
+        self.queue, self.waiter = broker.subscribe()
+
+    async def listen(self):
+        while True:
+            while self.queue:
+                yield self.queue.popleft()
+            self.waiter.clear()
+            await self.waiter.wait()
+
+
+class _RecordingManager:
+    def __init__(self, sent_at: dict[str, float]):
+        self.sent_at = sent_at
+        self.latencies: list[float] = []
+        self.active_connections: dict = {}
+
+    async def broadcast_player_data(self, message, player_id, **kwargs):
+        started = self.sent_at.pop(player_id, None)
+        if started is not None:
+            self.latencies.append(perf_counter() - started)
+
+    def fetch_completed(self, player_id):
+        return None
+
+
+async def polling_listener(pubsub, manager: _RecordingManager):
+    """The listener as it was: poll, sleep 10 ms, parse every message."""
+    while True:
+        message = pubsub.get_message()
+        if message and message["type"] == "message":
+            data = json.loads(message["data"])
+            await manager.broadcast_player_data(
+                message["data"], data["player_id"], progressive_only=True
+            )
+        else:
+            await asyncio.sleep(0.01)
+
+
+def build_message(mode: str, player_id: str, body: bytes) -> bytes:
+    if mode == "polling":
+        return body
+    return encode_player_pubsub_message(player_id, "analysis", body)
+
+
+def build_body(player_id: str, payload_kb: int) -> bytes:
+    rows = [
+        {"season_number": 5, "mode": "Rainmaker", "x_power": 2800.0 + i}
+        for i in range(payload_kb * 1024 // 60)
+    ]
+    return orjson.dumps(
+        {
+            "player_id": player_id,
+            "type": "player_chunk",
+            "phase": "analysis",
+            "payload": {"player_data": rows},
+        }
+    )
+
+
+async def open_subscriber(mode: str, args, broker):
+    if args.simulated:
+        if mode == "polling":
+            return _PollingPubSub(broker), None
+        return _BlockingPubSub(broker), None
+    if mode == "polling":
+        import redis
+
+        client = redis.Redis.from_url(args.redis_url)
+        pubsub = client.pubsub()
+        pubsub.subscribe(CHANNEL)
+        return pubsub, client
+    import redis.asyncio as aioredis
+
+    client = aioredis.Redis.from_url(args.redis_url)
+    pubsub = client.pubsub()
+    await pubsub.subscribe(CHANNEL)
+    return pubsub, client
+
+
+async def run_mode(mode: str, args) -> dict:
+    broker = _MemoryBroker()
+    sent_at: dict[str, float] = {}
+    manager = _RecordingManager(sent_at)
+    pubsub_mod.connection_manager = manager
+    pubsub, client = await open_subscriber(mode, args, broker)
+    if args.simulated:
+        publish = broker.publish
+    else:
+        import redis.asyncio as aioredis
+
+        publisher = aioredis.Redis.from_url(args.redis_url)
+
+        async def publish(channel, message):
+            await publisher.publish(channel, message)
+
+    if mode == "polling":
+        listener = asyncio.create_task(polling_listener(pubsub, manager))
+    else:
+        listener = asyncio.create_task(
+            pubsub_mod.process_pubsub_message(pubsub)
+        )
+    await asyncio.sleep(0.1)
+
+    cpu_started = time.process_time()
+    await asyncio.sleep(args.idle_seconds)
+    idle_cpu = time.process_time() - cpu_started
+
+    messages = [
+        build_message(
+            mode,
+            f"bench-{index}",
+            build_body(f"bench-{index}", args.payload_kb),
+        )
+        for index in range(args.messages)
+    ]
+    for index, message in enumerate(messages):
+        player_id = f"bench-{index}"
+        sent_at[player_id] = perf_counter()
+        result = publish(CHANNEL, message)
+        if asyncio.iscoroutine(result):
+            await result
+        await asyncio.sleep(args.interval_ms / 1000)
+    await asyncio.sleep(0.2)
+    listener.cancel()
+    if mode == "blocking" and client is not None:
+        await pubsub.aclose()
+    elif client is not None:
+        pubsub.close()
+    latencies = sorted(manager.latencies)
+    return {
+        "delivered": len(latencies),
+        "idle_cpu": idle_cpu,
+        "p50": latencies[len(latencies) // 2] if latencies else float("nan"),
+        "p99": (
+            latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            if latencies
+            else float("nan")
+        ),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    print(
+        f"messages={args.messages} interval={args.interval_ms}ms "
+        f"payload={args.payload_kb}KB "
+        + ("simulated broker" if args.simulated else f"redis={args.redis_url}")
+    )
+    print(
+        f"{'mode':>9} {'delivered':>9} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'idle cpu ms/s':>13}"
+    )
+    for mode in args.modes:
+        result = asyncio.run(run_mode(mode, args))
+        print(
+            f"{mode:>9} {result['delivered']:>9} "
+            f"{result['p50'] * 1000:>8.2f} {result['p99'] * 1000:>8.2f} "
+            f"{result['idle_cpu'] * 1000 / args.idle_seconds:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
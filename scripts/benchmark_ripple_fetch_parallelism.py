@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Time the ripple refresh player fetches at several parallelism levels.
+
+Loads ``--players`` player ids from the rankings database, then runs the
+owner, ranked history and match LOO fetches the way
+``_refresh_snapshots_async_once`` does: inside one refresh transaction,
+with batches fanned out over pooled connections that import its exported
+snapshot. ``--parallelism 1`` is the old sequential path on a single
+session.
+
+Point the usual ``DB_*`` / ``RANKINGS_DB_NAME`` / ``RANKINGS_DB_SCHEMA``
+variables at a Postgres holding a rankings schema.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from sqlalchemy import text  # noqa: E402
+
+from celery_app.connections import rankings_async_session  # noqa: E402
+from celery_app.tasks import ripple_snapshot as snapshot_mod  # noqa: E402
+from shared_lib.queries import ripple_queries  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--parallelism", nargs="+", type=int, default=[1, 2, 4, 8]
+    )
+    parser.add_argument("--players", type=int, default=20_000)
+    return parser.parse_args()
+
+
+async def load_player_ids(limit: int) -> tuple[list[str], int | None]:
+    schema_sql = f'"{ripple_queries._schema()}"'
+    async with rankings_async_session() as session:
+        result = await session.execute(
+            text(
+                f"SELECT player_id::text FROM {schema_sql}.players "
+                "ORDER BY player_id LIMIT :limit"
+            ),
+            {"limit": limit},
+        )
+        player_ids = [row[0] for row in result.all()]
+        _, _, calculated_at_ms, _ = await ripple_queries.fetch_ripple_page(
+            session, limit=1
+        )
+    return player_ids, snapshot_mod._to_int(calculated_at_ms)
+
+
+async def run_level(
+    parallelism: int, player_ids: list[str], calculated_at_ms: int | None
+) -> tuple[float, int]:
+    os.environ["RIPPLE_REFRESH_FETCH_PARALLELISM"] = str(parallelism)
+    async with rankings_async_session() as session:
+        async with session.begin():
+            started = perf_counter()
+            fetch_session = await snapshot_mod._open_snapshot_session_pool(
+                session
+            )
+            owners, (history, loo, _, _) = await snapshot_mod._gather_fetches(
+                fetch_session,
+                snapshot_mod._fetch_player_owner_discord_ids(
+                    fetch_session, player_ids
+                ),
+                snapshot_mod._fetch_player_index_sources(
+                    fetch_session,
+                    player_ids,
+                    calculated_at_ms=calculated_at_ms,
+                    build_version=None,
+                    base=None,
+                    active_player_ids=None,
+                ),
+            )
+            elapsed = perf_counter() - started
+    rows = (
+        len(owners or {})
+        + sum(len(items) for items in history.values())
+        + sum(len(items) for items in loo.values())
+    )
+    return elapsed, rows
+
+
+async def main_async(args) -> None:
+    player_ids, calculated_at_ms = await load_player_ids(args.players)
+    print(
+        f"players={len(player_ids)} "
+        f"chunk={snapshot_mod.PLAYER_HISTORY_CHUNK_SIZE} "
+        f"calculated_at_ms={calculated_at_ms}"
+    )
+    print(f"{'parallel':>8} {'seconds':>8} {'rows':>8}")
+    for parallelism in args.parallelism:
+        elapsed, rows = await run_level(
+            parallelism, player_ids, calculated_at_ms
+        )
+        print(f"{parallelism:>8} {elapsed:>8.2f} {rows:>8}")
+    await snapshot_mod.rankings_async_engine.dispose()
+
+
+def main() -> None:
+    asyncio.run(main_async(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
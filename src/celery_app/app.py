@@ -20,7 +20,11 @@ from celery_app.tasks.leaderboard import (
     fetch_weapon_leaderboard,
 )
 from celery_app.tasks.misc import pull_aliases, update_weapon_info
-from celery_app.tasks.player_detail import fetch_player_data
+from celery_app.tasks.player_detail import (
+    fetch_player_data,
+    fetch_player_data_batch,
+    warm_player_detail_cache,
+)
 from celery_app.tasks.ripple_snapshot import refresh_ripple_snapshots
 from celery_app.tasks.sqlite_lookup_snapshot import (
     refresh_lookup_sqlite_snapshot,
@@ -38,6 +42,8 @@ celery = Celery("tasks", broker=REDIS_URI, backend=REDIS_URI)
 celery.task(name="tasks.pull_data")(pull_data)
 celery.task(name="tasks.fetch_race_to_5000")(fetch_race_to_5000)
 celery.task(name="tasks.fetch_player_data")(fetch_player_data)
+celery.task(name="tasks.fetch_player_data_batch")(fetch_player_data_batch)
+celery.task(name="tasks.warm_player_detail_cache")(warm_player_detail_cache)
 celery.task(name="tasks.update_weapon_info")(update_weapon_info)
 celery.task(name="tasks.pull_aliases")(pull_aliases)
 celery.task(name="tasks.update_skill_offset")(compute_skill_offset)
@@ -14,6 +14,10 @@ celery.conf.beat_schedule = {
         "task": "tasks.pull_data",
         "schedule": crontab(minute="*/10"),
     },
+    "warm-player-detail-every-ten-minutes": {
+        "task": "tasks.warm_player_detail_cache",
+        "schedule": crontab(minute="3-59/10"),
+    },
     "fetch-race-to-5000-every-two-hours": {
         "task": "tasks.fetch_race_to_5000",
         "schedule": crontab(minute=15, hour="*/2"),
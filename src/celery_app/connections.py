@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from shared_lib.constants import REDIS_HOST, REDIS_PORT
-from shared_lib.db import create_ranking_uri, create_uri
+from shared_lib.db import create_ranking_uri, create_uri, ranking_connect_args
 
 engine = create_engine(create_uri().replace("asyncpg", "psycopg2"))
 Session = scoped_session(sessionmaker(bind=engine))
@@ -18,6 +18,7 @@ redis_conn = redis.Redis(
 
 rankings_async_engine = create_async_engine(
     create_ranking_uri(),
+    connect_args=ranking_connect_args(),
     pool_pre_ping=True,  # Test connection health before use
     pool_recycle=3600,  # Recycle connections every hour
 )
@@ -26,3 +27,10 @@ rankings_async_session = async_sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
 )
+# Sessions for work that imports a snapshot exported by another transaction;
+# SET TRANSACTION SNAPSHOT requires REPEATABLE READ or stricter.
+rankings_snapshot_session = async_sessionmaker(
+    rankings_async_engine.execution_options(isolation_level="REPEATABLE READ"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
@@ -7,6 +7,7 @@ import pandas as pd
 from sqlalchemy import text
 
 from celery_app.connections import Session, redis_conn
+from celery_app.tasks.player_detail import store_player_detail_warm_targets
 from shared_lib.constants import (
     ALIASES_REDIS_KEY,
     MODES,
@@ -288,6 +289,7 @@ def pull_data() -> None:
     logger.info("Pulling data")
     pull_start = perf_counter()
     dfs = []
+    ranked_rows = []
     for mode in MODES:
         for region in REGIONS:
             region_bool = region == "Takoroka"
@@ -296,6 +298,12 @@ def pull_data() -> None:
             df["mode"] = mode
             df["region"] = region
             dfs.append(df)
+            ranked_rows.extend(players)
+
+    try:
+        store_player_detail_warm_targets(ranked_rows)
+    except Exception:
+        logger.exception("Failed to store player detail warm targets")
 
     if metrics_enabled():
         total_raw_rows = sum(len(df) for df in dfs)
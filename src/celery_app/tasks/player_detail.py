@@ -1,35 +1,79 @@
+import hashlib
 import logging
 import math
+import os
+import zlib
+from contextlib import nullcontext
 from datetime import datetime, timezone
-from time import perf_counter
+from itertools import groupby
+from time import perf_counter, sleep
+from typing import Callable, Iterable, Iterator
 
 import orjson
 from sqlalchemy import text
 
 from celery_app.connections import Session, redis_conn
+from celery_app.tasks.player_history import (
+    history_columns_from_rows,
+    history_rows_from_columns,
+    reduce_history_columns,
+)
 from shared_lib.constants import (
+    PLAYER_CACHE_HARD_TTL_SECONDS,
+    PLAYER_DETAIL_BATCH_PENDING_KEY,
+    PLAYER_DETAIL_FETCH_PENDING_KEY,
+    PLAYER_DETAIL_WARM_SIGNATURES_KEY,
+    PLAYER_DETAIL_WARM_TARGETS_KEY,
+    PLAYER_HISTORY_STATE_REDIS_KEY,
+    PLAYER_LATEST_COMPACT_REDIS_KEY,
+    PLAYER_LATEST_FRAME_REDIS_KEY,
     PLAYER_LATEST_REDIS_KEY,
     PLAYER_PUBSUB_CHANNEL,
 )
 from shared_lib.monitoring import (
     DATA_PULL_DURATION,
     DATA_PULL_ROWS,
+    PLAYER_DETAIL_HISTORY_STATE,
     PLAYER_DETAIL_PAYLOAD_BYTES,
     PLAYER_DETAIL_PIPELINE_DURATION,
     PLAYER_DETAIL_ROWS,
+    PLAYER_DETAIL_WARM_EVENTS,
     metrics_enabled,
 )
+from shared_lib.payload_utils import (
+    compressed_pubsub_frames_enabled,
+    encode_player_pubsub_message,
+    is_player_cache_stale,
+    per_player_pubsub_enabled,
+    player_pubsub_channel,
+    players_to_columnar,
+)
 from shared_lib.queries.player_queries import (
+    PLAYER_DATA_BATCH_QUERY,
     PLAYER_DATA_QUERY,
-    PLAYER_LATEST_DATA_QUERY,
-    SEASON_RESULTS_QUERY,
+    PLAYER_DATA_SINCE_BATCH_QUERY,
+    PLAYER_DATA_SINCE_QUERY,
+    PLAYER_LATEST_DATA_BATCH_QUERY,
+    PLAYER_SNAPSHOT_QUERY,
+    SEASON_RESULTS_BATCH_QUERY,
 )
 
 logger = logging.getLogger(__name__)
 
 PLAYER_CHUNK_VERSION = 2
+# Version 3 clients get one pre-compressed, columnar payload from the cache.
+PLAYER_COMPACT_VERSION = 3
+PLAYER_COMPACT_ZLIB_LEVEL = 9
 PLAYER_FETCH_LOCK_TTL_SECONDS = 300
-PLAYER_CACHE_TTL_SECONDS = 900
+# Payloads live for the hard TTL; past the soft TTL they are served stale
+# and rebuilt by the next fetch.
+PLAYER_CACHE_TTL_SECONDS = PLAYER_CACHE_HARD_TTL_SECONDS
+# Incremental history state outlives the payload cache so refreshes after
+# expiry only fetch rows newer than the stored high-water timestamp.
+PLAYER_HISTORY_STATE_TTL_SECONDS = 7 * 24 * 60 * 60
+PLAYER_HISTORY_STATE_VERSION = 1
+PLAYER_WARM_TARGETS_TTL_SECONDS = 30 * 60
+PLAYER_WARM_UNRANKED = 10_000
 PLAYER_AGGREGATED_KEYS = (
     "weapon_counts",
     "weapon_winrate",
@@ -79,6 +123,59 @@ def build_analysis_payload(player_data: list[dict]) -> dict:
     }
 
 
+def build_compact_player_payload(payload: dict) -> bytes:
+    """Encodes a merged payload as zlib-compressed columnar JSON.
+
+    History rows become parallel arrays keyed by column name, so each key is
+    written once rather than once per row. The bytes are exactly what
+    version 3 websocket clients receive.
+    """
+    compact_payload = {
+        "version": PLAYER_COMPACT_VERSION,
+        "format": "columnar",
+        "player_data": players_to_columnar(payload["player_data"]),
+        "aggregated_data": payload["aggregated_data"],
+    }
+    return zlib.compress(
+        orjson.dumps(compact_payload), PLAYER_COMPACT_ZLIB_LEVEL
+    )
+
+
+def store_player_payload(
+    player_id: str, cache_key: str, merged_payload: dict
+) -> None:
+    """Caches the merged payload as JSON, a compact payload and a frame.
+
+    The frame is the JSON payload already zlib-compressed for legacy
+    websocket clients, so FastAPI forwards it on ``complete`` without
+    compressing it once per worker. Derived entries are written first so an
+    existing JSON entry implies the others are there too.
+    """
+    cached_payload_raw = orjson.dumps(merged_payload)
+    compact_payload = build_compact_player_payload(merged_payload)
+    legacy_frame = zlib.compress(cached_payload_raw)
+    if metrics_enabled():
+        PLAYER_DETAIL_PAYLOAD_BYTES.labels(kind="cache_payload").observe(
+            len(cached_payload_raw)
+        )
+        PLAYER_DETAIL_PAYLOAD_BYTES.labels(kind="compact_payload").observe(
+            len(compact_payload)
+        )
+    pipe = redis_conn.pipeline()
+    pipe.set(
+        f"{PLAYER_LATEST_COMPACT_REDIS_KEY}:{player_id}",
+        compact_payload,
+        ex=PLAYER_CACHE_TTL_SECONDS,
+    )
+    pipe.set(
+        f"{PLAYER_LATEST_FRAME_REDIS_KEY}:{player_id}",
+        legacy_frame,
+        ex=PLAYER_CACHE_TTL_SECONDS,
+    )
+    pipe.set(cache_key, cached_payload_raw, ex=PLAYER_CACHE_TTL_SECONDS)
+    pipe.execute()
+
+
 def publish_player_chunk(
     player_id: str,
     phase: str,
@@ -100,7 +197,26 @@ def publish_player_chunk(
         PLAYER_DETAIL_PAYLOAD_BYTES.labels(kind=f"{phase}_chunk").observe(
             len(message_bytes)
         )
-    redis_conn.publish(PLAYER_PUBSUB_CHANNEL, message_bytes)
+    # Compress here, once, instead of in every FastAPI worker that forwards
+    # the chunk; the body is then the exact websocket frame.
+    compressed = compressed_pubsub_frames_enabled()
+    if compressed:
+        message_bytes = zlib.compress(message_bytes)
+    channel = (
+        player_pubsub_channel(player_id)
+        if per_player_pubsub_enabled()
+        else PLAYER_PUBSUB_CHANNEL
+    )
+    redis_conn.publish(
+        channel,
+        encode_player_pubsub_message(
+            player_id,
+            phase,
+            message_bytes,
+            cache_key,
+            compressed=compressed,
+        ),
+    )
 
 
 def publish_cached_player_chunks(
@@ -112,6 +228,25 @@ def publish_cached_player_chunks(
     cached_payload = merge_player_payload(
         build_empty_player_payload(), orjson.loads(cached_payload_raw)
     )
+    compact_key = f"{PLAYER_LATEST_COMPACT_REDIS_KEY}:{player_id}"
+    if not redis_conn.exists(compact_key):
+        # Entries cached before the compact encoding existed.
+        redis_conn.set(
+            compact_key,
+            build_compact_player_payload(cached_payload),
+            ex=PLAYER_CACHE_TTL_SECONDS,
+        )
+    frame_key = f"{PLAYER_LATEST_FRAME_REDIS_KEY}:{player_id}"
+    if not redis_conn.exists(frame_key):
+        # Entries cached before the legacy frame existed.
+        raw = (
+            cached_payload_raw.encode()
+            if isinstance(cached_payload_raw, str)
+            else cached_payload_raw
+        )
+        redis_conn.set(
+            frame_key, zlib.compress(raw), ex=PLAYER_CACHE_TTL_SECONDS
+        )
     publish_player_chunk(
         player_id,
         "snapshot",
@@ -141,6 +276,122 @@ def publish_cached_player_chunks(
     publish_player_chunk(player_id, "complete", cache_key=cache_key)
 
 
+def _emit_player_snapshot(
+    player_id: str,
+    season_result: list[dict],
+    latest_data: list[dict],
+    *,
+    publish: bool,
+) -> dict:
+    merged_payload = merge_player_payload(
+        build_empty_player_payload(),
+        build_snapshot_payload(season_result, latest_data),
+    )
+    if publish:
+        publish_player_chunk(
+            player_id,
+            "snapshot",
+            build_snapshot_payload(season_result, latest_data),
+        )
+    return merged_payload
+
+
+def _emit_player_analysis(
+    player_id: str,
+    cache_key: str,
+    merged_payload: dict,
+    build_analysis: Callable[[], dict],
+    *,
+    publish: bool,
+) -> str:
+    analysis_started = perf_counter()
+    try:
+        analysis_payload = build_analysis()
+        merge_player_payload(merged_payload, analysis_payload)
+        if publish:
+            publish_player_chunk(player_id, "analysis", analysis_payload)
+        if metrics_enabled():
+            PLAYER_DETAIL_PIPELINE_DURATION.labels(
+                stage="analysis",
+                outcome="success",
+            ).observe(perf_counter() - analysis_started)
+        outcome = "success"
+    except Exception as e:
+        logger.exception(
+            "Error building player analysis payload for player_id=%s",
+            player_id,
+        )
+        if metrics_enabled():
+            PLAYER_DETAIL_PIPELINE_DURATION.labels(
+                stage="analysis",
+                outcome="error",
+            ).observe(perf_counter() - analysis_started)
+        outcome = "partial_error"
+        if publish:
+            publish_player_chunk(
+                player_id,
+                "error",
+                {"message": str(e), "stage": "analysis"},
+            )
+    finally:
+        store_player_payload(player_id, cache_key, merged_payload)
+
+    if publish:
+        publish_player_chunk(player_id, "complete", cache_key=cache_key)
+    return outcome
+
+
+def build_player_detail_cache(
+    player_id: str, cache_key: str, *, publish: bool = True
+) -> str:
+    """Builds the player detail payload from the database and caches it.
+
+    All queries share one session: the snapshot comes back from a single
+    statement and is published before the history query runs.
+
+    Args:
+        player_id (str): The ID of the player.
+        cache_key (str): Redis key the merged payload is written to.
+        publish (bool): Whether to stream progressive chunks over pub/sub.
+
+    Returns:
+        str: ``"success"`` or ``"partial_error"`` if only the snapshot built.
+    """
+    snapshot_started = perf_counter()
+    with Session() as session:
+        try:
+            season_result, latest_data = _fetch_player_snapshot(
+                player_id, session=session
+            )
+        except Exception:
+            if metrics_enabled():
+                PLAYER_DETAIL_PIPELINE_DURATION.labels(
+                    stage="snapshot",
+                    outcome="error",
+                ).observe(perf_counter() - snapshot_started)
+            raise
+        if metrics_enabled():
+            PLAYER_DETAIL_PIPELINE_DURATION.labels(
+                stage="snapshot",
+                outcome="success",
+            ).observe(perf_counter() - snapshot_started)
+        merged_payload = _emit_player_snapshot(
+            player_id, season_result, latest_data, publish=publish
+        )
+        if metrics_enabled():
+            PLAYER_DETAIL_PIPELINE_DURATION.labels(
+                stage="first_chunk",
+                outcome="success",
+            ).observe(perf_counter() - snapshot_started)
+        return _emit_player_analysis(
+            player_id,
+            cache_key,
+            merged_payload,
+            lambda: _fetch_player_analysis(player_id, session=session),
+            publish=publish,
+        )
+
+
 def fetch_player_data(player_id: str) -> None:
     """Fetches player data and stores it in Redis.
 
@@ -164,8 +415,17 @@ def fetch_player_data(player_id: str) -> None:
     total_outcome = "error"
     try:
         cache_key = f"{PLAYER_LATEST_REDIS_KEY}:{player_id}"
-        cached_payload_raw = redis_conn.get(cache_key)
-        if cached_payload_raw is not None:
+        pipe = redis_conn.pipeline()
+        pipe.get(cache_key)
+        pipe.ttl(cache_key)
+        cached_payload_raw, remaining_ttl = pipe.execute()
+        if cached_payload_raw is not None and is_player_cache_stale(
+            remaining_ttl
+        ):
+            logger.info("Cached data is stale. Refreshing.")
+            total_outcome = build_player_detail_cache(player_id, cache_key)
+            total_outcome = f"stale_{total_outcome}"
+        elif cached_payload_raw is not None:
             replay_started = perf_counter()
             logger.info("Data already exists in cache. Skipping fetch.")
             publish_cached_player_chunks(
@@ -178,167 +438,794 @@ def fetch_player_data(player_id: str) -> None:
                 ).observe(perf_counter() - replay_started)
             total_outcome = "cache_hit"
         else:
-            snapshot_started = perf_counter()
-            try:
-                season_result = _fetch_season_data(player_id)
-                latest_data = pull_all_latest_data(player_id)
-            except Exception:
-                if metrics_enabled():
-                    PLAYER_DETAIL_PIPELINE_DURATION.labels(
-                        stage="snapshot",
-                        outcome="error",
-                    ).observe(perf_counter() - snapshot_started)
-                raise
+            total_outcome = build_player_detail_cache(player_id, cache_key)
+    finally:
+        if metrics_enabled():
+            PLAYER_DETAIL_PIPELINE_DURATION.labels(
+                stage="total",
+                outcome=total_outcome,
+            ).observe(perf_counter() - total_started)
+        try:
+            redis_conn.delete(task_signature)
+            redis_conn.delete(f"{PLAYER_DETAIL_FETCH_PENDING_KEY}:{player_id}")
+        except Exception as e:
+            logger.error("Error deleting task signature: %s", e)
+            logger.error("Probably expired before deletion. Proceeding.")
+
+
+def _group_rows_by_player(result) -> tuple[tuple[str, ...], dict]:
+    """Splits a ``player_id``-first result into per-player row tuples."""
+    column_names = tuple(result.keys())[1:]
+    rows_by_player: dict[str, list[tuple]] = {}
+    for row in result.fetchall():
+        rows_by_player.setdefault(row[0], []).append(tuple(row[1:]))
+    return column_names, rows_by_player
+
+
+def _rows_as_dicts(column_names: tuple[str, ...], rows: list[tuple]) -> list:
+    return [dict(zip(column_names, row)) for row in rows]
+
+
+def _build_batch_player_analysis(
+    player_id: str,
+    state: dict | None,
+    history_columns: dict,
+    history_deltas: dict,
+    history_reduced: dict,
+) -> dict:
+    if state is None:
+        if player_id in history_reduced:
+            reduced = history_reduced[player_id]
+        else:
+            columns = history_columns[player_id]
+            if metrics_enabled():
+                PLAYER_DETAIL_ROWS.labels(stage="history_raw").observe(
+                    len(columns["_valid"])
+                )
+            reduced = history_rows_from_columns(
+                columns, reduce_history_columns(columns)
+            )
+        state = build_player_history_state(reduced)
+        return _store_player_history_state_payload(
+            player_id, state, outcome="miss"
+        )
+
+    new_rows = history_deltas.get(player_id, [])
+    if metrics_enabled():
+        PLAYER_DETAIL_ROWS.labels(stage="history_delta").observe(len(new_rows))
+    advance_player_history_state(state, new_rows)
+    return _store_player_history_state_payload(player_id, state, outcome="hit")
+
+
+def _build_player_detail_batch(player_ids: list[str], summary: dict) -> None:
+    """Builds and publishes payloads for several uncached players at once.
+
+    Every query runs in one session with ``player_id = ANY(:player_ids)``;
+    snapshot chunks go out before the history queries run.
+    """
+    states = {
+        player_id: _load_player_history_state(player_id)
+        for player_id in player_ids
+    }
+    cold_ids = [pid for pid in player_ids if states[pid] is None]
+    warm_ids = [pid for pid in player_ids if states[pid] is not None]
+    history_columns: dict[str, dict] = {}
+    history_deltas: dict[str, list[dict]] = {}
+    history_reduced: dict[str, list[dict]] = {}
+    history_error: Exception | None = None
+
+    with Session() as session:
+        snapshot_started = perf_counter()
+        try:
+            season_columns, season_rows = _group_rows_by_player(
+                session.execute(
+                    text(SEASON_RESULTS_BATCH_QUERY),
+                    {"player_ids": player_ids},
+                )
+            )
+            latest_columns, latest_rows = _group_rows_by_player(
+                session.execute(
+                    text(PLAYER_LATEST_DATA_BATCH_QUERY),
+                    {"player_ids": player_ids},
+                )
+            )
+        except Exception:
             if metrics_enabled():
                 PLAYER_DETAIL_PIPELINE_DURATION.labels(
-                    stage="snapshot",
-                    outcome="success",
+                    stage="batch_snapshot",
+                    outcome="error",
                 ).observe(perf_counter() - snapshot_started)
-            merged_payload = merge_player_payload(
-                build_empty_player_payload(),
-                build_snapshot_payload(season_result, latest_data),
-            )
-            publish_player_chunk(
+            raise
+        if metrics_enabled():
+            PLAYER_DETAIL_PIPELINE_DURATION.labels(
+                stage="batch_snapshot",
+                outcome="success",
+            ).observe(perf_counter() - snapshot_started)
+
+        merged_payloads = {
+            player_id: _emit_player_snapshot(
                 player_id,
-                "snapshot",
-                build_snapshot_payload(season_result, latest_data),
+                _rows_as_dicts(season_columns, season_rows.get(player_id, [])),
+                _rows_as_dicts(latest_columns, latest_rows.get(player_id, [])),
+                publish=True,
             )
+            for player_id in player_ids
+        }
 
-            analysis_started = perf_counter()
-            try:
-                player_result = _fetch_player_data(player_id)
-                analysis_payload = build_analysis_payload(player_result)
-                merge_player_payload(merged_payload, analysis_payload)
-                publish_player_chunk(
-                    player_id, "analysis", analysis_payload
-                )
-                if metrics_enabled():
-                    PLAYER_DETAIL_PIPELINE_DURATION.labels(
-                        stage="analysis",
-                        outcome="success",
-                    ).observe(perf_counter() - analysis_started)
-                total_outcome = "success"
-            except Exception as e:
-                logger.exception(
-                    "Error building player analysis payload for player_id=%s",
-                    player_id,
+        history_started = perf_counter()
+        try:
+            if cold_ids and _history_streaming_enabled():
+                for player_id in cold_ids:
+                    history_reduced[player_id] = []
+                for player_id, rows in _stream_player_history_batch(
+                    session, cold_ids
+                ):
+                    history_reduced[player_id] = reduce_player_history_stream(
+                        rows
+                    )
+            elif cold_ids:
+                column_names, rows_by_player = _group_rows_by_player(
+                    session.execute(
+                        text(PLAYER_DATA_BATCH_QUERY),
+                        {"player_ids": cold_ids},
+                    )
                 )
-                if metrics_enabled():
-                    PLAYER_DETAIL_PIPELINE_DURATION.labels(
-                        stage="analysis",
-                        outcome="error",
-                    ).observe(perf_counter() - analysis_started)
-                total_outcome = "partial_error"
-                publish_player_chunk(
-                    player_id,
-                    "error",
-                    {"message": str(e), "stage": "analysis"},
+                history_columns = {
+                    player_id: history_columns_from_rows(
+                        rows_by_player.get(player_id, []), column_names
+                    )
+                    for player_id in cold_ids
+                }
+            if warm_ids:
+                column_names, rows_by_player = _group_rows_by_player(
+                    session.execute(
+                        text(PLAYER_DATA_SINCE_BATCH_QUERY),
+                        {
+                            "player_ids": warm_ids,
+                            "since": [
+                                datetime.fromisoformat(
+                                    states[player_id]["high_water"]
+                                )
+                                for player_id in warm_ids
+                            ],
+                        },
+                    )
                 )
-            finally:
-                cached_payload_raw = orjson.dumps(merged_payload)
-                if metrics_enabled():
-                    PLAYER_DETAIL_PAYLOAD_BYTES.labels(
-                        kind="cache_payload"
-                    ).observe(len(cached_payload_raw))
-                redis_conn.set(
-                    cache_key,
-                    cached_payload_raw,
-                    ex=PLAYER_CACHE_TTL_SECONDS,
+                for player_id, rows in rows_by_player.items():
+                    history_deltas[player_id] = _rows_as_dicts(
+                        column_names, rows
+                    )
+                    for row in history_deltas[player_id]:
+                        row["timestamp"] = row["timestamp"].isoformat()
+        except Exception as e:
+            logger.exception("Error fetching batched player history")
+            history_error = e
+        if metrics_enabled():
+            DATA_PULL_DURATION.labels(
+                task="player_detail.fetch_player_data_batch"
+            ).observe(perf_counter() - history_started)
+
+    def _analysis_for(player_id: str) -> dict:
+        if history_error is not None:
+            raise history_error
+        return _build_batch_player_analysis(
+            player_id,
+            states[player_id],
+            history_columns,
+            history_deltas,
+            history_reduced,
+        )
+
+    for player_id in player_ids:
+        outcome = _emit_player_analysis(
+            player_id,
+            f"{PLAYER_LATEST_REDIS_KEY}:{player_id}",
+            merged_payloads[player_id],
+            lambda player_id=player_id: _analysis_for(player_id),
+            publish=True,
+        )
+        summary[outcome] += 1
+
+
+def _process_player_detail_batch(player_ids: list[str], summary: dict) -> None:
+    lock_pipe = redis_conn.pipeline()
+    for player_id in player_ids:
+        lock_pipe.set(
+            f"fetch_player_data:{player_id}",
+            "true",
+            nx=True,
+            ex=PLAYER_FETCH_LOCK_TTL_SECONDS,
+        )
+    locked_ids = [
+        player_id
+        for player_id, acquired in zip(player_ids, lock_pipe.execute())
+        if acquired
+    ]
+    summary["locked"] += len(player_ids) - len(locked_ids)
+    if not locked_ids:
+        return
+
+    try:
+        cache_keys = [
+            f"{PLAYER_LATEST_REDIS_KEY}:{player_id}" for player_id in locked_ids
+        ]
+        cache_pipe = redis_conn.pipeline()
+        for cache_key in cache_keys:
+            cache_pipe.get(cache_key)
+            cache_pipe.ttl(cache_key)
+        cache_results = cache_pipe.execute()
+        uncached_ids = []
+        for player_id, cache_key, cached_payload_raw, remaining_ttl in zip(
+            locked_ids, cache_keys, cache_results[::2], cache_results[1::2]
+        ):
+            if cached_payload_raw is None:
+                uncached_ids.append(player_id)
+                continue
+            if is_player_cache_stale(remaining_ttl):
+                summary["stale"] += 1
+                uncached_ids.append(player_id)
+                continue
+            publish_cached_player_chunks(
+                player_id, cached_payload_raw, cache_key
+            )
+            summary["cache_hit"] += 1
+        if uncached_ids:
+            _build_player_detail_batch(uncached_ids, summary)
+    finally:
+        unlock_pipe = redis_conn.pipeline()
+        for player_id in locked_ids:
+            unlock_pipe.delete(f"fetch_player_data:{player_id}")
+            unlock_pipe.delete(f"{PLAYER_DETAIL_FETCH_PENDING_KEY}:{player_id}")
+        try:
+            unlock_pipe.execute()
+        except Exception as e:
+            logger.error("Error deleting batch task signatures: %s", e)
+
+
+def fetch_player_data_batch(player_ids: list[str] | None = None) -> dict:
+    """Fetches player detail for every pending player in a few round trips.
+
+    Websocket cache misses add player ids to a pending set and schedule this
+    task once per short window. The task drains the set in chunks of
+    ``PLAYER_DETAIL_BATCH_MAX_PLAYERS`` and builds each chunk with batched
+    queries, publishing the usual per-player chunks and cache entries.
+
+    Args:
+        player_ids (list[str] | None): Extra ids to include up front.
+
+    Returns:
+        dict: Counts of players per outcome.
+    """
+    max_players = max(
+        1, int(os.getenv("PLAYER_DETAIL_BATCH_MAX_PLAYERS", "50"))
+    )
+    summary = {
+        "players": 0,
+        "batches": 0,
+        "cache_hit": 0,
+        "stale": 0,
+        "locked": 0,
+        "success": 0,
+        "partial_error": 0,
+    }
+    requested = list(player_ids or [])
+    started = perf_counter()
+    outcome = "error"
+    try:
+        while True:
+            drained = (
+                redis_conn.spop(PLAYER_DETAIL_BATCH_PENDING_KEY, max_players)
+                or []
+            )
+            batch = list(dict.fromkeys([*requested, *drained]))
+            requested = []
+            if not batch:
+                break
+            summary["players"] += len(batch)
+            summary["batches"] += 1
+            _process_player_detail_batch(batch, summary)
+        outcome = "success"
+    finally:
+        if metrics_enabled():
+            PLAYER_DETAIL_PIPELINE_DURATION.labels(
+                stage="batch_total",
+                outcome=outcome,
+            ).observe(perf_counter() - started)
+            if summary["players"]:
+                PLAYER_DETAIL_ROWS.labels(stage="batch_players").observe(
+                    summary["players"]
                 )
+    logger.info("Player detail batch summary: %s", summary)
+    return summary
+
+
+def _player_warm_signature(rows: list[dict]) -> str:
+    entries = sorted(
+        (
+            str(row.get("mode")),
+            bool(row.get("region")),
+            row.get("season_number"),
+            row.get("rank"),
+            row.get("x_power"),
+            row.get("weapon_id"),
+        )
+        for row in rows
+    )
+    return hashlib.blake2b(orjson.dumps(entries), digest_size=16).hexdigest()
+
+
+def store_player_detail_warm_targets(leaderboard_rows: list[dict]) -> int:
+    """Records who is currently ranked so the warmer can pre-build pages.
+
+    Args:
+        leaderboard_rows (list[dict]): Rows from every mode/region
+            leaderboard, each with ``player_id``, ``mode``, ``rank`` etc.
+
+    Returns:
+        int: Number of distinct players recorded.
+    """
+    rows_by_player: dict[str, list[dict]] = {}
+    for row in leaderboard_rows:
+        player_id = row.get("player_id")
+        if player_id:
+            rows_by_player.setdefault(player_id, []).append(row)
+
+    targets = [
+        {
+            "player_id": player_id,
+            "best_rank": min(
+                (row.get("rank") or PLAYER_WARM_UNRANKED) for row in rows
+            ),
+            "signature": _player_warm_signature(rows),
+        }
+        for player_id, rows in rows_by_player.items()
+    ]
+    targets.sort(key=lambda target: (target["best_rank"], target["player_id"]))
+    redis_conn.set(
+        PLAYER_DETAIL_WARM_TARGETS_KEY,
+        orjson.dumps(
+            {
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "targets": targets,
+            }
+        ),
+        ex=PLAYER_WARM_TARGETS_TTL_SECONDS,
+    )
+    return len(targets)
+
+
+def _warm_player_detail(player_id: str, signature: str) -> str:
+    task_signature = f"fetch_player_data:{player_id}"
+    lock_acquired = redis_conn.set(
+        task_signature,
+        "true",
+        nx=True,
+        ex=PLAYER_FETCH_LOCK_TTL_SECONDS,
+    )
+    if not lock_acquired:
+        return "locked"
 
-            publish_player_chunk(player_id, "complete", cache_key=cache_key)
+    started = perf_counter()
+    outcome = "error"
+    cache_key = f"{PLAYER_LATEST_REDIS_KEY}:{player_id}"
+    pending_key = f"{PLAYER_DETAIL_FETCH_PENDING_KEY}:{player_id}"
+    try:
+        outcome = build_player_detail_cache(player_id, cache_key, publish=False)
+        if outcome == "success":
+            outcome = "warmed"
+            redis_conn.hset(
+                PLAYER_DETAIL_WARM_SIGNATURES_KEY, player_id, signature
+            )
+        # A websocket miss during the warm enqueued a fetch that found this
+        # lock and skipped, so its listeners get the fresh payload from here.
+        if redis_conn.exists(pending_key):
+            publish_cached_player_chunks(
+                player_id, redis_conn.get(cache_key), cache_key
+            )
+    except Exception:
+        logger.exception("Failed to warm player detail for %s", player_id)
     finally:
         if metrics_enabled():
             PLAYER_DETAIL_PIPELINE_DURATION.labels(
-                stage="total",
-                outcome=total_outcome,
-            ).observe(perf_counter() - total_started)
+                stage="warm",
+                outcome=outcome,
+            ).observe(perf_counter() - started)
         try:
             redis_conn.delete(task_signature)
+            redis_conn.delete(pending_key)
         except Exception as e:
             logger.error("Error deleting task signature: %s", e)
-            logger.error("Probably expired before deletion. Proceeding.")
+    return outcome
 
 
-def _fetch_player_data(player_id: str) -> list[dict]:
-    """Fetches player data from the database.
+def warm_player_detail_cache() -> dict:
+    """Pre-builds player detail payloads for currently ranked players.
+
+    Targets are recorded by ``pull_data``. Players whose leaderboard rows
+    are unchanged and whose payload is still cached only get their TTL
+    extended; everyone else is rebuilt without publishing, best rank first,
+    in paced batches and up to ``PLAYER_DETAIL_WARM_BUDGET`` rebuilds.
+
+    Returns:
+        dict: Counts of players per outcome.
+    """
+    budget = int(os.getenv("PLAYER_DETAIL_WARM_BUDGET", "500"))
+    batch_size = max(1, int(os.getenv("PLAYER_DETAIL_WARM_BATCH_SIZE", "25")))
+    batch_pause = float(
+        os.getenv("PLAYER_DETAIL_WARM_BATCH_PAUSE_SECONDS", "0.5")
+    )
+    summary = {
+        "targets": 0,
+        "warmed": 0,
+        "extended": 0,
+        "locked": 0,
+        "partial_error": 0,
+        "error": 0,
+        "over_budget": 0,
+    }
+
+    raw_targets = redis_conn.get(PLAYER_DETAIL_WARM_TARGETS_KEY)
+    if raw_targets is None:
+        logger.info("No player detail warm targets recorded. Skipping.")
+        return summary
+    targets = orjson.loads(raw_targets).get("targets") or []
+    summary["targets"] = len(targets)
+    if not targets:
+        return summary
+
+    pipe = redis_conn.pipeline()
+    pipe.hmget(
+        PLAYER_DETAIL_WARM_SIGNATURES_KEY,
+        [target["player_id"] for target in targets],
+    )
+    for target in targets:
+        pipe.exists(f"{PLAYER_LATEST_REDIS_KEY}:{target['player_id']}")
+    stored_signatures, *cached_flags = pipe.execute()
+
+    pending = []
+    extend_pipe = redis_conn.pipeline()
+    for target, stored_signature, cached in zip(
+        targets, stored_signatures, cached_flags
+    ):
+        if cached and stored_signature == target["signature"]:
+            extend_pipe.expire(
+                f"{PLAYER_LATEST_COMPACT_REDIS_KEY}:{target['player_id']}",
+                PLAYER_CACHE_TTL_SECONDS,
+            )
+            extend_pipe.expire(
+                f"{PLAYER_LATEST_FRAME_REDIS_KEY}:{target['player_id']}",
+                PLAYER_CACHE_TTL_SECONDS,
+            )
+            extend_pipe.expire(
+                f"{PLAYER_LATEST_REDIS_KEY}:{target['player_id']}",
+                PLAYER_CACHE_TTL_SECONDS,
+            )
+            summary["extended"] += 1
+        else:
+            pending.append(target)
+    extend_pipe.execute()
+
+    summary["over_budget"] = max(0, len(pending) - budget)
+    pending = pending[: max(0, budget)]
+    for batch_start in range(0, len(pending), batch_size):
+        if batch_start and batch_pause > 0:
+            sleep(batch_pause)
+        for target in pending[batch_start : batch_start + batch_size]:
+            outcome = _warm_player_detail(
+                target["player_id"], target["signature"]
+            )
+            summary[outcome] += 1
+
+    if metrics_enabled():
+        for outcome, count in summary.items():
+            if outcome != "targets" and count:
+                PLAYER_DETAIL_WARM_EVENTS.labels(outcome=outcome).inc(count)
+    logger.info("Player detail warm summary: %s", summary)
+    return summary
+
+
+def _fetch_player_history_rows(
+    player_id: str, since: str, *, session=None
+) -> list[dict]:
+    """Fetches history rows for a player recorded after ``since``.
 
     Args:
         player_id (str): The ID of the player.
+        since (str): ISO timestamp; only newer rows are returned.
+        session: Open session to reuse instead of checking out a new one.
 
     Returns:
-        list[dict]: A list of dictionaries containing player data.
+        list[dict]: History rows in timestamp order with ISO timestamps.
     """
-    base_query = text(PLAYER_DATA_QUERY)
+    base_query = text(PLAYER_DATA_SINCE_QUERY)
     start = perf_counter()
-    with Session() as session:
+    with _session_scope(session) as session:
         result = session.execute(
-            base_query, {"player_id": player_id}
+            base_query,
+            {"player_id": player_id, "since": datetime.fromisoformat(since)},
         ).fetchall()
 
     result = [{**row._asdict()} for row in result]
     if metrics_enabled():
         DATA_PULL_DURATION.labels(
-            task="player_detail.fetch_player_data"
+            task="player_detail.fetch_player_data_delta"
         ).observe(perf_counter() - start)
-        DATA_PULL_ROWS.labels(task="player_detail.fetch_player_data").set(
+        DATA_PULL_ROWS.labels(task="player_detail.fetch_player_data_delta").set(
             len(result)
         )
-        PLAYER_DETAIL_ROWS.labels(stage="history_raw").observe(len(result))
+        PLAYER_DETAIL_ROWS.labels(stage="history_delta").observe(len(result))
     for player in result:
         player["timestamp"] = player["timestamp"].isoformat()
 
-    reduced = reduce_player_history_rows(result)
+    return result
+
+
+def _fetch_player_history_columns(player_id: str, *, session=None) -> dict:
+    """Fetches a player's full history as columnar NumPy arrays.
+
+    Args:
+        player_id (str): The ID of the player.
+        session: Open session to reuse instead of checking out a new one.
+
+    Returns:
+        dict: Column arrays as built by ``history_columns_from_rows``.
+    """
+    base_query = text(PLAYER_DATA_QUERY)
+    start = perf_counter()
+    with _session_scope(session) as session:
+        result = session.execute(base_query, {"player_id": player_id})
+        column_names = tuple(result.keys())
+        rows = result.fetchall()
+
+    columns = history_columns_from_rows(rows, column_names)
     if metrics_enabled():
-        PLAYER_DETAIL_ROWS.labels(stage="history_reduced").observe(
-            len(reduced)
+        DATA_PULL_DURATION.labels(
+            task="player_detail.fetch_player_data"
+        ).observe(perf_counter() - start)
+        DATA_PULL_ROWS.labels(task="player_detail.fetch_player_data").set(
+            len(rows)
         )
-    return reduced
+        PLAYER_DETAIL_ROWS.labels(stage="history_raw").observe(len(rows))
+    return columns
+
+
+def _history_streaming_enabled() -> bool:
+    return os.getenv("PLAYER_DETAIL_HISTORY_STREAMING", "0").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
+def _history_yield_per() -> int:
+    return int(os.getenv("PLAYER_DETAIL_HISTORY_YIELD_PER", "2000"))
+
+
+def _stream_player_history_rows(session, player_id: str) -> Iterator[dict]:
+    """Yields history rows from a server-side cursor, one dict at a time."""
+    result = session.execute(
+        text(PLAYER_DATA_QUERY),
+        {"player_id": player_id},
+        execution_options={"yield_per": _history_yield_per()},
+    )
+    for row in result:
+        player = row._asdict()
+        player["timestamp"] = player["timestamp"].isoformat()
+        yield player
+
+
+def _stream_player_history_batch(
+    session, player_ids: list[str]
+) -> Iterator[tuple[str, Iterator[dict]]]:
+    """Yields ``(player_id, rows)`` groups from one server-side cursor.
+
+    ``PLAYER_DATA_BATCH_QUERY`` orders by player, so each group is a run of
+    consecutive rows and has to be consumed before the next one is read.
+    """
+    result = session.execute(
+        text(PLAYER_DATA_BATCH_QUERY),
+        {"player_ids": player_ids},
+        execution_options={"yield_per": _history_yield_per()},
+    )
+    column_names = tuple(result.keys())[1:]
+    raw_count = 0
+
+    def _rows(group) -> Iterator[dict]:
+        nonlocal raw_count
+        for row in group:
+            raw_count += 1
+            player = dict(zip(column_names, row[1:]))
+            player["timestamp"] = player["timestamp"].isoformat()
+            yield player
+
+    for player_id, group in groupby(result, key=lambda row: row[0]):
+        raw_count = 0
+        yield player_id, _rows(group)
+        if metrics_enabled():
+            PLAYER_DETAIL_ROWS.labels(stage="history_raw").observe(raw_count)
 
 
-def _fetch_season_data(player_id: str) -> list[dict]:
-    """Fetches season data for a player from the database.
+def _fetch_player_data_streaming(player_id: str, *, session=None) -> list[dict]:
+    """Streams a player's history straight into the reducer.
+
+    Memory stays proportional to the reduced history, which suits very long
+    histories better than materializing every row for the columnar engine.
 
     Args:
         player_id (str): The ID of the player.
+        session: Open session to reuse instead of checking out a new one.
 
     Returns:
-        list[dict]: A list of dictionaries containing season data.
+        list[dict]: The reduced history rows.
     """
-    base_query = text(SEASON_RESULTS_QUERY)
     start = perf_counter()
-    with Session() as session:
-        result = session.execute(
-            base_query, {"player_id": player_id}
-        ).fetchall()
+    raw_count = 0
+
+    def _counted(rows: Iterator[dict]) -> Iterator[dict]:
+        nonlocal raw_count
+        for row in rows:
+            raw_count += 1
+            yield row
+
+    with _session_scope(session) as session:
+        reduced = reduce_player_history_stream(
+            _counted(_stream_player_history_rows(session, player_id))
+        )
 
-    result = [{**row._asdict()} for row in result]
     if metrics_enabled():
         DATA_PULL_DURATION.labels(
-            task="player_detail.fetch_season_data"
+            task="player_detail.fetch_player_data"
         ).observe(perf_counter() - start)
-        DATA_PULL_ROWS.labels(task="player_detail.fetch_season_data").set(
-            len(result)
+        DATA_PULL_ROWS.labels(task="player_detail.fetch_player_data").set(
+            raw_count
         )
-        PLAYER_DETAIL_ROWS.labels(stage="season_results").observe(len(result))
+        PLAYER_DETAIL_ROWS.labels(stage="history_raw").observe(raw_count)
+    return reduced
 
-    return result
 
+def _fetch_player_data(player_id: str, *, session=None) -> list[dict]:
+    """Fetches player data from the database.
 
-def aggregate_player_analysis(player_data: list[dict]) -> dict:
-    """Aggregates history-driven player detail data from player snapshots."""
-    logger.info("Aggregating player data")
+    Args:
+        player_id (str): The ID of the player.
+        session: Open session to reuse instead of checking out a new one.
+
+    Returns:
+        list[dict]: A list of dictionaries containing player data.
+    """
+    if _history_streaming_enabled():
+        return _fetch_player_data_streaming(player_id, session=session)
+
+    columns = _fetch_player_history_columns(player_id, session=session)
+    mask = reduce_history_columns(columns)
+    reduced = history_rows_from_columns(columns, mask)
+    logger.info(
+        "Reduced player history rows from %s to %s",
+        len(mask),
+        len(reduced),
+    )
+    return reduced
+
+
+def _load_player_history_state(player_id: str) -> dict | None:
+    state = deserialize_player_history_state(
+        redis_conn.get(f"{PLAYER_HISTORY_STATE_REDIS_KEY}:{player_id}")
+    )
+    if state is None or state["high_water"] is None:
+        return None
+    return state
+
+
+def _store_player_history_state_payload(
+    player_id: str, state: dict, *, outcome: str
+) -> dict:
+    """Persists history state and returns the analysis payload it implies."""
+    state_raw = serialize_player_history_state(state)
+    if metrics_enabled():
+        PLAYER_DETAIL_ROWS.labels(stage="history_reduced").observe(
+            len(state["rows"])
+        )
+        PLAYER_DETAIL_PAYLOAD_BYTES.labels(kind="history_state").observe(
+            len(state_raw)
+        )
+        PLAYER_DETAIL_HISTORY_STATE.labels(outcome=outcome).inc()
+    redis_conn.set(
+        f"{PLAYER_HISTORY_STATE_REDIS_KEY}:{player_id}",
+        state_raw,
+        ex=PLAYER_HISTORY_STATE_TTL_SECONDS,
+    )
+
+    player_data = state["rows"]
     if not player_data:
-        return {
-            "weapon_counts": [],
-            "weapon_winrate": [],
-            "aggregate_season_data": [],
-        }
+        return build_analysis_payload(player_data)
+    return {
+        "player_data": player_data,
+        "aggregated_data": _finalize_player_analysis(state["analysis"]),
+    }
+
+
+def _fetch_player_analysis(player_id: str, *, session=None) -> dict:
+    """Builds the analysis payload, reusing stored history state if present.
+
+    A stored state holds the reduced history plus running aggregates, so a
+    refresh only has to fetch and fold rows newer than its high-water mark.
+
+    Args:
+        player_id (str): The ID of the player.
+        session: Open session to reuse instead of checking out a new one.
+
+    Returns:
+        dict: The analysis payload (``player_data`` and aggregates).
+    """
+    state = _load_player_history_state(player_id)
+    if state is None:
+        outcome = "miss"
+        state = build_player_history_state(
+            _fetch_player_data(player_id, session=session)
+        )
+    else:
+        outcome = "hit"
+        new_rows = _fetch_player_history_rows(
+            player_id, since=state["high_water"], session=session
+        )
+        advance_player_history_state(state, new_rows)
 
-    weapon_counts: dict[tuple[str, int, int], int] = {}
-    weapon_winrate: dict[tuple[str, int, int], dict[str, int]] = {}
-    season_peaks: dict[tuple[int, str], float] = {}
-    previous_updated_x_power: float | None = None
+    return _store_player_history_state_payload(
+        player_id, state, outcome=outcome
+    )
+
+
+def _session_scope(session=None):
+    """Reuses ``session`` if given, otherwise opens a new one."""
+    return nullcontext(session) if session is not None else Session()
+
+
+def _fetch_player_snapshot(
+    player_id: str, *, session=None
+) -> tuple[list[dict], list[dict]]:
+    """Fetches season results and latest rows in one statement.
+
+    Args:
+        player_id (str): The ID of the player.
+        session: Open session to reuse instead of checking out a new one.
+
+    Returns:
+        tuple[list[dict], list[dict]]: Season results and latest data.
+    """
+    start = perf_counter()
+    with _session_scope(session) as session:
+        season_result, latest_data = session.execute(
+            text(PLAYER_SNAPSHOT_QUERY), {"player_id": player_id}
+        ).one()
+
+    if metrics_enabled():
+        DATA_PULL_DURATION.labels(
+            task="player_detail.fetch_player_snapshot"
+        ).observe(perf_counter() - start)
+        PLAYER_DETAIL_ROWS.labels(stage="season_results").observe(
+            len(season_result)
+        )
+        PLAYER_DETAIL_ROWS.labels(stage="latest_rows").observe(
+            len(latest_data)
+        )
+    return season_result, latest_data
+
+
+def _new_analysis_state() -> dict:
+    return {
+        "weapon_counts": {},
+        "weapon_winrate": {},
+        "season_peaks": {},
+        "previous_updated_x_power": None,
+    }
+
+
+def _accumulate_player_analysis(state: dict, player_data: list[dict]) -> None:
+    """Folds history rows into a running aggregation state in place."""
+    weapon_counts = state["weapon_counts"]
+    weapon_winrate = state["weapon_winrate"]
+    season_peaks = state["season_peaks"]
+    previous_updated_x_power = state["previous_updated_x_power"]
 
     for row in player_data:
         mode = row.get("mode")
@@ -380,6 +1267,10 @@ def aggregate_player_analysis(player_data: list[dict]) -> dict:
                         winrate_entry["sum"] += 1
             previous_updated_x_power = x_power
 
+    state["previous_updated_x_power"] = previous_updated_x_power
+
+
+def _finalize_player_analysis(state: dict) -> dict:
     return {
         "weapon_counts": [
             {
@@ -389,7 +1280,7 @@ def aggregate_player_analysis(player_data: list[dict]) -> dict:
                 "count": count,
             }
             for (mode, weapon_id, season_number), count in sorted(
-                weapon_counts.items(),
+                state["weapon_counts"].items(),
                 key=lambda item: (item[0][2], item[0][0], item[0][1]),
             )
         ],
@@ -401,7 +1292,7 @@ def aggregate_player_analysis(player_data: list[dict]) -> dict:
                 **stats,
             }
             for (mode, weapon_id, season_number), stats in sorted(
-                weapon_winrate.items(),
+                state["weapon_winrate"].items(),
                 key=lambda item: (item[0][2], item[0][0], item[0][1]),
             )
         ],
@@ -412,12 +1303,28 @@ def aggregate_player_analysis(player_data: list[dict]) -> dict:
                 "peak_x_power": peak_x_power,
             }
             for (season_number, mode), peak_x_power in sorted(
-                season_peaks.items(), key=lambda item: (item[0][0], item[0][1])
+                state["season_peaks"].items(),
+                key=lambda item: (item[0][0], item[0][1]),
             )
         ],
     }
 
 
+def aggregate_player_analysis(player_data: list[dict]) -> dict:
+    """Aggregates history-driven player detail data from player snapshots."""
+    logger.info("Aggregating player data")
+    if not player_data:
+        return {
+            "weapon_counts": [],
+            "weapon_winrate": [],
+            "aggregate_season_data": [],
+        }
+
+    state = _new_analysis_state()
+    _accumulate_player_analysis(state, player_data)
+    return _finalize_player_analysis(state)
+
+
 def _is_finite_number(value) -> bool:
     return isinstance(value, (int, float)) and math.isfinite(value)
 
@@ -439,6 +1346,80 @@ def _get_observed_day_key(timestamp: str | None) -> str | None:
     return parsed.date().isoformat()
 
 
+def _new_history_reducer_state() -> dict:
+    return {
+        "previous_x_power": {},
+        "core_keys": set(),
+        "last_row_by_partition": {},
+        "last_row_by_day": {},
+    }
+
+
+def _advance_history_reducer(state: dict, player_data: list[dict]) -> None:
+    """Feeds rows (in timestamp order) through the history reducer state.
+
+    Rows are "core" kept when they are updated, open a partition or change
+    x-power. Those decisions only look backwards, so they are final. The
+    last row per partition and per observed day can still be superseded by
+    later rows and are tracked separately.
+    """
+    for row in player_data:
+        _advance_history_reducer_row(state, row)
+
+
+def _advance_history_reducer_row(state: dict, row: dict) -> list[str | None]:
+    """Feeds one row through the reducer.
+
+    Returns the previous timestamp of every anchor slot the row now holds,
+    or ``None`` for slots it opened.
+    """
+    row_key = row.get("timestamp")
+    if not isinstance(row_key, str):
+        return []
+
+    previous_x_power_by_partition = state["previous_x_power"]
+    last_row_key_by_partition = state["last_row_by_partition"]
+    last_row_key_by_observed_day = state["last_row_by_day"]
+    partition_key = (row.get("mode"), row.get("season_number"))
+    observed_day_key = _get_observed_day_key(row_key)
+    x_power = row.get("x_power")
+    previous_x_power = previous_x_power_by_partition.get(partition_key)
+    should_keep = bool(row.get("updated"))
+
+    if partition_key not in previous_x_power_by_partition:
+        should_keep = True
+    elif _is_finite_number(x_power) and x_power != previous_x_power:
+        should_keep = True
+
+    if should_keep:
+        state["core_keys"].add(row_key)
+
+    if _is_finite_number(x_power):
+        previous_x_power_by_partition[partition_key] = x_power
+    else:
+        previous_x_power_by_partition.setdefault(partition_key, x_power)
+
+    replaced = [last_row_key_by_partition.get(partition_key)]
+    last_row_key_by_partition[partition_key] = row_key
+    if observed_day_key is not None:
+        day_key = (*partition_key, observed_day_key)
+        replaced.append(last_row_key_by_observed_day.get(day_key))
+        last_row_key_by_observed_day[day_key] = row_key
+    return replaced
+
+
+def _select_reduced_rows(state: dict, player_data: list[dict]) -> list[dict]:
+    keep_keys = set(state["core_keys"])
+    keep_keys.update(state["last_row_by_partition"].values())
+    keep_keys.update(state["last_row_by_day"].values())
+    return [
+        row
+        for row in player_data
+        if isinstance(row.get("timestamp"), str)
+        and row["timestamp"] in keep_keys
+    ]
+
+
 def reduce_player_history_rows(player_data: list[dict]) -> list[dict]:
     """Keeps only chart-relevant history rows to shrink websocket payloads.
 
@@ -451,87 +1432,216 @@ def reduce_player_history_rows(player_data: list[dict]) -> list[dict]:
     if not player_data:
         return []
 
-    previous_x_power_by_partition: dict[tuple[str | None, int | None], float] = {}
-    keep_keys: set[str] = set()
-    last_row_key_by_partition: dict[tuple[str | None, int | None], str] = {}
-    last_row_key_by_observed_day: dict[
-        tuple[str | None, int | None, str], str
-    ] = {}
+    state = _new_history_reducer_state()
+    _advance_history_reducer(state, player_data)
+    reduced_rows = _select_reduced_rows(state, player_data)
 
-    for row in player_data:
-        row_key = row.get("timestamp")
-        if not isinstance(row_key, str):
-            continue
+    logger.info(
+        "Reduced player history rows from %s to %s",
+        len(player_data),
+        len(reduced_rows),
+    )
+    return reduced_rows
 
-        partition_key = (row.get("mode"), row.get("season_number"))
-        observed_day_key = _get_observed_day_key(row_key)
-        x_power = row.get("x_power")
-        previous_x_power = previous_x_power_by_partition.get(partition_key)
-        should_keep = bool(row.get("updated"))
 
-        if partition_key not in previous_x_power_by_partition:
-            should_keep = True
-        elif _is_finite_number(x_power) and x_power != previous_x_power:
-            should_keep = True
+def reduce_player_history_stream(player_data: Iterable[dict]) -> list[dict]:
+    """Streaming equivalent of ``reduce_player_history_rows``.
 
-        if should_keep:
-            keep_keys.add(row_key)
+    Rows are consumed one at a time, in timestamp order, and only rows whose
+    timestamp is still a keep candidate (a core row or a live partition/day
+    anchor) stay buffered. Peak memory follows the reduced history instead
+    of the raw one.
+    """
+    state = _new_history_reducer_state()
+    core_keys = state["core_keys"]
+    anchor_counts: dict[str, int] = {}
+    rows_by_timestamp: dict[str, list[dict]] = {}
+    raw_count = 0
 
-        if _is_finite_number(x_power):
-            previous_x_power_by_partition[partition_key] = x_power
-        else:
-            previous_x_power_by_partition.setdefault(partition_key, x_power)
+    for row in player_data:
+        raw_count += 1
+        row_key = row.get("timestamp")
+        if not isinstance(row_key, str):
+            continue
+        replaced = _advance_history_reducer_row(state, row)
+        rows_by_timestamp.setdefault(row_key, []).append(row)
+        anchor_counts[row_key] = anchor_counts.get(row_key, 0) + len(replaced)
+        for replaced_key in replaced:
+            if replaced_key is None:
+                continue
+            anchor_counts[replaced_key] -= 1
+            if anchor_counts[replaced_key] == 0:
+                del anchor_counts[replaced_key]
+                if replaced_key not in core_keys:
+                    rows_by_timestamp.pop(replaced_key, None)
+
+    reduced_rows = [row for rows in rows_by_timestamp.values() for row in rows]
+    logger.info(
+        "Reduced player history rows from %s to %s",
+        raw_count,
+        len(reduced_rows),
+    )
+    return reduced_rows
 
-        last_row_key_by_partition[partition_key] = row_key
-        if observed_day_key is not None:
-            last_row_key_by_observed_day[
-                (*partition_key, observed_day_key)
-            ] = row_key
 
-    keep_keys.update(last_row_key_by_partition.values())
-    keep_keys.update(last_row_key_by_observed_day.values())
+def build_player_history_state(player_data: list[dict]) -> dict:
+    """Builds incremental history state from already reduced history rows.
 
-    reduced_rows = [
-        row
+    Re-reducing a reduced history yields the same reducer state as the raw
+    history did, and every row that contributes to the aggregates survives
+    reduction, so the reduced rows are a sufficient starting point.
+    """
+    reducer_state = _new_history_reducer_state()
+    _advance_history_reducer(reducer_state, player_data)
+    analysis_state = _new_analysis_state()
+    _accumulate_player_analysis(analysis_state, player_data)
+    timestamps = [
+        row["timestamp"]
         for row in player_data
         if isinstance(row.get("timestamp"), str)
-        and row["timestamp"] in keep_keys
     ]
+    return {
+        "high_water": timestamps[-1] if timestamps else None,
+        "rows": _select_reduced_rows(reducer_state, player_data),
+        "reducer": reducer_state,
+        "analysis": analysis_state,
+    }
 
-    logger.info(
-        "Reduced player history rows from %s to %s",
-        len(player_data),
-        len(reduced_rows),
-    )
-    return reduced_rows
 
+def advance_player_history_state(state: dict, new_rows: list[dict]) -> None:
+    """Appends rows newer than ``state["high_water"]`` to the history state.
 
-def pull_all_latest_data(player_id: str) -> list[dict]:
-    """Pulls the latest leaderboard rows for a player from the database.
+    Only rows already kept can stay kept, so the previously reduced rows plus
+    the delta are the only candidates. Aggregates fold in the raw delta:
+    every row that moves them is a row the reducer keeps.
+    """
+    if not new_rows:
+        return
 
-    Args:
-        player_id (str): The ID of the player.
+    _advance_history_reducer(state["reducer"], new_rows)
+    _accumulate_player_analysis(state["analysis"], new_rows)
+    state["rows"] = _select_reduced_rows(
+        state["reducer"], [*state["rows"], *new_rows]
+    )
+    for row in reversed(new_rows):
+        if isinstance(row.get("timestamp"), str):
+            state["high_water"] = row["timestamp"]
+            break
 
-    Returns:
-        list[dict]: A list of dictionaries containing the latest data.
-    """
-    base_query = text(PLAYER_LATEST_DATA_QUERY)
-    start = perf_counter()
-    with Session() as session:
-        result = session.execute(
-            base_query, {"player_id": player_id}
-        ).fetchall()
 
-    latest_rows = [{**row._asdict()} for row in result]
-    if metrics_enabled():
-        DATA_PULL_DURATION.labels(
-            task="player_detail.fetch_latest_data"
-        ).observe(perf_counter() - start)
-        DATA_PULL_ROWS.labels(task="player_detail.fetch_latest_data").set(
-            len(latest_rows)
-        )
-        PLAYER_DETAIL_ROWS.labels(stage="latest_rows").observe(
-            len(latest_rows)
-        )
+def serialize_player_history_state(state: dict) -> bytes:
+    reducer_state = state["reducer"]
+    analysis_state = state["analysis"]
+    return orjson.dumps(
+        {
+            "version": PLAYER_HISTORY_STATE_VERSION,
+            "high_water": state["high_water"],
+            "rows": state["rows"],
+            "reducer": {
+                "previous_x_power": [
+                    [*key, value]
+                    for key, value in reducer_state["previous_x_power"].items()
+                ],
+                "core_keys": sorted(reducer_state["core_keys"]),
+                "last_row_by_partition": [
+                    [*key, value]
+                    for key, value in reducer_state[
+                        "last_row_by_partition"
+                    ].items()
+                ],
+                "last_row_by_day": [
+                    [*key, value]
+                    for key, value in reducer_state["last_row_by_day"].items()
+                ],
+            },
+            "analysis": {
+                "weapon_counts": [
+                    [*key, value]
+                    for key, value in analysis_state["weapon_counts"].items()
+                ],
+                "weapon_winrate": [
+                    [*key, value["sum"], value["total_count"]]
+                    for key, value in analysis_state["weapon_winrate"].items()
+                ],
+                "season_peaks": [
+                    [*key, value]
+                    for key, value in analysis_state["season_peaks"].items()
+                ],
+                "previous_updated_x_power": analysis_state[
+                    "previous_updated_x_power"
+                ],
+            },
+        }
+    )
+
+
+def deserialize_player_history_state(raw: bytes | str | None) -> dict | None:
+    if raw is None:
+        return None
+    try:
+        payload = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != PLAYER_HISTORY_STATE_VERSION
+    ):
+        return None
 
-    return latest_rows
+    reducer_payload = payload["reducer"]
+    analysis_payload = payload["analysis"]
+    return {
+        "high_water": payload["high_water"],
+        "rows": payload["rows"],
+        "reducer": {
+            "previous_x_power": {
+                (mode, season_number): value
+                for mode, season_number, value in reducer_payload[
+                    "previous_x_power"
+                ]
+            },
+            "core_keys": set(reducer_payload["core_keys"]),
+            "last_row_by_partition": {
+                (mode, season_number): value
+                for mode, season_number, value in reducer_payload[
+                    "last_row_by_partition"
+                ]
+            },
+            "last_row_by_day": {
+                (mode, season_number, day): value
+                for mode, season_number, day, value in reducer_payload[
+                    "last_row_by_day"
+                ]
+            },
+        },
+        "analysis": {
+            "weapon_counts": {
+                (mode, weapon_id, season_number): count
+                for mode, weapon_id, season_number, count in analysis_payload[
+                    "weapon_counts"
+                ]
+            },
+            "weapon_winrate": {
+                (mode, weapon_id, season_number): {
+                    "sum": wins,
+                    "total_count": total_count,
+                }
+                for (
+                    mode,
+                    weapon_id,
+                    season_number,
+                    wins,
+                    total_count,
+                ) in analysis_payload["weapon_winrate"]
+            },
+            "season_peaks": {
+                (season_number, mode): value
+                for season_number, mode, value in analysis_payload[
+                    "season_peaks"
+                ]
+            },
+            "previous_updated_x_power": analysis_payload[
+                "previous_updated_x_power"
+            ],
+        },
+    }
@@ -0,0 +1,265 @@
+"""Columnar (NumPy) engine for player history reduction and aggregation.
+
+These functions mirror ``reduce_player_history_rows`` and
+``aggregate_player_analysis`` in ``celery_app.tasks.player_detail`` but work
+on parallel column arrays built straight from database rows. Timestamps are
+compared as UTC nanoseconds and only serialized for the rows that are kept.
+"""
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+PLAYER_HISTORY_COLUMNS = (
+    "mode",
+    "region",
+    "season_number",
+    "timestamp",
+    "x_power",
+    "weapon_id",
+    "rank",
+    "updated",
+)
+_NS_PER_DAY = 86_400_000_000_000
+
+
+def history_columns_from_rows(
+    rows: Sequence[Sequence],
+    column_names: Sequence[str] = PLAYER_HISTORY_COLUMNS,
+) -> dict[str, np.ndarray]:
+    """Transposes database rows into object columns plus derived arrays."""
+    count = len(rows)
+    transposed = list(zip(*rows)) if rows else [()] * len(column_names)
+    columns: dict[str, np.ndarray] = {
+        name: np.fromiter(values, dtype=object, count=count)
+        for name, values in zip(column_names, transposed)
+    }
+
+    valid = columns["timestamp"] != None  # noqa: E711 - elementwise
+    timestamp_ns = np.zeros(count, dtype=np.int64)
+    if valid.any():
+        timestamp_ns[valid] = pd.to_datetime(
+            columns["timestamp"][valid], utc=True
+        ).asi8
+    # None becomes NaN, which is treated like any other non-finite x-power.
+    x_power = columns["x_power"].astype(np.float64)
+
+    columns["_names"] = tuple(column_names)
+    columns["_valid"] = valid
+    columns["_timestamp_ns"] = timestamp_ns
+    columns["_x_power"] = x_power
+    columns["_x_power_finite"] = np.isfinite(x_power)
+    columns["_updated"] = columns["updated"].astype(bool)
+    columns["_partition"] = _factorize_pair(
+        columns["mode"], columns["season_number"]
+    )
+    return columns
+
+
+def _factorize(values: np.ndarray) -> tuple[np.ndarray, int]:
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    # Shift so missing values (-1) get their own non-negative code.
+    return codes.astype(np.int64) + 1, len(uniques) + 1
+
+
+def _factorize_pair(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    left_codes, _ = _factorize(left)
+    right_codes, right_size = _factorize(right)
+    return left_codes * right_size + right_codes
+
+
+def _last_index_per_key(keys: np.ndarray) -> np.ndarray:
+    _, reversed_index = np.unique(keys[::-1], return_index=True)
+    return len(keys) - 1 - reversed_index
+
+
+def reduce_history_columns(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """Returns the mask of rows ``reduce_player_history_rows`` would keep.
+
+    Rows must already be ordered by timestamp, as the query returns them.
+    """
+    valid = columns["_valid"]
+    count = len(valid)
+    if count == 0 or not valid.any():
+        return np.zeros(count, dtype=bool)
+
+    positions = np.flatnonzero(valid)
+    partition = columns["_partition"][positions]
+    x_power = columns["_x_power"][positions]
+    finite = columns["_x_power_finite"][positions]
+    timestamp_ns = columns["_timestamp_ns"][positions]
+    size = len(positions)
+
+    # Walk each partition in timestamp order to find x-power changes
+    # relative to the last finite x-power seen earlier in that partition.
+    order = np.argsort(partition, kind="stable")
+    sorted_partition = partition[order]
+    sorted_x_power = x_power[order]
+    sorted_finite = finite[order]
+    index = np.arange(size)
+    group_starts = np.ones(size, dtype=bool)
+    group_starts[1:] = sorted_partition[1:] != sorted_partition[:-1]
+    group_start_index = np.maximum.accumulate(np.where(group_starts, index, 0))
+    last_finite = np.maximum.accumulate(np.where(sorted_finite, index, -1))
+    previous_finite = np.empty(size, dtype=np.int64)
+    previous_finite[0] = -1
+    previous_finite[1:] = last_finite[:-1]
+    has_previous = previous_finite >= group_start_index
+    changed = sorted_finite & (
+        ~has_previous
+        | (sorted_x_power != sorted_x_power[np.maximum(previous_finite, 0)])
+    )
+
+    keep = np.empty(size, dtype=bool)
+    keep[order] = group_starts | changed
+    keep |= columns["_updated"][positions]
+
+    keep[_last_index_per_key(partition)] = True
+    observed_day = timestamp_ns // _NS_PER_DAY
+    observed_day -= observed_day.min()
+    keep[
+        _last_index_per_key(partition * (observed_day.max() + 1) + observed_day)
+    ] = True
+
+    # Rows share keep decisions by timestamp, like the row-based reducer.
+    mask = np.zeros(count, dtype=bool)
+    mask[positions] = np.isin(timestamp_ns, timestamp_ns[keep])
+    return mask
+
+
+def aggregate_history_columns(
+    columns: dict[str, np.ndarray], mask: np.ndarray | None = None
+) -> dict:
+    """Vectorized equivalent of ``aggregate_player_analysis``."""
+    if mask is None:
+        mask = np.ones(len(columns["_valid"]), dtype=bool)
+    if not mask.any():
+        return {
+            "weapon_counts": [],
+            "weapon_winrate": [],
+            "aggregate_season_data": [],
+        }
+
+    mode = columns["mode"][mask]
+    season_number = columns["season_number"][mask]
+    weapon_id = columns["weapon_id"][mask]
+    x_power = columns["_x_power"][mask]
+    finite = columns["_x_power_finite"][mask]
+    updated = columns["_updated"][mask]
+    size = len(mode)
+    has_mode = np.fromiter(
+        (bool(value) for value in mode), dtype=bool, count=size
+    )
+    has_season = np.fromiter(
+        (isinstance(value, int) for value in season_number),
+        dtype=bool,
+        count=size,
+    )
+    has_weapon = np.fromiter(
+        (isinstance(value, int) for value in weapon_id),
+        dtype=bool,
+        count=size,
+    )
+
+    peaks: dict[tuple[int, str], float] = {}
+    peak_rows = np.flatnonzero(has_mode & has_season & finite)
+    if len(peak_rows):
+        keys = _factorize_pair(season_number[peak_rows], mode[peak_rows])
+        unique_keys, first_index, inverse = np.unique(
+            keys, return_index=True, return_inverse=True
+        )
+        maxima = np.full(len(unique_keys), -np.inf)
+        np.maximum.at(maxima, inverse, x_power[peak_rows])
+        for position, peak in zip(peak_rows[first_index], maxima):
+            peaks[(season_number[position], mode[position])] = float(peak)
+
+    weapon_counts: dict[tuple[str, int, int], int] = {}
+    weapon_winrate: dict[tuple[str, int, int], dict[str, int]] = {}
+    count_rows = np.flatnonzero(updated & has_mode & has_season & has_weapon)
+    if len(count_rows):
+        keys = _factorize_pair(
+            _factorize_pair(mode[count_rows], weapon_id[count_rows]),
+            season_number[count_rows],
+        )
+        unique_keys, first_index, inverse, counts = np.unique(
+            keys, return_index=True, return_inverse=True, return_counts=True
+        )
+        key_tuples = [
+            (mode[position], weapon_id[position], season_number[position])
+            for position in count_rows[first_index]
+        ]
+        for key, count in zip(key_tuples, counts):
+            weapon_counts[key] = int(count)
+
+        # Winrate compares each updated row with the previous updated row
+        # that had a finite x-power, across all modes and seasons.
+        finite_rows = np.flatnonzero(finite[count_rows])
+        if len(finite_rows) > 1:
+            diffs = np.diff(x_power[count_rows[finite_rows]])
+            moved = diffs != 0
+            moved_groups = inverse[finite_rows[1:]][moved]
+            totals = np.bincount(moved_groups, minlength=len(unique_keys))
+            wins = np.bincount(
+                moved_groups,
+                weights=(diffs[moved] > 0).astype(np.int64),
+                minlength=len(unique_keys),
+            )
+            for group in np.flatnonzero(totals):
+                weapon_winrate[key_tuples[group]] = {
+                    "sum": int(wins[group]),
+                    "total_count": int(totals[group]),
+                }
+
+    return {
+        "weapon_counts": [
+            {
+                "mode": key[0],
+                "weapon_id": key[1],
+                "season_number": key[2],
+                "count": count,
+            }
+            for key, count in sorted(
+                weapon_counts.items(),
+                key=lambda item: (item[0][2], item[0][0], item[0][1]),
+            )
+        ],
+        "weapon_winrate": [
+            {
+                "mode": key[0],
+                "weapon_id": key[1],
+                "season_number": key[2],
+                **stats,
+            }
+            for key, stats in sorted(
+                weapon_winrate.items(),
+                key=lambda item: (item[0][2], item[0][0], item[0][1]),
+            )
+        ],
+        "aggregate_season_data": [
+            {
+                "season_number": key[0],
+                "mode": key[1],
+                "peak_x_power": peak,
+            }
+            for key, peak in sorted(
+                peaks.items(), key=lambda item: (item[0][0], item[0][1])
+            )
+        ],
+    }
+
+
+def history_rows_from_columns(
+    columns: dict[str, np.ndarray], mask: np.ndarray
+) -> list[dict]:
+    """Materializes kept rows as dicts, serializing only their timestamps."""
+    column_names = columns["_names"]
+    kept = np.flatnonzero(mask)
+    selected = {name: columns[name][kept].tolist() for name in column_names}
+    selected["timestamp"] = [
+        timestamp.isoformat() for timestamp in selected["timestamp"]
+    ]
+    return [
+        dict(zip(column_names, values))
+        for values in zip(*(selected[name] for name in column_names))
+    ]
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
 import math
+import os
+import re
 import time
 from bisect import bisect_right
 from collections.abc import Mapping
@@ -16,12 +19,17 @@ from sqlalchemy.exc import InterfaceError
 from celery_app.connections import (
     rankings_async_engine,
     rankings_async_session,
+    rankings_snapshot_session,
     redis_conn,
 )
 from shared_lib.constants import (
+    ANALYTICS_SCHEMA_COLUMNS_KEY,
+    ANALYTICS_SCHEMA_COLUMNS_TABLES,
     RIPPLE_DANGER_LATEST_KEY,
+    RIPPLE_PLAYER_INDEX_DIGESTS_PREFIX,
     RIPPLE_PLAYER_INDEX_LATEST_KEY,
     RIPPLE_PLAYER_INDEX_META_KEY,
+    RIPPLE_PLAYER_INDEX_PENDING_KEY,
     RIPPLE_PLAYER_INDEX_PLAYER_PREFIX,
     RIPPLE_PLAYER_INDEX_PLAYER_HISTORY_PREFIX,
     RIPPLE_PLAYER_INDEX_PLAYER_RESULTS_PREFIX,
@@ -36,6 +44,8 @@ from shared_lib.constants import (
     RIPPLE_STABLE_PREVIOUS_META_KEY,
     RIPPLE_STABLE_STATE_KEY,
 )
+from shared_lib.monitoring import RIPPLE_REFRESH_DURATION, metrics_enabled
+from shared_lib.payload_utils import ripple_player_index_key
 from shared_lib.queries import ripple_queries
 
 logger = logging.getLogger(__name__)
@@ -48,6 +58,22 @@ MAX_PLAYER_HISTORY_ENTRIES = 25
 PLAYER_HISTORY_CHUNK_SIZE = 2_000
 MAX_PLAYER_MATCH_LOO_ENTRIES = 20
 PLAYER_MATCH_LOO_CHUNK_SIZE = 2_000
+# Players written per pipeline round trip when publishing the player index.
+PLAYER_INDEX_PUBLISH_BATCH_SIZE = 500
+# How long the previous index generation outlives the pointer flip, so
+# readers that loaded the old meta can still fetch its player keys.
+PLAYER_INDEX_GC_GRACE_SECONDS = 5 * 60
+# Player hashes sampled with MEMORY USAGE for the refresh task result.
+PLAYER_INDEX_MEMORY_SAMPLE_SIZE = 50
+# Incremental refreshes refetch history only for players who appeared in
+# tournaments after the previous calculation, less this margin for results
+# ingested late.
+PLAYER_INDEX_APPEARANCE_LOOKBACK_MS = 3 * 86_400_000
+# Rebuild every player from the database at least this often.
+PLAYER_INDEX_FULL_REFRESH_INTERVAL_MS = 7 * 86_400_000
+# Shape of the ids pg_export_snapshot() returns, checked before the id is
+# inlined into SET TRANSACTION SNAPSHOT (which takes no bind parameters).
+_EXPORTED_SNAPSHOT_ID = re.compile(r"[0-9A-Fa-f]+-[0-9A-Fa-f]+(-[0-9]+)?")
 
 # Fetch the complete snapshot so the public cache can serve every stable row;
 # pagination happens on the consumer side.
@@ -130,33 +156,40 @@ async def _fetch_player_owner_discord_ids(
             player_id::text AS player_id,
             NULLIF(BTRIM(discord_id::text), '') AS discord_id
         FROM {schema_sql}.players
-        WHERE player_id::text = ANY(:player_ids)
+        WHERE {ripple_queries.player_id_in("player_id", "players")}
         """
     )
 
+    async def _fetch_batch(batch_session, batch):
+        result = await batch_session.execute(
+            query,
+            {
+                "player_ids": batch,
+            },
+        )
+        return result.mappings().all()
+
     owner_ids: Dict[str, str] = {}
-    for batch in _batched(player_ids, size=PLAYER_HISTORY_CHUNK_SIZE):
-        try:
-            result = await session.execute(
-                query,
-                {
-                    "player_ids": batch,
-                },
-            )
-            rows = result.mappings().all()
-        except Exception as exc:
-            logger.warning(
-                "Failed to fetch competition player owner ids for %s players: %s",
-                len(batch),
-                exc,
-            )
-            rollback = getattr(session, "rollback", None)
-            if callable(rollback):
-                maybe_awaitable = rollback()
-                if asyncio.iscoroutine(maybe_awaitable):
-                    await maybe_awaitable
-            return None
+    try:
+        batch_rows = await _run_batches(
+            session,
+            _batched(player_ids, size=PLAYER_HISTORY_CHUNK_SIZE),
+            _fetch_batch,
+        )
+    except Exception as exc:
+        logger.warning(
+            "Failed to fetch competition player owner ids for %s players: %s",
+            len(player_ids),
+            exc,
+        )
+        rollback = getattr(session, "rollback", None)
+        if callable(rollback):
+            maybe_awaitable = rollback()
+            if asyncio.iscoroutine(maybe_awaitable):
+                await maybe_awaitable
+        return None
 
+    for rows in batch_rows:
         for row in rows:
             player_id = str(row.get("player_id") or "").strip()
             discord_id = str(row.get("discord_id") or "").strip()
@@ -251,6 +284,106 @@ def _batched(items: List[str], *, size: int) -> List[List[str]]:
     return [items[idx : idx + size] for idx in range(0, len(items), size)]
 
 
+def _fetch_parallelism() -> int:
+    return max(1, int(os.getenv("RIPPLE_REFRESH_FETCH_PARALLELISM", "4")))
+
+
+class _SnapshotSessionPool:
+    """Stands in for the refresh session to run query batches in parallel.
+
+    Every batch gets its own pooled connection and a REPEATABLE READ
+    transaction that imports the snapshot exported by the refresh
+    transaction, so concurrent batches read exactly what a sequential run
+    on the refresh session would. At most ``parallelism`` batches run at
+    once, across all fetches sharing the pool. Only batched fetches accept
+    the pool; everything else keeps using the refresh session.
+    """
+
+    def __init__(self, snapshot_id: str, parallelism: int):
+        self.snapshot_id = snapshot_id
+        self.parallelism = parallelism
+        self._slots = asyncio.Semaphore(parallelism)
+
+    async def rollback(self) -> None:
+        # Failed batches roll back their own transactions on exit; the
+        # refresh transaction, which keeps the snapshot alive, is untouched.
+        return None
+
+    async def run_batch(self, fetch_batch, batch: List[str]):
+        async with self._slots:
+            async with rankings_snapshot_session() as session:
+                async with session.begin():
+                    await session.execute(
+                        text(f"SET TRANSACTION SNAPSHOT '{self.snapshot_id}'")
+                    )
+                    return await fetch_batch(session, batch)
+
+
+async def _open_snapshot_session_pool(session):
+    """Returns a parallel stand-in for ``session``, or ``session`` itself.
+
+    Falls back to running batches sequentially on ``session`` when
+    parallelism is off or the snapshot cannot be exported.
+    """
+    parallelism = _fetch_parallelism()
+    if parallelism <= 1:
+        return session
+    try:
+        result = await session.execute(text("SELECT pg_export_snapshot()"))
+        snapshot_id = result.scalar()
+    except Exception as exc:
+        logger.warning(
+            "Failed to export a snapshot for parallel ripple fetches; "
+            "running them sequentially: %s",
+            exc,
+        )
+        rollback = getattr(session, "rollback", None)
+        if callable(rollback):
+            maybe_awaitable = rollback()
+            if asyncio.iscoroutine(maybe_awaitable):
+                await maybe_awaitable
+        return session
+    if not _EXPORTED_SNAPSHOT_ID.fullmatch(str(snapshot_id or "")):
+        return session
+    return _SnapshotSessionPool(snapshot_id, parallelism)
+
+
+async def _run_batches(session, batches: List[List[str]], fetch_batch):
+    """Runs ``fetch_batch(session, batch)`` per batch, in batch order.
+
+    Batches run concurrently when ``session`` is a snapshot pool. The first
+    failure cancels the batches still running and is re-raised.
+    """
+    if not isinstance(session, _SnapshotSessionPool):
+        return [await fetch_batch(session, batch) for batch in batches]
+    tasks = [
+        asyncio.ensure_future(session.run_batch(fetch_batch, batch))
+        for batch in batches
+    ]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _gather_fetches(session, *fetches):
+    """Awaits independent fetches together when they cannot share a session."""
+    if isinstance(session, _SnapshotSessionPool):
+        return await asyncio.gather(*fetches)
+    results = []
+    try:
+        for fetch in fetches:
+            results.append(await fetch)
+    finally:
+        # A failed fetch leaves the later ones unstarted.
+        for fetch in fetches[len(results) + 1 :]:
+            fetch.close()
+    return results
+
+
 def _persist_state(state: Dict[str, Any]) -> None:
     # Keep player IDs as strings so reloads round-trip cleanly and remain
     # compatible with existing Redis payloads.
@@ -273,8 +406,10 @@ def _load_cached_payload(key: str) -> Dict[str, Any] | None:
     return payload if isinstance(payload, dict) else None
 
 
-def _player_index_key(player_id: str) -> str:
-    return f"{RIPPLE_PLAYER_INDEX_PLAYER_PREFIX}{player_id}"
+def _player_index_key(player_id: str, generation: str | None = None) -> str:
+    return ripple_player_index_key(
+        RIPPLE_PLAYER_INDEX_PLAYER_PREFIX, player_id, generation
+    )
 
 
 def _player_index_summary_key(player_id: str) -> str:
@@ -289,6 +424,24 @@ def _player_index_results_key(player_id: str) -> str:
     return f"{RIPPLE_PLAYER_INDEX_PLAYER_RESULTS_PREFIX}{player_id}"
 
 
+def _player_index_digests_key(generation: str) -> str:
+    return f"{RIPPLE_PLAYER_INDEX_DIGESTS_PREFIX}{generation}"
+
+
+def _player_index_storage_keys(
+    player_id: str, generation: str | None
+) -> List[str]:
+    if generation is not None:
+        return [_player_index_key(player_id, generation)]
+    # Unversioned builds wrote the full payload and each section as strings.
+    return [
+        _player_index_key(player_id),
+        _player_index_summary_key(player_id),
+        _player_index_history_key(player_id),
+        _player_index_results_key(player_id),
+    ]
+
+
 def _build_player_summary_section(payload: Mapping[str, Any]) -> Dict[str, Any]:
     return {
         key: value
@@ -340,6 +493,261 @@ def _extract_player_index_ids(payload: Mapping[str, Any] | None) -> set[str]:
     return set()
 
 
+def _extract_player_index_generation(
+    payload: Mapping[str, Any] | None,
+) -> str | None:
+    if not isinstance(payload, Mapping):
+        return None
+    generation = payload.get("generation")
+    return str(generation) if generation else None
+
+
+def _player_payload_digest(player_payload: Mapping[str, Any]) -> str:
+    # Section stamps move every run; leave them out so an unchanged player
+    # keeps its digest and is copied rather than rewritten.
+    content = {
+        key: value
+        for key, value in player_payload.items()
+        if key not in ("history_generated_at_ms", "match_loo_generated_at_ms")
+    }
+    return hashlib.blake2b(orjson.dumps(content), digest_size=16).hexdigest()
+
+
+def _load_player_index_digests(generation: str | None) -> Dict[str, str]:
+    if generation is None:
+        return {}
+    return dict(redis_conn.hgetall(_player_index_digests_key(generation)))
+
+
+def _incremental_player_index_base(
+    previous_payload: Mapping[str, Any] | None,
+    previous_digests: Mapping[str, str],
+    generated_at_ms: int,
+) -> Dict[str, Any] | None:
+    """The previous generation an incremental refresh can build on, if any."""
+    generation = _extract_player_index_generation(previous_payload)
+    if generation is None or not previous_digests:
+        return None
+    full_refresh_ms = _to_int(
+        previous_payload.get("full_refresh_generated_at_ms")
+    )
+    if (
+        full_refresh_ms is None
+        or generated_at_ms - full_refresh_ms
+        >= PLAYER_INDEX_FULL_REFRESH_INTERVAL_MS
+    ):
+        return None
+    calculated_at_ms = _to_int(previous_payload.get("calculated_at_ms"))
+    if calculated_at_ms is None:
+        return None
+    return {
+        "generation": generation,
+        "calculated_at_ms": calculated_at_ms,
+        "build_version": previous_payload.get("build_version"),
+        "full_refresh_generated_at_ms": full_refresh_ms,
+        "player_ids": set(previous_digests.keys()),
+    }
+
+
+def _load_previous_player_sections(
+    generation: str, player_ids: List[str], section: str
+) -> Dict[str, Dict[str, Any]]:
+    sections: Dict[str, Dict[str, Any]] = {}
+    for batch in _batched(player_ids, size=PLAYER_INDEX_PUBLISH_BATCH_SIZE):
+        pipe = redis_conn.pipeline(transaction=False)
+        for player_id in batch:
+            pipe.hget(_player_index_key(player_id, generation), section)
+        for player_id, raw in zip(batch, pipe.execute()):
+            if not raw:
+                continue
+            try:
+                payload = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(payload, dict):
+                sections[player_id] = payload
+    return sections
+
+
+def _restore_carried_section_stamps(
+    players: Mapping[str, Dict[str, Any]],
+    carried: Mapping[str, Mapping[str, Dict[str, Any]]],
+) -> None:
+    """Keeps the generated-at stamps of sections reused from the last build."""
+    for section, stamp in (
+        ("history", "history_generated_at_ms"),
+        ("results", "match_loo_generated_at_ms"),
+    ):
+        for player_id, previous in carried.get(section, {}).items():
+            player = players.get(player_id)
+            if player is not None and previous.get(stamp) is not None:
+                player[stamp] = previous[stamp]
+
+
+def _player_index_sections(
+    player_payload: Mapping[str, Any],
+) -> Dict[str, bytes]:
+    """Serialized hash fields for one player; readers rebuild the full view."""
+    return {
+        "summary": orjson.dumps(_build_player_summary_section(player_payload)),
+        "history": orjson.dumps(_build_player_history_section(player_payload)),
+        "results": orjson.dumps(_build_player_results_section(player_payload)),
+    }
+
+
+def _expire_abandoned_player_index_generation(
+    generation: str, previous_generation: str | None
+) -> None:
+    """Expires the hashes of a generation whose publish never flipped.
+
+    Its digests hash is written batch by batch with the player hashes, so
+    it lists every player the failed run wrote.
+    """
+    pending = redis_conn.get(RIPPLE_PLAYER_INDEX_PENDING_KEY)
+    if pending is None or pending in (generation, previous_generation):
+        return
+    player_ids = sorted(_load_player_index_digests(pending))
+    for batch in _batched(player_ids, size=PLAYER_INDEX_PUBLISH_BATCH_SIZE):
+        pipe = redis_conn.pipeline(transaction=False)
+        for player_id in batch:
+            pipe.expire(
+                _player_index_key(player_id, pending),
+                PLAYER_INDEX_GC_GRACE_SECONDS,
+            )
+        pipe.execute()
+    redis_conn.expire(
+        _player_index_digests_key(pending), PLAYER_INDEX_GC_GRACE_SECONDS
+    )
+    logger.warning(
+        "Expired %d player hashes of abandoned index generation %s",
+        len(player_ids),
+        pending,
+    )
+
+
+def _publish_player_index(
+    players: Mapping[str, Mapping[str, Any]],
+    *,
+    index_payload: Mapping[str, Any],
+    meta_payload: Mapping[str, Any],
+    previous_player_ids: set[str],
+    previous_generation: str | None,
+    previous_digests: Mapping[str, str] | None = None,
+) -> Dict[str, int]:
+    """Writes a new index generation, flips the pointer, expires the old one.
+
+    Player hashes go out in pipelined batches under the new generation,
+    which no reader resolves until the latest/meta pair is swapped in a
+    single MULTI/EXEC. Readers therefore see either the old index or the
+    new one, never a mix. Players whose digest matches the previous
+    generation are copied server-side instead of re-serialized.
+
+    The generation being written is recorded as pending until the flip, so
+    if this run fails before it, the next publish expires its hashes.
+    """
+    generation = str(index_payload["generation"])
+    _expire_abandoned_player_index_generation(generation, previous_generation)
+    redis_conn.set(RIPPLE_PLAYER_INDEX_PENDING_KEY, generation)
+    previous_digests = previous_digests or {}
+    can_copy = previous_generation not in (None, generation)
+    digests_key = _player_index_digests_key(generation)
+    player_ids = list(players.keys())
+    unchanged = 0
+    for batch in _batched(player_ids, size=PLAYER_INDEX_PUBLISH_BATCH_SIZE):
+        pipe = redis_conn.pipeline(transaction=False)
+        digests: Dict[str, str] = {}
+        copied: List[str] = []
+        for player_id in batch:
+            digest = _player_payload_digest(players[player_id])
+            digests[player_id] = digest
+            key = _player_index_key(player_id, generation)
+            if can_copy and previous_digests.get(player_id) == digest:
+                pipe.copy(
+                    _player_index_key(player_id, previous_generation),
+                    key,
+                    replace=True,
+                )
+                copied.append(player_id)
+            else:
+                pipe.hset(
+                    key, mapping=_player_index_sections(players[player_id])
+                )
+        pipe.hset(digests_key, mapping=digests)
+        copy_results = dict(zip(batch, pipe.execute()))
+
+        # A previous hash that already expired cannot be copied; write it.
+        missing = [
+            player_id for player_id in copied if not copy_results[player_id]
+        ]
+        unchanged += len(copied) - len(missing)
+        if missing:
+            pipe = redis_conn.pipeline(transaction=False)
+            for player_id in missing:
+                pipe.hset(
+                    _player_index_key(player_id, generation),
+                    mapping=_player_index_sections(players[player_id]),
+                )
+            pipe.execute()
+
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.set(RIPPLE_PLAYER_INDEX_LATEST_KEY, orjson.dumps(index_payload))
+    pipe.set(RIPPLE_PLAYER_INDEX_META_KEY, orjson.dumps(meta_payload))
+    pipe.delete(RIPPLE_PLAYER_INDEX_PENDING_KEY)
+    pipe.execute()
+
+    counts = {
+        "rewritten_players": len(player_ids) - unchanged,
+        "unchanged_players": unchanged,
+    }
+    if previous_generation == generation:
+        return counts
+    # Expire rather than delete: a reader holding the old meta may still be
+    # between its meta and player reads.
+    if previous_generation is not None:
+        redis_conn.expire(
+            _player_index_digests_key(previous_generation),
+            PLAYER_INDEX_GC_GRACE_SECONDS,
+        )
+    for batch in _batched(
+        sorted(previous_player_ids), size=PLAYER_INDEX_PUBLISH_BATCH_SIZE
+    ):
+        pipe = redis_conn.pipeline(transaction=False)
+        for player_id in batch:
+            for key in _player_index_storage_keys(
+                player_id, previous_generation
+            ):
+                pipe.expire(key, PLAYER_INDEX_GC_GRACE_SECONDS)
+        pipe.execute()
+    return counts
+
+
+def _sample_player_index_memory(
+    player_ids: List[str], generation: str
+) -> Dict[str, Any] | None:
+    """Estimates the index footprint from ``MEMORY USAGE`` on a sample."""
+    if not player_ids:
+        return None
+    step = max(1, len(player_ids) // PLAYER_INDEX_MEMORY_SAMPLE_SIZE)
+    sample = player_ids[::step][:PLAYER_INDEX_MEMORY_SAMPLE_SIZE]
+    try:
+        pipe = redis_conn.pipeline(transaction=False)
+        for player_id in sample:
+            pipe.memory_usage(_player_index_key(player_id, generation))
+        usages = [int(usage) for usage in pipe.execute() if usage]
+    except Exception as exc:
+        logger.warning("Failed to sample player index memory: %s", exc)
+        return None
+    if not usages:
+        return None
+    mean_bytes = sum(usages) / len(usages)
+    return {
+        "sampled_players": len(usages),
+        "mean_bytes_per_player": int(mean_bytes),
+        "max_bytes_per_player": max(usages),
+        "estimated_total_bytes": int(mean_bytes * len(player_ids)),
+    }
+
+
 def _match_loo_match_id_rank_value(row: Mapping[str, Any]) -> int:
     match_id = _to_int(row.get("match_id"))
     return match_id if match_id is not None else -1
@@ -748,6 +1156,9 @@ async def _fetch_player_events(
 
     schema = ripple_queries._schema()
     schema_sql = f'"{schema}"'
+    pat_filter = ripple_queries.player_id_in(
+        "pat.player_id", "player_appearance_teams"
+    )
 
     # Use LEFT JOIN to ensure lifetime tournament_count is not undercounted
     # when a tournament is missing from the event-time MV. We still compute
@@ -761,7 +1172,7 @@ async def _fetch_player_events(
         FROM {schema_sql}.player_appearance_teams pat
         LEFT JOIN {schema_sql}.tournament_event_times tet
           ON tet.tournament_id = pat.tournament_id
-        WHERE pat.player_id::text = ANY(:player_ids)
+        WHERE {pat_filter}
         GROUP BY pat.player_id
         """
     )
@@ -793,6 +1204,9 @@ async def _fetch_player_ranked_history(
     )
     schema = ripple_queries._schema()
     schema_sql = f'"{schema}"'
+    pat_filter = ripple_queries.player_id_in(
+        "pat.player_id", "player_appearance_teams"
+    )
 
     query = text(
         f"""
@@ -802,7 +1216,7 @@ async def _fetch_player_ranked_history(
                             pat.team_id,
                             pat.match_id
             FROM {schema_sql}.player_appearance_teams pat
-            WHERE pat.player_id::text = ANY(:player_ids)
+            WHERE {pat_filter}
         ),
         per_team AS (
             SELECT pm.player_id,
@@ -898,27 +1312,34 @@ async def _fetch_player_ranked_history(
         """
     ).bindparams(bindparam("max_per_player", type_=BigInteger))
 
+    async def _fetch_batch(batch_session, batch):
+        result = await batch_session.execute(
+            query,
+            {
+                "player_ids": batch,
+                "max_per_player": max_rows,
+            },
+        )
+        return result.mappings().all()
+
     history_by_player: Dict[str, List[Dict[str, Any]]] = {}
 
-    for batch in _batched(player_ids, size=PLAYER_HISTORY_CHUNK_SIZE):
-        try:
-            result = await session.execute(
-                query,
-                {
-                    "player_ids": batch,
-                    "max_per_player": max_rows,
-                },
-            )
-            rows = result.mappings().all()
-        except Exception as exc:
-            logger.warning(
-                "Failed to fetch ranked tournament history for %s players: %s",
-                len(batch),
-                exc,
-            )
-            await session.rollback()
-            return {}
+    try:
+        batch_rows = await _run_batches(
+            session,
+            _batched(player_ids, size=PLAYER_HISTORY_CHUNK_SIZE),
+            _fetch_batch,
+        )
+    except Exception as exc:
+        logger.warning(
+            "Failed to fetch ranked tournament history for %s players: %s",
+            len(player_ids),
+            exc,
+        )
+        await session.rollback()
+        return {}
 
+    for rows in batch_rows:
         for row in rows:
             if not bool(row.get("is_ranked")):
                 continue
@@ -995,6 +1416,12 @@ async def _fetch_player_match_loo_impacts(
     max_rows = max(1, int(max_per_player))
     schema = ripple_queries._schema()
     schema_sql = f'"{schema}"'
+    pat_filter = ripple_queries.player_id_in(
+        "pat.player_id", "player_appearance_teams"
+    )
+    impacts_filter = ripple_queries.player_id_in(
+        "impacts.player_id", "player_match_loo_impacts"
+    )
 
     query = text(
         f"""
@@ -1005,7 +1432,7 @@ async def _fetch_player_match_loo_impacts(
                 pat.tournament_id,
                 MAX(pat.team_id)::bigint AS player_team_id
             FROM {schema_sql}.player_appearance_teams pat
-            WHERE pat.player_id::text = ANY(:player_ids)
+            WHERE {pat_filter}
             GROUP BY pat.player_id::text, pat.match_id, pat.tournament_id
         ),
         base_ids AS (
@@ -1053,7 +1480,7 @@ async def _fetch_player_match_loo_impacts(
               ON player_match_team.player_id = impacts.player_id::text
              AND player_match_team.match_id = impacts.match_id
              AND player_match_team.tournament_id = impacts.tournament_id
-            WHERE impacts.player_id::text = ANY(:player_ids)
+            WHERE {impacts_filter}
               AND impacts.calculated_at_ms = :calculated_at_ms
               AND (
                 CAST(:match_any_build_version AS BOOLEAN) IS TRUE
@@ -1202,7 +1629,7 @@ async def _fetch_player_match_loo_impacts(
             impacts.calculated_at_ms::bigint AS calculated_at_ms,
             impacts.build_version::text AS build_version
         FROM {schema_sql}.player_match_loo_impacts impacts
-        WHERE impacts.player_id::text = ANY(:player_ids)
+        WHERE {impacts_filter}
         ORDER BY
             impacts.player_id::text,
             impacts.calculated_at_ms DESC NULLS LAST,
@@ -1210,89 +1637,90 @@ async def _fetch_player_match_loo_impacts(
         """
     )
 
-    impacts_by_player: Dict[str, List[Dict[str, Any]]] = {}
+    async def _fetch_batch(batch_session, batch):
+        rows = []
+        result = await batch_session.execute(
+            query,
+            {
+                "player_ids": batch,
+                "calculated_at_ms": int(calculated_at_ms),
+                "build_version": build_version,
+                "match_any_build_version": build_version is None,
+            },
+        )
+        rows.extend(result.mappings().all())
 
-    for batch in _batched(player_ids, size=PLAYER_MATCH_LOO_CHUNK_SIZE):
-        try:
-            rows = []
-            result = await session.execute(
-                query,
-                {
-                    "player_ids": batch,
-                    "calculated_at_ms": int(calculated_at_ms),
-                    "build_version": build_version,
-                    "match_any_build_version": build_version is None,
-                },
+        matched_player_ids = {
+            str(row.get("player_id") or "")
+            for row in rows
+            if row.get("player_id") is not None
+        }
+        missing_player_ids = [
+            player_id
+            for player_id in batch
+            if player_id not in matched_player_ids
+        ]
+
+        if missing_player_ids:
+            # Stable snapshot ids can drift from available LOO snapshots.
+            # When that happens, pull the newest per-player LOO slice
+            # instead of dropping the data entirely.
+            snapshot_result = await batch_session.execute(
+                latest_snapshot_query,
+                {"player_ids": missing_player_ids},
             )
-            rows.extend(result.mappings().all())
+            fallback_snapshots = snapshot_result.mappings().all()
+            fallback_groups: Dict[tuple[int, str | None], List[str]] = {}
+            for snapshot_row in fallback_snapshots:
+                fallback_player_id = str(snapshot_row.get("player_id") or "")
+                fallback_calculated_at_ms = _to_int(
+                    snapshot_row.get("calculated_at_ms")
+                )
+                if not fallback_player_id or fallback_calculated_at_ms is None:
+                    continue
 
-            matched_player_ids = {
-                str(row.get("player_id") or "")
-                for row in rows
-                if row.get("player_id") is not None
-            }
-            missing_player_ids = [
-                player_id
-                for player_id in batch
-                if player_id not in matched_player_ids
-            ]
+                fallback_key = (
+                    int(fallback_calculated_at_ms),
+                    snapshot_row.get("build_version"),
+                )
+                fallback_groups.setdefault(fallback_key, []).append(
+                    fallback_player_id
+                )
 
-            if missing_player_ids:
-                # Stable snapshot ids can drift from available LOO snapshots.
-                # When that happens, pull the newest per-player LOO slice
-                # instead of dropping the data entirely.
-                snapshot_result = await session.execute(
-                    latest_snapshot_query,
-                    {"player_ids": missing_player_ids},
+            for (
+                fallback_calculated_at_ms,
+                fallback_build_version,
+            ), fallback_player_ids in fallback_groups.items():
+                fallback_result = await batch_session.execute(
+                    query,
+                    {
+                        "player_ids": fallback_player_ids,
+                        "calculated_at_ms": fallback_calculated_at_ms,
+                        "build_version": fallback_build_version,
+                        "match_any_build_version": False,
+                    },
                 )
-                fallback_snapshots = snapshot_result.mappings().all()
-                fallback_groups: Dict[
-                    tuple[int, str | None], List[str]
-                ] = {}
-                for snapshot_row in fallback_snapshots:
-                    fallback_player_id = str(
-                        snapshot_row.get("player_id") or ""
-                    )
-                    fallback_calculated_at_ms = _to_int(
-                        snapshot_row.get("calculated_at_ms")
-                    )
-                    if (
-                        not fallback_player_id
-                        or fallback_calculated_at_ms is None
-                    ):
-                        continue
-
-                    fallback_key = (
-                        int(fallback_calculated_at_ms),
-                        snapshot_row.get("build_version"),
-                    )
-                    fallback_groups.setdefault(fallback_key, []).append(
-                        fallback_player_id
-                    )
+                rows.extend(fallback_result.mappings().all())
+        return rows
 
-                for (
-                    fallback_calculated_at_ms,
-                    fallback_build_version,
-                ), fallback_player_ids in fallback_groups.items():
-                    fallback_result = await session.execute(
-                        query,
-                        {
-                            "player_ids": fallback_player_ids,
-                            "calculated_at_ms": fallback_calculated_at_ms,
-                            "build_version": fallback_build_version,
-                            "match_any_build_version": False,
-                        },
-                    )
-                    rows.extend(fallback_result.mappings().all())
-        except Exception as exc:
-            logger.warning(
-                "Failed to fetch player match LOO impacts for %s players: %s",
-                len(batch),
-                exc,
-            )
-            await session.rollback()
-            return {}
+    impacts_by_player: Dict[str, List[Dict[str, Any]]] = {}
 
+    try:
+        batch_rows = await _run_batches(
+            session,
+            _batched(player_ids, size=PLAYER_MATCH_LOO_CHUNK_SIZE),
+            _fetch_batch,
+        )
+    except Exception as exc:
+        logger.warning(
+            "Failed to fetch player match LOO impacts for %s players: %s",
+            len(player_ids),
+            exc,
+        )
+        await session.rollback()
+        return {}
+
+    for rows in batch_rows:
         for row in rows:
             player_id = str(row.get("player_id") or "")
             if not player_id:
@@ -1363,6 +1791,130 @@ async def _fetch_player_match_loo_impacts(
     return impacts_by_player
 
 
+async def _fetch_player_ids_with_appearances_since(
+    session, since_ms: int
+) -> set[str] | None:
+    schema = ripple_queries._schema()
+    schema_sql = f'"{schema}"'
+    query = text(
+        f"""
+        SELECT DISTINCT pat.player_id::text AS player_id
+        FROM {schema_sql}.player_appearance_teams pat
+        JOIN {schema_sql}.tournament_event_times t
+          ON t.tournament_id = pat.tournament_id
+        WHERE t.event_ms > :since_ms
+        """
+    )
+    try:
+        result = await session.execute(query, {"since_ms": int(since_ms)})
+        return {str(row["player_id"]) for row in result.mappings().all()}
+    except Exception as exc:
+        logger.warning(
+            "Failed to fetch players with recent appearances: %s", exc
+        )
+        await session.rollback()
+        return None
+
+
+async def _fetch_player_index_sources(
+    session,
+    player_ids: List[str],
+    *,
+    calculated_at_ms: int | None,
+    build_version: str | None,
+    base: Mapping[str, Any] | None,
+    active_player_ids: set[str] | None,
+) -> tuple[
+    Dict[str, List[Dict[str, Any]]],
+    Dict[str, List[Dict[str, Any]]],
+    Dict[str, Dict[str, Dict[str, Any]]],
+    Dict[str, Any],
+]:
+    """Fetches history and match LOO rows, reusing the last build if it can.
+
+    With an incremental ``base``, only ``active_player_ids`` (players who
+    appeared in a tournament since its calculation) and players new to the
+    index are queried; everyone else keeps the history section stored in
+    the previous generation. LOO rows belong to one ranking calculation, so
+    they carry over only while the calculation is unchanged. The history
+    and LOO fetches run concurrently when ``session`` is a snapshot pool.
+    """
+    history_ids = player_ids
+    loo_ids = player_ids
+    carried: Dict[str, Dict[str, Dict[str, Any]]] = {
+        "history": {},
+        "results": {},
+    }
+    mode = "full"
+    if base is not None and active_player_ids is not None:
+        mode = "incremental"
+        quiet_ids = [
+            player_id
+            for player_id in player_ids
+            if player_id not in active_player_ids
+            and player_id in base["player_ids"]
+        ]
+        carried["history"] = _load_previous_player_sections(
+            base["generation"], quiet_ids, "history"
+        )
+        history_ids = [
+            player_id
+            for player_id in player_ids
+            if player_id not in carried["history"]
+        ]
+        if (
+            calculated_at_ms == base["calculated_at_ms"]
+            and build_version == base["build_version"]
+        ):
+            carried["results"] = _load_previous_player_sections(
+                base["generation"], quiet_ids, "results"
+            )
+            loo_ids = [
+                player_id
+                for player_id in player_ids
+                if player_id not in carried["results"]
+            ]
+
+    (
+        tournament_history_by_player,
+        match_loo_impacts_by_player,
+    ) = await _gather_fetches(
+        session,
+        _fetch_player_ranked_history(
+            session,
+            history_ids,
+            max_per_player=MAX_PLAYER_HISTORY_ENTRIES,
+        ),
+        _fetch_player_match_loo_impacts(
+            session,
+            loo_ids,
+            calculated_at_ms=calculated_at_ms,
+            build_version=build_version,
+            max_per_player=MAX_PLAYER_MATCH_LOO_ENTRIES,
+        ),
+    )
+    for player_id, section in carried["history"].items():
+        tournament_history_by_player[player_id] = (
+            section.get("tournament_history_ranked") or []
+        )
+    for player_id, section in carried["results"].items():
+        match_loo_impacts_by_player[player_id] = (
+            section.get("match_loo_impacts") or []
+        )
+
+    stats = {
+        "mode": mode,
+        "history_fetched_players": len(history_ids),
+        "match_loo_fetched_players": len(loo_ids),
+    }
+    return (
+        tournament_history_by_player,
+        match_loo_impacts_by_player,
+        carried,
+        stats,
+    )
+
+
 async def _first_scores_after_events(
     session,
     player_events: Dict[str, int],
@@ -1374,6 +1926,12 @@ async def _first_scores_after_events(
 
     schema = ripple_queries._schema()
     schema_sql = f'"{schema}"'
+    player_ids_sql = ripple_queries.player_id_array("player_rankings")
+    join_sql = (
+        "pr.player_id = p.player_id"
+        if ripple_queries.player_id_type("player_rankings")
+        else "pr.player_id::text = p.player_id"
+    )
 
     player_ids = list(player_events.keys())
     event_ms = [int(player_events[player_id]) for player_id in player_ids]
@@ -1382,7 +1940,7 @@ async def _first_scores_after_events(
         f"""
         WITH params AS (
             SELECT player_id, event_ms
-            FROM UNNEST(CAST(:player_ids AS text[]), CAST(:event_ms AS bigint[]))
+            FROM UNNEST({player_ids_sql}, CAST(:event_ms AS bigint[]))
                 AS t(player_id, event_ms)
         )
         SELECT DISTINCT ON (pr.player_id)
@@ -1390,7 +1948,7 @@ async def _first_scores_after_events(
                pr.score
         FROM params p
         JOIN {schema_sql}.player_rankings pr
-          ON pr.player_id::text = p.player_id
+          ON {join_sql}
          AND pr.calculated_at_ms >= p.event_ms
          AND (:cutoff_ms IS NULL OR pr.calculated_at_ms <= :cutoff_ms)
         ORDER BY pr.player_id, pr.calculated_at_ms
@@ -1678,8 +2236,10 @@ def _build_player_index_payload(
             "match_loo_impacts": match_impact_rows,
         }
 
+    generation = str(generated_at_ms)
     payload = {
         "generated_at_ms": generated_at_ms,
+        "generation": generation,
         "calculated_at_ms": calculated_at_ms,
         "build_version": build_version,
         "minimum_required_tournaments": MIN_REQUIRED_TOURNAMENTS,
@@ -1688,6 +2248,7 @@ def _build_player_index_payload(
     }
     meta = {
         "generated_at_ms": generated_at_ms,
+        "generation": generation,
         "calculated_at_ms": calculated_at_ms,
         "build_version": build_version,
         "minimum_required_tournaments": MIN_REQUIRED_TOURNAMENTS,
@@ -1696,7 +2257,33 @@ def _build_player_index_payload(
     return payload, meta, players
 
 
+async def _fetch_analytics_schema_columns(
+    session,
+) -> Dict[str, List[str]] | None:
+    # Runs in its own transaction: a failed catalog read must not abort the
+    # snapshot queries, and analytics falls back to introspecting itself.
+    try:
+        async with session.begin():
+            return await ripple_queries.fetch_table_columns(
+                session, ANALYTICS_SCHEMA_COLUMNS_TABLES
+            )
+    except Exception as exc:
+        logger.warning("Failed to introspect analytics schema columns: %s", exc)
+        return None
+
+
+async def _refresh_player_id_types(session) -> None:
+    # Own transaction, like the analytics column read: if the catalog read
+    # fails, the player lookups keep their text-cast filters.
+    try:
+        async with session.begin():
+            await ripple_queries.refresh_player_id_types(session)
+    except Exception as exc:
+        logger.warning("Failed to look up player_id column types: %s", exc)
+
+
 async def _refresh_snapshots_async_once() -> Dict[str, Any]:
+    started = time.perf_counter()
     generated_at_ms = _now_ms()
     rows: List[Mapping[str, Any]] = []
     all_rows: List[Mapping[str, Any]] = []
@@ -1721,9 +2308,31 @@ async def _refresh_snapshots_async_once() -> Dict[str, Any]:
         preserved_source = preserved_source or "redis_latest"
     yesterday_payload: Dict[str, Any] | None = None
     yesterday_cutoff_ms: int | None = None
+    schema_columns: Dict[str, List[str]] | None = None
+    previous_player_index_payload = _load_cached_payload(
+        RIPPLE_PLAYER_INDEX_LATEST_KEY
+    )
+    previous_player_ids = _extract_player_index_ids(
+        previous_player_index_payload
+    )
+    previous_player_index_generation = _extract_player_index_generation(
+        previous_player_index_payload
+    )
+    previous_player_digests = _load_player_index_digests(
+        previous_player_index_generation
+    )
+    player_index_base = _incremental_player_index_base(
+        previous_player_index_payload,
+        previous_player_digests,
+        generated_at_ms,
+    )
+    carried_sections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    player_index_refresh: Dict[str, Any] = {}
 
     # Use a single session for all database queries
     async with rankings_async_session() as session:
+        await _refresh_player_id_types(session)
+
         # Main query block in its own transaction
         async with session.begin():
             (
@@ -1765,23 +2374,43 @@ async def _refresh_snapshots_async_once() -> Dict[str, Any]:
             )
             calc_ts_int = _to_int(calc_ts)
             events = await _fetch_player_events(session, player_ids)
-            player_owner_discord_ids = (
-                await _fetch_player_owner_discord_ids(
-                    session,
-                    all_player_ids,
+            active_player_ids = None
+            if player_index_base is not None:
+                active_player_ids = (
+                    await _fetch_player_ids_with_appearances_since(
+                        session,
+                        player_index_base["calculated_at_ms"]
+                        - PLAYER_INDEX_APPEARANCE_LOOKBACK_MS,
+                    )
                 )
+            fetch_started = time.perf_counter()
+            fetch_session = await _open_snapshot_session_pool(session)
+            (
+                player_owner_discord_ids,
+                (
+                    tournament_history_by_player,
+                    match_loo_impacts_by_player,
+                    carried_sections,
+                    player_index_refresh,
+                ),
+            ) = await _gather_fetches(
+                fetch_session,
+                _fetch_player_owner_discord_ids(
+                    fetch_session,
+                    all_player_ids,
+                ),
+                _fetch_player_index_sources(
+                    fetch_session,
+                    all_player_ids,
+                    calculated_at_ms=calc_ts_int,
+                    build_version=build_version,
+                    base=player_index_base,
+                    active_player_ids=active_player_ids,
+                ),
             )
-            tournament_history_by_player = await _fetch_player_ranked_history(
-                session,
-                all_player_ids,
-                max_per_player=MAX_PLAYER_HISTORY_ENTRIES,
-            )
-            match_loo_impacts_by_player = await _fetch_player_match_loo_impacts(
-                session,
-                all_player_ids,
-                calculated_at_ms=calc_ts_int,
-                build_version=build_version,
-                max_per_player=MAX_PLAYER_MATCH_LOO_ENTRIES,
+            fetch_seconds = time.perf_counter() - fetch_started
+            player_index_refresh["fetch_parallelism"] = getattr(
+                fetch_session, "parallelism", 1
             )
             state, stable_rows = await _bootstrap_state(
                 session, rows, events, generated_at_ms
@@ -1829,6 +2458,8 @@ async def _refresh_snapshots_async_once() -> Dict[str, Any]:
                         preserved_payload = previous_stable_payload
                         preserved_source = "db_baseline"
 
+        schema_columns = await _fetch_analytics_schema_columns(session)
+
     new_state = state
     display_map = {
         row["player_id"]: row["display_score"] for row in stable_rows
@@ -1900,13 +2531,12 @@ async def _refresh_snapshots_async_once() -> Dict[str, Any]:
         calculated_at_ms=calc_ts_int,
         build_version=build_version,
     )
-    previous_player_index_payload = _load_cached_payload(
-        RIPPLE_PLAYER_INDEX_LATEST_KEY
-    )
-    previous_player_ids = _extract_player_index_ids(
-        previous_player_index_payload
+    _restore_carried_section_stamps(player_index_players, carried_sections)
+    player_index_payload["full_refresh_generated_at_ms"] = (
+        player_index_base["full_refresh_generated_at_ms"]
+        if player_index_refresh.get("mode") == "incremental"
+        else generated_at_ms
     )
-    current_player_ids = set(player_index_players.keys())
 
     _persist_previous_payload(
         preserved_payload,
@@ -1917,27 +2547,19 @@ async def _refresh_snapshots_async_once() -> Dict[str, Any]:
     _persist_payload(RIPPLE_STABLE_LATEST_KEY, stable_payload)
     _persist_payload(RIPPLE_DANGER_LATEST_KEY, danger_snapshot)
     _persist_payload(RIPPLE_STABLE_META_KEY, meta_payload)
-    _persist_payload(RIPPLE_STABLE_PERCENTILES_KEY, percentiles_payload)
-    _persist_payload(RIPPLE_STABLE_DELTAS_KEY, delta_payload)
-    for player_id, player_payload in player_index_players.items():
-        _persist_payload(_player_index_key(player_id), player_payload)
-        _persist_payload(
-            _player_index_summary_key(player_id),
-            _build_player_summary_section(player_payload),
-        )
+    if schema_columns is not None:
         _persist_payload(
-            _player_index_history_key(player_id),
-            _build_player_history_section(player_payload),
-        )
-        _persist_payload(
-            _player_index_results_key(player_id),
-            _build_player_results_section(player_payload),
+            ANALYTICS_SCHEMA_COLUMNS_KEY,
+            {
+                "schema": ripple_queries.schema_name(),
+                "build_version": build_version,
+                "calculated_at_ms": calc_ts_int,
+                "generated_at_ms": generated_at_ms,
+                "tables": schema_columns,
+            },
         )
-    for stale_player_id in previous_player_ids - current_player_ids:
-        redis_conn.delete(_player_index_key(stale_player_id))
-        redis_conn.delete(_player_index_summary_key(stale_player_id))
-        redis_conn.delete(_player_index_history_key(stale_player_id))
-        redis_conn.delete(_player_index_results_key(stale_player_id))
+    _persist_payload(RIPPLE_STABLE_PERCENTILES_KEY, percentiles_payload)
+    _persist_payload(RIPPLE_STABLE_DELTAS_KEY, delta_payload)
     if player_owner_discord_ids is not None:
         redis_conn.delete(RIPPLE_PLAYER_OWNER_DISCORD_HASH_KEY)
         if player_owner_discord_ids:
@@ -1945,8 +2567,16 @@ async def _refresh_snapshots_async_once() -> Dict[str, Any]:
                 RIPPLE_PLAYER_OWNER_DISCORD_HASH_KEY,
                 mapping=player_owner_discord_ids,
             )
-    _persist_payload(RIPPLE_PLAYER_INDEX_LATEST_KEY, player_index_payload)
-    _persist_payload(RIPPLE_PLAYER_INDEX_META_KEY, player_index_meta_payload)
+    player_index_refresh.update(
+        _publish_player_index(
+            player_index_players,
+            index_payload=player_index_payload,
+            meta_payload=player_index_meta_payload,
+            previous_player_ids=previous_player_ids,
+            previous_generation=previous_player_index_generation,
+            previous_digests=previous_player_digests,
+        )
+    )
 
     logger.info(
         "Refreshed ripple snapshots: %s stable rows, %s danger rows, %s indexed players",
@@ -1954,12 +2584,25 @@ async def _refresh_snapshots_async_once() -> Dict[str, Any]:
         len(danger_payload),
         len(player_index_players),
     )
+    logger.info("Ripple player index refresh: %s", player_index_refresh)
+    if metrics_enabled():
+        RIPPLE_REFRESH_DURATION.labels(stage="player_fetch").observe(
+            fetch_seconds
+        )
+        RIPPLE_REFRESH_DURATION.labels(stage="total").observe(
+            time.perf_counter() - started
+        )
 
     return {
         "stable_rows": len(stable_rows),
         "danger_rows": len(danger_payload),
         "indexed_players": len(player_index_players),
         "all_rows": _to_int(all_total),
+        "player_index_memory": _sample_player_index_memory(
+            player_index_payload["player_ids"],
+            player_index_payload["generation"],
+        ),
+        "player_index_refresh": player_index_refresh,
     }
 
 
@@ -15,7 +15,7 @@ from fast_api_app.comp_auth import (
     get_comp_auth_session_middleware_kwargs,
     is_development_like_environment,
 )
-from fast_api_app.connections import celery, limiter
+from fast_api_app.connections import celery, close_async_redis, limiter
 from fast_api_app.feature_flags import is_comp_leaderboard_enabled
 from fast_api_app.metrics import setup_metrics
 from fast_api_app.middleware import (
@@ -23,6 +23,7 @@ from fast_api_app.middleware import (
     APITokenUsageMiddleware,
 )
 from fast_api_app.pubsub import start_pubsub_listener
+from fast_api_app.routes.analytics import prime_schema_columns
 from fast_api_app.sqlite_lookup_store import prime_lookup_sqlite_snapshot
 from fast_api_app.routes import (
     analytics_router,
@@ -92,12 +93,14 @@ async def lifespan(app: FastAPI):
             celery.send_task("tasks.refresh_ripple_snapshots")
 
     prime_lookup_sqlite_snapshot()
+    prime_schema_columns()
     start_pubsub_listener()
     if _local_table_refreshers_enabled():
         from fast_api_app.background_tasks import background_runner
 
         asyncio.create_task(background_runner.run())
     yield
+    await close_async_redis()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -173,4 +176,8 @@ async def list_routes():
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=5000, log_level="info")
+    from fast_api_app.connections import record_websocket_server_config
+
+    config = uvicorn.Config(app, host="0.0.0.0", port=5000, log_level="info")
+    record_websocket_server_config(config)
+    uvicorn.Server(config).run()
@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from urllib.parse import urlsplit
 
 from fastapi import HTTPException, Request
-from fast_api_app.connections import redis_conn
+from fast_api_app.connections import async_redis_conn, redis_conn
 from shared_lib.constants import RIPPLE_PLAYER_OWNER_DISCORD_HASH_KEY
 
 COMP_AUTH_SESSION_COOKIE = "comp_auth_session"
@@ -158,21 +158,46 @@ def get_comp_auth_player_owner_map() -> dict[str, frozenset[str]]:
     }
 
 
-def is_comp_player_owner(
+def _normalize_owner_lookup(
     player_id: str | None,
     discord_id: str | None,
-) -> bool:
+) -> tuple[str, str] | None:
     if not player_id or not discord_id:
-        return False
+        return None
 
     player_key = str(player_id).strip()
     discord_key = str(discord_id).strip()
     if not player_key or not discord_key:
-        return False
+        return None
+    return player_key, discord_key
 
-    if discord_key in get_comp_auth_player_owner_map().get(
+
+def _is_configured_comp_player_owner(player_key: str, discord_key: str) -> bool:
+    return discord_key in get_comp_auth_player_owner_map().get(
         player_key, frozenset()
-    ):
+    )
+
+
+def _matches_cached_comp_player_owner(
+    cached_discord_id: str | None, discord_key: str
+) -> bool:
+    cached_discord_key = str(cached_discord_id or "").strip()
+    if not cached_discord_key:
+        return False
+
+    return cached_discord_key == discord_key
+
+
+def is_comp_player_owner(
+    player_id: str | None,
+    discord_id: str | None,
+) -> bool:
+    lookup = _normalize_owner_lookup(player_id, discord_id)
+    if lookup is None:
+        return False
+
+    player_key, discord_key = lookup
+    if _is_configured_comp_player_owner(player_key, discord_key):
         return True
 
     try:
@@ -185,11 +210,33 @@ def is_comp_player_owner(
         )
         return False
 
-    cached_discord_key = str(cached_discord_id or "").strip()
-    if not cached_discord_key:
+    return _matches_cached_comp_player_owner(cached_discord_id, discord_key)
+
+
+async def is_comp_player_owner_async(
+    player_id: str | None,
+    discord_id: str | None,
+) -> bool:
+    """Async variant of ``is_comp_player_owner`` for request handlers."""
+    lookup = _normalize_owner_lookup(player_id, discord_id)
+    if lookup is None:
         return False
 
-    return cached_discord_key == discord_key
+    player_key, discord_key = lookup
+    if _is_configured_comp_player_owner(player_key, discord_key):
+        return True
+
+    try:
+        cached_discord_id = await async_redis_conn.hget(
+            RIPPLE_PLAYER_OWNER_DISCORD_HASH_KEY, player_key
+        )
+    except Exception as exc:
+        logger.warning(
+            "Failed to read cached competition player owner map: %s", exc
+        )
+        return False
+
+    return _matches_cached_comp_player_owner(cached_discord_id, discord_key)
 
 
 def read_authenticated_comp_discord_id(request: Request) -> str | None:
@@ -1,12 +1,14 @@
 import asyncio
 import logging
+import os
 import sqlite3
 import zlib
-from time import perf_counter
+from time import monotonic, perf_counter
 
 import httpx
 import orjson
 import redis
+import redis.asyncio as aioredis
 from celery import Celery
 from fastapi import WebSocket
 from slowapi import Limiter
@@ -19,9 +21,19 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from fast_api_app.utils import get_client_ip
-from shared_lib.constants import PLAYER_LATEST_REDIS_KEY, REDIS_HOST, REDIS_PORT
-from shared_lib.db import create_ranking_uri, create_uri
+from shared_lib.constants import (
+    PLAYER_DETAIL_BATCH_PENDING_KEY,
+    PLAYER_DETAIL_BATCH_SCHEDULED_KEY,
+    PLAYER_DETAIL_FETCH_PENDING_KEY,
+    PLAYER_LATEST_COMPACT_REDIS_KEY,
+    PLAYER_LATEST_REDIS_KEY,
+    REDIS_HOST,
+    REDIS_PORT,
+)
+from shared_lib.db import create_ranking_uri, create_uri, ranking_connect_args
 from shared_lib.monitoring import (
+    PLAYER_DETAIL_FETCH_ENQUEUES,
+    PUBSUB_EVENTS,
     SPLATGPT_ERRORS,
     SPLATGPT_INFLIGHT,
     SPLATGPT_QUEUE_SIZE,
@@ -29,8 +41,15 @@ from shared_lib.monitoring import (
     WEBSOCKET_BYTES_SENT,
     WEBSOCKET_CONNECTIONS,
     WEBSOCKET_EVENTS,
+    WEBSOCKET_SEND_QUEUE_DEPTH,
+    WEBSOCKET_SLOW_CONSUMERS,
     metrics_enabled,
 )
+from shared_lib.payload_utils import (
+    is_player_cache_stale,
+    per_player_pubsub_enabled,
+    player_pubsub_channel,
+)
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -43,13 +62,47 @@ PLAYER_AGGREGATED_KEYS = (
     "aggregate_season_data",
     "latest_data",
 )
+# Cache misses within this window are fetched by a single batch task.
+PLAYER_DETAIL_BATCH_WINDOW_MS = int(
+    os.getenv("PLAYER_DETAIL_BATCH_WINDOW_MS", "50")
+)
+# Websocket opens for a player with a fetch already in flight (in this
+# process or any pod) wait for its chunks instead of enqueueing again.
+PLAYER_DETAIL_FETCH_COALESCE_SECONDS = int(
+    os.getenv("PLAYER_DETAIL_FETCH_COALESCE_SECONDS", "30")
+)
+# Each websocket has a bounded outbound queue drained by its own writer task,
+# so a slow client cannot stall broadcasts to other viewers or the pubsub
+# listener. A full queue either closes the client ("close", it reconnects
+# and replays the cache) or drops the frame ("drop").
+WEBSOCKET_SEND_QUEUE_SIZE = int(os.getenv("WEBSOCKET_SEND_QUEUE_SIZE", "32"))
+WEBSOCKET_SEND_TIMEOUT_SECONDS = float(
+    os.getenv("WEBSOCKET_SEND_TIMEOUT_SECONDS", "10")
+)
+WEBSOCKET_SLOW_CONSUMER_POLICY = os.getenv(
+    "WEBSOCKET_SLOW_CONSUMER_POLICY", "close"
+)
+# Clients that connect with ?deflate=1 and offer permessage-deflate get plain
+# JSON text frames and leave compression to the transport, whose context
+# takeover lets successive chunks share one dictionary. Everyone else keeps
+# zlib-compressed binary frames. Set this to 0 to keep zlib frames for all.
+WEBSOCKET_PERMESSAGE_DEFLATE = os.getenv(
+    "WEBSOCKET_PERMESSAGE_DEFLATE", "1"
+).strip().lower() in {"1", "true", "yes", "on"}
+# ASGI does not report which extensions a handshake accepted, so text frames
+# also wait for the server to confirm, from its websocket config, that it
+# negotiates permessage-deflate. fast_api_app.workers.UvicornWorker and the
+# app's __main__ do that; under any other launcher clients keep zlib frames.
+_permessage_deflate_negotiated = False
 
 # Create both synchronous and asynchronous engines
 sync_engine = create_engine(create_uri())
 async_engine = create_async_engine(create_uri())
 
 # Separate rankings async engine/session for ripple endpoints
-rankings_async_engine = create_async_engine(create_ranking_uri())
+rankings_async_engine = create_async_engine(
+    create_ranking_uri(), connect_args=ranking_connect_args()
+)
 
 # Synchronous session
 Session = scoped_session(sessionmaker(bind=sync_engine))
@@ -80,12 +133,79 @@ pool = redis.ConnectionPool(
 )
 redis_conn = redis.Redis(connection_pool=pool)
 
+# Pre-compressed payloads are raw bytes and must not be decoded.
+binary_pool = redis.ConnectionPool(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    db=0,
+    decode_responses=False,
+    max_connections=10,
+)
+binary_redis_conn = redis.Redis(connection_pool=binary_pool)
+
+# Request handlers, middleware, websockets and the pubsub listener share these
+# async clients; the sync clients above remain for code that runs in threads.
+# A blocking pool makes bursts wait briefly for a free connection instead of
+# failing with "Too many connections".
+ASYNC_REDIS_MAX_CONNECTIONS = int(
+    os.getenv("FASTAPI_ASYNC_REDIS_MAX_CONNECTIONS", "64")
+)
+ASYNC_REDIS_POOL_TIMEOUT_SECONDS = float(
+    os.getenv("FASTAPI_ASYNC_REDIS_POOL_TIMEOUT_SECONDS", "5")
+)
+async_pool = aioredis.BlockingConnectionPool(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    db=0,
+    decode_responses=True,
+    max_connections=ASYNC_REDIS_MAX_CONNECTIONS,
+    timeout=ASYNC_REDIS_POOL_TIMEOUT_SECONDS,
+)
+async_redis_conn = aioredis.Redis(connection_pool=async_pool)
+
+async_binary_pool = aioredis.BlockingConnectionPool(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    db=0,
+    decode_responses=False,
+    max_connections=ASYNC_REDIS_MAX_CONNECTIONS,
+    timeout=ASYNC_REDIS_POOL_TIMEOUT_SECONDS,
+)
+async_binary_redis_conn = aioredis.Redis(connection_pool=async_binary_pool)
+
+
+async def close_async_redis() -> None:
+    await async_pool.disconnect()
+    await async_binary_pool.disconnect()
+
+
+def record_websocket_server_config(config) -> None:
+    """Records whether the uvicorn ``config`` negotiates permessage-deflate."""
+    global _permessage_deflate_negotiated
+    _permessage_deflate_negotiated = (
+        bool(config.ws_per_message_deflate) and config.ws != "none"
+    )
+
+
+def permessage_deflate_requested(websocket: WebSocket) -> bool:
+    """Whether a websocket opted in to transport-level compression."""
+    if not WEBSOCKET_PERMESSAGE_DEFLATE or not _permessage_deflate_negotiated:
+        return False
+    if websocket.query_params.get("deflate") != "1":
+        return False
+    offered = websocket.headers.get("sec-websocket-extensions", "")
+    return "permessage-deflate" in offered.lower()
+
 
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
         self.active_connections: dict[str, dict[str, dict]] = {}
         self.heartbeat_interval = 30
+        # player_id -> monotonic deadline of the fetch this process enqueued
+        self.pending_fetches: dict[str, float] = {}
+        # Set by the pubsub listener while it is subscribed.
+        self.pubsub = None
 
     async def connect(
         self,
@@ -94,13 +214,20 @@ class ConnectionManager:
         connection_id: str,
         *,
         progressive: bool = False,
+        compact: bool = False,
+        deflate: bool = False,
     ):
         await websocket.accept()
-        if player_id not in self.active_connections:
+        first_connection = player_id not in self.active_connections
+        if first_connection:
             self.active_connections[player_id] = {}
         self.active_connections[player_id][connection_id] = {
             "websocket": websocket,
             "progressive": progressive,
+            "compact": compact,
+            "deflate": deflate,
+            "queue": asyncio.Queue(maxsize=WEBSOCKET_SEND_QUEUE_SIZE),
+            "writer": None,
         }
         if metrics_enabled():
             WEBSOCKET_EVENTS.labels(event="connected").inc()
@@ -108,32 +235,199 @@ class ConnectionManager:
                 len(self.active_connections[player_id])
             )
         logger.info(
-            "Client connected and added to room: %s with connection id: %s (progressive=%s)",
+            "Client connected and added to room: %s with connection id: %s (progressive=%s, compact=%s, deflate=%s)",
             player_id,
             connection_id,
             progressive,
+            compact,
+            deflate,
         )
+        if first_connection:
+            # Subscribe before reading the cache so no chunk is missed.
+            await self._subscribe_player(player_id)
+        try:
+            await self._serve_cached_player_payload(
+                websocket,
+                player_id,
+                progressive=progressive,
+                compact=compact,
+                deflate=deflate,
+            )
+        finally:
+            # Broadcasts that arrived during the replay wait in the queue,
+            # so the client sees them after the cached payload.
+            self._start_writer(player_id, connection_id)
+
+    async def _serve_cached_player_payload(
+        self,
+        websocket: WebSocket,
+        player_id: str,
+        *,
+        progressive: bool,
+        compact: bool,
+        deflate: bool = False,
+    ) -> None:
         cache_key = f"{PLAYER_LATEST_REDIS_KEY}:{player_id}"
-        cached_payload_raw = redis_conn.get(cache_key)
+        if compact:
+            cache_pipe = async_binary_redis_conn.pipeline()
+            compact_key = f"{PLAYER_LATEST_COMPACT_REDIS_KEY}:{player_id}"
+            cache_pipe.get(compact_key)
+            cache_pipe.ttl(compact_key)
+        else:
+            cache_pipe = async_redis_conn.pipeline()
+            cache_pipe.get(cache_key)
+            cache_pipe.ttl(cache_key)
+        cached_payload_raw, remaining_ttl = await cache_pipe.execute()
+        stale = cached_payload_raw is not None and is_player_cache_stale(
+            remaining_ttl
+        )
+        if metrics_enabled():
+            if cached_payload_raw is None:
+                cache_event = "cache_miss"
+            elif stale:
+                cache_event = "cache_stale"
+            else:
+                cache_event = "cache_hit"
+            WEBSOCKET_EVENTS.labels(event=cache_event).inc()
         if cached_payload_raw is not None:
             try:
-                await self.send_cached_player_payload(
+                if compact and deflate:
+                    await websocket.send_text(
+                        zlib.decompress(cached_payload_raw).decode()
+                    )
+                    logger.info("Cached compact player data sent as text")
+                elif compact:
+                    # Stored already compressed; send the bytes as they are.
+                    await websocket.send_bytes(cached_payload_raw)
+                    logger.info("Cached compact player data sent directly")
+                else:
+                    await self.send_cached_player_payload(
+                        websocket,
+                        player_id,
+                        cached_payload_raw,
+                        cache_key,
+                        progressive=progressive,
+                        deflate=deflate,
+                    )
+                    logger.info("Cached player data sent directly")
+                if not stale:
+                    return
+                # Serve stale, then refresh; fresh chunks arrive over pubsub.
+                await self._send_compressed_message(
                     websocket,
-                    player_id,
-                    cached_payload_raw,
-                    cache_key,
-                    progressive=progressive,
+                    orjson.dumps(
+                        {
+                            "player_id": player_id,
+                            "type": "player_cache_status",
+                            "stale": True,
+                        }
+                    ),
+                    deflate=deflate,
                 )
-                logger.info("Cached player data sent directly")
-                return
             except Exception:
                 logger.exception(
                     "Failed to send cached player data directly for %s",
                     player_id,
                 )
-        celery.send_task("tasks.fetch_player_data", args=[player_id])
+        await self.enqueue_player_fetch(player_id)
         logger.info("Task sent to Celery")
 
+    async def enqueue_player_fetch(self, player_id: str) -> None:
+        """Queues a player detail fetch unless one is already in flight.
+
+        Fetches are single-flight per player: first in this process, then
+        across pods through a short-lived Redis marker that the task clears
+        when it finishes. Deduplicated opens still receive the in-flight
+        fetch's chunks because their socket is already registered.
+        """
+        now = monotonic()
+        if self.pending_fetches.get(player_id, 0.0) > now:
+            if metrics_enabled():
+                PLAYER_DETAIL_FETCH_ENQUEUES.labels(
+                    outcome="deduplicated_local"
+                ).inc()
+            return
+        self.pending_fetches[player_id] = (
+            now + PLAYER_DETAIL_FETCH_COALESCE_SECONDS
+        )
+        claimed = await async_redis_conn.set(
+            f"{PLAYER_DETAIL_FETCH_PENDING_KEY}:{player_id}",
+            "1",
+            nx=True,
+            ex=PLAYER_DETAIL_FETCH_COALESCE_SECONDS,
+        )
+        if not claimed:
+            if metrics_enabled():
+                PLAYER_DETAIL_FETCH_ENQUEUES.labels(
+                    outcome="deduplicated_remote"
+                ).inc()
+            return
+        if metrics_enabled():
+            PLAYER_DETAIL_FETCH_ENQUEUES.labels(outcome="enqueued").inc()
+        await self._send_player_fetch(player_id)
+
+    def fetch_completed(self, player_id: str) -> None:
+        self.pending_fetches.pop(player_id, None)
+
+    async def attach_pubsub(self, pubsub) -> None:
+        """Adopts the listener's pubsub and resubscribes hosted players."""
+        self.pubsub = pubsub
+        if per_player_pubsub_enabled() and self.active_connections:
+            await pubsub.subscribe(
+                *(
+                    player_pubsub_channel(player_id)
+                    for player_id in self.active_connections
+                )
+            )
+
+    def detach_pubsub(self) -> None:
+        self.pubsub = None
+
+    async def _subscribe_player(self, player_id: str) -> None:
+        if self.pubsub is None or not per_player_pubsub_enabled():
+            return
+        try:
+            await self.pubsub.subscribe(player_pubsub_channel(player_id))
+        except Exception:
+            logger.exception("Failed to subscribe to player %s", player_id)
+            return
+        if metrics_enabled():
+            PUBSUB_EVENTS.labels(event="player_subscribed").inc()
+
+    async def _unsubscribe_player(self, player_id: str) -> None:
+        if self.pubsub is None or not per_player_pubsub_enabled():
+            return
+        try:
+            await self.pubsub.unsubscribe(player_pubsub_channel(player_id))
+        except Exception:
+            logger.exception("Failed to unsubscribe from player %s", player_id)
+            return
+        if metrics_enabled():
+            PUBSUB_EVENTS.labels(event="player_unsubscribed").inc()
+
+    @staticmethod
+    async def _send_player_fetch(player_id: str) -> None:
+        """Sends the fetch task, coalescing misses into batches.
+
+        The id joins a pending set; the first miss in each window schedules
+        ``tasks.fetch_player_data_batch`` to drain it once the window ends.
+        """
+        if PLAYER_DETAIL_BATCH_WINDOW_MS <= 0:
+            celery.send_task("tasks.fetch_player_data", args=[player_id])
+            return
+        await async_redis_conn.sadd(PLAYER_DETAIL_BATCH_PENDING_KEY, player_id)
+        scheduled = await async_redis_conn.set(
+            PLAYER_DETAIL_BATCH_SCHEDULED_KEY,
+            "1",
+            nx=True,
+            px=PLAYER_DETAIL_BATCH_WINDOW_MS,
+        )
+        if scheduled:
+            celery.send_task(
+                "tasks.fetch_player_data_batch",
+                countdown=PLAYER_DETAIL_BATCH_WINDOW_MS / 1000,
+            )
+
     @staticmethod
     def _build_empty_player_payload() -> dict:
         return {
@@ -186,8 +480,14 @@ class ConnectionManager:
 
     @staticmethod
     async def _send_compressed_message(
-        websocket: WebSocket, message: str | bytes
+        websocket: WebSocket, message: str | bytes, *, deflate: bool = False
     ) -> None:
+        if deflate:
+            # permessage-deflate compresses the frame on the way out.
+            await websocket.send_text(
+                message if isinstance(message, str) else message.decode()
+            )
+            return
         message_bytes = (
             message.encode() if isinstance(message, str) else message
         )
@@ -201,6 +501,7 @@ class ConnectionManager:
         cache_key: str,
         *,
         progressive: bool,
+        deflate: bool = False,
     ) -> None:
         cached_payload_bytes = (
             cached_payload_raw.encode()
@@ -241,20 +542,108 @@ class ConnectionManager:
             ]
             for message in messages:
                 await self._send_compressed_message(
-                    websocket, orjson.dumps(message)
+                    websocket, orjson.dumps(message), deflate=deflate
                 )
             return
 
-        await self._send_compressed_message(websocket, cached_payload_bytes)
+        await self._send_compressed_message(
+            websocket, cached_payload_bytes, deflate=deflate
+        )
+
+    def _start_writer(self, player_id: str, connection_id: str) -> None:
+        connection = self.active_connections.get(player_id, {}).get(
+            connection_id
+        )
+        if connection is None or connection["writer"] is not None:
+            return
+        connection["writer"] = asyncio.create_task(
+            self._run_writer(player_id, connection_id, connection)
+        )
+
+    async def _run_writer(
+        self, player_id: str, connection_id: str, connection: dict
+    ) -> None:
+        websocket = connection["websocket"]
+        queue = connection["queue"]
+        try:
+            while True:
+                kind, data = await queue.get()
+                send = (
+                    websocket.send_bytes
+                    if kind == "bytes"
+                    else websocket.send_text
+                )
+                await asyncio.wait_for(
+                    send(data), WEBSOCKET_SEND_TIMEOUT_SECONDS
+                )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Websocket send timed out for %s (%s)",
+                player_id,
+                connection_id,
+            )
+            if metrics_enabled():
+                WEBSOCKET_SLOW_CONSUMERS.labels(action="send_timeout").inc()
+        except Exception:
+            logger.info(
+                "Websocket send failed for %s (%s)", player_id, connection_id
+            )
+        await self.disconnect(player_id, connection_id)
+        await self._close_websocket(websocket)
+
+    @staticmethod
+    async def _close_websocket(websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=1013), WEBSOCKET_SEND_TIMEOUT_SECONDS
+            )
+        except Exception:
+            pass
 
-    def disconnect(self, player_id: str, connection_id: str):
+    async def _enqueue_send(
+        self,
+        player_id: str,
+        connection_id: str,
+        connection: dict,
+        kind: str,
+        data: str | bytes,
+    ) -> bool:
+        """Queues a frame for the connection's writer without waiting on it."""
+        queue = connection["queue"]
+        try:
+            queue.put_nowait((kind, data))
+        except asyncio.QueueFull:
+            if WEBSOCKET_SLOW_CONSUMER_POLICY == "drop":
+                if metrics_enabled():
+                    WEBSOCKET_SLOW_CONSUMERS.labels(action="dropped").inc()
+                return False
+            logger.warning(
+                "Closing slow websocket consumer for %s (%s)",
+                player_id,
+                connection_id,
+            )
+            if metrics_enabled():
+                WEBSOCKET_SLOW_CONSUMERS.labels(action="closed").inc()
+            await self.disconnect(player_id, connection_id)
+            asyncio.create_task(self._close_websocket(connection["websocket"]))
+            return False
+        if metrics_enabled():
+            WEBSOCKET_SEND_QUEUE_DEPTH.observe(queue.qsize())
+        return True
+
+    async def disconnect(self, player_id: str, connection_id: str):
         if (
             player_id in self.active_connections
             and connection_id in self.active_connections[player_id]
         ):
-            del self.active_connections[player_id][connection_id]
+            connection = self.active_connections[player_id].pop(connection_id)
+            writer = connection.get("writer")
+            if writer is not None and writer is not asyncio.current_task():
+                writer.cancel()
             if not self.active_connections[player_id]:
                 del self.active_connections[player_id]
+                self.pending_fetches.pop(player_id, None)
+                await self._unsubscribe_player(player_id)
                 if metrics_enabled():
                     try:
                         WEBSOCKET_CONNECTIONS.remove(player_id)
@@ -279,20 +668,20 @@ class ConnectionManager:
             player_id in self.active_connections
             and connection_id in self.active_connections[player_id]
         ):
-            websocket = self.active_connections[player_id][connection_id][
-                "websocket"
-            ]
-            await websocket.send_text(message)
+            connection = self.active_connections[player_id][connection_id]
+            await self._enqueue_send(
+                player_id, connection_id, connection, "text", message
+            )
             if metrics_enabled():
                 WEBSOCKET_EVENTS.labels(event="personal_message").inc()
 
     async def broadcast(self, message: str):
-        for player_id in self.active_connections:
-            for connection_id in self.active_connections[player_id]:
-                websocket = self.active_connections[player_id][connection_id][
-                    "websocket"
-                ]
-                await websocket.send_text(message)
+        for player_id in list(self.active_connections):
+            connections = self.active_connections.get(player_id, {})
+            for connection_id, connection in list(connections.items()):
+                await self._enqueue_send(
+                    player_id, connection_id, connection, "text", message
+                )
                 if metrics_enabled():
                     WEBSOCKET_EVENTS.labels(event="broadcast_message").inc()
 
@@ -303,6 +692,8 @@ class ConnectionManager:
         *,
         progressive_only: bool = False,
         legacy_only: bool = False,
+        compact_only: bool = False,
+        precompressed: bool = False,
     ):
         logger.info("Broadcasting player data for: %s", player_id)
         if player_id in self.active_connections:
@@ -310,7 +701,9 @@ class ConnectionManager:
             message_bytes = (
                 message.encode() if isinstance(message, str) else message
             )
-            compressed_message = zlib.compress(message_bytes)
+            compressed_message = (
+                message_bytes if precompressed else zlib.compress(message_bytes)
+            )
             logger.info("Player is connected, sending compressed data")
             logger.info(
                 "Original message length: %s, Compressed message length: %s",
@@ -318,14 +711,33 @@ class ConnectionManager:
                 f"{len(compressed_message):,}",
             )
             recipients = 0
-            for connection_id in self.active_connections[player_id]:
-                connection = self.active_connections[player_id][connection_id]
+            bytes_queued = 0
+            text_message = None
+            # Every recipient's writer gets the same buffer for its encoding.
+            connections = list(self.active_connections[player_id].items())
+            for connection_id, connection in connections:
                 if progressive_only and not connection["progressive"]:
                     continue
                 if legacy_only and connection["progressive"]:
                     continue
-                await connection["websocket"].send_bytes(compressed_message)
-                recipients += 1
+                # Compact connections only understand compact payloads.
+                if compact_only != connection.get("compact", False):
+                    continue
+                if connection.get("deflate"):
+                    if text_message is None:
+                        text_message = (
+                            zlib.decompress(message_bytes)
+                            if precompressed
+                            else message_bytes
+                        ).decode()
+                    kind, data = "text", text_message
+                else:
+                    kind, data = "bytes", compressed_message
+                if await self._enqueue_send(
+                    player_id, connection_id, connection, kind, data
+                ):
+                    recipients += 1
+                    bytes_queued += len(data)
             if recipients == 0:
                 logger.info(
                     "No matching websocket recipients for player %s",
@@ -339,7 +751,7 @@ class ConnectionManager:
                     player_id=player_id
                 ).observe(duration)
                 WEBSOCKET_BYTES_SENT.labels(player_id=player_id).inc(
-                    len(compressed_message) * recipients
+                    bytes_queued
                 )
             logger.info("Compressed data sent")
         else:
@@ -40,14 +40,34 @@ def _redis():
     return connections.redis_conn
 
 
-def is_comp_leaderboard_enabled() -> bool:
-    """Return whether the competition leaderboard is enabled."""
-    override = _parse_bool(_redis().get(COMP_LEADERBOARD_FLAG_KEY))
+def _async_redis():
+    try:
+        app_module = import_module("fast_api_app.app")
+        redis_override = getattr(app_module, "async_redis_conn", None)
+        if redis_override is not None:
+            return redis_override
+    except Exception:
+        pass
+    return connections.async_redis_conn
+
+
+def _resolve_flag(raw: Optional[str]) -> bool:
+    override = _parse_bool(raw)
     if override is not None:
         return override
     return _env_default()
 
 
+def is_comp_leaderboard_enabled() -> bool:
+    """Return whether the competition leaderboard is enabled."""
+    return _resolve_flag(_redis().get(COMP_LEADERBOARD_FLAG_KEY))
+
+
+async def is_comp_leaderboard_enabled_async() -> bool:
+    """Async variant of ``is_comp_leaderboard_enabled`` for request handlers."""
+    return _resolve_flag(await _async_redis().get(COMP_LEADERBOARD_FLAG_KEY))
+
+
 def set_comp_leaderboard_flag(enabled: Optional[bool]) -> None:
     """Persist an override for the competition leaderboard flag.
 
@@ -13,7 +13,7 @@ from starlette.responses import JSONResponse, Response
 
 from fast_api_app.auth import _get_header_token
 from fast_api_app.comp_auth import is_development_like_environment
-from fast_api_app.connections import redis_conn
+from fast_api_app.connections import async_redis_conn
 from fast_api_app.utils import get_client_ip
 from shared_lib.constants import API_USAGE_QUEUE_KEY
 from shared_lib.monitoring import RATE_LIMIT_EVENTS, metrics_enabled
@@ -71,7 +71,9 @@ class APITokenUsageMiddleware(BaseHTTPMiddleware):
                         "latency_ms": latency_ms,
                         "ua": request.headers.get("user-agent"),
                     }
-                    redis_conn.rpush(API_USAGE_QUEUE_KEY, orjson.dumps(event))
+                    await async_redis_conn.rpush(
+                        API_USAGE_QUEUE_KEY, orjson.dumps(event)
+                    )
                     if _dev_request_logging_enabled():
                         logger.info(
                             "API request complete method=%s path=%s status=%s latency_ms=%s",
@@ -140,12 +142,12 @@ class APITokenRateLimitMiddleware(BaseHTTPMiddleware):
             sec_key = f"api:rl:sec:{ident}:{now}"
             min_key = f"api:rl:min:{ident}:{now // 60}"
             try:
-                pipe = redis_conn.pipeline()
+                pipe = async_redis_conn.pipeline()
                 pipe.incr(sec_key)
                 pipe.expire(sec_key, 2)
                 pipe.incr(min_key)
                 pipe.expire(min_key, 120)
-                sec_count, _, min_count, _ = pipe.execute()
+                sec_count, _, min_count, _ = await pipe.execute()
                 if (self.per_sec and int(sec_count) > self.per_sec) or (
                     self.per_min and int(min_count) > self.per_min
                 ):
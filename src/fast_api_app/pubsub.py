@@ -1,11 +1,15 @@
 import asyncio
-import json
 import logging
 
-from redis.client import PubSub
+import orjson
+from redis.asyncio.client import PubSub
 
-from fast_api_app.connections import connection_manager, redis_conn
-from shared_lib.constants import PLAYER_PUBSUB_CHANNEL
+from fast_api_app.connections import async_binary_redis_conn, connection_manager
+from shared_lib.constants import (
+    PLAYER_LATEST_COMPACT_REDIS_KEY,
+    PLAYER_LATEST_FRAME_REDIS_KEY,
+    PLAYER_PUBSUB_CHANNEL,
+)
 from shared_lib.monitoring import (
     PUBSUB_ACTIVE,
     PUBSUB_BYTES_BROADCAST,
@@ -13,79 +17,131 @@ from shared_lib.monitoring import (
     PUBSUB_RESTARTS,
     metrics_enabled,
 )
+from shared_lib.payload_utils import decode_player_pubsub_message
 
 logger = logging.getLogger(__name__)
+# Pause before resubscribing so a Redis outage does not spin the loop.
+PUBSUB_RECONNECT_DELAY_SECONDS = 1.0
+
+
+async def _broadcast_cached_player_data(
+    player_id: str, cache_key: str, **broadcast_kwargs
+) -> None:
+    player_data = await async_binary_redis_conn.get(cache_key)
+    if player_data is None:
+        if metrics_enabled():
+            PUBSUB_EVENTS.labels(event="cache_miss").inc()
+        return
+    if metrics_enabled():
+        PUBSUB_BYTES_BROADCAST.labels(player_id=player_id).inc(len(player_data))
+    await connection_manager.broadcast_player_data(
+        player_data, player_id, **broadcast_kwargs
+    )
+
+
+async def _broadcast_legacy_frame(player_id: str, cache_key: str) -> None:
+    frame = await async_binary_redis_conn.get(
+        f"{PLAYER_LATEST_FRAME_REDIS_KEY}:{player_id}"
+    )
+    if frame is None:
+        # Entries cached before the frame existed are compressed here.
+        await _broadcast_cached_player_data(
+            player_id, cache_key, legacy_only=True
+        )
+        return
+    if metrics_enabled():
+        PUBSUB_BYTES_BROADCAST.labels(player_id=player_id).inc(len(frame))
+    await connection_manager.broadcast_player_data(
+        frame, player_id, legacy_only=True, precompressed=True
+    )
+
+
+async def handle_player_chunk(
+    player_id: str,
+    phase: str,
+    cache_key: str | None,
+    body: bytes,
+    *,
+    compressed: bool = False,
+) -> None:
+    if metrics_enabled():
+        PUBSUB_BYTES_BROADCAST.labels(player_id=player_id).inc(len(body))
+    await connection_manager.broadcast_player_data(
+        body, player_id, progressive_only=True, precompressed=compressed
+    )
+    if phase != "complete":
+        return
+    connection_manager.fetch_completed(player_id)
+    # Cache reads are only worth a round trip if a socket can use them.
+    if not cache_key or player_id not in connection_manager.active_connections:
+        return
+    compact_data = await async_binary_redis_conn.get(
+        f"{PLAYER_LATEST_COMPACT_REDIS_KEY}:{player_id}"
+    )
+    if compact_data is not None:
+        await connection_manager.broadcast_player_data(
+            compact_data,
+            player_id,
+            compact_only=True,
+            precompressed=True,
+        )
+    await _broadcast_legacy_frame(player_id, cache_key)
+
+
+async def route_pubsub_message(raw_message: bytes) -> None:
+    """Routes one message using its header, parsing JSON only as a fallback.
+
+    Bare JSON messages come from publishers that predate the routing header.
+    """
+    routed = decode_player_pubsub_message(raw_message)
+    if routed is not None:
+        player_id, phase, cache_key, body, compressed = routed
+        logger.info("Received player data for: %s", player_id)
+        if metrics_enabled():
+            PUBSUB_EVENTS.labels(event="message").inc()
+        await handle_player_chunk(
+            player_id, phase, cache_key, body, compressed=compressed
+        )
+        return
+
+    try:
+        data = orjson.loads(raw_message)
+    except orjson.JSONDecodeError:
+        if metrics_enabled():
+            PUBSUB_EVENTS.labels(event="decode_error").inc()
+        return
+    logger.info("Received player data for: %s", data["player_id"])
+    if metrics_enabled():
+        PUBSUB_EVENTS.labels(event="message").inc()
+    if data.get("type") == "player_chunk":
+        await handle_player_chunk(
+            data["player_id"], data.get("phase"), data.get("key"), raw_message
+        )
+        return
+    await _broadcast_cached_player_data(data["player_id"], data["key"])
 
 
 async def process_pubsub_message(pubsub: PubSub):
-    while True:
-        message = pubsub.get_message()
-        if message and message["type"] == "message":
-            raw_message = message["data"]
-            try:
-                data = json.loads(raw_message)
-            except json.JSONDecodeError:
-                if metrics_enabled():
-                    PUBSUB_EVENTS.labels(event="decode_error").inc()
-                continue
-            logger.info(
-                "Received player data for: %s", data["player_id"]
-            )
-            if metrics_enabled():
-                PUBSUB_EVENTS.labels(event="message").inc()
-            if data.get("type") == "player_chunk":
-                if metrics_enabled():
-                    PUBSUB_BYTES_BROADCAST.labels(
-                        player_id=data.get("player_id", "unknown")
-                    ).inc(len(raw_message))
-                await connection_manager.broadcast_player_data(
-                    raw_message,
-                    data["player_id"],
-                    progressive_only=True,
-                )
-                if data.get("phase") == "complete" and data.get("key"):
-                    player_data = redis_conn.get(data["key"])
-                    if player_data is None:
-                        if metrics_enabled():
-                            PUBSUB_EVENTS.labels(event="cache_miss").inc()
-                        continue
-                    if metrics_enabled():
-                        PUBSUB_BYTES_BROADCAST.labels(
-                            player_id=data.get("player_id", "unknown")
-                        ).inc(len(player_data))
-                    await connection_manager.broadcast_player_data(
-                        player_data,
-                        data["player_id"],
-                        legacy_only=True,
-                    )
-                continue
-
-            player_data = redis_conn.get(data["key"])
-            if player_data is None:
-                if metrics_enabled():
-                    PUBSUB_EVENTS.labels(event="cache_miss").inc()
-                continue
-            if metrics_enabled():
-                PUBSUB_BYTES_BROADCAST.labels(
-                    player_id=data.get("player_id", "unknown")
-                ).inc(len(player_data))
-            await connection_manager.broadcast_player_data(
-                player_data, data["player_id"]
-            )
-        else:
-            await asyncio.sleep(0.01)
+    # listen() waits on the socket, so an idle worker does no work here.
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        await route_pubsub_message(message["data"])
 
 
 async def listen_for_updates():
     while True:
-        pubsub = redis_conn.pubsub()
-        pubsub.subscribe(PLAYER_PUBSUB_CHANNEL)
-        logger.info("Subscribed to channel: %s", PLAYER_PUBSUB_CHANNEL)
-        if metrics_enabled():
-            PUBSUB_RESTARTS.inc()
-            PUBSUB_ACTIVE.set(1)
-
+        pubsub = async_binary_redis_conn.pubsub()
         try:
+            # The shared channel stays subscribed in per-player mode: it
+            # keeps listen() alive with no players hosted and still carries
+            # chunks from publishers without per-player channels.
+            await pubsub.subscribe(PLAYER_PUBSUB_CHANNEL)
+            logger.info("Subscribed to channel: %s", PLAYER_PUBSUB_CHANNEL)
+            await connection_manager.attach_pubsub(pubsub)
+            if metrics_enabled():
+                PUBSUB_RESTARTS.inc()
+                PUBSUB_ACTIVE.set(1)
             await process_pubsub_message(pubsub)
         except Exception:
             logger.exception("Error in pubsub listener")
@@ -93,9 +149,11 @@ async def listen_for_updates():
                 PUBSUB_EVENTS.labels(event="listener_error").inc()
         finally:
             logger.info("Closing pubsub connection")
-            pubsub.close()
+            connection_manager.detach_pubsub()
+            await pubsub.aclose()
             if metrics_enabled():
                 PUBSUB_ACTIVE.set(0)
+        await asyncio.sleep(PUBSUB_RECONNECT_DELAY_SECONDS)
 
 
 def start_pubsub_listener():
@@ -2,21 +2,30 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Sequence
+import hashlib
 import logging
 import math
 import re
+import uuid
+from functools import lru_cache
 from time import monotonic
-from typing import Any, Literal, Mapping
+from typing import Any, Awaitable, Callable, Literal, Mapping
 
 import orjson
-from fastapi import APIRouter, HTTPException, Path, Query, Request
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from sqlalchemy import bindparam, text
+from sqlalchemy import BigInteger, bindparam, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import TextClause
 
 from fast_api_app.connections import limiter, rankings_async_session, redis_conn
+from shared_lib.constants import (
+    ANALYTICS_SCHEMA_COLUMNS_KEY,
+    ANALYTICS_SCHEMA_COLUMNS_TABLES,
+)
+from shared_lib.monitoring import ANALYTICS_TEAM_MATCHES_BUILDS, metrics_enabled
 from shared_lib.queries import ripple_queries
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
@@ -24,15 +33,37 @@ router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 logger = logging.getLogger(__name__)
 
 _TEAM_ID_RE = re.compile(r"\d+")
-_TEAM_MATCHES_CACHE_PREFIX = "analytics:team_matches:v1"
+_TEAM_MATCHES_CACHE_PREFIX = "analytics:team_matches:v2"
 _TEAM_MATCHES_CACHE_TTL_SECONDS = 120
+# A snapshot pins the team names, but matches, rosters and rounds are read
+# from the live tables, so pinned payloads still change as matches are
+# ingested. Their entries live a little longer than "latest" ones, and
+# clients revalidate them by ETag once max-age passes.
+_TEAM_MATCHES_SNAPSHOT_CACHE_TTL_SECONDS = 300
+_TEAM_MATCHES_SNAPSHOT_CACHE_CONTROL = "public, max-age=60, must-revalidate"
 _TEAM_MATCHES_LATEST_SNAPSHOT_CACHE_PREFIX = (
     "analytics:team_matches:latest_snapshot:v1"
 )
 _TEAM_MATCHES_LATEST_SNAPSHOT_CACHE_TTL_SECONDS = 30
 _TEAM_MATCHES_ENRICH_TIMEOUT_SECONDS = 30.0
+# Cache misses for one key are built once: concurrent requests in this worker
+# await the same task, and other pods wait on a Redis build lock and poll the
+# cache for the payload. Waiters build it themselves past the wait budget.
+_TEAM_MATCHES_BUILD_LOCK_PREFIX = "analytics:team_matches:build_lock:v1"
+_TEAM_MATCHES_BUILD_LOCK_TTL_SECONDS = 45
+_TEAM_MATCHES_BUILD_WAIT_SECONDS = 20.0
+_TEAM_MATCHES_BUILD_POLL_SECONDS = 0.1
+# Deletes the build lock only while it still holds our token, in one step, so
+# a lock that expired and was re-taken by another pod is left alone.
+_RELEASE_TEAM_MATCHES_BUILD_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
 _MAX_SELECTED_TEAM_IDS = 10
 _SCHEMA_COLUMNS_CACHE_TTL_SECONDS = 300.0
+_PUBLISHED_SCHEMA_COLUMNS_POLL_SECONDS = 30.0
 _SCORE_EPSILON = 1e-9
 _MAX_ROUND_MAPS_COUNT = 20
 _TOURNAMENT_SCORE_TIERS: tuple[tuple[float, str, str], ...] = (
@@ -59,6 +90,17 @@ _SCHEMA_COLUMNS_CACHE: dict[
     tuple[str, tuple[str, ...]], tuple[float, dict[str, set[str]]]
 ] = {}
 _SCHEMA_COLUMNS_CACHE_LOCK = asyncio.Lock()
+# Column maps the ripple snapshot task publishes once per rankings build. They
+# are loaded at startup and swapped when the published build version changes;
+# the information_schema path above is only a fallback for when none exist.
+_PUBLISHED_SCHEMA_COLUMNS: dict[str, Any] = {
+    "polled_at": None,
+    "build_version": None,
+    "schema": None,
+    "tables": {},
+}
+# cache key -> task building that payload in this worker
+_TEAM_MATCHES_BUILDS: dict[str, asyncio.Task] = {}
 
 
 class TeamMatchRosterPlayer(BaseModel):
@@ -389,6 +431,83 @@ async def _get_table_columns(
     }
 
 
+def _read_published_schema_columns() -> dict[str, Any] | None:
+    raw = redis_conn.get(ANALYTICS_SCHEMA_COLUMNS_KEY)
+    if raw is None:
+        return None
+    try:
+        published = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        logger.warning("Failed to decode published analytics schema columns")
+        return None
+    if not isinstance(published, dict) or not isinstance(
+        published.get("tables"), dict
+    ):
+        return None
+    return published
+
+
+def _apply_published_schema_columns(published: Mapping[str, Any]) -> None:
+    state = _PUBLISHED_SCHEMA_COLUMNS
+    build_version = published.get("build_version")
+    schema = published.get("schema")
+    if (
+        state["build_version"] == build_version
+        and state["schema"] == schema
+        and state["tables"]
+    ):
+        return
+    state["build_version"] = build_version
+    state["schema"] = schema
+    state["tables"] = {
+        str(table): frozenset(str(column) for column in columns or [])
+        for table, columns in published["tables"].items()
+    }
+    logger.info(
+        "Loaded analytics schema columns for build %s (%s tables)",
+        build_version,
+        len(state["tables"]),
+    )
+
+
+def prime_schema_columns() -> None:
+    """Loads the published column maps so first requests skip the catalog."""
+    _PUBLISHED_SCHEMA_COLUMNS["polled_at"] = monotonic()
+    try:
+        published = _read_published_schema_columns()
+    except Exception as exc:
+        logger.warning("Failed to load analytics schema columns: %s", exc)
+        return
+    if published is not None:
+        _apply_published_schema_columns(published)
+
+
+async def _published_table_columns(
+    schema: str, tables: Sequence[str]
+) -> dict[str, set[str]] | None:
+    state = _PUBLISHED_SCHEMA_COLUMNS
+    polled_at = state["polled_at"]
+    if (
+        polled_at is None
+        or monotonic() - polled_at >= _PUBLISHED_SCHEMA_COLUMNS_POLL_SECONDS
+    ):
+        state["polled_at"] = monotonic()
+        try:
+            published = await run_in_threadpool(_read_published_schema_columns)
+        except Exception as exc:
+            logger.warning("Failed to poll analytics schema columns: %s", exc)
+            published = None
+        if published is not None:
+            _apply_published_schema_columns(published)
+
+    published_tables = state["tables"]
+    if state["schema"] != schema or any(
+        table not in published_tables for table in tables
+    ):
+        return None
+    return {table: set(published_tables[table]) for table in tables}
+
+
 async def _get_table_columns_map(
     session: AsyncSession, schema: str, tables: Sequence[str]
 ) -> dict[str, set[str]]:
@@ -398,6 +517,10 @@ async def _get_table_columns_map(
     if not normalized_tables:
         return {}
 
+    published = await _published_table_columns(schema, normalized_tables)
+    if published is not None:
+        return published
+
     cache_key = (schema, tuple(normalized_tables))
     async with _SCHEMA_COLUMNS_CACHE_LOCK:
         cached = _SCHEMA_COLUMNS_CACHE.get(cache_key)
@@ -454,13 +577,14 @@ def _team_matches_cache_key(
     schema: str,
     snapshot_id: int,
     team_ids: Sequence[int],
-    limit: int,
 ) -> str:
+    # No limit in the key: one entry holds the widest window fetched so far
+    # and every smaller limit is sliced from it.
     normalized_team_ids = _canonical_team_ids_for_cache(team_ids)
     team_ids_key = ",".join(str(team_id) for team_id in normalized_team_ids)
     return (
         f"{_TEAM_MATCHES_CACHE_PREFIX}:{schema}:snapshot:{int(snapshot_id)}:"
-        f"limit:{int(limit)}:team_ids:{team_ids_key}"
+        f"team_ids:{team_ids_key}"
     )
 
 
@@ -468,7 +592,7 @@ def _latest_snapshot_cache_key(schema: str) -> str:
     return f"{_TEAM_MATCHES_LATEST_SNAPSHOT_CACHE_PREFIX}:{schema}"
 
 
-async def _load_cached_team_matches_payload(
+async def _load_cached_team_matches_entry(
     cache_key: str,
 ) -> dict[str, Any] | None:
     try:
@@ -493,18 +617,26 @@ async def _load_cached_team_matches_payload(
             "Failed to decode cached team matches payload: %s", cache_key
         )
         return None
-    return payload if isinstance(payload, dict) else None
+    if (
+        not isinstance(payload, dict)
+        or not isinstance(payload.get("window"), int)
+        or not isinstance(payload.get("payload"), dict)
+    ):
+        return None
+    return payload
 
 
-async def _store_cached_team_matches_payload(
-    cache_key: str, payload: Mapping[str, Any]
+async def _store_cached_team_matches_entry(
+    cache_key: str,
+    entry: Mapping[str, Any],
+    ttl_seconds: int = _TEAM_MATCHES_CACHE_TTL_SECONDS,
 ) -> None:
     try:
         await run_in_threadpool(
             redis_conn.setex,
             cache_key,
-            _TEAM_MATCHES_CACHE_TTL_SECONDS,
-            orjson.dumps(payload),
+            ttl_seconds,
+            orjson.dumps(entry),
         )
     except Exception:
         logger.exception(
@@ -512,6 +644,186 @@ async def _store_cached_team_matches_payload(
         )
 
 
+def _team_matches_entry_covers(
+    entry: Mapping[str, Any] | None, limit: int
+) -> bool:
+    if entry is None:
+        return False
+    return bool(entry.get("exhausted")) or int(entry["window"]) >= limit
+
+
+def _slice_team_matches_payload(
+    entry: Mapping[str, Any], limit: int
+) -> dict[str, Any]:
+    payload = entry["payload"]
+    matches = payload["matches"]
+    if len(matches) <= limit:
+        return payload
+    sliced = matches[:limit]
+    return {
+        **payload,
+        "summary": _summarize_team_matches(payload["summary"], sliced),
+        "matches": sliced,
+    }
+
+
+def _team_matches_cursor(
+    entry: Mapping[str, Any] | None,
+) -> tuple[int | None, int] | None:
+    """The keyset cursor past the last match of a cached window."""
+    if entry is None or not entry["payload"]["matches"]:
+        return None
+    last_match = entry["payload"]["matches"][-1]
+    return last_match.get("event_time_ms"), int(last_match["match_id"])
+
+
+def _extend_team_matches_entry(
+    entry: Mapping[str, Any] | None,
+    page: Mapping[str, Any],
+    *,
+    fetched_rows: int,
+    page_size: int,
+    window: int,
+) -> dict[str, Any]:
+    """Appends ``page``, the matches past the cached ones, to a window."""
+    page_matches = list(page["matches"])
+    # A short page means the team has no older matches left to fetch. Count
+    # the query's rows, not the built matches, which may have dropped some.
+    exhausted = fetched_rows < page_size
+    if entry is None:
+        return {"window": window, "exhausted": exhausted, "payload": page}
+
+    payload = entry["payload"]
+    seen = {match["match_id"] for match in payload["matches"]}
+    matches = [
+        *payload["matches"],
+        *(match for match in page_matches if match["match_id"] not in seen),
+    ]
+    return {
+        "window": window,
+        "exhausted": exhausted,
+        "payload": {
+            **payload,
+            "summary": _summarize_team_matches(payload["summary"], matches),
+            "matches": matches,
+        },
+    }
+
+
+def _record_team_matches_build(outcome: str) -> None:
+    if metrics_enabled():
+        ANALYTICS_TEAM_MATCHES_BUILDS.labels(outcome=outcome).inc()
+
+
+async def _acquire_team_matches_build_lock(lock_key: str, token: str) -> bool:
+    try:
+        acquired = await run_in_threadpool(
+            redis_conn.set,
+            lock_key,
+            token,
+            nx=True,
+            ex=_TEAM_MATCHES_BUILD_LOCK_TTL_SECONDS,
+        )
+    except Exception:
+        # Without Redis there is nothing to coordinate on; build locally.
+        logger.exception("Failed to acquire team matches build lock")
+        return True
+    return bool(acquired)
+
+
+async def _release_team_matches_build_lock(lock_key: str, token: str) -> None:
+    try:
+        await run_in_threadpool(
+            redis_conn.eval,
+            _RELEASE_TEAM_MATCHES_BUILD_LOCK_SCRIPT,
+            1,
+            lock_key,
+            token,
+        )
+    except Exception:
+        logger.exception("Failed to release team matches build lock")
+
+
+_TeamMatchesEntryBuilder = Callable[
+    [dict[str, Any] | None], Awaitable[dict[str, Any]]
+]
+
+
+async def _build_team_matches_entry_across_pods(
+    cache_key: str,
+    limit: int,
+    build: _TeamMatchesEntryBuilder,
+    ttl_seconds: int,
+) -> dict[str, Any]:
+    lock_key = f"{_TEAM_MATCHES_BUILD_LOCK_PREFIX}:{cache_key}"
+    token = uuid.uuid4().hex
+    deadline = monotonic() + _TEAM_MATCHES_BUILD_WAIT_SECONDS
+    while True:
+        if await _acquire_team_matches_build_lock(lock_key, token):
+            try:
+                # The lock holder may have finished just before we took over.
+                cached_entry = await _load_cached_team_matches_entry(cache_key)
+                if _team_matches_entry_covers(cached_entry, limit):
+                    _record_team_matches_build("coalesced_remote")
+                    return cached_entry
+                entry = await build(cached_entry)
+                await _store_cached_team_matches_entry(
+                    cache_key, entry, ttl_seconds
+                )
+                _record_team_matches_build("built")
+                return entry
+            finally:
+                await _release_team_matches_build_lock(lock_key, token)
+
+        await asyncio.sleep(_TEAM_MATCHES_BUILD_POLL_SECONDS)
+        cached_entry = await _load_cached_team_matches_entry(cache_key)
+        if _team_matches_entry_covers(cached_entry, limit):
+            _record_team_matches_build("coalesced_remote")
+            return cached_entry
+        if monotonic() >= deadline:
+            logger.warning(
+                "Timed out waiting for team matches build lock: %s", cache_key
+            )
+            entry = await build(cached_entry)
+            await _store_cached_team_matches_entry(
+                cache_key, entry, ttl_seconds
+            )
+            _record_team_matches_build("lock_timeout")
+            return entry
+
+
+async def _single_flight_team_matches_entry(
+    cache_key: str,
+    limit: int,
+    build: _TeamMatchesEntryBuilder,
+    *,
+    ttl_seconds: int = _TEAM_MATCHES_CACHE_TTL_SECONDS,
+) -> dict[str, Any]:
+    """Returns a cache entry for a miss, building it once per key.
+
+    The build runs in its own task, so a cancelled request does not abort it
+    for the other requests awaiting the same key. A joined build may cover a
+    smaller window than the caller asked for; callers loop until it does.
+    """
+    task = _TEAM_MATCHES_BUILDS.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(
+            _build_team_matches_entry_across_pods(
+                cache_key, limit, build, ttl_seconds
+            )
+        )
+        _TEAM_MATCHES_BUILDS[cache_key] = task
+
+        def _forget(done: asyncio.Task) -> None:
+            if _TEAM_MATCHES_BUILDS.get(cache_key) is done:
+                del _TEAM_MATCHES_BUILDS[cache_key]
+
+        task.add_done_callback(_forget)
+    else:
+        _record_team_matches_build("coalesced_local")
+    return await asyncio.shield(task)
+
+
 async def _load_cached_latest_snapshot_id(schema: str) -> int | None:
     try:
         cached_snapshot_id = await run_in_threadpool(
@@ -633,31 +945,15 @@ async def _fetch_team_name_map(
     }
 
 
-async def _fetch_match_rows(
-    session: AsyncSession,
-    *,
+@lru_cache(maxsize=256)
+def _match_rows_sql(
     schema: str,
-    team_ids: Sequence[int],
-    limit: int,
-    match_columns: set[str] | None = None,
-    tournament_columns: set[str] | None = None,
-) -> list[dict[str, Any]]:
-    team_ids_sorted = _normalize_id_sequence(team_ids)
-    if not team_ids_sorted:
-        return []
-
-    # Normal route flow passes batched column metadata from
-    # _fetch_team_matches_payload(). Keep the singular fallback so these helpers
-    # remain usable in isolation and in focused tests.
-    if match_columns is None:
-        match_columns = await _get_table_columns(session, schema, "matches")
-    if not {"match_id", "team1_id", "team2_id"}.issubset(match_columns):
-        return []
-
-    if tournament_columns is None:
-        tournament_columns = await _get_table_columns(
-            session, schema, "tournaments"
-        )
+    match_columns: frozenset[str],
+    tournament_columns: frozenset[str],
+    multi_team: bool,
+) -> TextClause:
+    # Rendered once per schema and column layout so repeated builds reuse the
+    # same SQL text, and with it the connection's prepared statement.
     schema_sql = _schema_sql(schema)
 
     select_parts = [
@@ -749,12 +1045,15 @@ async def _fetch_match_rows(
     where_clauses = [
         "(m.team1_id IN :team_ids OR m.team2_id IN :team_ids)",
     ]
-    if len(team_ids_sorted) > 1:
+    if multi_team:
         where_clauses.append(
             "NOT (m.team1_id IN :team_ids AND m.team2_id IN :team_ids)"
         )
 
-    query = text(
+    # Keyset pages: only rows past the (event_time_ms, match_id) cursor in
+    # this ordering, so matches ingested since an earlier page was read do
+    # not shift the rows that follow it.
+    return text(
         f"""
         WITH match_rows AS (
             SELECT
@@ -765,15 +1064,71 @@ async def _fetch_match_rows(
         )
         SELECT *
         FROM match_rows
+        WHERE :after_match_id IS NULL
+           OR (
+                :after_event_time_ms IS NULL
+                AND event_time_ms IS NULL
+                AND match_id < :after_match_id
+           )
+           OR event_time_ms < :after_event_time_ms
+           OR (event_time_ms IS NULL AND :after_event_time_ms IS NOT NULL)
+           OR (
+                event_time_ms = :after_event_time_ms
+                AND match_id < :after_match_id
+           )
         ORDER BY event_time_ms DESC NULLS LAST, match_id DESC
         LIMIT :limit
         """
-    ).bindparams(bindparam("team_ids", expanding=True))
+    ).bindparams(
+        bindparam("team_ids", expanding=True),
+        bindparam("after_event_time_ms", type_=BigInteger),
+        bindparam("after_match_id", type_=BigInteger),
+    )
+
+
+async def _fetch_match_rows(
+    session: AsyncSession,
+    *,
+    schema: str,
+    team_ids: Sequence[int],
+    limit: int,
+    after: tuple[int | None, int] | None = None,
+    match_columns: set[str] | None = None,
+    tournament_columns: set[str] | None = None,
+) -> list[dict[str, Any]]:
+    team_ids_sorted = _normalize_id_sequence(team_ids)
+    if not team_ids_sorted:
+        return []
+
+    # Normal route flow passes batched column metadata from
+    # _fetch_team_matches_payload(). Keep the singular fallback so these helpers
+    # remain usable in isolation and in focused tests.
+    if match_columns is None:
+        match_columns = await _get_table_columns(session, schema, "matches")
+    if not {"match_id", "team1_id", "team2_id"}.issubset(match_columns):
+        return []
+
+    if tournament_columns is None:
+        tournament_columns = await _get_table_columns(
+            session, schema, "tournaments"
+        )
+    query = _match_rows_sql(
+        schema,
+        frozenset(match_columns),
+        frozenset(tournament_columns),
+        len(team_ids_sorted) > 1,
+    )
+    after_event_time_ms, after_match_id = after or (None, None)
 
     try:
         result = await session.execute(
             query,
-            {"team_ids": team_ids_sorted, "limit": max(1, int(limit))},
+            {
+                "team_ids": team_ids_sorted,
+                "limit": max(1, int(limit)),
+                "after_event_time_ms": after_event_time_ms,
+                "after_match_id": after_match_id,
+            },
         )
     except SQLAlchemyError as exc:
         if (
@@ -1196,9 +1551,6 @@ def _build_team_matches_payload(
     )
 
     matches_out: list[dict[str, Any]] = []
-    tournaments_seen: set[int] = set()
-    tournaments_by_tier: dict[str, int] = {}
-    matches_by_tier: dict[str, int] = {}
 
     sorted_rows = sorted(
         rows,
@@ -1320,27 +1672,12 @@ def _build_team_matches_payload(
                 }
             ]
 
-        if winner_side == "team":
-            summary["wins"] += 1
-        elif winner_side == "opponent":
-            summary["losses"] += 1
-        else:
-            summary["unresolved_matches"] += 1
-
         tournament_score = (
             tournament_scores.get(tournament_id)
             if tournament_id is not None
             else None
         )
         tier = _tournament_tier(tournament_score)
-        matches_by_tier[tier["tier_id"]] = (
-            matches_by_tier.get(tier["tier_id"], 0) + 1
-        )
-        if tournament_id is not None and tournament_id not in tournaments_seen:
-            tournaments_by_tier[tier["tier_id"]] = (
-                tournaments_by_tier.get(tier["tier_id"], 0) + 1
-            )
-            tournaments_seen.add(tournament_id)
 
         matches_out.append(
             {
@@ -1382,30 +1719,62 @@ def _build_team_matches_payload(
             }
         )
 
-    summary["total_matches"] = len(matches_out)
-    summary["tournaments"] = len(tournaments_seen)
-    summary["decided_matches"] = summary["wins"] + summary["losses"]
-    summary["win_rate"] = (
-        round(summary["wins"] / summary["decided_matches"], 4)
-        if summary["decided_matches"] > 0
-        else 0.0
-    )
-    summary["tournament_tier_distribution"] = {
-        label: tournaments_by_tier.get(tier_id, 0)
-        for tier_id, label in _TIER_BUCKETS
-    }
-    summary["tournament_tier_match_distribution"] = {
-        label: matches_by_tier.get(tier_id, 0)
-        for tier_id, label in _TIER_BUCKETS
-    }
-
     return {
         "snapshot_id": snapshot_id,
-        "summary": summary,
+        "summary": _summarize_team_matches(summary, matches_out),
         "matches": matches_out,
     }
 
 
+def _summarize_team_matches(
+    summary: Mapping[str, Any], matches: Sequence[Mapping[str, Any]]
+) -> dict[str, Any]:
+    """Recomputes the match-derived summary fields for ``matches``.
+
+    Matches must be newest first; a tournament's tier is counted once, at
+    its first match.
+    """
+    wins = losses = unresolved = 0
+    tournaments_seen: set[int] = set()
+    tournaments_by_tier: dict[str, int] = {}
+    matches_by_tier: dict[str, int] = {}
+    for match in matches:
+        if match.get("winner_side") == "team":
+            wins += 1
+        elif match.get("winner_side") == "opponent":
+            losses += 1
+        else:
+            unresolved += 1
+        tier_id = match.get("tournament_score_tier_id") or "unscored"
+        matches_by_tier[tier_id] = matches_by_tier.get(tier_id, 0) + 1
+        tournament_id = match.get("tournament_id")
+        if tournament_id is not None and tournament_id not in tournaments_seen:
+            tournaments_by_tier[tier_id] = (
+                tournaments_by_tier.get(tier_id, 0) + 1
+            )
+            tournaments_seen.add(tournament_id)
+
+    decided = wins + losses
+    return {
+        **summary,
+        "total_matches": len(matches),
+        "wins": wins,
+        "losses": losses,
+        "unresolved_matches": unresolved,
+        "decided_matches": decided,
+        "win_rate": round(wins / decided, 4) if decided > 0 else 0.0,
+        "tournaments": len(tournaments_seen),
+        "tournament_tier_distribution": {
+            label: tournaments_by_tier.get(tier_id, 0)
+            for tier_id, label in _TIER_BUCKETS
+        },
+        "tournament_tier_match_distribution": {
+            label: matches_by_tier.get(tier_id, 0)
+            for tier_id, label in _TIER_BUCKETS
+        },
+    }
+
+
 async def _fetch_match_rosters_in_new_session(
     *,
     schema: str,
@@ -1465,23 +1834,20 @@ async def _fetch_team_matches_payload(
     snapshot_id: int | None,
     team_ids: Sequence[int],
     limit: int,
-) -> dict[str, Any]:
+    after: tuple[int | None, int] | None = None,
+) -> tuple[dict[str, Any], int]:
+    """Builds the payload for up to ``limit`` matches past ``after``.
+
+    Also returns how many match rows the query returned, which can exceed
+    the matches kept in the payload.
+    """
     schema = ripple_queries.schema_name()
     team_ids_sorted = _normalize_id_sequence(team_ids)
     if not team_ids_sorted:
-        return _empty_payload(snapshot_id)
+        return _empty_payload(snapshot_id), 0
 
     columns_by_table = await _get_table_columns_map(
-        session,
-        schema,
-        [
-            "matches",
-            "tournaments",
-            "player_appearance_teams",
-            "players",
-            "rounds",
-            "player_rankings",
-        ],
+        session, schema, ANALYTICS_SCHEMA_COLUMNS_TABLES
     )
     match_columns = columns_by_table.get("matches", set())
     tournament_columns = columns_by_table.get("tournaments", set())
@@ -1495,6 +1861,7 @@ async def _fetch_team_matches_payload(
         schema=schema,
         team_ids=team_ids_sorted,
         limit=limit,
+        after=after,
         match_columns=match_columns,
         tournament_columns=tournament_columns,
     )
@@ -1514,12 +1881,13 @@ async def _fetch_team_matches_payload(
         team_ids=[*team_ids_sorted, *opponent_ids],
     )
     if not rows:
-        return _build_team_matches_payload(
+        payload = _build_team_matches_payload(
             snapshot_id=snapshot_id,
             team_ids=team_ids_sorted,
             rows=[],
             team_names=team_name_map,
         )
+        return payload, 0
 
     tournament_ids = list(
         dict.fromkeys(
@@ -1562,7 +1930,7 @@ async def _fetch_team_matches_payload(
             limit,
         )
         rosters, rounds, tournament_scores = {}, {}, {}
-    return _build_team_matches_payload(
+    payload = _build_team_matches_payload(
         snapshot_id=snapshot_id,
         team_ids=team_ids_sorted,
         rows=rows,
@@ -1571,6 +1939,122 @@ async def _fetch_team_matches_payload(
         match_rounds=rounds,
         tournament_scores=tournament_scores,
     )
+    return payload, len(rows)
+
+
+def _if_none_match_tags(header: str | None) -> set[str]:
+    if not header:
+        return set()
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def _snapshot_team_matches_response(
+    request: Request, payload: Mapping[str, Any]
+) -> Response:
+    """Serves a snapshot-pinned payload with a strong ETag.
+
+    Browsers and the ingress may reuse it briefly, then revalidate with
+    If-None-Match; an unchanged payload costs a 304 with no body.
+    """
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": _TEAM_MATCHES_SNAPSHOT_CACHE_CONTROL,
+    }
+    tags = _if_none_match_tags(request.headers.get("if-none-match"))
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=body, media_type="application/json", headers=headers
+    )
+
+
+async def _load_team_matches_payload(
+    *,
+    snapshot_id: int | None,
+    team_ids: list[int],
+    limit: int,
+) -> dict[str, Any]:
+    schema = ripple_queries.schema_name()
+    checked_cache_key: str | None = None
+    cached_entry: dict[str, Any] | None = None
+    if snapshot_id is not None:
+        checked_cache_key = _team_matches_cache_key(
+            schema=schema,
+            snapshot_id=int(snapshot_id),
+            team_ids=team_ids,
+        )
+        cached_entry = await _load_cached_team_matches_entry(checked_cache_key)
+        if _team_matches_entry_covers(cached_entry, limit):
+            return _slice_team_matches_payload(cached_entry, limit)
+    else:
+        cached_latest_snapshot_id = await _load_cached_latest_snapshot_id(
+            schema
+        )
+        if cached_latest_snapshot_id is not None:
+            # Snapshot advances can race this optimistic lookup; the resolved
+            # snapshot re-check below is the authoritative cache key.
+            checked_cache_key = _team_matches_cache_key(
+                schema=schema,
+                snapshot_id=cached_latest_snapshot_id,
+                team_ids=team_ids,
+            )
+            cached_entry = await _load_cached_team_matches_entry(
+                checked_cache_key
+            )
+            if _team_matches_entry_covers(cached_entry, limit):
+                return _slice_team_matches_payload(cached_entry, limit)
+
+    if snapshot_id is not None:
+        resolved_snapshot_id = int(snapshot_id)
+    else:
+        async with rankings_async_session() as session:
+            resolved_snapshot_id = await _resolve_snapshot_id(session, None)
+        await _store_cached_latest_snapshot_id(schema, resolved_snapshot_id)
+    cache_key = _team_matches_cache_key(
+        schema=schema,
+        snapshot_id=resolved_snapshot_id,
+        team_ids=team_ids,
+    )
+    if cache_key != checked_cache_key:
+        cached_entry = await _load_cached_team_matches_entry(cache_key)
+
+    async def _build(entry: dict[str, Any] | None) -> dict[str, Any]:
+        # Extend a narrower cached window with only the matches older than
+        # its last one.
+        page_size = limit - (
+            len(entry["payload"]["matches"]) if entry is not None else 0
+        )
+        async with rankings_async_session() as session:
+            page, fetched_rows = await _fetch_team_matches_payload(
+                session,
+                snapshot_id=resolved_snapshot_id,
+                team_ids=team_ids,
+                limit=page_size,
+                after=_team_matches_cursor(entry),
+            )
+        return _extend_team_matches_entry(
+            entry,
+            page,
+            fetched_rows=fetched_rows,
+            page_size=page_size,
+            window=limit,
+        )
+
+    # "Latest" entries must age out quickly, before the snapshot advances.
+    ttl_seconds = (
+        _TEAM_MATCHES_SNAPSHOT_CACHE_TTL_SECONDS
+        if snapshot_id is not None
+        else _TEAM_MATCHES_CACHE_TTL_SECONDS
+    )
+    # Waiters hold no DB session; only the builder opens one.
+    while not _team_matches_entry_covers(cached_entry, limit):
+        cached_entry = await _single_flight_team_matches_entry(
+            cache_key, limit, _build, ttl_seconds=ttl_seconds
+        )
+    return _slice_team_matches_payload(cached_entry, limit)
 
 
 @router.get(
@@ -1606,61 +2090,11 @@ async def analytics_team_matches(
             ),
         )
 
-    schema = ripple_queries.schema_name()
-    checked_cache_key: str | None = None
+    payload = await _load_team_matches_payload(
+        snapshot_id=snapshot_id,
+        team_ids=parsed_team_ids,
+        limit=limit,
+    )
     if snapshot_id is not None:
-        checked_cache_key = _team_matches_cache_key(
-            schema=schema,
-            snapshot_id=int(snapshot_id),
-            team_ids=parsed_team_ids,
-            limit=limit,
-        )
-        cached_payload = await _load_cached_team_matches_payload(
-            checked_cache_key
-        )
-        if cached_payload is not None:
-            return cached_payload
-    else:
-        cached_latest_snapshot_id = await _load_cached_latest_snapshot_id(
-            schema
-        )
-        if cached_latest_snapshot_id is not None:
-            # Snapshot advances can race this optimistic lookup; the resolved
-            # snapshot re-check below is the authoritative cache key.
-            checked_cache_key = _team_matches_cache_key(
-                schema=schema,
-                snapshot_id=cached_latest_snapshot_id,
-                team_ids=parsed_team_ids,
-                limit=limit,
-            )
-            cached_payload = await _load_cached_team_matches_payload(
-                checked_cache_key
-            )
-            if cached_payload is not None:
-                return cached_payload
-
-    async with rankings_async_session() as session:
-        resolved_snapshot_id = await _resolve_snapshot_id(session, snapshot_id)
-        if snapshot_id is None:
-            await _store_cached_latest_snapshot_id(schema, resolved_snapshot_id)
-        cache_key = _team_matches_cache_key(
-            schema=schema,
-            snapshot_id=resolved_snapshot_id,
-            team_ids=parsed_team_ids,
-            limit=limit,
-        )
-        if cache_key != checked_cache_key:
-            cached_payload = await _load_cached_team_matches_payload(
-                cache_key
-            )
-            if cached_payload is not None:
-                return cached_payload
-
-        payload = await _fetch_team_matches_payload(
-            session,
-            snapshot_id=resolved_snapshot_id,
-            team_ids=parsed_team_ids,
-            limit=limit,
-        )
-        await _store_cached_team_matches_payload(cache_key, payload)
-        return payload
+        return _snapshot_team_matches_response(request, payload)
+    return payload
@@ -1,7 +1,7 @@
 import orjson
 from fastapi import APIRouter, HTTPException, Query
 
-from fast_api_app.connections import redis_conn
+from fast_api_app.connections import async_redis_conn
 from fast_api_app.sqlite_lookup_store import (
     lookup_fetchall,
     lookup_fetchall_with_columns,
@@ -33,7 +33,7 @@ async def leaderboard(
     region: str = Query("Tentatek", description="Region for the leaderboard"),
 ):
     redis_key = f"leaderboard_data:{mode}:{region}"
-    players = redis_conn.get(redis_key)
+    players = await async_redis_conn.get(redis_key)
 
     if players is None:
         raise HTTPException(
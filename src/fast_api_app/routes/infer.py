@@ -13,10 +13,10 @@ from redis.exceptions import RedisError
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from fast_api_app.connections import (
+    async_redis_conn,
     async_session,
     limiter,
     model_queue,
-    redis_conn,
 )
 from fast_api_app.utils import get_client_ip
 from shared_lib.constants import (
@@ -414,7 +414,7 @@ async def infer(inference_request: InferenceRequest, request: Request):
     abilities_str.append(f"weapon_id:{inference_request.weapon_id}")
     abilities_str = ",".join(abilities_str)
     abilities_hash = hash(abilities_str)
-    cached_result = redis_conn.hget(redis_key, abilities_hash)
+    cached_result = await async_redis_conn.hget(redis_key, abilities_hash)
 
     model_request: dict | None = None
 
@@ -455,10 +455,10 @@ async def infer(inference_request: InferenceRequest, request: Request):
             predictions = model_response.predictions
 
             try:
-                pipe = redis_conn.pipeline(transaction=True)
+                pipe = async_redis_conn.pipeline(transaction=True)
                 pipe.hset(redis_key, abilities_hash, str(predictions))
                 pipe.expire(redis_key, model_queue.cache_expiration)
-                pipe.execute()
+                await pipe.execute()
             except RedisError:
                 logger.warning(
                     "Failed to persist model predictions to redis cache",
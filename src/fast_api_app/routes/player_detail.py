@@ -4,7 +4,11 @@ import uuid
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from sqlalchemy import text
 
-from fast_api_app.connections import async_session_factory, connection_manager
+from fast_api_app.connections import (
+    async_session_factory,
+    connection_manager,
+    permessage_deflate_requested,
+)
 from shared_lib.queries.player_queries import PLAYER_ALIAS_QUERY
 
 router = APIRouter(tags=["players"])
@@ -35,15 +39,17 @@ async def player_detail(player_id: str):
 @router.websocket("/ws/player/{player_id}")
 async def websocket_endpoint(websocket: WebSocket, player_id: str):
     connection_id = str(uuid.uuid4())
+    version = websocket.query_params.get("version")
     progressive = (
-        websocket.query_params.get("progressive") == "1"
-        and websocket.query_params.get("version") == "2"
+        websocket.query_params.get("progressive") == "1" and version == "2"
     )
     await connection_manager.connect(
         websocket,
         player_id,
         connection_id,
         progressive=progressive,
+        compact=version == "3",
+        deflate=permessage_deflate_requested(websocket),
     )
 
     try:
@@ -51,7 +57,7 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
             data = await websocket.receive_text()
             # Do nothing with data for now
     except WebSocketDisconnect:
-        connection_manager.disconnect(player_id, connection_id)
+        await connection_manager.disconnect(player_id, connection_id)
     finally:
         logger.info(
             "WebSocket connection for player %s with connection ID %s closed",
@@ -12,7 +12,7 @@ from pydantic import BaseModel
 from redis.exceptions import RedisError
 
 from fast_api_app.auth import require_scopes
-from fast_api_app.connections import rankings_async_session, redis_conn
+from fast_api_app.connections import async_redis_conn, rankings_async_session
 from shared_lib.monitoring import (
     RIPPLE_CACHE_PAYLOAD_BYTES,
     RIPPLE_CACHE_REQUESTS,
@@ -95,10 +95,12 @@ def _cache_key(kind: str, params: Dict[str, Any]) -> str:
     return f"{_CACHE_PREFIX}{kind}:{digest}"
 
 
-def _get_cached(kind: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+async def _get_cached(
+    kind: str, params: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
     key = _cache_key(kind, params)
     try:
-        cached = redis_conn.get(key)
+        cached = await async_redis_conn.get(key)
     except RedisError:
         if metrics_enabled():
             RIPPLE_CACHE_REQUESTS.labels(kind, "redis_error").inc()
@@ -118,7 +120,7 @@ def _get_cached(kind: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         if metrics_enabled():
             RIPPLE_CACHE_REQUESTS.labels(kind, "decode_error").inc()
         try:
-            redis_conn.delete(key)
+            await async_redis_conn.delete(key)
         except RedisError:
             pass
         return None
@@ -127,13 +129,13 @@ def _get_cached(kind: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return data
 
 
-def _set_cached(
+async def _set_cached(
     kind: str, params: Dict[str, Any], payload: Dict[str, Any]
 ) -> None:
     key = _cache_key(kind, params)
     serialized = orjson.dumps(payload)
     try:
-        redis_conn.setex(key, _CACHE_TTL_SECONDS, serialized)
+        await async_redis_conn.setex(key, _CACHE_TTL_SECONDS, serialized)
     except RedisError:
         if metrics_enabled():
             RIPPLE_CACHE_REQUESTS.labels(kind, "store_error").inc()
@@ -238,7 +240,7 @@ async def get_ripple_leaderboard(
         "score_offset": score_offset,
     }
 
-    cached = _get_cached("leaderboard", cache_params)
+    cached = await _get_cached("leaderboard", cache_params)
     if cached is not None:
         return cached
 
@@ -292,7 +294,7 @@ async def get_ripple_leaderboard(
         "data": items,
     }
 
-    _set_cached("leaderboard", cache_params, response_payload)
+    await _set_cached("leaderboard", cache_params, response_payload)
 
     return response_payload
 
@@ -329,7 +331,7 @@ async def get_ripple_raw(
         "ranked_only": ranked_only,
     }
 
-    cached = _get_cached("raw", cache_params)
+    cached = await _get_cached("raw", cache_params)
     if cached is not None:
         return cached
 
@@ -358,7 +360,7 @@ async def get_ripple_raw(
         "data": items,
     }
 
-    _set_cached("raw", cache_params, response_payload)
+    await _set_cached("raw", cache_params, response_payload)
 
     return response_payload
 
@@ -393,7 +395,7 @@ async def get_ripple_danger(
         "ts_ms": ts_ms,
     }
 
-    cached = _get_cached("danger", cache_params)
+    cached = await _get_cached("danger", cache_params)
     if cached is not None:
         return cached
 
@@ -443,6 +445,6 @@ async def get_ripple_danger(
         "data": items,
     }
 
-    _set_cached("danger", cache_params, response_payload)
+    await _set_cached("danger", cache_params, response_payload)
 
     return response_payload
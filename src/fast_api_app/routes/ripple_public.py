@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from html import escape
 from io import BytesIO
 import time
 from time import perf_counter
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 from urllib.parse import quote
 
 import orjson
@@ -14,6 +15,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse, Response
 from PIL import Image, ImageDraw, ImageFont
 from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
 
 from celery_app.tasks.ripple_snapshot import (
     MAX_PLAYER_HISTORY_ENTRIES,
@@ -25,12 +27,16 @@ from celery_app.tasks.ripple_snapshot import (
 )
 from fast_api_app.comp_auth import (
     is_comp_admin_discord_id,
-    is_comp_player_owner,
+    is_comp_player_owner_async,
     read_authenticated_comp_discord_id,
     require_comp_admin,
 )
-from fast_api_app.connections import celery, rankings_async_session, redis_conn
-from fast_api_app.feature_flags import is_comp_leaderboard_enabled
+from fast_api_app.connections import (
+    async_redis_conn,
+    celery,
+    rankings_async_session,
+)
+from fast_api_app.feature_flags import is_comp_leaderboard_enabled_async
 from shared_lib.constants import (
     RIPPLE_DANGER_LATEST_KEY,
     RIPPLE_PLAYER_INDEX_LATEST_KEY,
@@ -51,6 +57,7 @@ from shared_lib.monitoring import (
     RIPPLE_PLAYER_SECTION_RESOLVE_DURATION,
     metrics_enabled,
 )
+from shared_lib.payload_utils import ripple_player_index_key
 
 router = APIRouter(prefix="/api/ripple/public", tags=["ripple-public"])
 admin_router = APIRouter(prefix="/api/ripple/admin", tags=["ripple-admin"])
@@ -69,15 +76,14 @@ _SHARE_FONT_BOLD_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
 _DEFAULT_PLAYER_WINDOW_DAYS = 120
 
 
-def _ensure_enabled() -> None:
-    if not is_comp_leaderboard_enabled():
+async def _ensure_enabled() -> None:
+    if not await is_comp_leaderboard_enabled_async():
         raise HTTPException(
             status_code=404, detail="Competition leaderboard is disabled"
         )
 
 
-def _load_payload(key: str) -> Optional[Dict[str, Any]]:
-    raw = redis_conn.get(key)
+def _decode_payload(raw: Any) -> Optional[Dict[str, Any]]:
     if not raw:
         return None
     try:
@@ -86,6 +92,10 @@ def _load_payload(key: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+async def _load_payload(key: str) -> Optional[Dict[str, Any]]:
+    return _decode_payload(await async_redis_conn.get(key))
+
+
 def _observe_ripple_player_section_payload(
     section: str, payload: Dict[str, Any] | None
 ) -> None:
@@ -147,8 +157,10 @@ def _empty_player_index_payload() -> Dict[str, Any]:
     }
 
 
-def _player_index_key(player_id: str) -> str:
-    return f"{RIPPLE_PLAYER_INDEX_PLAYER_PREFIX}{player_id}"
+def _player_index_key(player_id: str, generation: str | None = None) -> str:
+    return ripple_player_index_key(
+        RIPPLE_PLAYER_INDEX_PLAYER_PREFIX, player_id, generation
+    )
 
 
 def _player_index_summary_key(player_id: str) -> str:
@@ -163,6 +175,61 @@ def _player_index_results_key(player_id: str) -> str:
     return f"{RIPPLE_PLAYER_INDEX_PLAYER_RESULTS_PREFIX}{player_id}"
 
 
+def _player_index_generation(meta_payload: Dict[str, Any]) -> Optional[str]:
+    generation = meta_payload.get("generation")
+    return str(generation) if generation else None
+
+
+def _assemble_player_from_sections(
+    summary: Optional[Dict[str, Any]],
+    history: Optional[Dict[str, Any]],
+    results: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    if not isinstance(summary, dict):
+        return None
+    player = dict(summary)
+    player["tournament_history_ranked"] = (
+        history.get("tournament_history_ranked")
+        if isinstance(history, dict)
+        else None
+    ) or []
+    player["match_loo_impacts"] = (
+        results.get("match_loo_impacts") if isinstance(results, dict) else None
+    ) or []
+    return player
+
+
+async def _load_player_index_entry(
+    player_id: str, generation: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    if generation is None:
+        return await _load_payload(_player_index_key(player_id))
+    summary, history, results = await async_redis_conn.hmget(
+        _player_index_key(player_id, generation),
+        ["summary", "history", "results"],
+    )
+    return _assemble_player_from_sections(
+        _decode_payload(summary),
+        _decode_payload(history),
+        _decode_payload(results),
+    )
+
+
+async def _load_player_index_section(
+    player_id: str,
+    generation: Optional[str],
+    section: str,
+    section_key: Callable[[str], str],
+) -> Optional[Dict[str, Any]]:
+    if generation is None:
+        return await _load_payload(section_key(player_id))
+    return _decode_payload(
+        await async_redis_conn.hget(
+            _player_index_key(player_id, generation), section
+        )
+    )
+
+
 def _extract_player_from_legacy_index(
     payload: Dict[str, Any], player_id: str
 ) -> Optional[Dict[str, Any]]:
@@ -174,10 +241,10 @@ def _extract_player_from_legacy_index(
     return player if isinstance(player, dict) else None
 
 
-def _load_player_index_meta_payload() -> Dict[str, Any]:
-    meta_payload = _load_payload(RIPPLE_PLAYER_INDEX_META_KEY)
+async def _load_player_index_meta_payload() -> Dict[str, Any]:
+    meta_payload = await _load_payload(RIPPLE_PLAYER_INDEX_META_KEY)
     if not isinstance(meta_payload, dict):
-        latest_payload = _load_payload(RIPPLE_PLAYER_INDEX_LATEST_KEY)
+        latest_payload = await _load_payload(RIPPLE_PLAYER_INDEX_LATEST_KEY)
         if isinstance(latest_payload, dict):
             meta_payload = latest_payload
         else:
@@ -206,11 +273,15 @@ def _merge_player_payload_with_meta(
     return response
 
 
-def _load_public_player_payload(player_id: str) -> Optional[Dict[str, Any]]:
-    meta_payload = _load_player_index_meta_payload()
-    player = _load_payload(_player_index_key(player_id))
+async def _load_public_player_payload(
+    player_id: str,
+) -> Optional[Dict[str, Any]]:
+    meta_payload = await _load_player_index_meta_payload()
+    player = await _load_player_index_entry(
+        player_id, _player_index_generation(meta_payload)
+    )
     if not isinstance(player, dict):
-        latest_payload = _load_payload(RIPPLE_PLAYER_INDEX_LATEST_KEY)
+        latest_payload = await _load_payload(RIPPLE_PLAYER_INDEX_LATEST_KEY)
         if isinstance(latest_payload, dict):
             player = _extract_player_from_legacy_index(
                 latest_payload, player_id
@@ -222,19 +293,24 @@ def _load_public_player_payload(player_id: str) -> Optional[Dict[str, Any]]:
     return _merge_player_payload_with_meta(player, meta_payload)
 
 
-def _load_public_player_section_payload(
+async def _load_public_player_section_payload(
     player_id: str,
     section: str,
-    section_key: str,
+    section_key: Callable[[str], str],
 ) -> Optional[Dict[str, Any]]:
     started = perf_counter()
-    meta_payload = _load_player_index_meta_payload()
-    player = _load_payload(section_key)
+    meta_payload = await _load_player_index_meta_payload()
+    player = await _load_player_index_section(
+        player_id,
+        _player_index_generation(meta_payload),
+        section,
+        section_key,
+    )
     if isinstance(player, dict):
         resolved = _merge_player_payload_with_meta(player, meta_payload)
         status = "section_hit"
     else:
-        resolved = _load_public_player_payload(player_id)
+        resolved = await _load_public_player_payload(player_id)
         status = "legacy_hit" if isinstance(resolved, dict) else "miss"
 
     if metrics_enabled():
@@ -268,8 +344,8 @@ def _to_float(value: Any) -> float | None:
         return None
 
 
-def _danger_days_left_for_player(player_id: str) -> float | None:
-    payload = _load_payload(RIPPLE_DANGER_LATEST_KEY)
+async def _danger_days_left_for_player(player_id: str) -> float | None:
+    payload = await _load_payload(RIPPLE_DANGER_LATEST_KEY)
     rows = payload.get("data") if isinstance(payload, dict) else None
     if not isinstance(rows, list):
         return None
@@ -283,15 +359,10 @@ def _danger_days_left_for_player(player_id: str) -> float | None:
     return None
 
 
-async def _load_admin_player_base_from_db(
-    session,
-    player_id: str,
-) -> Dict[str, Any] | None:
-    schema = ripple_queries._schema()
+@lru_cache(maxsize=None)
+def _admin_player_base_sql(schema: str) -> TextClause:
     schema_sql = f'"{schema}"'
-    window_ms = _DEFAULT_PLAYER_WINDOW_DAYS * 86_400_000
-
-    query = text(
+    return text(
         f"""
         WITH latest_ts AS (
             SELECT MAX(calculated_at_ms) AS ts
@@ -397,6 +468,14 @@ async def _load_admin_player_base_from_db(
         """
     )
 
+
+async def _load_admin_player_base_from_db(
+    session,
+    player_id: str,
+) -> Dict[str, Any] | None:
+    window_ms = _DEFAULT_PLAYER_WINDOW_DAYS * 86_400_000
+    query = _admin_player_base_sql(ripple_queries._schema())
+
     result = await session.execute(
         query,
         {
@@ -487,9 +566,9 @@ async def _load_admin_player_payload_from_db_only(
     if not player_id:
         return None
 
-    meta_payload = _load_payload(RIPPLE_PLAYER_INDEX_META_KEY)
+    meta_payload = await _load_payload(RIPPLE_PLAYER_INDEX_META_KEY)
     if not isinstance(meta_payload, dict):
-        meta_payload = _load_payload(RIPPLE_STABLE_META_KEY) or {}
+        meta_payload = await _load_payload(RIPPLE_STABLE_META_KEY) or {}
 
     async with rankings_async_session() as session:
         base = await _load_admin_player_base_from_db(session, player_id)
@@ -538,7 +617,7 @@ async def _load_admin_player_payload_from_db_only(
         0, MIN_REQUIRED_TOURNAMENTS - progress_current
     )
 
-    delta_payload = _load_payload(RIPPLE_STABLE_DELTAS_KEY) or {}
+    delta_payload = await _load_payload(RIPPLE_STABLE_DELTAS_KEY) or {}
     delta_players = (
         delta_payload.get("players")
         if isinstance(delta_payload.get("players"), dict)
@@ -567,7 +646,7 @@ async def _load_admin_player_payload_from_db_only(
         "stable_rank": stable_rank,
         "stable_score": stable_score,
         "display_score": display_score,
-        "danger_days_left": _danger_days_left_for_player(player_id),
+        "danger_days_left": await _danger_days_left_for_player(player_id),
         "last_active_ms": last_active_ms,
         "last_tournament_ms": last_tournament_ms,
         "rank_delta": _to_int(delta_entry.get("rank_delta"))
@@ -616,7 +695,7 @@ async def _load_admin_player_payload_from_db(
         return None
 
     cached_player = _apply_admin_player_overrides(
-        _load_public_player_payload(player_id)
+        await _load_public_player_payload(player_id)
     )
     if isinstance(cached_player, dict):
         return await _enrich_admin_player_payload_with_db_history(
@@ -676,7 +755,7 @@ def _apply_admin_player_overrides(
     return _strip_private_player_fields(response)
 
 
-def _apply_public_player_visibility(
+async def _apply_public_player_visibility(
     payload: Dict[str, Any] | None,
     request: Request,
     player_id: str,
@@ -688,7 +767,7 @@ def _apply_public_player_visibility(
     discord_id = read_authenticated_comp_discord_id(request)
     can_view_results = is_comp_admin_discord_id(
         discord_id
-    ) or is_comp_player_owner(player_id, discord_id)
+    ) or await is_comp_player_owner_async(player_id, discord_id)
 
     response = (
         dict(public_payload)
@@ -801,9 +880,12 @@ def _decorate_percentiles(payload: Dict[str, Any]) -> Dict[str, Any]:
     deprecated=True,
 )
 async def get_public_ripple_leaderboard() -> Dict[str, Any]:
-    _ensure_enabled()
-    payload = _load_payload(RIPPLE_STABLE_LATEST_KEY) or _empty_payload()
-    deltas = _load_payload(RIPPLE_STABLE_DELTAS_KEY) or _empty_deltas_payload()
+    await _ensure_enabled()
+    payload = await _load_payload(RIPPLE_STABLE_LATEST_KEY) or _empty_payload()
+    deltas = (
+        await _load_payload(RIPPLE_STABLE_DELTAS_KEY)
+        or _empty_deltas_payload()
+    )
     enriched = _decorate(payload)
     enriched["deltas"] = _decorate(deltas)
     return enriched
@@ -821,8 +903,8 @@ async def get_public_ripple_leaderboard() -> Dict[str, Any]:
     deprecated=True,
 )
 async def get_public_ripple_danger() -> Dict[str, Any]:
-    _ensure_enabled()
-    payload = _load_payload(RIPPLE_DANGER_LATEST_KEY) or _empty_payload()
+    await _ensure_enabled()
+    payload = await _load_payload(RIPPLE_DANGER_LATEST_KEY) or _empty_payload()
     return _decorate(payload)
 
 
@@ -834,13 +916,13 @@ async def get_public_ripple_danger() -> Dict[str, Any]:
 async def get_public_ripple_player_summary(
     player_id: str, request: Request
 ) -> Dict[str, Any]:
-    _ensure_enabled()
+    await _ensure_enabled()
     player = _build_player_summary_payload(
-        _apply_public_player_visibility(
-            _load_public_player_section_payload(
+        await _apply_public_player_visibility(
+            await _load_public_player_section_payload(
                 player_id,
                 "summary",
-                _player_index_summary_key(player_id),
+                _player_index_summary_key,
             ),
             request,
             player_id,
@@ -860,13 +942,13 @@ async def get_public_ripple_player_summary(
 async def get_public_ripple_player_history(
     player_id: str, request: Request
 ) -> Dict[str, Any]:
-    _ensure_enabled()
+    await _ensure_enabled()
     player = _build_player_history_payload(
-        _apply_public_player_visibility(
-            _load_public_player_section_payload(
+        await _apply_public_player_visibility(
+            await _load_public_player_section_payload(
                 player_id,
                 "history",
-                _player_index_history_key(player_id),
+                _player_index_history_key,
             ),
             request,
             player_id,
@@ -886,13 +968,13 @@ async def get_public_ripple_player_history(
 async def get_public_ripple_player_results(
     player_id: str, request: Request
 ) -> Dict[str, Any]:
-    _ensure_enabled()
+    await _ensure_enabled()
     player = _build_player_results_payload(
-        _apply_public_player_visibility(
-            _load_public_player_section_payload(
+        await _apply_public_player_visibility(
+            await _load_public_player_section_payload(
                 player_id,
                 "results",
-                _player_index_results_key(player_id),
+                _player_index_results_key,
             ),
             request,
             player_id,
@@ -912,9 +994,9 @@ async def get_public_ripple_player_results(
 async def get_public_ripple_player(
     player_id: str, request: Request
 ) -> Dict[str, Any]:
-    _ensure_enabled()
-    player = _apply_public_player_visibility(
-        _load_public_player_payload(player_id),
+    await _ensure_enabled()
+    player = await _apply_public_player_visibility(
+        await _load_public_player_payload(player_id),
         request,
         player_id,
     )
@@ -931,13 +1013,13 @@ async def get_public_ripple_player(
 async def get_admin_ripple_player_summary(
     player_id: str, _discord_id: str = Depends(require_comp_admin)
 ) -> Dict[str, Any]:
-    _ensure_enabled()
+    await _ensure_enabled()
     player = _build_player_summary_payload(
         _apply_admin_player_overrides(
-            _load_public_player_section_payload(
+            await _load_public_player_section_payload(
                 player_id,
                 "summary",
-                _player_index_summary_key(player_id),
+                _player_index_summary_key,
             )
         )
     )
@@ -956,7 +1038,7 @@ async def get_admin_ripple_player_summary(
 async def get_admin_ripple_player_history(
     player_id: str, _discord_id: str = Depends(require_comp_admin)
 ) -> Dict[str, Any]:
-    _ensure_enabled()
+    await _ensure_enabled()
     player = None
     try:
         player = await _load_admin_player_payload_from_db(player_id)
@@ -967,10 +1049,10 @@ async def get_admin_ripple_player_history(
         )
     if not isinstance(player, dict):
         player = _apply_admin_player_overrides(
-            _load_public_player_section_payload(
+            await _load_public_player_section_payload(
                 player_id,
                 "history",
-                _player_index_history_key(player_id),
+                _player_index_history_key,
             )
         )
     player = _build_player_history_payload(player)
@@ -988,7 +1070,7 @@ async def get_admin_ripple_player_history(
 async def get_admin_ripple_player_results(
     player_id: str, _discord_id: str = Depends(require_comp_admin)
 ) -> Dict[str, Any]:
-    _ensure_enabled()
+    await _ensure_enabled()
     player = None
     try:
         player = await _load_admin_player_payload_from_db(player_id)
@@ -999,10 +1081,10 @@ async def get_admin_ripple_player_results(
         )
     if not isinstance(player, dict):
         player = _apply_admin_player_overrides(
-            _load_public_player_section_payload(
+            await _load_public_player_section_payload(
                 player_id,
                 "results",
-                _player_index_results_key(player_id),
+                _player_index_results_key,
             )
         )
     if isinstance(player, dict):
@@ -1022,7 +1104,7 @@ async def get_admin_ripple_player_results(
 async def get_admin_ripple_player(
     player_id: str, _discord_id: str = Depends(require_comp_admin)
 ) -> Dict[str, Any]:
-    _ensure_enabled()
+    await _ensure_enabled()
     player = None
     try:
         player = await _load_admin_player_payload_from_db(player_id)
@@ -1033,7 +1115,7 @@ async def get_admin_ripple_player(
         )
     if not isinstance(player, dict):
         player = _apply_admin_player_overrides(
-            _load_public_player_payload(player_id)
+            await _load_public_player_payload(player_id)
         )
     if not isinstance(player, dict):
         raise _player_not_found()
@@ -1085,10 +1167,10 @@ async def queue_admin_ripple_refresh(
     deprecated=True,
 )
 async def get_public_ripple_meta() -> Dict[str, Any]:
-    _ensure_enabled()
-    meta = _load_payload(RIPPLE_STABLE_META_KEY) or {}
-    stable = _load_payload(RIPPLE_STABLE_LATEST_KEY)
-    danger = _load_payload(RIPPLE_DANGER_LATEST_KEY)
+    await _ensure_enabled()
+    meta = await _load_payload(RIPPLE_STABLE_META_KEY) or {}
+    stable = await _load_payload(RIPPLE_STABLE_LATEST_KEY)
+    danger = await _load_payload(RIPPLE_DANGER_LATEST_KEY)
     now_ms = int(time.time() * 1000)
     return {
         "meta": meta,
@@ -1121,9 +1203,9 @@ async def get_public_ripple_meta() -> Dict[str, Any]:
     deprecated=True,
 )
 async def get_public_ripple_percentiles() -> Dict[str, Any]:
-    _ensure_enabled()
+    await _ensure_enabled()
     payload = (
-        _load_payload(RIPPLE_STABLE_PERCENTILES_KEY)
+        await _load_payload(RIPPLE_STABLE_PERCENTILES_KEY)
         or _empty_percentiles_payload()
     )
     return _decorate_percentiles(payload)
@@ -1586,8 +1668,8 @@ def _share_preview_html(
 async def get_public_ripple_player_preview(
     request: Request, player_id: str
 ) -> HTMLResponse:
-    _ensure_enabled()
-    player = _load_public_player_payload(player_id)
+    await _ensure_enabled()
+    player = await _load_public_player_payload(player_id)
     if not isinstance(player, dict):
         raise HTTPException(
             status_code=404,
@@ -1618,8 +1700,8 @@ async def get_public_ripple_player_preview(
 async def get_public_ripple_player_share_alias(
     request: Request, player_id: str
 ) -> HTMLResponse:
-    _ensure_enabled()
-    player = _load_public_player_payload(player_id)
+    await _ensure_enabled()
+    player = await _load_public_player_payload(player_id)
     if not isinstance(player, dict):
         raise HTTPException(
             status_code=404,
@@ -1648,8 +1730,8 @@ async def get_public_ripple_player_share_alias(
     summary="Competition player preview image",
 )
 async def get_public_ripple_player_share_image(player_id: str) -> Response:
-    _ensure_enabled()
-    player = _load_public_player_payload(player_id)
+    await _ensure_enabled()
+    player = await _load_public_player_payload(player_id)
     if not isinstance(player, dict):
         raise HTTPException(
             status_code=404,
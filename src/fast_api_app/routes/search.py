@@ -3,7 +3,7 @@ from time import perf_counter
 
 from fastapi import APIRouter, HTTPException, Request
 
-from fast_api_app.connections import limiter, redis_conn
+from fast_api_app.connections import async_redis_conn, limiter
 from fast_api_app.sqlite_lookup_store import lookup_fetchall
 from shared_lib.constants import LOOKUP_SQLITE_SNAPSHOT_META_KEY
 from shared_lib.monitoring import (
@@ -19,7 +19,7 @@ logger = logging.getLogger(__name__)
 @router.get("/api/search/{query}")
 @limiter.limit("10/second")
 async def search(query: str, request: Request):
-    if not redis_conn.get(LOOKUP_SQLITE_SNAPSHOT_META_KEY):
+    if not await async_redis_conn.get(LOOKUP_SQLITE_SNAPSHOT_META_KEY):
         if metrics_enabled():
             SEARCH_RESULTS.labels(outcome="unavailable").inc()
         raise HTTPException(
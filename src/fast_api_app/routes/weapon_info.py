@@ -1,7 +1,7 @@
 import orjson
 from fastapi import APIRouter, HTTPException, Query
 
-from fast_api_app.connections import redis_conn
+from fast_api_app.connections import async_redis_conn
 from shared_lib.constants import (
     GAME_TRANSLATION_REDIS_KEY,
     GINI_COEFF_REDIS_KEY,
@@ -18,7 +18,7 @@ ALL_SLICE_KEY = "all"
 
 @router.get("/weapon-info", summary="Get weapon reference data")
 async def weapon_info():
-    weapon_info = redis_conn.get(WEAPON_INFO_REDIS_KEY)
+    weapon_info = await async_redis_conn.get(WEAPON_INFO_REDIS_KEY)
     if weapon_info is None:
         raise HTTPException(
             status_code=503,
@@ -31,7 +31,7 @@ async def weapon_info():
 
 @router.get("/game-translation", summary="Get game translation data")
 async def game_translation():
-    game_translation = redis_conn.get(GAME_TRANSLATION_REDIS_KEY)
+    game_translation = await async_redis_conn.get(GAME_TRANSLATION_REDIS_KEY)
     if game_translation is None:
         raise HTTPException(
             status_code=503,
@@ -79,7 +79,7 @@ async def skill_offset(
     mode: str | None = Query(default=None),
     region: str | None = Query(default=None),
 ):
-    skill_offset = redis_conn.get(SKILL_OFFSET_REDIS_KEY)
+    skill_offset = await async_redis_conn.get(SKILL_OFFSET_REDIS_KEY)
     if skill_offset is None:
         raise HTTPException(
             status_code=503,
@@ -92,8 +92,8 @@ async def skill_offset(
 
 @router.get("/lorenz", summary="Get Lorenz curve and Gini coefficient")
 async def lorenz():
-    lorenz = redis_conn.get(LORENZ_CURVE_REDIS_KEY)
-    gini = redis_conn.get(GINI_COEFF_REDIS_KEY)
+    lorenz = await async_redis_conn.get(LORENZ_CURVE_REDIS_KEY)
+    gini = await async_redis_conn.get(GINI_COEFF_REDIS_KEY)
     if lorenz is None:
         raise HTTPException(
             status_code=503,
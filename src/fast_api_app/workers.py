@@ -0,0 +1,13 @@
+from uvicorn.workers import UvicornWorker as BaseUvicornWorker
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """Uvicorn worker that tells the app how it negotiates websockets."""
+
+    def init_process(self) -> None:
+        # Imported here so the gunicorn arbiter never builds the app's
+        # connections before it forks.
+        from fast_api_app.connections import record_websocket_server_config
+
+        record_websocket_server_config(self.config)
+        super().init_process()
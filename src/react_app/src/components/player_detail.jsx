@@ -54,7 +54,9 @@ const PlayerDetailContent = () => {
       const apiUrl = getBaseApiUrl();
       const endpoint = `${apiUrl}/api/players/${player_id}`;
       const baseWebsocketUrl = getBaseWebsocketUrl();
-      const websocketEndpoint = `${baseWebsocketUrl}/ws/player/${player_id}`;
+      // deflate=1 asks for plain JSON text frames compressed by the browser's
+      // permessage-deflate; servers without it keep sending zlib blobs.
+      const websocketEndpoint = `${baseWebsocketUrl}/ws/player/${player_id}?deflate=1`;
 
       try {
         const playerData = await fetchJson(endpoint);
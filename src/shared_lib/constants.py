@@ -20,6 +20,19 @@ REDIS_HOST = "redis"
 REDIS_URI = f"redis://{REDIS_HOST}:{REDIS_PORT}"
 PLAYER_PUBSUB_CHANNEL = "player_data_channel"
 PLAYER_LATEST_REDIS_KEY = "player_latest_data_v2"
+PLAYER_LATEST_COMPACT_REDIS_KEY = "player_latest_data_v3"
+# zlib frame of the version 2 payload, ready to send to legacy websockets.
+PLAYER_LATEST_FRAME_REDIS_KEY = "player_latest_frame_v2"
+# Player payloads are fresh for the soft TTL, then served stale while a
+# background refresh runs, until the hard TTL evicts them.
+PLAYER_CACHE_SOFT_TTL_SECONDS = 15 * 60
+PLAYER_CACHE_HARD_TTL_SECONDS = 6 * 60 * 60
+PLAYER_HISTORY_STATE_REDIS_KEY = "player_history_state"
+PLAYER_DETAIL_FETCH_PENDING_KEY = "player_detail:fetch:pending"
+PLAYER_DETAIL_BATCH_PENDING_KEY = "player_detail:batch:pending"
+PLAYER_DETAIL_BATCH_SCHEDULED_KEY = "player_detail:batch:scheduled"
+PLAYER_DETAIL_WARM_TARGETS_KEY = "player_detail:warm:targets"
+PLAYER_DETAIL_WARM_SIGNATURES_KEY = "player_detail:warm:signatures"
 PLAYER_DATA_REDIS_KEY = "player_data"
 WEAPON_INFO_URL = (
     "https://splat-top.nyc3.cdn.digitaloceanspaces.com/splat-top/data/weapon_info.json"
@@ -64,10 +77,24 @@ RIPPLE_PLAYER_INDEX_PLAYER_PREFIX = "ripple:player_index:player:"
 RIPPLE_PLAYER_INDEX_PLAYER_SUMMARY_PREFIX = "ripple:player_index:player_summary:"
 RIPPLE_PLAYER_INDEX_PLAYER_HISTORY_PREFIX = "ripple:player_index:player_history:"
 RIPPLE_PLAYER_INDEX_PLAYER_RESULTS_PREFIX = "ripple:player_index:player_results:"
+RIPPLE_PLAYER_INDEX_DIGESTS_PREFIX = "ripple:player_index:digests:"
+RIPPLE_PLAYER_INDEX_PENDING_KEY = "ripple:player_index:pending"
 RIPPLE_PLAYER_OWNER_DISCORD_HASH_KEY = "ripple:player_owner:discord"
 RIPPLE_SNAPSHOT_LOCK_KEY = "ripple:snapshot:lock"
 COMP_LEADERBOARD_FLAG_KEY = "feature:comp_leaderboard"
 
+# Rankings-schema column maps, published once per ripple snapshot build so
+# analytics routes never introspect information_schema on the request path.
+ANALYTICS_SCHEMA_COLUMNS_KEY = "analytics:schema_columns:v1"
+ANALYTICS_SCHEMA_COLUMNS_TABLES = (
+    "matches",
+    "tournaments",
+    "player_appearance_teams",
+    "players",
+    "rounds",
+    "player_rankings",
+)
+
 # API token management (Redis keys)
 API_TOKENS_ACTIVE_SET = "api:tokens:active"
 API_TOKEN_HASH_MAP_PREFIX = "api:token:hash:"
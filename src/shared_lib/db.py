@@ -28,3 +28,16 @@ def create_ranking_uri() -> str:
     """Rankings DB URI (uses env RANKINGS_DB_NAME or falls back to DB_NAME)."""
     db_name = os.getenv("RANKINGS_DB_NAME") or "rankings_db"
     return _build_uri(db_name)
+
+
+def ranking_connect_args() -> dict:
+    """asyncpg connect args for rankings engines.
+
+    Rankings queries reuse a small set of fixed SQL strings per schema, so a
+    larger per-connection prepared statement cache keeps every one of them
+    prepared instead of re-parsing once the default 100 entries churn.
+    """
+    cache_size = int(
+        os.getenv("RANKINGS_DB_PREPARED_STATEMENT_CACHE_SIZE", "500")
+    )
+    return {"prepared_statement_cache_size": cache_size}
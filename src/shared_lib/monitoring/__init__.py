@@ -2,6 +2,7 @@
 
 from shared_lib.monitoring.config import metrics_enabled
 from shared_lib.monitoring.prometheus import (
+    ANALYTICS_TEAM_MATCHES_BUILDS,
     API_USAGE_BATCH_DURATION,
     API_USAGE_EVENTS,
     API_USAGE_RECOVERED,
@@ -15,9 +16,12 @@ from shared_lib.monitoring.prometheus import (
     LOOKUP_SQLITE_SNAPSHOT_LAST_SUCCESS_TIMESTAMP,
     LOOKUP_SQLITE_SNAPSHOT_RELOAD_DURATION,
     METRICS_CONTENT_TYPE,
+    PLAYER_DETAIL_FETCH_ENQUEUES,
+    PLAYER_DETAIL_HISTORY_STATE,
     PLAYER_DETAIL_PAYLOAD_BYTES,
     PLAYER_DETAIL_PIPELINE_DURATION,
     PLAYER_DETAIL_ROWS,
+    PLAYER_DETAIL_WARM_EVENTS,
     PUBSUB_ACTIVE,
     PUBSUB_BYTES_BROADCAST,
     PUBSUB_EVENTS,
@@ -31,6 +35,7 @@ from shared_lib.monitoring.prometheus import (
     RIPPLE_PLAYER_SECTION_PAYLOAD_BYTES,
     RIPPLE_PLAYER_SECTION_RESOLVE_DURATION,
     RIPPLE_QUERY_DURATION,
+    RIPPLE_REFRESH_DURATION,
     SEARCH_LATENCY,
     SEARCH_RESULTS,
     SPLATGPT_CACHE_REQUESTS,
@@ -45,11 +50,14 @@ from shared_lib.monitoring.prometheus import (
     WEBSOCKET_BYTES_SENT,
     WEBSOCKET_CONNECTIONS,
     WEBSOCKET_EVENTS,
+    WEBSOCKET_SEND_QUEUE_DEPTH,
+    WEBSOCKET_SLOW_CONSUMERS,
     ensure_collectors_registered,
     render_latest,
 )
 
 __all__ = [
+    "ANALYTICS_TEAM_MATCHES_BUILDS",
     "API_USAGE_BATCH_DURATION",
     "API_USAGE_EVENTS",
     "API_USAGE_RECOVERED",
@@ -63,9 +71,12 @@ __all__ = [
     "LOOKUP_SQLITE_SNAPSHOT_LAST_SUCCESS_TIMESTAMP",
     "LOOKUP_SQLITE_SNAPSHOT_RELOAD_DURATION",
     "METRICS_CONTENT_TYPE",
+    "PLAYER_DETAIL_FETCH_ENQUEUES",
+    "PLAYER_DETAIL_HISTORY_STATE",
     "PLAYER_DETAIL_PAYLOAD_BYTES",
     "PLAYER_DETAIL_PIPELINE_DURATION",
     "PLAYER_DETAIL_ROWS",
+    "PLAYER_DETAIL_WARM_EVENTS",
     "PUBSUB_ACTIVE",
     "PUBSUB_BYTES_BROADCAST",
     "PUBSUB_EVENTS",
@@ -79,6 +90,7 @@ __all__ = [
     "RIPPLE_PLAYER_SECTION_PAYLOAD_BYTES",
     "RIPPLE_PLAYER_SECTION_RESOLVE_DURATION",
     "RIPPLE_QUERY_DURATION",
+    "RIPPLE_REFRESH_DURATION",
     "SEARCH_LATENCY",
     "SEARCH_RESULTS",
     "SPLATGPT_CACHE_REQUESTS",
@@ -93,6 +105,8 @@ __all__ = [
     "WEBSOCKET_BYTES_SENT",
     "WEBSOCKET_CONNECTIONS",
     "WEBSOCKET_EVENTS",
+    "WEBSOCKET_SEND_QUEUE_DEPTH",
+    "WEBSOCKET_SLOW_CONSUMERS",
     "ensure_collectors_registered",
     "metrics_enabled",
     "render_latest",
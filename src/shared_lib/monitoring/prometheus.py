@@ -86,6 +86,16 @@ WEBSOCKET_BYTES_SENT = Counter(
     "Total bytes of websocket payloads sent.",
     labelnames=["player_id"],
 )
+WEBSOCKET_SEND_QUEUE_DEPTH = Histogram(
+    "fastapi_websocket_send_queue_depth",
+    "Outbound websocket queue depth observed after each enqueue.",
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64),
+)
+WEBSOCKET_SLOW_CONSUMERS = Counter(
+    "fastapi_websocket_slow_consumers_total",
+    "Slow websocket consumers grouped by the action taken.",
+    labelnames=["action"],
+)
 
 TABLE_REFRESH_DURATION = Histogram(
     "fastapi_table_refresh_duration_seconds",
@@ -185,6 +195,21 @@ PLAYER_DETAIL_PAYLOAD_BYTES = Histogram(
         16_777_216,
     ),
 )
+PLAYER_DETAIL_HISTORY_STATE = Counter(
+    "player_detail_history_state_total",
+    "Incremental player history state lookups grouped by outcome.",
+    labelnames=["outcome"],
+)
+PLAYER_DETAIL_WARM_EVENTS = Counter(
+    "player_detail_warm_events_total",
+    "Player detail cache warmer decisions grouped by outcome.",
+    labelnames=["outcome"],
+)
+PLAYER_DETAIL_FETCH_ENQUEUES = Counter(
+    "player_detail_fetch_enqueues_total",
+    "Player detail fetches requested by websocket opens, by outcome.",
+    labelnames=["outcome"],
+)
 
 RIPPLE_CACHE_REQUESTS = Counter(
     "ripple_cache_requests_total",
@@ -196,11 +221,23 @@ RIPPLE_QUERY_DURATION = Histogram(
     "Duration of ripple query calls grouped by kind.",
     labelnames=["kind"],
 )
+RIPPLE_REFRESH_DURATION = Histogram(
+    "ripple_snapshot_refresh_duration_seconds",
+    "Wall-clock duration of ripple snapshot refresh stages.",
+    labelnames=["stage"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600),
+)
 RIPPLE_CACHE_PAYLOAD_BYTES = Gauge(
     "ripple_cache_payload_bytes",
     "Payload size stored in ripple cache per kind.",
     labelnames=["kind"],
 )
+ANALYTICS_TEAM_MATCHES_BUILDS = Counter(
+    "analytics_team_matches_builds_total",
+    "Team-match payload cache misses, by how the payload was obtained.",
+    labelnames=["outcome"],
+)
+
 RIPPLE_PLAYER_SECTION_CACHE_REQUESTS = Counter(
     "ripple_player_section_cache_requests_total",
     "Competition player section cache lookups grouped by section and outcome.",
@@ -1,5 +1,13 @@
+import os
+
 import orjson
 
+from shared_lib.constants import (
+    PLAYER_CACHE_HARD_TTL_SECONDS,
+    PLAYER_CACHE_SOFT_TTL_SECONDS,
+    PLAYER_PUBSUB_CHANNEL,
+)
+
 
 def players_to_columnar(players: list[dict]) -> dict[str, list]:
     out: dict[str, list] = {}
@@ -11,3 +19,96 @@ def players_to_columnar(players: list[dict]) -> dict[str, list]:
 
 def serialize_leaderboard_payload(players: list[dict]) -> bytes:
     return orjson.dumps({"players": players_to_columnar(players)})
+
+
+def is_player_cache_stale(remaining_ttl: int | None) -> bool:
+    """Whether a player payload has outlived the soft TTL.
+
+    Payloads are written with the hard TTL, so their age follows from the
+    TTL Redis reports. Keys without an expiry count as fresh.
+    """
+    if remaining_ttl is None or remaining_ttl < 0:
+        return False
+    return remaining_ttl <= (
+        PLAYER_CACHE_HARD_TTL_SECONDS - PLAYER_CACHE_SOFT_TTL_SECONDS
+    )
+
+
+def per_player_pubsub_enabled() -> bool:
+    """Whether player chunks use one pubsub channel per player.
+
+    Publishers and FastAPI subscribers both read this flag. Subscribers keep
+    the shared channel as well, so enable it on FastAPI before Celery.
+    """
+    raw = os.getenv("PLAYER_PUBSUB_PER_PLAYER_CHANNELS", "0")
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def player_pubsub_channel(player_id: str) -> str:
+    return f"{PLAYER_PUBSUB_CHANNEL}:{player_id}"
+
+
+def ripple_player_index_key(
+    prefix: str, player_id: str, generation: str | None = None
+) -> str:
+    """Key for one player's ripple index entry.
+
+    Each snapshot build stores a player as one hash of JSON sections under
+    the ``generation`` recorded in the index meta. Keys without a generation
+    predate versioned publishing and hold a JSON string per section.
+    """
+    if generation is None:
+        return f"{prefix}{player_id}"
+    return f"{prefix}{generation}:{player_id}"
+
+
+def compressed_pubsub_frames_enabled() -> bool:
+    """Whether publishers zlib-compress player chunks before publishing.
+
+    Subscribers accept both encodings, so roll FastAPI out first, or set
+    ``PLAYER_PUBSUB_COMPRESSED_FRAMES=0`` on Celery until it is.
+    """
+    raw = os.getenv("PLAYER_PUBSUB_COMPRESSED_FRAMES", "1")
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def encode_player_pubsub_message(
+    player_id: str,
+    phase: str,
+    body: bytes,
+    cache_key: str | None = None,
+    *,
+    compressed: bool = False,
+) -> bytes:
+    """Prefixes a player chunk with a tab-separated routing header line.
+
+    Subscribers route on the header and forward ``body`` to websockets as is,
+    so the JSON is never parsed on the FastAPI side. A trailing ``zlib``
+    field marks a body that is already a compressed websocket frame.
+    """
+    fields = [player_id, phase, cache_key or ""]
+    if compressed:
+        fields.append("zlib")
+    return "\t".join(fields).encode() + b"\n" + body
+
+
+def decode_player_pubsub_message(
+    message: bytes,
+) -> tuple[str, str, str | None, bytes, bool] | None:
+    """Splits a message into its routing fields and body.
+
+    The result is ``(player_id, phase, cache_key, body, compressed)``.
+    Returns ``None`` for bare JSON messages published without a header.
+    """
+    if message[:1] == b"{":
+        return None
+    header, separator, body = message.partition(b"\n")
+    if not separator:
+        return None
+    fields = header.decode().split("\t")
+    if len(fields) == 3:
+        fields.append("")
+    if len(fields) != 4:
+        return None
+    player_id, phase, cache_key, encoding = fields
+    return player_id, phase, cache_key or None, body, encoding == "zlib"
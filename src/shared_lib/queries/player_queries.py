@@ -77,6 +77,22 @@ WHERE player_id = :player_id
 ORDER BY timestamp ASC
 """
 
+PLAYER_DATA_SINCE_QUERY = """
+SELECT
+    mode,
+    region,
+    season_number,
+    timestamp,
+    x_power,
+    weapon_id,
+    rank,
+    updated
+FROM xscraper.players
+WHERE player_id = :player_id
+  AND timestamp > :since
+ORDER BY timestamp ASC
+"""
+
 SEASON_RESULTS_QUERY = """
 SELECT
     mode,
@@ -89,3 +105,118 @@ FROM xscraper.season_results
 WHERE player_id = :player_id
 ORDER BY season_number DESC, mode ASC
 """
+
+# Season results and latest rows in a single round trip, as two JSON arrays,
+# so the snapshot chunk only waits on one statement.
+PLAYER_SNAPSHOT_QUERY = """
+SELECT
+    COALESCE(
+        (
+            SELECT json_agg(sr ORDER BY sr.season_number DESC, sr.mode ASC)
+            FROM (
+                SELECT
+                    mode,
+                    region,
+                    season_number,
+                    rank,
+                    x_power,
+                    weapon_id
+                FROM xscraper.season_results
+                WHERE player_id = :player_id
+            ) sr
+        ),
+        CAST('[]' AS json)
+    ) AS season_results,
+    COALESCE(
+        (
+            SELECT json_agg(ld ORDER BY ld.mode ASC)
+            FROM (
+                SELECT
+                    p.mode,
+                    p.region,
+                    p.season_number,
+                    p.rank,
+                    p.x_power,
+                    p.weapon_id
+                FROM xscraper.player_latest pl
+                JOIN xscraper.players p
+                    ON p.player_id = pl.player_id
+                    AND p.mode = pl.mode
+                    AND p.timestamp = pl.timestamp
+                WHERE pl.player_id = :player_id
+            ) ld
+        ),
+        CAST('[]' AS json)
+    ) AS latest_data
+"""
+
+# Batched variants used by fetch_player_data_batch. Each selects player_id
+# first so rows can be fanned back out per player.
+SEASON_RESULTS_BATCH_QUERY = """
+SELECT
+    player_id,
+    mode,
+    region,
+    season_number,
+    rank,
+    x_power,
+    weapon_id
+FROM xscraper.season_results
+WHERE player_id = ANY(:player_ids)
+ORDER BY player_id, season_number DESC, mode ASC
+"""
+
+PLAYER_LATEST_DATA_BATCH_QUERY = """
+SELECT
+    pl.player_id,
+    p.mode,
+    p.region,
+    p.season_number,
+    p.rank,
+    p.x_power,
+    p.weapon_id
+FROM xscraper.player_latest pl
+JOIN xscraper.players p
+    ON p.player_id = pl.player_id
+    AND p.mode = pl.mode
+    AND p.timestamp = pl.timestamp
+WHERE pl.player_id = ANY(:player_ids)
+ORDER BY pl.player_id, p.mode ASC;
+"""
+
+PLAYER_DATA_BATCH_QUERY = """
+SELECT
+    player_id,
+    mode,
+    region,
+    season_number,
+    timestamp,
+    x_power,
+    weapon_id,
+    rank,
+    updated
+FROM xscraper.players
+WHERE player_id = ANY(:player_ids)
+ORDER BY player_id, timestamp ASC
+"""
+
+PLAYER_DATA_SINCE_BATCH_QUERY = """
+SELECT
+    p.player_id,
+    p.mode,
+    p.region,
+    p.season_number,
+    p.timestamp,
+    p.x_power,
+    p.weapon_id,
+    p.rank,
+    p.updated
+FROM unnest(
+    CAST(:player_ids AS text[]),
+    CAST(:since AS timestamptz[])
+) AS s(player_id, since)
+JOIN xscraper.players p
+    ON p.player_id = s.player_id
+    AND p.timestamp > s.since
+ORDER BY p.player_id, p.timestamp ASC
+"""
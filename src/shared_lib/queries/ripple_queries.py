@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import logging
 import re
+from functools import lru_cache
 from typing import Any, Mapping, Optional, Sequence
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import TextClause
 
 logger = logging.getLogger(__name__)
 
@@ -35,34 +37,14 @@ def _schema() -> str:
     return schema_name()
 
 
-async def fetch_ripple_page(
-    session: "AsyncSession",
-    *,
-    limit: Optional[int] = None,
-    offset: int = 0,
-    min_tournaments: Optional[int] = 3,
-    tournament_window_days: int = 90,
-    ranked_only: bool = True,
-    build: Optional[str] = None,
-    ts_ms: Optional[int] = None,
-) -> tuple[list[Mapping[str, Any]], int, Optional[int], Optional[str]]:
-    """
-    Faster Ripple page using the tournament_event_times MV.
-    - 1 SQL round-trip (COUNT(*) OVER()).
-    - No correlated subqueries for window counts.
-    - No DB ROW_NUMBER(); page rank computed client-side.
-    - Never references the 'rank' identifier from player_rankings.
-    """
-
-    schema = schema_name()
+# Statements are rendered once per schema. SQLAlchemy's asyncpg adapter keeps a
+# per-connection prepared statement cache keyed by SQL text, so reusing the same
+# text lets every call after the first skip the parse/prepare round trip.
+@lru_cache(maxsize=None)
+def _ripple_page_sql(schema: str, paged: bool) -> TextClause:
     schema_sql = f'"{schema}"'  # safe quoting, schema name validated upstream
-
-    # Compute once in Python (no risk of int overflow here; Python ints are unbounded).
-    window_ms = int(tournament_window_days) * 86_400_000
-
-    limit_clause = "" if limit is None else "LIMIT :limit_value\n"
-
-    sql = text(
+    limit_clause = "LIMIT :limit_value\n" if paged else ""
+    return text(
         f"""
 WITH latest_ts AS (
   SELECT CASE
@@ -136,6 +118,56 @@ ORDER BY score DESC, player_id  -- deterministic for client-side rank
 """
     )
 
+
+@lru_cache(maxsize=None)
+def _ripple_meta_sql(schema: str) -> TextClause:
+    schema_sql = f'"{schema}"'
+    return text(
+        f"""
+        WITH latest_ts AS (
+          SELECT CASE
+            WHEN CAST(:ts_param AS BIGINT) IS NOT NULL THEN CAST(:ts_param AS BIGINT)
+            WHEN CAST(:build_param AS TEXT) IS NOT NULL THEN (
+              SELECT MAX(calculated_at_ms)
+              FROM {schema_sql}.player_rankings
+              WHERE build_version = CAST(:build_param AS TEXT)
+            )
+            ELSE (SELECT MAX(calculated_at_ms) FROM {schema_sql}.player_rankings)
+          END AS ts
+        )
+        SELECT l.ts AS calculated_at_ms,
+               (SELECT MAX(build_version)::text
+                  FROM {schema_sql}.player_rankings r
+                  JOIN latest_ts l ON r.calculated_at_ms = l.ts) AS build_version
+        FROM latest_ts l
+        """
+    )
+
+
+async def fetch_ripple_page(
+    session: "AsyncSession",
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    min_tournaments: Optional[int] = 3,
+    tournament_window_days: int = 90,
+    ranked_only: bool = True,
+    build: Optional[str] = None,
+    ts_ms: Optional[int] = None,
+) -> tuple[list[Mapping[str, Any]], int, Optional[int], Optional[str]]:
+    """
+    Faster Ripple page using the tournament_event_times MV.
+    - 1 SQL round-trip (COUNT(*) OVER()).
+    - No correlated subqueries for window counts.
+    - No DB ROW_NUMBER(); page rank computed client-side.
+    - Never references the 'rank' identifier from player_rankings.
+    """
+
+    # Compute once in Python (no risk of int overflow here; Python ints are unbounded).
+    window_ms = int(tournament_window_days) * 86_400_000
+
+    sql = _ripple_page_sql(schema_name(), limit is not None)
+
     params = {
         "offset": int(offset),
         "min_tournaments_is_null": min_tournaments is None,
@@ -160,26 +192,7 @@ ORDER BY score DESC, player_id  -- deterministic for client-side rank
         build_version = rows[0]["build_version"]
     else:
         # No rows matched the filter; fetch run metadata cheaply
-        meta_sql = text(
-            f"""
-        WITH latest_ts AS (
-          SELECT CASE
-            WHEN CAST(:ts_param AS BIGINT) IS NOT NULL THEN CAST(:ts_param AS BIGINT)
-            WHEN CAST(:build_param AS TEXT) IS NOT NULL THEN (
-              SELECT MAX(calculated_at_ms)
-              FROM {schema_sql}.player_rankings
-              WHERE build_version = CAST(:build_param AS TEXT)
-            )
-            ELSE (SELECT MAX(calculated_at_ms) FROM {schema_sql}.player_rankings)
-          END AS ts
-        )
-        SELECT l.ts AS calculated_at_ms,
-               (SELECT MAX(build_version)::text
-                  FROM {schema_sql}.player_rankings r
-                  JOIN latest_ts l ON r.calculated_at_ms = l.ts) AS build_version
-        FROM latest_ts l
-        """
-        )
+        meta_sql = _ripple_meta_sql(schema_name())
         meta = (await session.execute(meta_sql, params)).mappings().one()
         total = 0
         calc_ts = meta["calculated_at_ms"]
@@ -196,24 +209,10 @@ ORDER BY score DESC, player_id  -- deterministic for client-side rank
     return out_rows, total, calc_ts, build_version
 
 
-async def fetch_ripple_danger(
-    session: AsyncSession,
-    *,
-    limit: Optional[int] = 20,
-    offset: int = 0,
-    min_tournaments: Optional[int] = None,
-    tournament_window_days: int = 90,
-    ranked_only: bool = True,
-    build: Optional[str] = None,
-    ts_ms: Optional[int] = None,
-) -> tuple[list[Mapping[str, Any]], int, Optional[int], Optional[str]]:
-    """Optimized 'danger' query (top‑k lateral semantics via NOT MATERIALIZED CTEs).
-
-    Returns rows with player_rank, player_id, display_name, score,
-    oldest_in_window_ms, next_expiry_ms, ms_left, calculated_at_ms, build_version.
-    """
-
-    schema = schema_name()
+@lru_cache(maxsize=None)
+def _ripple_danger_sql(
+    schema: str, paged: bool
+) -> tuple[TextClause, TextClause]:
     schema_sql = f'"{schema}"'
 
     ctes = f"""
@@ -295,9 +294,7 @@ WHERE (CAST(:min_tournaments AS INT) IS NULL OR a.n_tournaments = CAST(:min_tour
 ORDER BY ms_left ASC, rr.player_rank ASC
         """
 
-    limit_offset_clause = (
-        "" if limit is None else "\nLIMIT :limit OFFSET :offset"
-    )
+    limit_offset_clause = "\nLIMIT :limit OFFSET :offset" if paged else ""
     page_sql = text(ctes + base_page_sql + limit_offset_clause)
 
     count_sql = text(
@@ -310,6 +307,27 @@ JOIN latest_ts l ON TRUE
 WHERE (CAST(:min_tournaments AS INT) IS NULL OR a.n_tournaments = CAST(:min_tournaments AS INT))
         """
     )
+    return page_sql, count_sql
+
+
+async def fetch_ripple_danger(
+    session: AsyncSession,
+    *,
+    limit: Optional[int] = 20,
+    offset: int = 0,
+    min_tournaments: Optional[int] = None,
+    tournament_window_days: int = 90,
+    ranked_only: bool = True,
+    build: Optional[str] = None,
+    ts_ms: Optional[int] = None,
+) -> tuple[list[Mapping[str, Any]], int, Optional[int], Optional[str]]:
+    """Optimized 'danger' query (top‑k lateral semantics via NOT MATERIALIZED CTEs).
+
+    Returns rows with player_rank, player_id, display_name, score,
+    oldest_in_window_ms, next_expiry_ms, ms_left, calculated_at_ms, build_version.
+    """
+
+    page_sql, count_sql = _ripple_danger_sql(schema_name(), limit is not None)
 
     params = {
         "min_tournaments": min_tournaments,
@@ -333,3 +351,106 @@ WHERE (CAST(:min_tournaments AS INT) IS NULL OR a.n_tournaments = CAST(:min_tour
     if rows:
         build_version = rows[0].get("build_version")
     return list(rows), total, calc_ts, build_version
+
+
+async def fetch_table_columns(
+    session: "AsyncSession", tables: Sequence[str]
+) -> dict[str, list[str]]:
+    """Return the column names of each rankings-schema table in ``tables``.
+
+    Tables that do not exist map to an empty list.
+    """
+    query = text(
+        """
+SELECT table_name, column_name
+FROM information_schema.columns
+WHERE table_schema = :schema
+  AND table_name IN :tables
+ORDER BY table_name, ordinal_position
+        """
+    ).bindparams(bindparam("tables", expanding=True))
+    result = await session.execute(
+        query, {"schema": schema_name(), "tables": list(tables)}
+    )
+    out: dict[str, list[str]] = {str(table): [] for table in tables}
+    for row in result.mappings().all():
+        table_name = str(row.get("table_name") or "")
+        column_name = row.get("column_name")
+        if table_name in out and column_name:
+            out[table_name].append(str(column_name))
+    return out
+
+
+# Tables whose player_id the batched ripple lookups filter on.
+PLAYER_ID_TABLES = (
+    "player_appearance_teams",
+    "player_match_loo_impacts",
+    "player_rankings",
+    "players",
+)
+# player_id column type per table, by schema; filled by
+# refresh_player_id_types(). Tables missing here use text-cast filters.
+_PLAYER_ID_TYPES: dict[str, dict[str, str]] = {}
+# format_type() spellings safe to inline into a CAST.
+_TYPE_NAME_RE = re.compile(r"^[a-z][a-z0-9 ]*(\(\d+(,\d+)?\))?$")
+
+
+@lru_cache(maxsize=None)
+def _player_id_types_sql() -> TextClause:
+    return text(
+        """
+SELECT c.relname AS table_name,
+       format_type(a.atttypid, a.atttypmod) AS data_type
+FROM pg_attribute a
+JOIN pg_class c ON c.oid = a.attrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = :schema
+  AND c.relname IN :tables
+  AND a.attname = 'player_id'
+  AND NOT a.attisdropped
+        """
+    ).bindparams(bindparam("tables", expanding=True))
+
+
+async def refresh_player_id_types(session: "AsyncSession") -> dict[str, str]:
+    """Look up the player_id column type of each table in PLAYER_ID_TABLES."""
+    schema = schema_name()
+    result = await session.execute(
+        _player_id_types_sql(),
+        {"schema": schema, "tables": list(PLAYER_ID_TABLES)},
+    )
+    types: dict[str, str] = {}
+    for row in result.mappings().all():
+        data_type = str(row.get("data_type") or "")
+        if _TYPE_NAME_RE.match(data_type):
+            types[str(row.get("table_name"))] = data_type
+    _PLAYER_ID_TYPES[schema] = types
+    return types
+
+
+def player_id_type(table: str) -> Optional[str]:
+    return _PLAYER_ID_TYPES.get(schema_name(), {}).get(table)
+
+
+def player_id_array(table: str, param: str = "player_ids") -> str:
+    """SQL for the text array bound to ``param``, cast to ``table``'s type.
+
+    Stays ``text[]`` while the column type is unknown.
+    """
+    data_type = player_id_type(table)
+    if data_type is None:
+        return f"CAST(:{param} AS text[])"
+    return f"CAST(CAST(:{param} AS text[]) AS {data_type}[])"
+
+
+def player_id_in(column: str, table: str, param: str = "player_ids") -> str:
+    """SQL matching ``column`` against the player ids bound to ``param``.
+
+    With the column type known, the bound array is cast to it and the
+    column is compared as-is, so a btree index on player_id can serve the
+    lookup. Otherwise the column is cast to text, which matches any column
+    type but rules the index out.
+    """
+    if player_id_type(table) is None:
+        return f"{column}::text = ANY(:{param})"
+    return f"{column} = ANY({player_id_array(table, param)})"
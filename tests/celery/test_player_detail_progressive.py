@@ -1,5 +1,6 @@
 import importlib
 import os
+import zlib
 from collections import namedtuple
 
 import orjson
@@ -11,8 +12,13 @@ os.environ.setdefault("DB_PASSWORD", "pass")
 os.environ.setdefault("DB_NAME", "db")
 os.environ.setdefault("RANKINGS_DB_NAME", "db")
 
-from shared_lib.constants import PLAYER_LATEST_REDIS_KEY, PLAYER_PUBSUB_CHANNEL
+from shared_lib.constants import (
+    PLAYER_CACHE_SOFT_TTL_SECONDS,
+    PLAYER_LATEST_REDIS_KEY,
+    PLAYER_PUBSUB_CHANNEL,
+)
 from shared_lib.monitoring import render_latest
+from shared_lib.payload_utils import decode_player_pubsub_message
 
 
 class RedisSpy:
@@ -20,6 +26,10 @@ class RedisSpy:
         self.kv = {}
         self.published = []
         self.set_calls = []
+        self.hashes = {}
+        self.expired = []
+        self.sets = {}
+        self.ttls = {}
 
     def get(self, key):
         return self.kv.get(key)
@@ -31,8 +41,14 @@ class RedisSpy:
         if nx and key in self.kv:
             return False
         self.kv[key] = value
+        self.ttls[key] = ex if ex is not None else -1
         return True
 
+    def ttl(self, key):
+        if key not in self.kv:
+            return -2
+        return self.ttls.get(key, -1)
+
     def exists(self, key):
         return key in self.kv
 
@@ -44,15 +60,71 @@ class RedisSpy:
         self.kv.pop(key, None)
         return 1
 
+    def expire(self, key, ttl):
+        self.expired.append((key, ttl))
+        if key in self.kv:
+            self.ttls[key] = ttl
+        return key in self.kv
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+        return 1
+
+    def hmget(self, key, fields):
+        stored = self.hashes.get(key, {})
+        return [stored.get(field) for field in fields]
+
+    def mget(self, keys):
+        return [self.kv.get(key) for key in keys]
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def spop(self, key, count=None):
+        members = sorted(self.sets.get(key, set()))[:count]
+        self.sets.get(key, set()).difference_update(members)
+        return members
+
+    def pipeline(self):
+        return _RedisSpyPipeline(self)
+
+
+class _RedisSpyPipeline:
+    def __init__(self, redis_spy):
+        self._redis_spy = redis_spy
+        self._calls = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        calls, self._calls = self._calls, []
+        return [
+            getattr(self._redis_spy, name)(*args, **kwargs)
+            for name, args, kwargs in calls
+        ]
+
 
 def _decode_published_phases(redis_spy):
     return [
-        orjson.loads(message)["phase"]
+        decode_player_pubsub_message(message)[1]
         for channel, message in redis_spy.published
         if channel == PLAYER_PUBSUB_CHANNEL
     ]
 
 
+def _decode_published_message(redis_spy, index):
+    _, _, _, body, compressed = decode_player_pubsub_message(
+        redis_spy.published[index][1]
+    )
+    return orjson.loads(zlib.decompress(body) if compressed else body)
+
+
 def _metrics_body() -> str:
     return render_latest().decode("utf-8")
 
@@ -67,32 +139,30 @@ def test_fetch_player_data_publishes_snapshot_then_analysis_then_complete(
     monkeypatch.setattr(mod, "metrics_enabled", lambda: True)
     monkeypatch.setattr(
         mod,
-        "_fetch_season_data",
-        lambda player_id: [
-            {
-                "season_number": 6,
-                "mode": "Rainmaker",
-                "rank": 4,
-                "x_power": 2801.1,
-            }
-        ],
-    )
-    monkeypatch.setattr(
-        mod,
-        "pull_all_latest_data",
-        lambda player_id: [
-            {
-                "season_number": 5,
-                "mode": "Rainmaker",
-                "rank": 5,
-                "x_power": 2798.4,
-            }
-        ],
+        "_fetch_player_snapshot",
+        lambda player_id, session=None: (
+            [
+                {
+                    "season_number": 6,
+                    "mode": "Rainmaker",
+                    "rank": 4,
+                    "x_power": 2801.1,
+                }
+            ],
+            [
+                {
+                    "season_number": 5,
+                    "mode": "Rainmaker",
+                    "rank": 5,
+                    "x_power": 2798.4,
+                }
+            ],
+        ),
     )
     monkeypatch.setattr(
         mod,
         "_fetch_player_data",
-        lambda player_id: [
+        lambda player_id, session=None: [
             {
                 "season_number": 5,
                 "mode": "Rainmaker",
@@ -113,7 +183,7 @@ def test_fetch_player_data_publishes_snapshot_then_analysis_then_complete(
         "complete",
     ]
 
-    snapshot_message = orjson.loads(redis_spy.published[0][1])
+    snapshot_message = _decode_published_message(redis_spy, 0)
     assert snapshot_message["payload"]["aggregated_data"] == {
         "season_results": [
             {
@@ -133,7 +203,7 @@ def test_fetch_player_data_publishes_snapshot_then_analysis_then_complete(
         ],
     }
 
-    analysis_message = orjson.loads(redis_spy.published[1][1])
+    analysis_message = _decode_published_message(redis_spy, 1)
     assert analysis_message["payload"]["player_data"] == [
         {
             "season_number": 5,
@@ -193,13 +263,17 @@ def test_fetch_player_data_replays_cached_chunks_without_refetching(
     monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
     monkeypatch.setattr(
         mod,
-        "_fetch_season_data",
-        lambda player_id: (_ for _ in ()).throw(AssertionError("no refetch")),
+        "_fetch_player_snapshot",
+        lambda player_id, session=None: (_ for _ in ()).throw(
+            AssertionError("no refetch")
+        ),
     )
     monkeypatch.setattr(
         mod,
         "_fetch_player_data",
-        lambda player_id: (_ for _ in ()).throw(AssertionError("no refetch")),
+        lambda player_id, session=None: (_ for _ in ()).throw(
+            AssertionError("no refetch")
+        ),
     )
 
     mod.fetch_player_data("player-2")
@@ -220,16 +294,18 @@ def test_fetch_player_data_preserves_snapshot_when_analysis_fails(
     monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
     monkeypatch.setattr(
         mod,
-        "_fetch_season_data",
-        lambda player_id: [
-            {"season_number": 6, "mode": "Rainmaker", "rank": 7}
-        ],
+        "_fetch_player_snapshot",
+        lambda player_id, session=None: (
+            [{"season_number": 6, "mode": "Rainmaker", "rank": 7}],
+            [],
+        ),
     )
-    monkeypatch.setattr(mod, "pull_all_latest_data", lambda player_id: [])
     monkeypatch.setattr(
         mod,
         "_fetch_player_data",
-        lambda player_id: (_ for _ in ()).throw(RuntimeError("boom")),
+        lambda player_id, session=None: (_ for _ in ()).throw(
+            RuntimeError("boom")
+        ),
     )
 
     mod.fetch_player_data("player-3")
@@ -240,7 +316,7 @@ def test_fetch_player_data_preserves_snapshot_when_analysis_fails(
         "complete",
     ]
 
-    error_message = orjson.loads(redis_spy.published[1][1])
+    error_message = _decode_published_message(redis_spy, 1)
     assert error_message["payload"] == {"message": "boom", "stage": "analysis"}
 
     cache_key = f"{PLAYER_LATEST_REDIS_KEY}:player-3"
@@ -261,8 +337,10 @@ def test_fetch_player_data_uses_atomic_lock_and_skips_when_already_running(
     monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
     monkeypatch.setattr(
         mod,
-        "_fetch_season_data",
-        lambda player_id: (_ for _ in ()).throw(AssertionError("no refetch")),
+        "_fetch_player_snapshot",
+        lambda player_id, session=None: (_ for _ in ()).throw(
+            AssertionError("no refetch")
+        ),
     )
 
     mod.fetch_player_data("player-4")
@@ -286,16 +364,22 @@ def test_fetch_player_data_releases_lock_when_snapshot_fetch_fails(
     monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
     monkeypatch.setattr(
         mod,
-        "_fetch_season_data",
-        lambda player_id: (_ for _ in ()).throw(RuntimeError("snapshot boom")),
+        "_fetch_player_snapshot",
+        lambda player_id, session=None: (_ for _ in ()).throw(
+            RuntimeError("snapshot boom")
+        ),
     )
 
+    pending_key = f"{mod.PLAYER_DETAIL_FETCH_PENDING_KEY}:player-5"
+    redis_spy.set(pending_key, "1")
+
     import pytest
 
     with pytest.raises(RuntimeError, match="snapshot boom"):
         mod.fetch_player_data("player-5")
 
     assert redis_spy.get("fetch_player_data:player-5") is None
+    assert redis_spy.get(pending_key) is None
 
 
 def test_aggregate_player_analysis_uses_minimal_rows_without_pandas():
@@ -465,36 +549,495 @@ def test_reduce_player_history_rows_keeps_changes_updates_and_endpoints():
     ]
 
 
-def test_pull_all_latest_data_queries_player_latest_rows(monkeypatch):
+def _synthetic_history(count: int, seed: int = 7) -> list[dict]:
+    import random
+    from datetime import datetime, timedelta, timezone
+
+    rng = random.Random(seed)
+    started = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    modes = ["Rainmaker", "Splat Zones"]
+    x_power = 2500.0
+    rows = []
+    for index in range(count):
+        if rng.random() < 0.3:
+            x_power = round(x_power + rng.uniform(-20, 20), 1)
+        rows.append(
+            {
+                "mode": modes[(index // 40) % 2],
+                "region": False,
+                "season_number": 5 + index // 150,
+                "timestamp": (started + timedelta(hours=3 * index)).isoformat(),
+                "x_power": x_power,
+                "weapon_id": rng.choice([10, 20, 30]),
+                "rank": rng.randint(1, 500),
+                "updated": rng.random() < 0.2,
+            }
+        )
+    return rows
+
+
+def test_incremental_history_state_matches_full_recompute():
     mod = importlib.import_module("celery_app.tasks.player_detail")
     mod = importlib.reload(mod)
-    captured = {}
-    latest_row = namedtuple(
-        "LatestRow",
+    rows = _synthetic_history(600)
+
+    full_rows = mod.reduce_player_history_rows(rows)
+    expected = orjson.dumps(mod.build_analysis_payload(full_rows))
+
+    for split in (1, 97, 300, 599):
+        state = mod.build_player_history_state(
+            mod.reduce_player_history_rows(rows[:split])
+        )
+        for delta_start in range(split, len(rows), 53):
+            state = mod.deserialize_player_history_state(
+                mod.serialize_player_history_state(state)
+            )
+            mod.advance_player_history_state(
+                state, rows[delta_start : delta_start + 53]
+            )
+
+        assert state["high_water"] == rows[-1]["timestamp"]
+        assert state["rows"] == full_rows
+        assert (
+            orjson.dumps(
+                {
+                    "player_data": state["rows"],
+                    "aggregated_data": mod._finalize_player_analysis(
+                        state["analysis"]
+                    ),
+                }
+            )
+            == expected
+        )
+
+
+def test_fetch_player_analysis_only_fetches_rows_after_high_water(
+    monkeypatch,
+):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    rows = _synthetic_history(200)
+    fetches = []
+
+    def _fake_full_history(player_id, session=None):
+        fetches.append(None)
+        return mod.reduce_player_history_rows(rows[:150])
+
+    def _fake_history_rows(player_id, since, session=None):
+        fetches.append(since)
+        return [row for row in rows if row["timestamp"] > since]
+
+    monkeypatch.setattr(mod, "_fetch_player_data", _fake_full_history)
+    monkeypatch.setattr(mod, "_fetch_player_history_rows", _fake_history_rows)
+
+    mod._fetch_player_analysis("player-7")
+    refreshed = mod._fetch_player_analysis("player-7")
+
+    assert fetches == [None, rows[149]["timestamp"]]
+    assert refreshed == mod.build_analysis_payload(
+        mod.reduce_player_history_rows(rows)
+    )
+    state_key = f"{mod.PLAYER_HISTORY_STATE_REDIS_KEY}:player-7"
+    assert redis_spy.set_calls[-1]["key"] == state_key
+    assert redis_spy.set_calls[-1]["ex"] == mod.PLAYER_HISTORY_STATE_TTL_SECONDS
+
+
+def _leaderboard_row(player_id, rank, x_power, mode="Rainmaker"):
+    return {
+        "player_id": player_id,
+        "mode": mode,
+        "region": False,
+        "season_number": 9,
+        "rank": rank,
+        "x_power": x_power,
+        "weapon_id": 40,
+    }
+
+
+def test_warm_player_detail_cache_rebuilds_changed_players_only(monkeypatch):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    monkeypatch.setenv("PLAYER_DETAIL_WARM_BATCH_PAUSE_SECONDS", "0")
+    built = []
+
+    def _fake_build(player_id, cache_key, *, publish=True):
+        built.append((player_id, publish))
+        redis_spy.set(cache_key, b"{}")
+        return "success"
+
+    monkeypatch.setattr(mod, "build_player_detail_cache", _fake_build)
+
+    assert (
+        mod.store_player_detail_warm_targets(
+            [
+                _leaderboard_row("p-b", 7, 3000.0),
+                _leaderboard_row("p-a", 2, 3100.0),
+                _leaderboard_row("p-a", 40, 2900.0, mode="Splat Zones"),
+            ]
+        )
+        == 2
+    )
+    first = mod.warm_player_detail_cache()
+
+    assert built == [("p-a", False), ("p-b", False)]
+    assert first["warmed"] == 2
+    assert redis_spy.published == []
+
+    built.clear()
+    mod.store_player_detail_warm_targets(
         [
-            "mode",
-            "region",
-            "season_number",
-            "rank",
-            "x_power",
-            "weapon_id",
-        ],
+            _leaderboard_row("p-b", 6, 3010.0),
+            _leaderboard_row("p-a", 2, 3100.0),
+            _leaderboard_row("p-a", 40, 2900.0, mode="Splat Zones"),
+        ]
+    )
+    second = mod.warm_player_detail_cache()
+
+    assert built == [("p-b", False)]
+    assert second["warmed"] == 1
+    assert second["extended"] == 1
+    assert redis_spy.expired == [
+        (
+            f"{mod.PLAYER_LATEST_COMPACT_REDIS_KEY}:p-a",
+            mod.PLAYER_CACHE_TTL_SECONDS,
+        ),
+        (
+            f"{mod.PLAYER_LATEST_FRAME_REDIS_KEY}:p-a",
+            mod.PLAYER_CACHE_TTL_SECONDS,
+        ),
+        (f"{PLAYER_LATEST_REDIS_KEY}:p-a", mod.PLAYER_CACHE_TTL_SECONDS),
+    ]
+
+
+def test_warm_player_detail_cache_respects_budget_and_locks(monkeypatch):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    monkeypatch.setenv("PLAYER_DETAIL_WARM_BUDGET", "2")
+    monkeypatch.setenv("PLAYER_DETAIL_WARM_BATCH_SIZE", "1")
+    monkeypatch.setenv("PLAYER_DETAIL_WARM_BATCH_PAUSE_SECONDS", "0")
+    monkeypatch.setattr(
+        mod,
+        "build_player_detail_cache",
+        lambda player_id, cache_key, *, publish=True: "success",
+    )
+    redis_spy.set("fetch_player_data:p-1", "true")
+
+    mod.store_player_detail_warm_targets(
+        [_leaderboard_row(f"p-{rank}", rank, 3000.0) for rank in range(1, 5)]
+    )
+    summary = mod.warm_player_detail_cache()
+
+    assert summary["targets"] == 4
+    assert summary["locked"] == 1
+    assert summary["warmed"] == 1
+    assert summary["over_budget"] == 2
+    assert redis_spy.get("fetch_player_data:p-2") is None
+    assert _metrics_body().count("player_detail_warm_events_total") > 0
+
+
+def test_warm_player_detail_replays_to_a_fetch_it_locked_out(monkeypatch):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    monkeypatch.setenv("PLAYER_DETAIL_WARM_BATCH_PAUSE_SECONDS", "0")
+    cache_key = f"{PLAYER_LATEST_REDIS_KEY}:p-a"
+    pending_key = f"{mod.PLAYER_DETAIL_FETCH_PENDING_KEY}:p-a"
+    overlapped = []
+
+    def _fake_build(player_id, cache_key, *, publish=True):
+        # A websocket miss lands mid-warm and its fetch finds the lock.
+        redis_spy.set(pending_key, "1", nx=True, ex=30)
+        mod.fetch_player_data(player_id)
+        overlapped.append(list(redis_spy.published))
+        mod.store_player_payload(
+            player_id,
+            cache_key,
+            mod.merge_player_payload(
+                mod.build_empty_player_payload(),
+                mod.build_analysis_payload(
+                    mod.reduce_player_history_rows(_synthetic_history(50))
+                ),
+            ),
+        )
+        return "success"
+
+    monkeypatch.setattr(mod, "build_player_detail_cache", _fake_build)
+    mod.store_player_detail_warm_targets([_leaderboard_row("p-a", 1, 3000.0)])
+
+    summary = mod.warm_player_detail_cache()
+
+    assert summary["warmed"] == 1
+    assert overlapped == [[]]
+    assert _decode_published_phases(redis_spy) == [
+        "snapshot",
+        "analysis",
+        "complete",
+    ]
+    assert decode_player_pubsub_message(redis_spy.published[-1][1])[2] == (
+        cache_key
     )
+    assert redis_spy.get(pending_key) is None
+    assert redis_spy.get("fetch_player_data:p-a") is None
+
+
+def test_fetch_player_data_batch_matches_single_player_payloads(monkeypatch):
+    from datetime import datetime
+
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    rows = _synthetic_history(300)
+    history_names = tuple(rows[0])
+    executed = []
+
+    def _db_rows(player_id, history):
+        return [
+            (
+                player_id,
+                *(
+                    datetime.fromisoformat(row[name])
+                    if name == "timestamp"
+                    else row[name]
+                    for name in history_names
+                ),
+            )
+            for row in history
+        ]
 
     class FakeResult:
+        def __init__(self, names, result_rows):
+            self._names = names
+            self._rows = result_rows
+
+        def keys(self):
+            return ["player_id", *self._names]
+
+        def fetchall(self):
+            return self._rows
+
+    class FakeSession:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def execute(self, query, params):
+            sql = str(query)
+            executed.append((sql, len(redis_spy.published)))
+            if sql == mod.SEASON_RESULTS_BATCH_QUERY:
+                return FakeResult(
+                    ("season_number", "mode", "rank", "x_power"),
+                    [
+                        (player_id, 9, "Rainmaker", 3, 3000.0)
+                        for player_id in params["player_ids"]
+                    ],
+                )
+            if sql == mod.PLAYER_LATEST_DATA_BATCH_QUERY:
+                return FakeResult(("mode", "x_power"), [])
+            if sql == mod.PLAYER_DATA_BATCH_QUERY:
+                assert params == {"player_ids": ["p-cold"]}
+                return FakeResult(history_names, _db_rows("p-cold", rows))
+            assert sql == mod.PLAYER_DATA_SINCE_BATCH_QUERY
+            assert params["player_ids"] == ["p-warm"]
+            since = params["since"][0]
+            return FakeResult(
+                history_names,
+                _db_rows(
+                    "p-warm",
+                    [
+                        row
+                        for row in rows
+                        if datetime.fromisoformat(row["timestamp"]) > since
+                    ],
+                ),
+            )
+
+    monkeypatch.setattr(mod, "Session", FakeSession)
+    mod._store_player_history_state_payload(
+        "p-warm",
+        mod.build_player_history_state(
+            mod.reduce_player_history_rows(rows[:180])
+        ),
+        outcome="miss",
+    )
+    redis_spy.set("fetch_player_data:p-locked", "true")
+    redis_spy.sadd(mod.PLAYER_DETAIL_BATCH_PENDING_KEY, "p-warm", "p-locked")
+
+    summary = mod.fetch_player_data_batch(["p-cold"])
+
+    assert summary["players"] == 3
+    assert summary["success"] == 2
+    assert summary["locked"] == 1
+    assert [sql for sql, _ in executed] == [
+        mod.SEASON_RESULTS_BATCH_QUERY,
+        mod.PLAYER_LATEST_DATA_BATCH_QUERY,
+        mod.PLAYER_DATA_BATCH_QUERY,
+        mod.PLAYER_DATA_SINCE_BATCH_QUERY,
+    ]
+    # Both snapshots are out before any history query runs.
+    assert executed[2][1] == 2
+    expected = mod.build_analysis_payload(mod.reduce_player_history_rows(rows))
+    for player_id in ("p-cold", "p-warm"):
+        cached = orjson.loads(
+            redis_spy.get(f"{PLAYER_LATEST_REDIS_KEY}:{player_id}")
+        )
+        assert cached["player_data"] == expected["player_data"]
+        for key, value in expected["aggregated_data"].items():
+            assert cached["aggregated_data"][key] == value
+        assert cached["aggregated_data"]["season_results"] == [
+            {
+                "season_number": 9,
+                "mode": "Rainmaker",
+                "rank": 3,
+                "x_power": 3000.0,
+            }
+        ]
+        assert redis_spy.get(f"fetch_player_data:{player_id}") is None
+    assert redis_spy.get("fetch_player_data:p-locked") == "true"
+    assert _decode_published_phases(redis_spy).count("complete") == 2
+
+
+def test_fetch_player_data_batch_streams_cold_history_when_enabled(
+    monkeypatch,
+):
+    from datetime import datetime
+
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    monkeypatch.setenv("PLAYER_DETAIL_HISTORY_STREAMING", "true")
+    monkeypatch.setenv("PLAYER_DETAIL_HISTORY_YIELD_PER", "50")
+    histories = {
+        "p-a": _synthetic_history(300, seed=1),
+        "p-b": _synthetic_history(250, seed=2),
+        "p-empty": [],
+    }
+    history_names = tuple(histories["p-a"][0])
+    captured = {}
+
+    class FakeResult:
+        def __init__(self, names, result_rows):
+            self._names = names
+            self._rows = result_rows
+
+        def keys(self):
+            return ["player_id", *self._names]
+
+        def fetchall(self):
+            return self._rows
+
+    class StreamedResult(FakeResult):
+        def fetchall(self):
+            raise AssertionError("cold history should not be materialized")
+
+        def __iter__(self):
+            for row in self._rows:
+                captured["streamed"] = captured.get("streamed", 0) + 1
+                yield row
+
+    class FakeSession:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def execute(self, query, params, execution_options=None):
+            sql = str(query)
+            if sql == mod.PLAYER_DATA_BATCH_QUERY:
+                captured["execution_options"] = execution_options
+                return StreamedResult(
+                    history_names,
+                    [
+                        (
+                            player_id,
+                            *(
+                                (
+                                    datetime.fromisoformat(row[name])
+                                    if name == "timestamp"
+                                    else row[name]
+                                )
+                                for name in history_names
+                            ),
+                        )
+                        for player_id in params["player_ids"]
+                        for row in histories[player_id]
+                    ],
+                )
+            return FakeResult(("mode", "x_power"), [])
+
+    monkeypatch.setattr(mod, "Session", FakeSession)
+
+    summary = mod.fetch_player_data_batch(list(histories))
+
+    assert summary["success"] == 3
+    assert captured["execution_options"] == {"yield_per": 50}
+    assert captured["streamed"] == 550
+    for player_id, rows in histories.items():
+        cached = orjson.loads(
+            redis_spy.get(f"{PLAYER_LATEST_REDIS_KEY}:{player_id}")
+        )
+        expected = mod.build_analysis_payload(
+            mod.reduce_player_history_rows(rows)
+        )
+        assert cached["player_data"] == expected["player_data"]
+    for player_id in ("p-a", "p-b"):
+        state = mod._load_player_history_state(player_id)
+        assert state["rows"] == mod.reduce_player_history_rows(
+            histories[player_id]
+        )
+
+
+def test_build_player_detail_cache_uses_one_session_and_snapshot_statement(
+    monkeypatch,
+):
+    from datetime import datetime
+
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    monkeypatch.setattr(mod, "metrics_enabled", lambda: True)
+    rows = _synthetic_history(40)
+    history_names = tuple(rows[0])
+    sessions = []
+    executed = []
+
+    class FakeResult:
+        def one(self):
+            return (
+                [{"season_number": 9, "mode": "Rainmaker", "rank": 3}],
+                [{"season_number": 9, "mode": "Rainmaker", "x_power": 1.0}],
+            )
+
+        def keys(self):
+            return list(history_names)
+
         def fetchall(self):
             return [
-                latest_row(
-                    "Rainmaker",
-                    False,
-                    5,
-                    4,
-                    2801.1,
-                    42,
+                tuple(
+                    datetime.fromisoformat(row[name])
+                    if name == "timestamp"
+                    else row[name]
+                    for name in history_names
                 )
+                for row in rows
             ]
 
     class FakeSession:
+        def __init__(self):
+            sessions.append(self)
+
         def __enter__(self):
             return self
 
@@ -502,21 +1045,207 @@ def test_pull_all_latest_data_queries_player_latest_rows(monkeypatch):
             return False
 
         def execute(self, query, params):
-            captured["sql"] = str(query)
-            captured["params"] = params
+            executed.append((str(query), len(redis_spy.published)))
             return FakeResult()
 
     monkeypatch.setattr(mod, "Session", FakeSession)
 
-    assert mod.pull_all_latest_data("player-6") == [
-        {
-            "mode": "Rainmaker",
-            "region": False,
-            "season_number": 5,
-            "rank": 4,
-            "x_power": 2801.1,
-            "weapon_id": 42,
-        }
+    assert (
+        mod.build_player_detail_cache(
+            "player-8", f"{PLAYER_LATEST_REDIS_KEY}:player-8"
+        )
+        == "success"
+    )
+
+    assert len(sessions) == 1
+    assert executed == [
+        (mod.PLAYER_SNAPSHOT_QUERY, 0),
+        (mod.PLAYER_DATA_QUERY, 1),
+    ]
+    assert _decode_published_phases(redis_spy) == [
+        "snapshot",
+        "analysis",
+        "complete",
+    ]
+    assert 'stage="first_chunk"' in _metrics_body()
+
+
+def test_reduce_player_history_stream_matches_buffered_reducer():
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    consumed = []
+
+    for seed in range(5):
+        rows = _synthetic_history(900, seed=seed)
+        rows.insert(10, {**rows[10], "timestamp": None})
+
+        def _rows():
+            for row in rows:
+                consumed.append(row)
+                yield row
+
+        assert mod.reduce_player_history_stream(
+            _rows()
+        ) == mod.reduce_player_history_rows(rows)
+        assert len(consumed) == len(rows)
+        consumed.clear()
+
+
+def test_fetch_player_data_streams_rows_when_enabled(monkeypatch):
+    from datetime import datetime
+
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    monkeypatch.setenv("PLAYER_DETAIL_HISTORY_STREAMING", "true")
+    monkeypatch.setenv("PLAYER_DETAIL_HISTORY_YIELD_PER", "50")
+    rows = _synthetic_history(300)
+    history_row = namedtuple("HistoryRow", list(rows[0]))
+    captured = {}
+
+    class FakeSession:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def execute(self, query, params, execution_options=None):
+            captured["execution_options"] = execution_options
+            return (
+                history_row(
+                    **{
+                        **row,
+                        "timestamp": datetime.fromisoformat(row["timestamp"]),
+                    }
+                )
+                for row in rows
+            )
+
+    monkeypatch.setattr(mod, "Session", FakeSession)
+
+    assert mod._fetch_player_data("player-9") == (
+        mod.reduce_player_history_rows(rows)
+    )
+    assert captured["execution_options"] == {"yield_per": 50}
+
+
+def test_store_player_payload_writes_compact_columnar_encoding(monkeypatch):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    monkeypatch.setattr(mod, "metrics_enabled", lambda: True)
+    payload = mod.merge_player_payload(
+        mod.build_empty_player_payload(),
+        mod.build_analysis_payload(
+            mod.reduce_player_history_rows(_synthetic_history(200))
+        ),
+    )
+    cache_key = f"{PLAYER_LATEST_REDIS_KEY}:player-10"
+
+    mod.store_player_payload("player-10", cache_key, payload)
+
+    compact_key = f"{mod.PLAYER_LATEST_COMPACT_REDIS_KEY}:player-10"
+    frame_key = f"{mod.PLAYER_LATEST_FRAME_REDIS_KEY}:player-10"
+    assert [call["key"] for call in redis_spy.set_calls] == [
+        compact_key,
+        frame_key,
+        cache_key,
+    ]
+    assert zlib.decompress(redis_spy.get(frame_key)) == redis_spy.get(cache_key)
+    compact = orjson.loads(zlib.decompress(redis_spy.get(compact_key)))
+    assert compact["version"] == mod.PLAYER_COMPACT_VERSION
+    assert compact["aggregated_data"] == payload["aggregated_data"]
+    columns = compact["player_data"]
+    assert [
+        dict(zip(columns, values)) for values in zip(*columns.values())
+    ] == payload["player_data"]
+    assert len(redis_spy.get(compact_key)) < len(redis_spy.get(cache_key))
+    assert 'kind="compact_payload"' in _metrics_body()
+
+
+def test_fetch_player_data_rebuilds_stale_cache_instead_of_replaying(
+    monkeypatch,
+):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    mod = importlib.reload(mod)
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    cache_key = f"{PLAYER_LATEST_REDIS_KEY}:player-11"
+    built = []
+
+    def _fake_build(player_id, cache_key, *, publish=True):
+        built.append(player_id)
+        return "success"
+
+    monkeypatch.setattr(mod, "build_player_detail_cache", _fake_build)
+
+    redis_spy.set(cache_key, orjson.dumps(mod.build_empty_player_payload()))
+    redis_spy.ttls[cache_key] = mod.PLAYER_CACHE_TTL_SECONDS - 60
+    mod.fetch_player_data("player-11")
+
+    assert built == []
+    assert _decode_published_phases(redis_spy) == [
+        "snapshot",
+        "analysis",
+        "complete",
     ]
-    assert "xscraper.player_latest" in captured["sql"]
-    assert captured["params"] == {"player_id": "player-6"}
+
+    redis_spy.published.clear()
+    redis_spy.ttls[cache_key] = (
+        mod.PLAYER_CACHE_TTL_SECONDS - PLAYER_CACHE_SOFT_TTL_SECONDS - 1
+    )
+    mod.fetch_player_data("player-11")
+
+    assert built == ["player-11"]
+    assert redis_spy.published == []
+    assert redis_spy.get("fetch_player_data:player-11") is None
+
+
+def test_publish_player_chunk_uses_per_player_channel_when_enabled(
+    monkeypatch,
+):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+
+    mod.publish_player_chunk("player-1", "snapshot", {})
+    monkeypatch.setenv("PLAYER_PUBSUB_PER_PLAYER_CHANNELS", "1")
+    mod.publish_player_chunk("player-1", "analysis", {})
+
+    assert [channel for channel, _ in redis_spy.published] == [
+        PLAYER_PUBSUB_CHANNEL,
+        f"{PLAYER_PUBSUB_CHANNEL}:player-1",
+    ]
+
+
+def test_publish_player_chunk_compresses_frames_unless_disabled(monkeypatch):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+
+    mod.publish_player_chunk("player-1", "snapshot", {"player_data": []})
+    monkeypatch.setenv("PLAYER_PUBSUB_COMPRESSED_FRAMES", "0")
+    mod.publish_player_chunk("player-1", "analysis", {"player_data": []})
+
+    compressed, plain = [
+        decode_player_pubsub_message(message)
+        for _, message in redis_spy.published
+    ]
+    assert compressed[4] is True
+    assert orjson.loads(zlib.decompress(compressed[3]))["phase"] == "snapshot"
+    assert plain[4] is False
+    assert orjson.loads(plain[3])["phase"] == "analysis"
+
+
+def test_publish_cached_player_chunks_backfills_legacy_frame(monkeypatch):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    redis_spy = RedisSpy()
+    monkeypatch.setattr(mod, "redis_conn", redis_spy, raising=False)
+    cache_key = f"{PLAYER_LATEST_REDIS_KEY}:player-1"
+    cached = orjson.dumps(mod.build_empty_player_payload()).decode()
+
+    mod.publish_cached_player_chunks("player-1", cached, cache_key)
+
+    frame = redis_spy.get(f"{mod.PLAYER_LATEST_FRAME_REDIS_KEY}:player-1")
+    assert zlib.decompress(frame) == cached.encode()
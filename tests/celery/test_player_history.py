@@ -0,0 +1,134 @@
+import importlib
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import orjson
+import pytest
+
+from celery_app.tasks.player_history import (
+    PLAYER_HISTORY_COLUMNS,
+    aggregate_history_columns,
+    history_columns_from_rows,
+    history_rows_from_columns,
+    reduce_history_columns,
+)
+
+
+def _synthetic_db_rows(count: int, seed: int) -> list[tuple]:
+    rng = random.Random(seed)
+    started = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    modes = ["Rainmaker", "Splat Zones", "Tower Control"]
+    x_power = 2500.0
+    timestamp = started
+    rows = []
+    for index in range(count):
+        # Several modes are often scraped at the same timestamp.
+        if rng.random() < 0.7:
+            timestamp = timestamp + timedelta(minutes=rng.choice([10, 600]))
+        if rng.random() < 0.3:
+            x_power = round(x_power + rng.uniform(-20, 20), 1)
+        rows.append(
+            (
+                rng.choice(modes),
+                rng.random() < 0.5,
+                5 + index // 400,
+                timestamp,
+                x_power,
+                rng.choice([10, 20, 30]),
+                rng.randint(1, 500),
+                rng.random() < 0.15,
+            )
+        )
+    return rows
+
+
+def _as_dicts(rows: list[tuple]) -> list[dict]:
+    result = [dict(zip(PLAYER_HISTORY_COLUMNS, row)) for row in rows]
+    for row in result:
+        row["timestamp"] = row["timestamp"].isoformat()
+    return result
+
+
+@pytest.mark.parametrize("count,seed", [(0, 1), (1, 2), (250, 3), (3_000, 4)])
+def test_columnar_engine_matches_row_functions_byte_for_byte(count, seed):
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    rows = _synthetic_db_rows(count, seed)
+
+    expected_rows = mod.reduce_player_history_rows(_as_dicts(rows))
+    columns = history_columns_from_rows(rows)
+    mask = reduce_history_columns(columns)
+    reduced_rows = history_rows_from_columns(columns, mask)
+
+    assert orjson.dumps(reduced_rows) == orjson.dumps(expected_rows)
+    assert orjson.dumps(
+        aggregate_history_columns(columns, mask)
+    ) == orjson.dumps(mod.aggregate_player_analysis(expected_rows))
+
+
+def test_columnar_reducer_handles_nan_and_non_utc_timestamps():
+    mod = importlib.import_module("celery_app.tasks.player_detail")
+    offset = timezone(timedelta(hours=-5))
+    started = datetime(2024, 12, 1, 22, tzinfo=offset)
+    rows = [
+        ("Rainmaker", False, 5, started, float("nan"), 10, 3, False),
+        (
+            "Rainmaker",
+            False,
+            5,
+            started + timedelta(hours=1),
+            2600.0,
+            10,
+            3,
+            False,
+        ),
+        (
+            "Rainmaker",
+            False,
+            5,
+            started + timedelta(hours=2),
+            2600.0,
+            10,
+            3,
+            False,
+        ),
+        (
+            "Rainmaker",
+            False,
+            5,
+            started + timedelta(hours=3),
+            float("nan"),
+            10,
+            3,
+            False,
+        ),
+        (
+            "Rainmaker",
+            False,
+            5,
+            started + timedelta(hours=4),
+            2600.0,
+            10,
+            3,
+            False,
+        ),
+        (
+            "Rainmaker",
+            False,
+            5,
+            started + timedelta(hours=5),
+            2610.0,
+            10,
+            3,
+            True,
+        ),
+    ]
+
+    columns = history_columns_from_rows(rows)
+    mask = reduce_history_columns(columns)
+
+    expected = mod.reduce_player_history_rows(_as_dicts(rows))
+    assert [row["timestamp"] for row in expected] == [
+        row["timestamp"] for row in history_rows_from_columns(columns, mask)
+    ]
+    assert mask.dtype == np.bool_
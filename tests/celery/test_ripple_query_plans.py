@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+
+# Ensure DB env vars exist before importing modules that build SQLAlchemy engines
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_PORT", "5432")
+os.environ.setdefault("DB_USER", "user")
+os.environ.setdefault("DB_PASSWORD", "pass")
+os.environ.setdefault("DB_NAME", "db")
+os.environ.setdefault("RANKINGS_DB_NAME", "db")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from celery_app.tasks import ripple_snapshot as snapshot_mod
+from shared_lib.queries import ripple_queries
+
+DATABASE_URL = os.getenv("RANKINGS_TEST_DATABASE_URL")
+SCHEMA = "ripple_plan_test"
+PLAYER_TABLES = set(ripple_queries.PLAYER_ID_TABLES)
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL,
+    reason="set RANKINGS_TEST_DATABASE_URL to a scratch Postgres database",
+)
+
+# Just the columns the ripple lookups touch, with player_id as bigint and
+# the indexes the rankings schema keeps on it.
+FIXTURE_DDL = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+CREATE TABLE {SCHEMA}.players (
+    player_id bigint PRIMARY KEY,
+    display_name text,
+    discord_id text
+);
+CREATE TABLE {SCHEMA}.tournaments (
+    tournament_id bigint PRIMARY KEY,
+    name text,
+    start_time_ms bigint,
+    is_ranked boolean
+);
+CREATE TABLE {SCHEMA}.tournament_teams (
+    tournament_id bigint,
+    team_id bigint,
+    name text,
+    PRIMARY KEY (tournament_id, team_id)
+);
+CREATE TABLE {SCHEMA}.matches (
+    match_id bigint,
+    tournament_id bigint,
+    last_game_finished_at_ms bigint,
+    winner_team_id bigint,
+    loser_team_id bigint,
+    team1_id bigint,
+    team1_score int,
+    team2_id bigint,
+    team2_score int,
+    PRIMARY KEY (match_id, tournament_id)
+);
+CREATE TABLE {SCHEMA}.tournament_event_times (
+    tournament_id bigint PRIMARY KEY,
+    event_ms bigint
+);
+CREATE TABLE {SCHEMA}.player_appearance_teams (
+    player_id bigint,
+    tournament_id bigint,
+    team_id bigint,
+    match_id bigint
+);
+CREATE INDEX ON {SCHEMA}.player_appearance_teams (player_id);
+CREATE INDEX ON {SCHEMA}.player_appearance_teams
+    (tournament_id, match_id, team_id);
+CREATE TABLE {SCHEMA}.player_rankings (
+    player_id bigint,
+    calculated_at_ms bigint,
+    score double precision
+);
+CREATE INDEX ON {SCHEMA}.player_rankings (player_id, calculated_at_ms);
+CREATE TABLE {SCHEMA}.player_match_loo_impacts (
+    player_id bigint,
+    match_id bigint,
+    tournament_id bigint,
+    calculated_at_ms bigint,
+    build_version text,
+    player_rank int,
+    player_score double precision,
+    is_win boolean,
+    exact_score_delta double precision,
+    exact_abs_delta double precision
+);
+CREATE INDEX ON {SCHEMA}.player_match_loo_impacts
+    (player_id, calculated_at_ms);
+INSERT INTO {SCHEMA}.players
+SELECT g, 'Player ' || g, (900000 + g)::text FROM generate_series(1, 2000) g;
+INSERT INTO {SCHEMA}.tournaments
+SELECT g, 'Cup ' || g, g * 1000, true FROM generate_series(1, 50) g;
+INSERT INTO {SCHEMA}.tournament_event_times
+SELECT g, g * 1000 FROM generate_series(1, 50) g;
+INSERT INTO {SCHEMA}.player_appearance_teams
+SELECT p, t, p % 8, t * 10 + p % 4
+FROM generate_series(1, 2000) p, generate_series(1, 5) t;
+INSERT INTO {SCHEMA}.player_rankings
+SELECT p, c * 1000, p / 100.0
+FROM generate_series(1, 2000) p, generate_series(1, 5) c;
+INSERT INTO {SCHEMA}.player_match_loo_impacts
+SELECT p, t * 10 + p % 4, t, 5000, 'v1', 1, 1.0, true, 0.1, 0.1
+FROM generate_series(1, 2000) p, generate_series(1, 5) t;
+ANALYZE;
+"""
+
+
+class _ExplainingSession:
+    """Runs EXPLAIN ahead of every statement and keeps the plans."""
+
+    def __init__(self, session, plans: list):
+        self._session = session
+        self._plans = plans
+
+    async def execute(self, query, params=None):
+        explain = text(f"EXPLAIN (FORMAT JSON) {query.text}").bindparams(
+            *query._bindparams.values()
+        )
+        result = await self._session.execute(explain, params)
+        self._plans.append(result.scalar()[0]["Plan"])
+        return await self._session.execute(query, params)
+
+    async def rollback(self):
+        await self._session.rollback()
+
+
+def _probed(plan) -> set[str]:
+    """Player tables the plan looks up through a player_id index."""
+    probed = set()
+    relation = plan.get("Relation Name") or plan.get("Index Name", "")
+    condition = plan.get("Index Cond") or plan.get("Recheck Cond") or ""
+    if "player_id" in condition:
+        probed |= {table for table in PLAYER_TABLES if table in relation}
+    for child in plan.get("Plans", []):
+        probed |= _probed(child)
+    return probed
+
+
+async def _fetch_plans(typed: bool) -> dict[str, set[str]]:
+    engine = create_async_engine(
+        DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+    )
+    player_ids = [str(player_id) for player_id in range(1, 201)]
+    fetches = {
+        "events": lambda s: snapshot_mod._fetch_player_events(s, player_ids),
+        "history": lambda s: snapshot_mod._fetch_player_ranked_history(
+            s, player_ids
+        ),
+        "owners": lambda s: snapshot_mod._fetch_player_owner_discord_ids(
+            s, player_ids
+        ),
+        "match_loo": lambda s: snapshot_mod._fetch_player_match_loo_impacts(
+            s, player_ids, calculated_at_ms=5000, build_version="v1"
+        ),
+        "first_scores": lambda s: snapshot_mod._first_scores_after_events(
+            s, {player_id: 2000 for player_id in player_ids}
+        ),
+    }
+    probed: dict[str, set[str]] = {}
+    try:
+        async with AsyncSession(engine) as session:
+            async with session.begin():
+                for statement in FIXTURE_DDL.split(";"):
+                    if statement.strip():
+                        await session.execute(text(statement))
+            async with session.begin():
+                # The fixture is small enough that a scan would otherwise
+                # win; this way any player_id index a filter allows is used.
+                await session.execute(text("SET LOCAL enable_seqscan = off"))
+                if typed:
+                    await ripple_queries.refresh_player_id_types(session)
+                for name, fetch in fetches.items():
+                    plans: list = []
+                    assert await fetch(_ExplainingSession(session, plans))
+                    probed[name] = set().union(*map(_probed, plans))
+            async with session.begin():
+                await session.execute(
+                    text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                )
+    finally:
+        await engine.dispose()
+    return probed
+
+
+def test_player_lookups_use_player_id_indexes(monkeypatch):
+    monkeypatch.setenv("RANKINGS_DB_SCHEMA", SCHEMA)
+    monkeypatch.setattr(ripple_queries, "_PLAYER_ID_TYPES", {})
+
+    probed = asyncio.run(_fetch_plans(typed=True))
+
+    assert ripple_queries.player_id_type("player_rankings") == "bigint"
+    assert probed == {
+        "events": {"player_appearance_teams"},
+        "history": {"player_appearance_teams"},
+        "owners": {"players"},
+        "match_loo": {"player_appearance_teams", "player_match_loo_impacts"},
+        "first_scores": {"player_rankings"},
+    }
+
+
+def test_text_cast_filters_cannot_use_player_id_indexes(monkeypatch):
+    # The regression the typed filters guard against: with the column cast
+    # to text, no player_id index applies and the tables are read in full.
+    monkeypatch.setenv("RANKINGS_DB_SCHEMA", SCHEMA)
+    monkeypatch.setattr(ripple_queries, "_PLAYER_ID_TYPES", {})
+
+    probed = asyncio.run(_fetch_plans(typed=False))
+
+    assert not probed["events"]
+    assert not probed["first_scores"]
@@ -24,6 +24,7 @@ from shared_lib.constants import (
     RIPPLE_DANGER_LATEST_KEY,
     RIPPLE_PLAYER_INDEX_LATEST_KEY,
     RIPPLE_PLAYER_INDEX_META_KEY,
+    RIPPLE_PLAYER_INDEX_PENDING_KEY,
     RIPPLE_PLAYER_INDEX_PLAYER_HISTORY_PREFIX,
     RIPPLE_PLAYER_INDEX_PLAYER_PREFIX,
     RIPPLE_PLAYER_INDEX_PLAYER_RESULTS_PREFIX,
@@ -34,10 +35,13 @@ from shared_lib.constants import (
     RIPPLE_STABLE_META_KEY,
     RIPPLE_STABLE_STATE_KEY,
 )
+from shared_lib.payload_utils import ripple_player_index_key
 
 
-def _player_index_key(player_id: str) -> str:
-    return f"{RIPPLE_PLAYER_INDEX_PLAYER_PREFIX}{player_id}"
+def _player_index_key(player_id: str, generation: str | None = None) -> str:
+    return ripple_player_index_key(
+        RIPPLE_PLAYER_INDEX_PLAYER_PREFIX, player_id, generation
+    )
 
 
 def _player_index_summary_key(player_id: str) -> str:
@@ -52,6 +56,14 @@ def _player_index_results_key(player_id: str) -> str:
     return f"{RIPPLE_PLAYER_INDEX_PLAYER_RESULTS_PREFIX}{player_id}"
 
 
+def _player_index_section(
+    fake_redis, player_id: str, generation: str, section: str
+):
+    return orjson.loads(
+        fake_redis.hget(_player_index_key(player_id, generation), section)
+    )
+
+
 def test_fetch_player_ranked_history_limits_and_sorts():
     rows = [
         {
@@ -784,7 +796,7 @@ def test_refresh_ripple_snapshots_persists_payloads(monkeypatch):
         snapshot_mod, "rankings_async_session", FakeScoped(), raising=False
     )
 
-    snapshot_mod.refresh_ripple_snapshots()
+    result = snapshot_mod.refresh_ripple_snapshots()
 
     stable_payload = orjson.loads(fake_redis.get(RIPPLE_STABLE_LATEST_KEY))
     assert stable_payload["record_count"] == 2
@@ -814,57 +826,68 @@ def test_refresh_ripple_snapshots_persists_payloads(monkeypatch):
     )
     assert player_index_payload["record_count"] == 2
     assert set(player_index_payload["player_ids"]) == {"p1", "p2"}
+    generation = player_index_payload["generation"]
     assert fake_redis.hget(RIPPLE_PLAYER_OWNER_DISCORD_HASH_KEY, "p1") == "11111"
     assert fake_redis.hget(RIPPLE_PLAYER_OWNER_DISCORD_HASH_KEY, "p2") == "22222"
 
-    player_one_payload = orjson.loads(fake_redis.get(_player_index_key("p1")))
-    assert player_one_payload["eligible"] is True
-    assert player_one_payload["minimum_required_tournaments"] == 3
-    assert player_one_payload["history_record_count"] == 1
-    assert (
-        player_one_payload["tournament_history_ranked"][0]["tournament_name"]
-        == "Winter Open"
-    )
-    assert player_one_payload["match_loo_record_count"] == 1
-    assert player_one_payload["match_loo_impacts"][0]["match_id"] == 501
-    assert (
-        player_one_payload["match_loo_impacts"][0]["player_team_name"]
-        == "Ink Storm"
-    )
-    assert (
-        player_one_payload["match_loo_impacts"][0]["player_team_players"][0]
-        == "Player One"
-    )
-
-    player_two_payload = orjson.loads(fake_redis.get(_player_index_key("p2")))
-    assert player_two_payload["history_record_count"] == 0
-    assert player_two_payload["match_loo_record_count"] == 0
-    player_one_summary = orjson.loads(
-        fake_redis.get(_player_index_summary_key("p1"))
+    # Each player is one hash of sections; no full-payload copy is stored.
+    assert set(fake_redis.hgetall(_player_index_key("p1", generation))) == {
+        "summary",
+        "history",
+        "results",
+    }
+    player_one_summary = _player_index_section(
+        fake_redis, "p1", generation, "summary"
     )
+    assert player_one_summary["eligible"] is True
+    assert player_one_summary["minimum_required_tournaments"] == 3
+    assert player_one_summary["history_record_count"] == 1
+    assert player_one_summary["match_loo_record_count"] == 1
     assert "tournament_history_ranked" not in player_one_summary
     assert "match_loo_impacts" not in player_one_summary
-    player_one_history = orjson.loads(
-        fake_redis.get(_player_index_history_key("p1"))
+    player_one_history = _player_index_section(
+        fake_redis, "p1", generation, "history"
     )
     assert player_one_history["history_record_count"] == 1
     assert player_one_history["tournament_history_ranked"][0][
         "tournament_name"
     ] == "Winter Open"
-    player_one_results = orjson.loads(
-        fake_redis.get(_player_index_results_key("p1"))
+    player_one_results = _player_index_section(
+        fake_redis, "p1", generation, "results"
     )
     assert player_one_results["match_loo_record_count"] == 1
     assert player_one_results["match_loo_impacts"][0]["match_id"] == 501
-    assert fake_redis.get(_player_index_key("stale-player")) is None
-    assert fake_redis.get(_player_index_summary_key("stale-player")) is None
-    assert fake_redis.get(_player_index_history_key("stale-player")) is None
-    assert fake_redis.get(_player_index_results_key("stale-player")) is None
+    assert (
+        player_one_results["match_loo_impacts"][0]["player_team_name"]
+        == "Ink Storm"
+    )
+    assert (
+        player_one_results["match_loo_impacts"][0]["player_team_players"][0]
+        == "Player One"
+    )
+    player_two_summary = _player_index_section(
+        fake_redis, "p2", generation, "summary"
+    )
+    assert player_two_summary["history_record_count"] == 0
+    assert player_two_summary["match_loo_record_count"] == 0
+    # The previous, unversioned generation expires after the pointer flip.
+    assert (
+        fake_redis.ttl(_player_index_key("stale-player"))
+        == snapshot_mod.PLAYER_INDEX_GC_GRACE_SECONDS
+    )
+    assert (
+        fake_redis.hgetall(_player_index_key("stale-player", generation)) == {}
+    )
 
     player_index_meta = orjson.loads(
         fake_redis.get(RIPPLE_PLAYER_INDEX_META_KEY)
     )
     assert player_index_meta["record_count"] == 2
+    assert player_index_meta["generation"] == generation
+    assert fake_redis.ttl(_player_index_key("p1", generation)) == -1
+    memory = result["player_index_memory"]
+    assert memory["sampled_players"] == 2
+    assert memory["estimated_total_bytes"] >= memory["max_bytes_per_player"]
 
     state = orjson.loads(fake_redis.get(RIPPLE_STABLE_STATE_KEY))
     assert set(state.keys()) == {"p1", "p2"}
@@ -872,6 +895,349 @@ def test_refresh_ripple_snapshots_persists_payloads(monkeypatch):
     assert state["p1"]["tournament_count"] == 6
 
 
+def test_publish_player_index_batches_and_flips_generation(monkeypatch):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(snapshot_mod, "redis_conn", fake_redis, raising=False)
+    monkeypatch.setattr(snapshot_mod, "PLAYER_INDEX_PUBLISH_BATCH_SIZE", 2)
+    pipelines = []
+    make_pipeline = fake_redis.pipeline
+
+    def _pipeline(transaction=True):
+        pipelines.append(transaction)
+        return make_pipeline(transaction)
+
+    monkeypatch.setattr(fake_redis, "pipeline", _pipeline)
+    for player_id in ("p1", "gone"):
+        fake_redis.hset(
+            _player_index_key(player_id, "100"), mapping={"summary": b"{}"}
+        )
+    players = {
+        player_id: {"player_id": player_id, "match_loo_impacts": []}
+        for player_id in ("p1", "p2", "p3")
+    }
+
+    snapshot_mod._publish_player_index(
+        players,
+        index_payload={"generation": "200", "player_ids": sorted(players)},
+        meta_payload={"generation": "200", "record_count": 3},
+        previous_player_ids={"p1", "gone"},
+        previous_generation="100",
+    )
+
+    # Two write batches, one MULTI/EXEC pointer flip, one expiry batch.
+    assert pipelines == [False, False, True, False]
+    for player_id in players:
+        summary = _player_index_section(fake_redis, player_id, "200", "summary")
+        assert summary == {"player_id": player_id}
+        results = _player_index_section(fake_redis, player_id, "200", "results")
+        assert results["match_loo_impacts"] == []
+    meta = orjson.loads(fake_redis.get(RIPPLE_PLAYER_INDEX_META_KEY))
+    assert meta["generation"] == "200"
+    for player_id in ("p1", "gone"):
+        assert (
+            fake_redis.ttl(_player_index_key(player_id, "100"))
+            == snapshot_mod.PLAYER_INDEX_GC_GRACE_SECONDS
+        )
+
+
+def test_publish_player_index_expires_generation_of_failed_run(monkeypatch):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(snapshot_mod, "redis_conn", fake_redis, raising=False)
+    make_pipeline = fake_redis.pipeline
+
+    def _failing_flip(transaction=True):
+        pipe = make_pipeline(transaction)
+        if transaction:
+
+            def _execute():
+                raise ConnectionError("lost redis before the flip")
+
+            pipe.execute = _execute
+        return pipe
+
+    players = {
+        player_id: {"player_id": player_id} for player_id in ("p1", "p2")
+    }
+
+    def _publish(generation):
+        snapshot_mod._publish_player_index(
+            players,
+            index_payload={"generation": generation, "player_ids": ["p1"]},
+            meta_payload={"generation": generation, "record_count": 2},
+            previous_player_ids=set(),
+            previous_generation=None,
+        )
+
+    monkeypatch.setattr(fake_redis, "pipeline", _failing_flip)
+    with pytest.raises(ConnectionError):
+        _publish("100")
+    assert fake_redis.get(RIPPLE_PLAYER_INDEX_META_KEY) is None
+    assert fake_redis.get(RIPPLE_PLAYER_INDEX_PENDING_KEY) == "100"
+
+    monkeypatch.setattr(fake_redis, "pipeline", make_pipeline)
+    _publish("200")
+
+    grace = snapshot_mod.PLAYER_INDEX_GC_GRACE_SECONDS
+    for player_id in players:
+        assert fake_redis.ttl(_player_index_key(player_id, "100")) == grace
+        assert fake_redis.ttl(_player_index_key(player_id, "200")) == -1
+    assert (
+        fake_redis.ttl(snapshot_mod._player_index_digests_key("100")) == grace
+    )
+    assert fake_redis.get(RIPPLE_PLAYER_INDEX_PENDING_KEY) is None
+
+
+def test_publish_player_index_copies_unchanged_players(monkeypatch):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(snapshot_mod, "redis_conn", fake_redis, raising=False)
+    players = {
+        player_id: {"player_id": player_id, "display_score": 150.0}
+        for player_id in ("p1", "p2", "p3")
+    }
+    players["p2"]["display_score"] = 151.0
+    # Stored under the old generation as-is, so a copy is observable.
+    fake_redis.hset(_player_index_key("p1", "100"), mapping={"summary": "old"})
+    fake_redis.hset(_player_index_key("p2", "100"), mapping={"summary": "old"})
+    previous_digests = {
+        player_id: snapshot_mod._player_payload_digest(
+            {**players[player_id], "display_score": 150.0}
+        )
+        for player_id in players
+    }
+    fake_redis.hset(
+        snapshot_mod._player_index_digests_key("100"), mapping=previous_digests
+    )
+
+    counts = snapshot_mod._publish_player_index(
+        players,
+        index_payload={"generation": "200", "player_ids": sorted(players)},
+        meta_payload={"generation": "200", "record_count": 3},
+        previous_player_ids={"p1", "p2"},
+        previous_generation="100",
+        previous_digests=previous_digests,
+    )
+
+    # p1 is copied; p2 changed; p3's old hash is gone, so it is rewritten.
+    assert counts == {"rewritten_players": 2, "unchanged_players": 1}
+    assert fake_redis.hget(_player_index_key("p1", "200"), "summary") == "old"
+    for player_id in ("p2", "p3"):
+        summary = _player_index_section(fake_redis, player_id, "200", "summary")
+        assert summary["display_score"] == players[player_id]["display_score"]
+    digests = fake_redis.hgetall(snapshot_mod._player_index_digests_key("200"))
+    assert digests["p1"] == previous_digests["p1"]
+    assert digests["p2"] != previous_digests["p2"]
+    assert (
+        fake_redis.ttl(snapshot_mod._player_index_digests_key("100"))
+        == snapshot_mod.PLAYER_INDEX_GC_GRACE_SECONDS
+    )
+
+
+def test_player_index_sources_refetch_only_active_players(monkeypatch):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(snapshot_mod, "redis_conn", fake_redis, raising=False)
+    for player_id in ("quiet", "active"):
+        fake_redis.hset(
+            _player_index_key(player_id, "100"),
+            mapping={
+                "history": orjson.dumps(
+                    {
+                        "history_generated_at_ms": 100,
+                        "tournament_history_ranked": [{"tournament_id": 1}],
+                    }
+                ),
+                "results": orjson.dumps(
+                    {
+                        "match_loo_generated_at_ms": 100,
+                        "match_loo_impacts": [{"match_id": 9}],
+                    }
+                ),
+            },
+        )
+    base = {
+        "generation": "100",
+        "calculated_at_ms": 5_000_000_000,
+        "build_version": "v1",
+        "full_refresh_generated_at_ms": 100,
+        "player_ids": {"quiet", "active"},
+    }
+    history_calls = []
+    loo_calls = []
+
+    async def fake_history(session, player_ids, max_per_player):
+        history_calls.append(list(player_ids))
+        return {pid: [{"tournament_id": 2}] for pid in player_ids}
+
+    async def fake_loo(session, player_ids, **kwargs):
+        loo_calls.append(list(player_ids))
+        return {pid: [{"match_id": 10}] for pid in player_ids}
+
+    monkeypatch.setattr(
+        snapshot_mod, "_fetch_player_ranked_history", fake_history
+    )
+    monkeypatch.setattr(
+        snapshot_mod, "_fetch_player_match_loo_impacts", fake_loo
+    )
+    player_ids = ["active", "new", "quiet"]
+
+    history, loo, carried, stats = asyncio.run(
+        snapshot_mod._fetch_player_index_sources(
+            object(),
+            player_ids,
+            calculated_at_ms=base["calculated_at_ms"],
+            build_version="v1",
+            base=base,
+            active_player_ids={"active"},
+        )
+    )
+
+    assert history_calls == [["active", "new"]]
+    assert loo_calls == [["active", "new"]]
+    assert history["quiet"] == [{"tournament_id": 1}]
+    assert loo["quiet"] == [{"match_id": 9}]
+    assert history["active"] == [{"tournament_id": 2}]
+    assert set(carried["history"]) == {"quiet"}
+    assert stats == {
+        "mode": "incremental",
+        "history_fetched_players": 2,
+        "match_loo_fetched_players": 2,
+    }
+
+    # A new calculation invalidates every LOO row, quiet players included.
+    loo_calls.clear()
+    _, _, carried, stats = asyncio.run(
+        snapshot_mod._fetch_player_index_sources(
+            object(),
+            player_ids,
+            calculated_at_ms=base["calculated_at_ms"] + 1,
+            build_version="v1",
+            base=base,
+            active_player_ids={"active"},
+        )
+    )
+    assert loo_calls == [player_ids]
+    assert carried["results"] == {}
+    assert stats["match_loo_fetched_players"] == 3
+
+
+def test_snapshot_pool_runs_batches_in_parallel_on_one_snapshot(monkeypatch):
+    monkeypatch.setattr(snapshot_mod, "PLAYER_HISTORY_CHUNK_SIZE", 1)
+    statements = []
+    running = 0
+    peak = 0
+
+    class FakeResult:
+        def __init__(self, rows):
+            self._rows = rows
+
+        def mappings(self):
+            return self
+
+        def all(self):
+            return self._rows
+
+    class FakeSession:
+        def __init__(self):
+            self.snapshot = None
+
+        @asynccontextmanager
+        async def begin(self):
+            yield
+
+        async def execute(self, query, params=None):
+            nonlocal running, peak
+            sql = str(query)
+            if sql.startswith("SET TRANSACTION SNAPSHOT"):
+                self.snapshot = sql
+                return FakeResult([])
+            statements.append((self.snapshot, params["player_ids"]))
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return FakeResult(
+                [
+                    {
+                        "player_id": player_id,
+                        "tournament_id": 1,
+                        "event_ms": 1_000,
+                        "is_ranked": True,
+                        "wins": 1,
+                        "losses": 0,
+                    }
+                    for player_id in params["player_ids"]
+                ]
+            )
+
+    @asynccontextmanager
+    async def fake_snapshot_session():
+        yield FakeSession()
+
+    monkeypatch.setattr(
+        snapshot_mod, "rankings_snapshot_session", fake_snapshot_session
+    )
+
+    class ExportResult:
+        def scalar(self):
+            return "00000003-0000001B-1"
+
+    class RefreshSession:
+        async def execute(self, query, params=None):
+            assert "pg_export_snapshot" in str(query)
+            return ExportResult()
+
+    monkeypatch.setenv("RIPPLE_REFRESH_FETCH_PARALLELISM", "2")
+    pool = asyncio.run(
+        snapshot_mod._open_snapshot_session_pool(RefreshSession())
+    )
+
+    history = asyncio.run(
+        snapshot_mod._fetch_player_ranked_history(pool, ["p1", "p2", "p3"])
+    )
+
+    assert set(history) == {"p1", "p2", "p3"}
+    assert sorted(batch for _, batch in statements) == [
+        ["p1"],
+        ["p2"],
+        ["p3"],
+    ]
+    assert {snapshot for snapshot, _ in statements} == {
+        "SET TRANSACTION SNAPSHOT '00000003-0000001B-1'"
+    }
+    assert peak == 2
+
+
+def test_snapshot_pool_falls_back_to_the_refresh_session(monkeypatch):
+    class Result:
+        def __init__(self, value):
+            self._value = value
+
+        def scalar(self):
+            return self._value
+
+    class Session:
+        def __init__(self, value):
+            self.value = value
+            self.executed = 0
+
+        async def execute(self, query, params=None):
+            self.executed += 1
+            return Result(self.value)
+
+    monkeypatch.setenv("RIPPLE_REFRESH_FETCH_PARALLELISM", "1")
+    session = Session("00000003-0000001B-1")
+    assert asyncio.run(snapshot_mod._open_snapshot_session_pool(session)) is (
+        session
+    )
+    assert session.executed == 0
+
+    # Anything that is not an exported snapshot id is never inlined.
+    monkeypatch.setenv("RIPPLE_REFRESH_FETCH_PARALLELISM", "4")
+    session = Session("1'; DROP TABLE players; --")
+    assert asyncio.run(snapshot_mod._open_snapshot_session_pool(session)) is (
+        session
+    )
+
+
 def test_bootstrap_rebuilds_stable_state(monkeypatch):
     fake_redis = FakeRedis()
     # Prepopulate state with old tournament timestamp
@@ -1036,3 +1402,54 @@ def test_build_player_index_payload_preserves_private_scores_for_admins():
     assert player_payload["private_stable_rank"] == 21
     assert player_payload["private_stable_score"] == pytest.approx(1.75)
     assert player_payload["private_display_score"] == pytest.approx(193.75)
+
+
+def test_fetch_analytics_schema_columns_groups_columns_by_table():
+    class FakeMappings:
+        def all(self):
+            return [
+                {"table_name": "matches", "column_name": "match_id"},
+                {"table_name": "matches", "column_name": "team1_id"},
+                {"table_name": "rounds", "column_name": "round_no"},
+            ]
+
+    class FakeResult:
+        def mappings(self):
+            return FakeMappings()
+
+    class FakeSession:
+        def __init__(self):
+            self.params = None
+
+        async def execute(self, _query, params=None):
+            self.params = params
+            return FakeResult()
+
+        @asynccontextmanager
+        async def begin(self):
+            yield
+
+    session = FakeSession()
+    columns = asyncio.run(snapshot_mod._fetch_analytics_schema_columns(session))
+
+    assert columns["matches"] == ["match_id", "team1_id"]
+    assert columns["rounds"] == ["round_no"]
+    assert columns["players"] == []
+    assert session.params["tables"] == list(
+        snapshot_mod.ANALYTICS_SCHEMA_COLUMNS_TABLES
+    )
+
+
+def test_fetch_analytics_schema_columns_tolerates_catalog_errors():
+    class FakeSession:
+        async def execute(self, _query, params=None):
+            raise RuntimeError("permission denied for information_schema")
+
+        @asynccontextmanager
+        async def begin(self):
+            yield
+
+    assert (
+        asyncio.run(snapshot_mod._fetch_analytics_schema_columns(FakeSession()))
+        is None
+    )
@@ -56,6 +56,26 @@ class _FakePipeline:
         self._ops.append(("hgetall", key))
         return self
 
+    def get(self, key):
+        self._ops.append(("get", key))
+        return self
+
+    def hget(self, key, field):
+        self._ops.append(("hget", key, field))
+        return self
+
+    def copy(self, source, destination, replace=False):
+        self._ops.append(("copy", source, destination, replace))
+        return self
+
+    def ttl(self, key):
+        self._ops.append(("ttl", key))
+        return self
+
+    def memory_usage(self, key, samples=None):
+        self._ops.append(("memory_usage", key))
+        return self
+
     def execute(self):
         out = []
         for op in self._ops:
@@ -67,7 +87,11 @@ class _FakePipeline:
                 )
                 out.append(self._store._counters[key])
             elif name == "expire":
-                out.append(True)
+                _, key, ttl = op
+                exists = key in self._store._kv or key in self._store._hashes
+                if exists:
+                    self._store._ttls[key] = ttl
+                out.append(exists)
             elif name == "set":
                 _, key, val = op
                 self._store._kv[key] = val
@@ -110,6 +134,21 @@ class _FakePipeline:
             elif name == "hgetall":
                 _, key = op
                 out.append(self._store._hashes.get(key, {}).copy())
+            elif name == "get":
+                _, key = op
+                out.append(self._store.get(key))
+            elif name == "hget":
+                _, key, field = op
+                out.append(self._store.hget(key, field))
+            elif name == "copy":
+                _, source, destination, replace = op
+                out.append(self._store.copy(source, destination, replace))
+            elif name == "ttl":
+                _, key = op
+                out.append(self._store.ttl(key))
+            elif name == "memory_usage":
+                _, key = op
+                out.append(self._store.memory_usage(key))
             else:
                 out.append(None)
         self._ops.clear()
@@ -123,6 +162,7 @@ class FakeRedis:
         self._hashes = {}
         self._lists = {}
         self._counters = {}
+        self._ttls = {}
 
     # Set ops
     def sismember(self, key, member):
@@ -145,10 +185,26 @@ class FakeRedis:
         if nx and key in self._kv:
             return False
         self._kv[key] = val
+        if ex is not None:
+            self._ttls[key] = ex
+        else:
+            self._ttls.pop(key, None)
         return True
 
+    def ttl(self, key):
+        if key not in self._kv and key not in self._hashes:
+            return -2
+        return self._ttls.get(key, -1)
+
+    def expire(self, key, ttl):
+        exists = key in self._kv or key in self._hashes
+        if exists:
+            self._ttls[key] = ttl
+        return exists
+
     def setex(self, key, ttl, value):
         self._kv[key] = value
+        self._ttls[key] = ttl
         return True
 
     def delete(self, key):
@@ -157,6 +213,15 @@ class FakeRedis:
         self._lists.pop(key, None)
         self._sets.pop(key, None)
 
+    def eval(self, script, numkeys, *keys_and_args):
+        # Only the token lock release is modelled: delete KEYS[1] if it still
+        # holds ARGV[1].
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        if self._kv.get(keys[0]) != args[0]:
+            return 0
+        self.delete(keys[0])
+        return 1
+
     # Hash ops
     def hgetall(self, key):
         return self._hashes.get(key, {}).copy()
@@ -176,6 +241,39 @@ class FakeRedis:
     def hget(self, key, field):
         return self._hashes.get(key, {}).get(field)
 
+    def copy(self, source, destination, replace=False):
+        exists = destination in self._kv or destination in self._hashes
+        if exists and not replace:
+            return False
+        if source in self._hashes:
+            self._kv.pop(destination, None)
+            self._hashes[destination] = dict(self._hashes[source])
+        elif source in self._kv:
+            self._hashes.pop(destination, None)
+            self._kv[destination] = self._kv[source]
+        else:
+            return False
+        if source in self._ttls:
+            self._ttls[destination] = self._ttls[source]
+        else:
+            self._ttls.pop(destination, None)
+        return True
+
+    def hmget(self, key, keys, *args):
+        store = self._hashes.get(key, {})
+        fields = [keys] if isinstance(keys, str) else list(keys)
+        return [store.get(field) for field in [*fields, *args]]
+
+    def memory_usage(self, key, samples=None):
+        if key in self._hashes:
+            return sum(
+                len(field) + len(value)
+                for field, value in self._hashes[key].items()
+            )
+        if key in self._kv:
+            return len(self._kv[key])
+        return None
+
     def hdel(self, key, *fields):
         if not fields:
             return 0
@@ -272,10 +370,59 @@ class FakeRedis:
         return self._counters[key]
 
     # Pipeline for rate limiter and admin ops
-    def pipeline(self):
+    def pipeline(self, transaction=True):
         return _FakePipeline(self)
 
 
+class _AsyncFakePipeline:
+    """Queues commands synchronously and awaits execute, like redis.asyncio."""
+
+    def __init__(self, pipe):
+        self._pipe = pipe
+
+    def __getattr__(self, name):
+        command = getattr(self._pipe, name)
+
+        def _queue(*args, **kwargs):
+            command(*args, **kwargs)
+            return self
+
+        return _queue
+
+    async def execute(self):
+        return self._pipe.execute()
+
+
+class AsyncFakeRedis:
+    """Awaitable view over a sync fake so both clients share one store."""
+
+    def __init__(self, sync_redis):
+        self._sync = sync_redis
+
+    def pipeline(self, *args, **kwargs):
+        return _AsyncFakePipeline(self._sync.pipeline())
+
+    def __getattr__(self, name):
+        command = getattr(self._sync, name)
+        if not callable(command):
+            return command
+
+        async def _call(*args, **kwargs):
+            return command(*args, **kwargs)
+
+        return _call
+
+
+def patch_async_redis(monkeypatch, module, redis):
+    """Points a module's async Redis clients at ``redis`` (a sync fake)."""
+    async_redis = AsyncFakeRedis(redis)
+    monkeypatch.setattr(module, "async_redis_conn", async_redis, raising=False)
+    monkeypatch.setattr(
+        module, "async_binary_redis_conn", async_redis, raising=False
+    )
+    return async_redis
+
+
 @pytest.fixture()
 def fake_redis():
     return FakeRedis()
@@ -442,6 +589,8 @@ def app(fake_redis, monkeypatch, tmp_path):
     monkeypatch.setattr(
         lookup_store_mod.conn_mod, "redis_conn", fake_redis, raising=False
     )
+    for mod in (conn_mod, mw_mod, ripple_public_mod, search_mod):
+        patch_async_redis(monkeypatch, mod, fake_redis)
     limiter_storage = getattr(conn_mod.limiter, "_storage", None)
     if limiter_storage is not None and hasattr(limiter_storage, "reset"):
         limiter_storage.reset()
@@ -468,6 +617,8 @@ def app(fake_redis, monkeypatch, tmp_path):
     # Avoid real DB session creation in ripple routes by patching context manager
     import fast_api_app.routes.ripple as ripple_mod
 
+    patch_async_redis(monkeypatch, ripple_mod, fake_redis)
+
     @asynccontextmanager
     async def _dummy_session():
         class _S:  # bare dummy session
@@ -573,6 +724,15 @@ def client_factory(fake_redis, monkeypatch, tmp_path_factory):
             monkeypatch.setattr(
                 lookup_store_mod.conn_mod, "redis_conn", r, raising=False
             )
+            for mod in (
+                comp_auth_mod,
+                conn_mod,
+                mw_mod,
+                ripple_mod,
+                ripple_public_mod,
+                search_mod,
+            ):
+                patch_async_redis(monkeypatch, mod, r)
             limiter_storage = getattr(conn_mod.limiter, "_storage", None)
             if limiter_storage is not None and hasattr(
                 limiter_storage, "reset"
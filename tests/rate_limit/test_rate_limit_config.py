@@ -31,7 +31,9 @@ def test_rate_limit_outage_behavior(client_factory, monkeypatch, env, expected):
             raise RuntimeError("down")
 
         # Make pipeline blow up to simulate outage
-        monkeypatch.setattr(mw_mod.redis_conn, "pipeline", _boom, raising=False)
+        monkeypatch.setattr(
+            mw_mod.async_redis_conn, "pipeline", _boom, raising=False
+        )
 
         r = c.get("/api/ripple/leaderboard/docs")
         assert r.status_code == expected
@@ -5,6 +5,7 @@ from urllib.parse import parse_qs, urlparse
 import orjson
 
 from shared_lib.constants import (
+    COMP_LEADERBOARD_FLAG_KEY,
     RIPPLE_DANGER_LATEST_KEY,
     RIPPLE_PLAYER_INDEX_LATEST_KEY,
     RIPPLE_PLAYER_INDEX_META_KEY,
@@ -550,6 +551,61 @@ def test_public_player_profile_returns_results_for_cached_db_owner(
         assert data["match_loo_impacts"][0]["match_id"] == 501
 
 
+def test_public_player_routes_read_flag_and_owner_without_sync_redis(
+    client_factory, fake_redis, monkeypatch
+):
+    import fast_api_app.comp_auth as comp_auth_mod
+    import fast_api_app.feature_flags as feature_flags_mod
+
+    class _BlockingRedis:
+        def __getattr__(self, name):
+            raise AssertionError(f"sync redis {name} called on the loop")
+
+    generated_at = _now_ms()
+    fake_redis.set(
+        _player_index_key("p1"),
+        orjson.dumps(
+            {
+                "player_id": "p1",
+                "display_name": "Player 1",
+                "eligible": True,
+                "generated_at_ms": generated_at,
+                "match_loo_record_count": 1,
+                "match_loo_impacts": [{"match_id": 501}],
+            }
+        ),
+    )
+    fake_redis.hset(
+        RIPPLE_PLAYER_OWNER_DISCORD_HASH_KEY,
+        mapping={"p1": "11111"},
+    )
+
+    with client_factory(
+        env={
+            "COMP_LEADERBOARD_ENABLED": "true",
+            "COMP_AUTH_SESSION_SECRET": "test-comp-session-secret",
+            "COMP_DISCORD_CLIENT_ID": "discord-client-id",
+            "COMP_DISCORD_CLIENT_SECRET": "discord-client-secret",
+            "COMP_DISCORD_REDIRECT_URI": (
+                "http://localhost:5000/api/comp-auth/discord/callback"
+            ),
+            "COMP_AUTH_FRONTEND_URL": "http://comp.localhost:3000",
+        },
+        redis=fake_redis,
+    ) as client:
+        _login_comp_user(client, monkeypatch, "11111")
+        monkeypatch.setattr(feature_flags_mod, "_redis", _BlockingRedis)
+        monkeypatch.setattr(comp_auth_mod, "redis_conn", _BlockingRedis())
+
+        res = client.get("/api/ripple/public/player/p1/summary")
+        assert res.status_code == 200
+        assert res.json()["viewer_can_view_results"] is True
+
+        fake_redis.set(COMP_LEADERBOARD_FLAG_KEY, "0")
+        res = client.get("/api/ripple/public/player/p1/summary")
+        assert res.status_code == 404
+
+
 def test_admin_player_profile_returns_unredacted_values_for_admin(
     client_factory, fake_redis, monkeypatch
 ):
@@ -1427,6 +1483,60 @@ def test_public_player_summary_omits_heavy_arrays(
         assert "match_loo_record_count" not in data
 
 
+def test_public_player_reads_follow_index_generation(
+    client_factory, fake_redis
+):
+    generated_at = _now_ms()
+    meta_payload = {
+        "generated_at_ms": generated_at,
+        "generation": str(generated_at),
+        "calculated_at_ms": generated_at - 1_000,
+        "build_version": "2024.09.01",
+        "minimum_required_tournaments": 3,
+        "record_count": 1,
+    }
+    fake_redis.set(RIPPLE_PLAYER_INDEX_META_KEY, orjson.dumps(meta_payload))
+    # Left over from the previous, unversioned generation.
+    fake_redis.set(
+        _player_index_summary_key("p1"),
+        orjson.dumps({"player_id": "p1", "display_name": "Old Name"}),
+    )
+    fake_redis.hset(
+        f"{RIPPLE_PLAYER_INDEX_PLAYER_PREFIX}{generated_at}:p1",
+        mapping={
+            "summary": orjson.dumps(
+                {"player_id": "p1", "display_name": "New Name"}
+            ),
+            "history": orjson.dumps(
+                {
+                    "player_id": "p1",
+                    "tournament_history_ranked": [{"tournament_id": 44}],
+                }
+            ),
+            "results": orjson.dumps(
+                {"player_id": "p1", "match_loo_impacts": [{"match_id": 501}]}
+            ),
+        },
+    )
+
+    with client_factory(
+        env={"COMP_LEADERBOARD_ENABLED": "true"}, redis=fake_redis
+    ) as client:
+        summary = client.get("/api/ripple/public/player/p1/summary")
+        profile = client.get("/api/ripple/public/player/p1")
+
+    assert summary.status_code == 200
+    assert summary.json()["display_name"] == "New Name"
+    assert profile.status_code == 200
+    # The full profile is assembled from the section fields.
+    assert profile.json()["display_name"] == "New Name"
+    assert profile.json()["tournament_history_ranked"] == [
+        {"tournament_id": 44}
+    ]
+    # Match impacts stay hidden from non-owners.
+    assert "match_loo_impacts" not in profile.json()
+
+
 def test_public_player_results_endpoint_hides_rows_for_non_owner(
     client_factory, fake_redis
 ):
@@ -100,6 +100,10 @@ def _load_analytics_module(monkeypatch):
     monkeypatch.setenv("RANKINGS_DB_NAME", "db")
     module_name = "fast_api_app.routes.analytics"
     if module_name in sys.modules:
+        # Each reload re-registers the route's rate limit under the same
+        # name; drop the old ones so a request is only counted once.
+        limiter = sys.modules[module_name].limiter
+        limiter._route_limits.pop(f"{module_name}.analytics_team_matches", None)
         return importlib.reload(sys.modules[module_name])
     return importlib.import_module(module_name)
 
@@ -299,8 +303,11 @@ def test_tournament_tier_boundaries(monkeypatch):
     }
 
 
-def test_get_table_columns_map_returns_empty_sets_on_error(monkeypatch):
+def test_get_table_columns_map_returns_empty_sets_on_error(
+    fake_redis, monkeypatch
+):
     analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
 
     result = asyncio.run(
         analytics_mod._get_table_columns_map(
@@ -313,8 +320,9 @@ def test_get_table_columns_map_returns_empty_sets_on_error(monkeypatch):
     assert result == {"matches": set(), "players": set()}
 
 
-def test_get_table_columns_map_uses_ttl_cache(monkeypatch):
+def test_get_table_columns_map_uses_ttl_cache(fake_redis, monkeypatch):
     analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
 
     session = _CountingSession(
         [{"table_name": "matches", "column_name": "match_id"}]
@@ -339,6 +347,94 @@ def test_get_table_columns_map_uses_ttl_cache(monkeypatch):
     assert session.calls == 1
 
 
+def _publish_schema_columns(analytics_mod, fake_redis, build_version, tables):
+    fake_redis.set(
+        analytics_mod.ANALYTICS_SCHEMA_COLUMNS_KEY,
+        analytics_mod.orjson.dumps(
+            {
+                "schema": "comp_rankings",
+                "build_version": build_version,
+                "tables": tables,
+            }
+        ),
+    )
+
+
+def test_get_table_columns_map_prefers_published_columns(
+    fake_redis, monkeypatch
+):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+    _publish_schema_columns(
+        analytics_mod,
+        fake_redis,
+        "build-1",
+        {"matches": ["match_id", "team1_id"], "players": []},
+    )
+    analytics_mod.prime_schema_columns()
+    catalog = _RaisingSession(AssertionError("catalog must not be queried"))
+
+    columns = asyncio.run(
+        analytics_mod._get_table_columns_map(
+            catalog, "comp_rankings", ["matches", "players"]
+        )
+    )
+
+    assert columns == {"matches": {"match_id", "team1_id"}, "players": set()}
+
+
+def test_published_columns_follow_build_version(fake_redis, monkeypatch):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+    _publish_schema_columns(
+        analytics_mod, fake_redis, "build-1", {"matches": ["match_id"]}
+    )
+    analytics_mod.prime_schema_columns()
+    _publish_schema_columns(
+        analytics_mod,
+        fake_redis,
+        "build-2",
+        {"matches": ["match_id", "event_time_ms"]},
+    )
+
+    def _columns():
+        return asyncio.run(
+            analytics_mod._get_table_columns_map(
+                _RaisingSession(AssertionError("catalog queried")),
+                "comp_rankings",
+                ["matches"],
+            )
+        )
+
+    # Within the poll interval the loaded build keeps serving.
+    assert _columns() == {"matches": {"match_id"}}
+    monkeypatch.setattr(
+        analytics_mod, "_PUBLISHED_SCHEMA_COLUMNS_POLL_SECONDS", 0.0
+    )
+    assert _columns() == {"matches": {"match_id", "event_time_ms"}}
+
+
+def test_unpublished_tables_fall_back_to_catalog(fake_redis, monkeypatch):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+    _publish_schema_columns(
+        analytics_mod, fake_redis, "build-1", {"matches": ["match_id"]}
+    )
+    analytics_mod.prime_schema_columns()
+    session = _CountingSession(
+        [{"table_name": "rounds", "column_name": "round_no"}]
+    )
+
+    columns = asyncio.run(
+        analytics_mod._get_table_columns_map(
+            session, "comp_rankings", ["matches", "rounds"]
+        )
+    )
+
+    assert columns == {"matches": set(), "rounds": {"round_no"}}
+    assert session.calls == 1
+
+
 def test_missing_error_helpers_do_not_overlap(monkeypatch):
     analytics_mod = _load_analytics_module(monkeypatch)
 
@@ -369,16 +465,15 @@ def test_team_matches_cache_key_canonicalizes_alias_order(monkeypatch):
         schema="comp_rankings",
         snapshot_id=7,
         team_ids=[1, 3, 5],
-        limit=25,
     )
     key_b = analytics_mod._team_matches_cache_key(
         schema="comp_rankings",
         snapshot_id=7,
         team_ids=[1, 5, 3],
-        limit=25,
     )
 
     assert key_a == key_b
+    assert "limit" not in key_a
 
 
 def test_fetch_match_rows_returns_empty_when_query_unavailable(monkeypatch):
@@ -560,7 +655,7 @@ def test_fetch_team_matches_payload_degrades_on_enrichment_timeout(
         raising=False,
     )
 
-    payload = asyncio.run(
+    payload, fetched_rows = asyncio.run(
         analytics_mod._fetch_team_matches_payload(
             object(),
             snapshot_id=7,
@@ -569,6 +664,8 @@ def test_fetch_team_matches_payload_degrades_on_enrichment_timeout(
         )
     )
 
+    assert fetched_rows == 1
+
     assert payload["summary"]["total_matches"] == 1
     assert payload["matches"][0]["team_name"] == "Alpha"
     assert payload["matches"][0]["opponent_team_name"] == "Bravo"
@@ -590,7 +687,6 @@ def test_team_matches_route_uses_cached_latest_snapshot_payload(
         schema=schema,
         snapshot_id=9,
         team_ids=[1, 3],
-        limit=17,
     )
     fake_redis.setex(latest_snapshot_key, 30, "9")
     fake_redis.setex(
@@ -598,40 +694,44 @@ def test_team_matches_route_uses_cached_latest_snapshot_payload(
         120,
         analytics_mod.orjson.dumps(
             {
-                "snapshot_id": 9,
-                "summary": {
-                    "primary_team_id": 1,
-                    "primary_team_name": "Alpha",
-                    "team_ids": [1, 3],
-                    "team_names": ["Alpha", "Alpha Prime"],
-                    "selected_team_count": 2,
-                    "total_matches": 0,
-                    "wins": 0,
-                    "losses": 0,
-                    "unresolved_matches": 0,
-                    "decided_matches": 0,
-                    "win_rate": 0.0,
-                    "tournaments": 0,
-                    "tournament_tier_distribution": {
-                        "X": 0,
-                        "S+": 0,
-                        "S": 0,
-                        "A+": 0,
-                        "A": 0,
-                        "A-": 0,
-                        "Unscored": 0,
-                    },
-                    "tournament_tier_match_distribution": {
-                        "X": 0,
-                        "S+": 0,
-                        "S": 0,
-                        "A+": 0,
-                        "A": 0,
-                        "A-": 0,
-                        "Unscored": 0,
+                "window": 17,
+                "exhausted": False,
+                "payload": {
+                    "snapshot_id": 9,
+                    "summary": {
+                        "primary_team_id": 1,
+                        "primary_team_name": "Alpha",
+                        "team_ids": [1, 3],
+                        "team_names": ["Alpha", "Alpha Prime"],
+                        "selected_team_count": 2,
+                        "total_matches": 0,
+                        "wins": 0,
+                        "losses": 0,
+                        "unresolved_matches": 0,
+                        "decided_matches": 0,
+                        "win_rate": 0.0,
+                        "tournaments": 0,
+                        "tournament_tier_distribution": {
+                            "X": 0,
+                            "S+": 0,
+                            "S": 0,
+                            "A+": 0,
+                            "A": 0,
+                            "A-": 0,
+                            "Unscored": 0,
+                        },
+                        "tournament_tier_match_distribution": {
+                            "X": 0,
+                            "S+": 0,
+                            "S": 0,
+                            "A+": 0,
+                            "A": 0,
+                            "A-": 0,
+                            "Unscored": 0,
+                        },
                     },
+                    "matches": [],
                 },
-                "matches": [],
             }
         ),
     )
@@ -677,15 +777,17 @@ def test_team_matches_route_prepends_path_team_id(
         snapshot_id,
         team_ids,
         limit,
+        after=None,
     ):
         seen["resolved_snapshot_id"] = snapshot_id
         seen["team_ids"] = team_ids
         seen["limit"] = limit
-        return {
+        payload = {
             "snapshot_id": snapshot_id,
             "summary": _empty_summary_for(team_ids),
             "matches": [],
         }
+        return payload, 0
 
     monkeypatch.setattr(
         analytics_mod, "rankings_async_session", fake_session, raising=False
@@ -798,9 +900,10 @@ def test_team_matches_route_caches_explicit_snapshot_requests(
         snapshot_id,
         team_ids,
         limit,
+        after=None,
     ):
         seen["fetch_calls"] += 1
-        return {
+        payload = {
             "snapshot_id": snapshot_id,
             "summary": _empty_summary_for(team_ids),
             "matches": [
@@ -831,6 +934,7 @@ def test_team_matches_route_caches_explicit_snapshot_requests(
                 }
             ],
         }
+        return payload, 1
 
     monkeypatch.setattr(
         analytics_mod, "rankings_async_session", fake_session, raising=False
@@ -887,3 +991,543 @@ def test_team_matches_route_caches_explicit_snapshot_requests(
     assert response_one.json() == expected_payload
     assert response_two.json() == expected_payload
     assert seen == {"session_entries": 1, "fetch_calls": 1}
+
+
+def _stampede_payload(snapshot_id, team_ids):
+    return {
+        "snapshot_id": snapshot_id,
+        "summary": _empty_summary_for(team_ids),
+        "matches": [],
+    }
+
+
+def _stampede_entry(snapshot_id, team_ids):
+    return {
+        "window": 25,
+        "exhausted": True,
+        "payload": _stampede_payload(snapshot_id, team_ids),
+    }
+
+
+def test_team_matches_route_builds_once_for_concurrent_misses(
+    app, fake_redis, monkeypatch
+):
+    import httpx
+
+    analytics_mod = sys.modules["fast_api_app.routes.analytics"]
+    monkeypatch.setenv("TRUST_PROXY_HEADERS", "1")
+    monkeypatch.setattr(analytics_mod, "metrics_enabled", lambda: True)
+    seen = {"session_entries": 0, "fetch_calls": 0}
+
+    @asynccontextmanager
+    async def fake_session():
+        seen["session_entries"] += 1
+        yield object()
+
+    async def fake_fetch_team_matches_payload(
+        session, *, snapshot_id, team_ids, limit, after=None
+    ):
+        seen["fetch_calls"] += 1
+        # Long enough for every request to miss the cache first.
+        await asyncio.sleep(0.05)
+        return _stampede_payload(snapshot_id, team_ids), 0
+
+    monkeypatch.setattr(
+        analytics_mod, "rankings_async_session", fake_session, raising=False
+    )
+    monkeypatch.setattr(
+        analytics_mod,
+        "_fetch_team_matches_payload",
+        fake_fetch_team_matches_payload,
+        raising=False,
+    )
+
+    async def _stampede():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as http:
+            return await asyncio.gather(
+                *(
+                    http.get(
+                        "/api/analytics/team/1/matches"
+                        "?team_ids=1,3&snapshot_id=7&limit=25",
+                        headers={"x-forwarded-for": f"198.51.100.{index}"},
+                    )
+                    for index in range(50)
+                )
+            )
+
+    responses = asyncio.run(_stampede())
+
+    assert [response.status_code for response in responses] == [200] * 50
+    assert all(
+        response.json() == _stampede_payload(7, [1, 3])
+        for response in responses
+    )
+    assert seen == {"session_entries": 1, "fetch_calls": 1}
+    assert analytics_mod._TEAM_MATCHES_BUILDS == {}
+    metrics = analytics_mod.ANALYTICS_TEAM_MATCHES_BUILDS
+    assert metrics.labels(outcome="built")._value.get() >= 1
+    assert metrics.labels(outcome="coalesced_local")._value.get() >= 49
+
+
+def test_team_matches_build_waits_for_lock_held_by_another_pod(
+    fake_redis, monkeypatch
+):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+    monkeypatch.setattr(
+        analytics_mod, "_TEAM_MATCHES_BUILD_POLL_SECONDS", 0.01, raising=False
+    )
+    cache_key = "analytics:team_matches:v2:test"
+    fake_redis.set(
+        f"{analytics_mod._TEAM_MATCHES_BUILD_LOCK_PREFIX}:{cache_key}",
+        "other-pod",
+        nx=True,
+        ex=45,
+    )
+    builds = []
+
+    async def build(entry):
+        builds.append(entry)
+        return _stampede_entry(7, [1])
+
+    async def _scenario():
+        waiter = asyncio.create_task(
+            analytics_mod._single_flight_team_matches_entry(
+                cache_key, 25, build
+            )
+        )
+        await asyncio.sleep(0.03)
+        # The other pod finishes and publishes its entry.
+        fake_redis.setex(
+            cache_key,
+            120,
+            analytics_mod.orjson.dumps(_stampede_entry(7, [1])),
+        )
+        return await asyncio.wait_for(waiter, 1)
+
+    assert asyncio.run(_scenario()) == _stampede_entry(7, [1])
+    assert builds == []
+
+
+def test_team_matches_build_takes_over_after_lock_holder_fails(
+    fake_redis, monkeypatch
+):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+    monkeypatch.setattr(
+        analytics_mod, "_TEAM_MATCHES_BUILD_POLL_SECONDS", 0.01, raising=False
+    )
+    cache_key = "analytics:team_matches:v2:test"
+    lock_key = f"{analytics_mod._TEAM_MATCHES_BUILD_LOCK_PREFIX}:{cache_key}"
+    fake_redis.set(lock_key, "other-pod", nx=True, ex=45)
+
+    async def build(entry):
+        return _stampede_entry(7, [1])
+
+    async def _scenario():
+        waiter = asyncio.create_task(
+            analytics_mod._single_flight_team_matches_entry(
+                cache_key, 25, build
+            )
+        )
+        await asyncio.sleep(0.03)
+        # The other pod gives up without caching anything.
+        fake_redis.delete(lock_key)
+        return await asyncio.wait_for(waiter, 1)
+
+    assert asyncio.run(_scenario()) == _stampede_entry(7, [1])
+    assert analytics_mod.orjson.loads(fake_redis.get(cache_key)) == (
+        _stampede_entry(7, [1])
+    )
+    assert fake_redis.get(lock_key) is None
+
+
+def _window_match(match_id, winner_side, tournament_id, tier_id="unscored"):
+    return {
+        "match_id": match_id,
+        "team_id": 1,
+        "team_name": "Alpha",
+        "opponent_team_id": 2,
+        "opponent_team_name": "Bravo",
+        "tournament_id": tournament_id,
+        "tournament_name": None,
+        "tournament_mode": None,
+        "map_picking_style": None,
+        "tournament_tags": None,
+        "tournament_score": None,
+        "tournament_score_tier_id": tier_id,
+        "tournament_score_tier": "Unscored" if tier_id == "unscored" else "X",
+        "winner_team_id": None,
+        "winner_side": winner_side,
+        "team_score": None,
+        "opponent_score": None,
+        "team_roster": [],
+        "opponent_roster": [],
+        "event_time_ms": 1000 - match_id,
+        "match_rounds": [],
+        "team_is_winner": winner_side == "team",
+        "opponent_is_winner": winner_side == "opponent",
+    }
+
+
+def _history_page(history, after, limit):
+    """The ``limit`` matches of ``history`` past the ``after`` cursor."""
+    if after is not None:
+        history = [
+            match
+            for match in history
+            if (match["event_time_ms"], match["match_id"]) < after
+        ]
+    return history[:limit]
+
+
+def _window_page(analytics_mod, snapshot_id, team_ids, matches):
+    return {
+        "snapshot_id": snapshot_id,
+        "summary": analytics_mod._summarize_team_matches(
+            _empty_summary_for(team_ids), matches
+        ),
+        "matches": matches,
+    }
+
+
+def test_team_matches_route_slices_and_extends_one_cached_window(
+    client, fake_redis, monkeypatch
+):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setenv("TRUST_PROXY_HEADERS", "1")
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+    history = [
+        _window_match(1, "team", 101, "x"),
+        _window_match(2, "opponent", 101, "x"),
+        _window_match(3, "team", 102),
+    ]
+    fetches = []
+
+    @asynccontextmanager
+    async def fake_session():
+        yield object()
+
+    async def fake_fetch_team_matches_payload(
+        session, *, snapshot_id, team_ids, limit, after=None
+    ):
+        fetches.append((after, limit))
+        rows = _history_page(history, after, limit)
+        page = _window_page(analytics_mod, snapshot_id, team_ids, rows)
+        return page, len(rows)
+
+    monkeypatch.setattr(
+        analytics_mod, "rankings_async_session", fake_session, raising=False
+    )
+    monkeypatch.setattr(
+        analytics_mod,
+        "_fetch_team_matches_payload",
+        fake_fetch_team_matches_payload,
+        raising=False,
+    )
+
+    def _get(limit):
+        response = client.get(
+            "/api/analytics/team/1/matches"
+            f"?team_ids=1,3&snapshot_id=7&limit={limit}",
+            headers={"x-forwarded-for": "203.0.113.15"},
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    first = _get(2)
+    sliced = _get(1)
+    extended = _get(5)
+    widest = _get(200)
+
+    # Only the rows past the cached window are fetched, and a short page
+    # marks the window complete for every larger limit.
+    assert fetches == [(None, 2), ((998, 2), 3)]
+    assert [match["match_id"] for match in first["matches"]] == [1, 2]
+    assert [match["match_id"] for match in sliced["matches"]] == [1]
+    assert sliced["summary"]["wins"] == 1
+    assert sliced["summary"]["losses"] == 0
+    assert sliced["summary"]["total_matches"] == 1
+    assert sliced["summary"]["tournament_tier_distribution"]["X"] == 1
+    assert extended == widest
+    assert [match["match_id"] for match in widest["matches"]] == [1, 2, 3]
+    assert widest["summary"]["total_matches"] == 3
+    assert widest["summary"]["tournaments"] == 2
+    assert widest["summary"]["win_rate"] == round(2 / 3, 4)
+    entry = analytics_mod.orjson.loads(
+        fake_redis.get(
+            analytics_mod._team_matches_cache_key(
+                schema=analytics_mod.ripple_queries.schema_name(),
+                snapshot_id=7,
+                team_ids=[1, 3],
+            )
+        )
+    )
+    assert entry["window"] == 5
+    assert entry["exhausted"] is True
+
+
+def test_team_matches_window_extension_ignores_newly_ingested_matches(
+    client, fake_redis, monkeypatch
+):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setenv("TRUST_PROXY_HEADERS", "1")
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+    history = [_window_match(match_id, "team", 101) for match_id in (2, 3, 4)]
+
+    @asynccontextmanager
+    async def fake_session():
+        yield object()
+
+    async def fake_fetch_team_matches_payload(
+        session, *, snapshot_id, team_ids, limit, after=None
+    ):
+        rows = _history_page(history, after, limit)
+        page = _window_page(analytics_mod, snapshot_id, team_ids, rows)
+        return page, len(rows)
+
+    monkeypatch.setattr(
+        analytics_mod, "rankings_async_session", fake_session, raising=False
+    )
+    monkeypatch.setattr(
+        analytics_mod,
+        "_fetch_team_matches_payload",
+        fake_fetch_team_matches_payload,
+        raising=False,
+    )
+
+    def _get(limit):
+        response = client.get(
+            f"/api/analytics/team/1/matches?snapshot_id=7&limit={limit}",
+            headers={"x-forwarded-for": "203.0.113.16"},
+        )
+        assert response.status_code == 200
+        return [match["match_id"] for match in response.json()["matches"]]
+
+    assert _get(2) == [2, 3]
+    # A newer match lands before the window is extended. An offset past the
+    # cached rows would now re-read match 3; the cursor continues at 4.
+    history.insert(0, _window_match(1, "team", 101))
+    assert _get(3) == [2, 3, 4]
+
+
+def test_extend_team_matches_entry_counts_fetched_rows(monkeypatch):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    page = _window_page(analytics_mod, 7, [1], [_window_match(1, "team", 1)])
+
+    # Two rows fetched for a page of two, one dropped while building.
+    entry = analytics_mod._extend_team_matches_entry(
+        None, page, fetched_rows=2, page_size=2, window=2
+    )
+    assert entry["exhausted"] is False
+    assert analytics_mod._team_matches_cursor(entry) == (999, 1)
+
+    short = analytics_mod._extend_team_matches_entry(
+        None, page, fetched_rows=1, page_size=2, window=2
+    )
+    assert short["exhausted"] is True
+
+
+def test_summarize_team_matches_matches_full_build(monkeypatch):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    rows = [
+        {
+            "match_id": match_id,
+            "tournament_id": tournament_id,
+            "team1_id": 1,
+            "team2_id": 2,
+            "winner_team_id": winner,
+            "event_time_ms": 1000 - match_id,
+        }
+        for match_id, tournament_id, winner in [
+            (1, 101, 1),
+            (2, 101, 2),
+            (3, 102, None),
+            (4, None, 1),
+        ]
+    ]
+    payload = analytics_mod._build_team_matches_payload(
+        snapshot_id=7,
+        team_ids=[1],
+        rows=rows,
+        tournament_scores={101: 30.0},
+    )
+
+    assert (
+        analytics_mod._summarize_team_matches(
+            payload["summary"], payload["matches"]
+        )
+        == payload["summary"]
+    )
+    assert payload["summary"]["wins"] == 2
+    assert payload["summary"]["losses"] == 1
+    assert payload["summary"]["unresolved_matches"] == 1
+    assert payload["summary"]["tournaments"] == 2
+
+
+def test_team_matches_pinned_snapshot_is_cached_and_revalidates(
+    client, fake_redis, monkeypatch
+):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setenv("TRUST_PROXY_HEADERS", "1")
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+
+    @asynccontextmanager
+    async def fake_session():
+        yield object()
+
+    async def fake_resolve_snapshot_id(session, snapshot_id):
+        return 9
+
+    async def fake_fetch_team_matches_payload(
+        session, *, snapshot_id, team_ids, limit, after=None
+    ):
+        page = _window_page(
+            analytics_mod,
+            snapshot_id,
+            team_ids,
+            [_window_match(1, "team", 101)],
+        )
+        return page, 1
+
+    monkeypatch.setattr(
+        analytics_mod, "rankings_async_session", fake_session, raising=False
+    )
+    monkeypatch.setattr(
+        analytics_mod,
+        "_resolve_snapshot_id",
+        fake_resolve_snapshot_id,
+        raising=False,
+    )
+    monkeypatch.setattr(
+        analytics_mod,
+        "_fetch_team_matches_payload",
+        fake_fetch_team_matches_payload,
+        raising=False,
+    )
+    schema = analytics_mod.ripple_queries.schema_name()
+
+    pinned = client.get(
+        "/api/analytics/team/1/matches?snapshot_id=7",
+        headers={"x-forwarded-for": "203.0.113.21"},
+    )
+    revalidated = client.get(
+        "/api/analytics/team/1/matches?snapshot_id=7",
+        headers={
+            "x-forwarded-for": "203.0.113.22",
+            "if-none-match": f'W/"stale", {pinned.headers["etag"]}',
+        },
+    )
+    latest = client.get(
+        "/api/analytics/team/1/matches",
+        headers={"x-forwarded-for": "203.0.113.23"},
+    )
+
+    assert pinned.status_code == 200
+    assert pinned.json()["matches"][0]["match_id"] == 1
+    assert pinned.headers["cache-control"] == (
+        "public, max-age=60, must-revalidate"
+    )
+    assert pinned.headers["etag"].startswith('"')
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == pinned.headers["etag"]
+    assert latest.status_code == 200
+    assert "etag" not in latest.headers
+    assert "cache-control" not in latest.headers
+    pinned_key = analytics_mod._team_matches_cache_key(
+        schema=schema, snapshot_id=7, team_ids=[1]
+    )
+    latest_key = analytics_mod._team_matches_cache_key(
+        schema=schema, snapshot_id=9, team_ids=[1]
+    )
+    assert fake_redis.ttl(pinned_key) == (
+        analytics_mod._TEAM_MATCHES_SNAPSHOT_CACHE_TTL_SECONDS
+    )
+    assert fake_redis.ttl(latest_key) == (
+        analytics_mod._TEAM_MATCHES_CACHE_TTL_SECONDS
+    )
+
+
+def test_team_matches_build_lock_release_keeps_a_retaken_lock(
+    fake_redis, monkeypatch
+):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+    lock_key = f"{analytics_mod._TEAM_MATCHES_BUILD_LOCK_PREFIX}:test"
+
+    async def _scenario():
+        assert await analytics_mod._acquire_team_matches_build_lock(
+            lock_key, "ours"
+        )
+        # Our lock expires and another pod takes it before we release.
+        fake_redis.delete(lock_key)
+        fake_redis.set(lock_key, "other-pod", nx=True, ex=45)
+        await analytics_mod._release_team_matches_build_lock(lock_key, "ours")
+        assert fake_redis.get(lock_key) == "other-pod"
+        await analytics_mod._release_team_matches_build_lock(
+            lock_key, "other-pod"
+        )
+
+    asyncio.run(_scenario())
+    assert fake_redis.get(lock_key) is None
+
+
+def test_team_matches_pinned_snapshot_revalidates_to_new_matches(
+    client, fake_redis, monkeypatch
+):
+    analytics_mod = _load_analytics_module(monkeypatch)
+    monkeypatch.setenv("TRUST_PROXY_HEADERS", "1")
+    monkeypatch.setattr(analytics_mod, "redis_conn", fake_redis, raising=False)
+    history = [_window_match(2, "team", 101)]
+
+    @asynccontextmanager
+    async def fake_session():
+        yield object()
+
+    async def fake_fetch_team_matches_payload(
+        session, *, snapshot_id, team_ids, limit, after=None
+    ):
+        rows = _history_page(history, after, limit)
+        page = _window_page(analytics_mod, snapshot_id, team_ids, rows)
+        return page, len(rows)
+
+    monkeypatch.setattr(
+        analytics_mod, "rankings_async_session", fake_session, raising=False
+    )
+    monkeypatch.setattr(
+        analytics_mod,
+        "_fetch_team_matches_payload",
+        fake_fetch_team_matches_payload,
+        raising=False,
+    )
+
+    first = client.get(
+        "/api/analytics/team/1/matches?snapshot_id=7",
+        headers={"x-forwarded-for": "203.0.113.24"},
+    )
+    # Matches are read live, so a pinned payload changes once a new match is
+    # ingested and the cached entry ages out.
+    history.insert(0, _window_match(1, "team", 101))
+    fake_redis.delete(
+        analytics_mod._team_matches_cache_key(
+            schema=analytics_mod.ripple_queries.schema_name(),
+            snapshot_id=7,
+            team_ids=[1],
+        )
+    )
+    revalidated = client.get(
+        "/api/analytics/team/1/matches?snapshot_id=7",
+        headers={
+            "x-forwarded-for": "203.0.113.25",
+            "if-none-match": first.headers["etag"],
+        },
+    )
+
+    assert "immutable" not in first.headers["cache-control"]
+    assert revalidated.status_code == 200
+    assert revalidated.headers["etag"] != first.headers["etag"]
+    assert [m["match_id"] for m in revalidated.json()["matches"]] == [1, 2]
@@ -0,0 +1,127 @@
+import asyncio
+
+from shared_lib.db import ranking_connect_args
+from shared_lib.queries import ripple_queries
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def one(self):
+        return self._rows[0]
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params):
+        self.statements.append((statement, params))
+        return _Result(
+            [
+                {
+                    "__total": 1,
+                    "calculated_at_ms": 1700000000000,
+                    "build_version": "2024.09.02",
+                    "player_id": "p1",
+                }
+            ]
+        )
+
+
+def test_ripple_page_reuses_one_statement_per_schema(monkeypatch):
+    monkeypatch.setenv("RANKINGS_DB_SCHEMA", "comp_rankings")
+    session = _RecordingSession()
+
+    async def _scenario():
+        await ripple_queries.fetch_ripple_page(session, limit=10)
+        await ripple_queries.fetch_ripple_page(session, limit=25, offset=50)
+        await ripple_queries.fetch_ripple_page(session)
+
+    asyncio.run(_scenario())
+
+    (
+        (first, first_params),
+        (second, second_params),
+        (unpaged, _),
+    ) = session.statements
+    # Same SQL object, so asyncpg sees identical text and reuses the
+    # prepared statement; only the bind parameters change.
+    assert first is second
+    assert first_params["limit_value"] == 10
+    assert second_params["limit_value"] == 25
+    assert unpaged is not first
+    assert "LIMIT" not in str(unpaged)
+    assert '"comp_rankings"' in str(first)
+
+
+def test_ripple_danger_statements_follow_schema(monkeypatch):
+    session = _RecordingSession()
+    monkeypatch.setenv("RANKINGS_DB_SCHEMA", "comp_rankings")
+    asyncio.run(ripple_queries.fetch_ripple_danger(session, limit=5))
+    monkeypatch.setenv("RANKINGS_DB_SCHEMA", "other_rankings")
+    asyncio.run(ripple_queries.fetch_ripple_danger(session, limit=5))
+
+    first_page, first_count = (stmt for stmt, _ in session.statements[:2])
+    other_page, other_count = (stmt for stmt, _ in session.statements[2:])
+    assert first_page is not other_page
+    assert '"other_rankings"' in str(other_page)
+    assert '"other_rankings"' in str(other_count)
+
+
+def test_ranking_connect_args_sizes_prepared_statement_cache(monkeypatch):
+    monkeypatch.delenv(
+        "RANKINGS_DB_PREPARED_STATEMENT_CACHE_SIZE", raising=False
+    )
+    assert ranking_connect_args() == {"prepared_statement_cache_size": 500}
+    monkeypatch.setenv("RANKINGS_DB_PREPARED_STATEMENT_CACHE_SIZE", "0")
+    assert ranking_connect_args() == {"prepared_statement_cache_size": 0}
+
+
+class _TypesSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.params = []
+
+    async def execute(self, statement, params):
+        self.params.append(params)
+        return _Result(self.rows)
+
+
+def test_player_id_filters_cast_ids_to_the_column_type(monkeypatch):
+    monkeypatch.setenv("RANKINGS_DB_SCHEMA", "comp_rankings")
+    monkeypatch.setattr(ripple_queries, "_PLAYER_ID_TYPES", {})
+    # Before the types are known, the filter matches any column type.
+    assert ripple_queries.player_id_in("pat.player_id", "players") == (
+        "pat.player_id::text = ANY(:player_ids)"
+    )
+
+    session = _TypesSession(
+        [
+            {"table_name": "players", "data_type": "bigint"},
+            {"table_name": "player_rankings", "data_type": "bigint; --"},
+        ]
+    )
+    types = asyncio.run(ripple_queries.refresh_player_id_types(session))
+
+    assert session.params[0]["schema"] == "comp_rankings"
+    assert set(session.params[0]["tables"]) == set(
+        ripple_queries.PLAYER_ID_TABLES
+    )
+    # A type name that is not a plain identifier is never inlined.
+    assert types == {"players": "bigint"}
+    assert ripple_queries.player_id_in("pat.player_id", "players") == (
+        "pat.player_id = ANY(CAST(CAST(:player_ids AS text[]) AS bigint[]))"
+    )
+    assert ripple_queries.player_id_array("player_rankings") == (
+        "CAST(:player_ids AS text[])"
+    )
+    monkeypatch.setenv("RANKINGS_DB_SCHEMA", "other_rankings")
+    assert ripple_queries.player_id_type("players") is None
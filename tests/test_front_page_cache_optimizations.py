@@ -1,8 +1,10 @@
 import asyncio
 import importlib
 import zlib
+from types import SimpleNamespace
 
 import orjson
+from conftest import patch_async_redis
 
 from shared_lib.constants import PLAYER_LATEST_REDIS_KEY
 
@@ -23,7 +25,7 @@ def test_leaderboard_route_returns_precomputed_columnar_payload(
 ):
     import fast_api_app.routes.front_page as front_page_mod
 
-    monkeypatch.setattr(front_page_mod, "redis_conn", fake_redis, raising=False)
+    patch_async_redis(monkeypatch, front_page_mod, fake_redis)
     fake_redis.set(
         "leaderboard_data:Splat Zones:Tentatek",
         orjson.dumps(
@@ -56,7 +58,7 @@ def test_connection_manager_connect_replays_cached_progressive_payload(
 ):
     conn_mod = _reload_connections(monkeypatch)
 
-    monkeypatch.setattr(conn_mod, "redis_conn", fake_redis, raising=False)
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
     send_task_calls = []
 
     class _SpyCelery:
@@ -127,7 +129,7 @@ def test_connection_manager_connect_replays_cached_legacy_payload(
 ):
     conn_mod = _reload_connections(monkeypatch)
 
-    monkeypatch.setattr(conn_mod, "redis_conn", fake_redis, raising=False)
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
     send_task_calls = []
 
     class _SpyCelery:
@@ -174,12 +176,200 @@ def test_connection_manager_connect_replays_cached_legacy_payload(
     assert orjson.loads(zlib.decompress(websocket.messages[0])) == expected_payload
 
 
+def test_connection_manager_connect_passes_compact_payload_through(
+    fake_redis, monkeypatch
+):
+    conn_mod = _reload_connections(monkeypatch)
+
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
+    send_task_calls = []
+
+    class _SpyCelery:
+        def send_task(self, *args, **kwargs):
+            send_task_calls.append((args, kwargs))
+            return None
+
+    monkeypatch.setattr(conn_mod, "celery", _SpyCelery(), raising=False)
+
+    compact_payload = zlib.compress(
+        orjson.dumps(
+            {
+                "version": 3,
+                "format": "columnar",
+                "player_data": {"x_power": [4300.1]},
+                "aggregated_data": {},
+            }
+        ),
+        9,
+    )
+    fake_redis.set(
+        f"{conn_mod.PLAYER_LATEST_COMPACT_REDIS_KEY}:p1", compact_payload
+    )
+
+    class _DummyWebSocket:
+        def __init__(self):
+            self.messages = []
+
+        async def accept(self):
+            return None
+
+        async def send_bytes(self, data):
+            self.messages.append(data)
+
+    websocket = _DummyWebSocket()
+    manager = conn_mod.ConnectionManager()
+
+    asyncio.run(manager.connect(websocket, "p1", "conn-1", compact=True))
+
+    assert send_task_calls == []
+    assert websocket.messages == [compact_payload]
+    assert websocket.messages[0] is compact_payload
+
+
+def test_connection_manager_serves_stale_payload_then_refreshes(
+    fake_redis, monkeypatch
+):
+    from shared_lib.constants import (
+        PLAYER_CACHE_HARD_TTL_SECONDS,
+        PLAYER_CACHE_SOFT_TTL_SECONDS,
+    )
+
+    conn_mod = _reload_connections(monkeypatch)
+
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
+    enqueued = []
+
+    async def _enqueue(player_id):
+        enqueued.append(player_id)
+
+    monkeypatch.setattr(
+        conn_mod.ConnectionManager,
+        "enqueue_player_fetch",
+        staticmethod(_enqueue),
+    )
+    payload = {"player_data": [], "aggregated_data": {}}
+    fake_redis.set(
+        f"{PLAYER_LATEST_REDIS_KEY}:p1",
+        orjson.dumps(payload),
+        ex=PLAYER_CACHE_HARD_TTL_SECONDS - PLAYER_CACHE_SOFT_TTL_SECONDS - 1,
+    )
+
+    class _DummyWebSocket:
+        def __init__(self):
+            self.messages = []
+
+        async def accept(self):
+            return None
+
+        async def send_bytes(self, data):
+            self.messages.append(data)
+
+    websocket = _DummyWebSocket()
+    manager = conn_mod.ConnectionManager()
+
+    asyncio.run(manager.connect(websocket, "p1", "conn-1"))
+
+    decoded_messages = [
+        orjson.loads(zlib.decompress(message)) for message in websocket.messages
+    ]
+    assert decoded_messages == [
+        payload,
+        {"player_id": "p1", "type": "player_cache_status", "stale": True},
+    ]
+    assert enqueued == ["p1"]
+
+
+def test_connection_manager_coalesces_cache_misses_into_one_batch_task(
+    fake_redis, monkeypatch
+):
+    conn_mod = _reload_connections(monkeypatch)
+
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
+    send_task_calls = []
+
+    class _SpyCelery:
+        def send_task(self, *args, **kwargs):
+            send_task_calls.append((args, kwargs))
+            return None
+
+    monkeypatch.setattr(conn_mod, "celery", _SpyCelery(), raising=False)
+
+    class _DummyWebSocket:
+        async def accept(self):
+            return None
+
+    manager = conn_mod.ConnectionManager()
+    for index, player_id in enumerate(["p1", "p2", "p3"]):
+        asyncio.run(
+            manager.connect(_DummyWebSocket(), player_id, f"conn-{index}")
+        )
+
+    assert send_task_calls == [
+        (
+            ("tasks.fetch_player_data_batch",),
+            {"countdown": conn_mod.PLAYER_DETAIL_BATCH_WINDOW_MS / 1000},
+        )
+    ]
+    assert fake_redis.smembers(conn_mod.PLAYER_DETAIL_BATCH_PENDING_KEY) == {
+        "p1",
+        "p2",
+        "p3",
+    }
+
+
+def test_connection_manager_single_flights_fetches_across_processes(
+    fake_redis, monkeypatch
+):
+    from shared_lib.monitoring import render_latest
+
+    conn_mod = _reload_connections(monkeypatch)
+
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
+    monkeypatch.setattr(conn_mod, "metrics_enabled", lambda: True)
+    sent = []
+
+    async def _send(player_id):
+        sent.append(player_id)
+
+    monkeypatch.setattr(
+        conn_mod.ConnectionManager,
+        "_send_player_fetch",
+        staticmethod(_send),
+    )
+
+    class _DummyWebSocket:
+        async def accept(self):
+            return None
+
+    pod_a = conn_mod.ConnectionManager()
+    pod_b = conn_mod.ConnectionManager()
+    for index, manager in enumerate([pod_a, pod_a, pod_b, pod_a]):
+        asyncio.run(manager.connect(_DummyWebSocket(), "p1", f"conn-{index}"))
+
+    assert sent == ["p1"]
+    assert set(pod_a.active_connections["p1"]) == {
+        "conn-0",
+        "conn-1",
+        "conn-3",
+    }
+    metrics_body = render_latest().decode("utf-8")
+    assert 'outcome="deduplicated_local"' in metrics_body
+    assert 'outcome="deduplicated_remote"' in metrics_body
+
+    # The task clears the shared marker; the complete chunk clears local state.
+    fake_redis.delete(f"{conn_mod.PLAYER_DETAIL_FETCH_PENDING_KEY}:p1")
+    pod_a.fetch_completed("p1")
+    asyncio.run(pod_a.connect(_DummyWebSocket(), "p1", "conn-4"))
+
+    assert sent == ["p1", "p1"]
+
+
 def test_connection_manager_merge_payload_preserves_defaults_for_missing_keys(
     fake_redis, monkeypatch
 ):
     conn_mod = _reload_connections(monkeypatch)
 
-    monkeypatch.setattr(conn_mod, "redis_conn", fake_redis, raising=False)
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
 
     merged = conn_mod.ConnectionManager._merge_player_payload(
         {
@@ -206,7 +396,7 @@ def test_connection_manager_connect_replays_partial_progressive_payload(
 ):
     conn_mod = _reload_connections(monkeypatch)
 
-    monkeypatch.setattr(conn_mod, "redis_conn", fake_redis, raising=False)
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
     send_task_calls = []
 
     class _SpyCelery:
@@ -264,3 +454,228 @@ def test_connection_manager_connect_replays_partial_progressive_payload(
             "weapon_winrate": [],
         },
     }
+
+
+def test_async_redis_pools_are_bounded_and_block_when_exhausted(monkeypatch):
+    import redis.asyncio as aioredis
+
+    monkeypatch.setenv("FASTAPI_ASYNC_REDIS_MAX_CONNECTIONS", "7")
+    conn_mod = _reload_connections(monkeypatch)
+
+    for pool in (conn_mod.async_pool, conn_mod.async_binary_pool):
+        assert isinstance(pool, aioredis.BlockingConnectionPool)
+        assert pool.max_connections == 7
+    assert conn_mod.async_pool.connection_kwargs["decode_responses"] is True
+    assert (
+        conn_mod.async_binary_pool.connection_kwargs["decode_responses"]
+        is False
+    )
+
+
+class _QueuedWebSocket:
+    def __init__(self, block=False):
+        self.messages = []
+        self.closed_with = None
+        self._release = asyncio.Event()
+        if not block:
+            self._release.set()
+
+    async def accept(self):
+        return None
+
+    async def send_bytes(self, data):
+        await self._release.wait()
+        self.messages.append(data)
+
+    async def send_text(self, data):
+        await self._release.wait()
+        self.messages.append(data)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def _queued_manager(monkeypatch, fake_redis, **knobs):
+    conn_mod = _reload_connections(monkeypatch)
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
+    for name, value in knobs.items():
+        monkeypatch.setattr(conn_mod, name, value)
+
+    async def _send(player_id):
+        return None
+
+    monkeypatch.setattr(
+        conn_mod.ConnectionManager, "_send_player_fetch", staticmethod(_send)
+    )
+    return conn_mod, conn_mod.ConnectionManager()
+
+
+def test_broadcast_is_not_stalled_by_a_slow_websocket(fake_redis, monkeypatch):
+    conn_mod, manager = _queued_manager(
+        monkeypatch, fake_redis, WEBSOCKET_SEND_QUEUE_SIZE=8
+    )
+    fast = _QueuedWebSocket()
+    slow = _QueuedWebSocket(block=True)
+
+    async def _scenario():
+        await manager.connect(fast, "p1", "fast")
+        await manager.connect(slow, "p1", "slow")
+        for index in range(3):
+            await asyncio.wait_for(
+                manager.broadcast_player_data(f"chunk-{index}", "p1"), 1
+            )
+        await asyncio.sleep(0.01)
+        slow_queue_depth = manager.active_connections["p1"]["slow"][
+            "queue"
+        ].qsize()
+        slow._release.set()
+        await asyncio.sleep(0.01)
+        return slow_queue_depth
+
+    slow_queue_depth = asyncio.run(_scenario())
+
+    expected = [zlib.compress(f"chunk-{index}".encode()) for index in range(3)]
+    assert fast.messages == expected
+    assert slow.messages == expected
+    assert slow_queue_depth == 2
+
+
+def test_slow_consumer_with_full_queue_is_closed(fake_redis, monkeypatch):
+    from shared_lib.monitoring import render_latest
+
+    conn_mod, manager = _queued_manager(
+        monkeypatch, fake_redis, WEBSOCKET_SEND_QUEUE_SIZE=1
+    )
+    monkeypatch.setattr(conn_mod, "metrics_enabled", lambda: True)
+    fast = _QueuedWebSocket()
+    slow = _QueuedWebSocket(block=True)
+
+    async def _scenario():
+        await manager.connect(fast, "p1", "fast")
+        await manager.connect(slow, "p1", "slow")
+        for index in range(4):
+            await manager.broadcast_player_data(f"chunk-{index}", "p1")
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(_scenario())
+
+    assert set(manager.active_connections["p1"]) == {"fast"}
+    assert len(fast.messages) == 4
+    assert slow.closed_with == 1013
+    assert (
+        'fastapi_websocket_slow_consumers_total{action="closed"}'
+        in render_latest().decode("utf-8")
+    )
+
+
+def test_slow_consumer_drop_policy_keeps_connection(fake_redis, monkeypatch):
+    conn_mod, manager = _queued_manager(
+        monkeypatch,
+        fake_redis,
+        WEBSOCKET_SEND_QUEUE_SIZE=1,
+        WEBSOCKET_SLOW_CONSUMER_POLICY="drop",
+    )
+    slow = _QueuedWebSocket(block=True)
+
+    async def _scenario():
+        await manager.connect(slow, "p1", "slow")
+        for index in range(4):
+            await manager.broadcast_player_data(f"chunk-{index}", "p1")
+            await asyncio.sleep(0.001)
+        slow._release.set()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(_scenario())
+
+    assert set(manager.active_connections["p1"]) == {"slow"}
+    assert slow.closed_with is None
+    assert [zlib.decompress(message) for message in slow.messages] == [
+        b"chunk-0",
+        b"chunk-1",
+    ]
+
+
+def test_permessage_deflate_requires_opt_in_and_offered_extension(
+    monkeypatch,
+):
+    conn_mod = _reload_connections(monkeypatch)
+
+    class _Handshake:
+        def __init__(self, query, extensions=None):
+            self.query_params = query
+            self.headers = (
+                {"sec-websocket-extensions": extensions} if extensions else {}
+            )
+
+    offered = "permessage-deflate; client_max_window_bits"
+    # Nothing has confirmed that the server negotiates the extension yet.
+    assert not conn_mod.permessage_deflate_requested(
+        _Handshake({"deflate": "1"}, offered)
+    )
+    conn_mod.record_websocket_server_config(
+        SimpleNamespace(ws="auto", ws_per_message_deflate=False)
+    )
+    assert not conn_mod.permessage_deflate_requested(
+        _Handshake({"deflate": "1"}, offered)
+    )
+    conn_mod.record_websocket_server_config(
+        SimpleNamespace(ws="auto", ws_per_message_deflate=True)
+    )
+    assert conn_mod.permessage_deflate_requested(
+        _Handshake({"deflate": "1"}, offered)
+    )
+    assert not conn_mod.permessage_deflate_requested(_Handshake({}, offered))
+    assert not conn_mod.permessage_deflate_requested(
+        _Handshake({"deflate": "1"})
+    )
+    monkeypatch.setattr(conn_mod, "WEBSOCKET_PERMESSAGE_DEFLATE", False)
+    assert not conn_mod.permessage_deflate_requested(
+        _Handshake({"deflate": "1"}, offered)
+    )
+
+
+def test_uvicorn_worker_records_websocket_config_before_serving(
+    monkeypatch,
+):
+    conn_mod = _reload_connections(monkeypatch)
+    from uvicorn.workers import UvicornWorker as BaseUvicornWorker
+
+    from fast_api_app.workers import UvicornWorker
+
+    served = []
+
+    def _serve(self):
+        served.append(conn_mod._permessage_deflate_negotiated)
+
+    monkeypatch.setattr(BaseUvicornWorker, "init_process", _serve)
+    worker = UvicornWorker.__new__(UvicornWorker)
+    worker.config = SimpleNamespace(ws="auto", ws_per_message_deflate=True)
+
+    worker.init_process()
+
+    assert served == [True]
+
+
+def test_deflate_connections_get_text_frames_and_others_keep_zlib(
+    fake_redis, monkeypatch
+):
+    conn_mod, manager = _queued_manager(monkeypatch, fake_redis)
+    cached = orjson.dumps({"player_data": [], "aggregated_data": {}})
+    fake_redis.set(f"{PLAYER_LATEST_REDIS_KEY}:p1", cached)
+    deflate = _QueuedWebSocket()
+    legacy = _QueuedWebSocket()
+    chunk = b'{"player_id":"p1","phase":"analysis"}'
+
+    async def _scenario():
+        await manager.connect(deflate, "p1", "deflate", deflate=True)
+        await manager.connect(legacy, "p1", "legacy")
+        await manager.broadcast_player_data(
+            zlib.compress(chunk), "p1", precompressed=True
+        )
+        await asyncio.sleep(0.01)
+
+    asyncio.run(_scenario())
+
+    assert deflate.messages == [cached.decode(), chunk.decode()]
+    assert legacy.messages == [zlib.compress(cached), zlib.compress(chunk)]
@@ -0,0 +1,287 @@
+import asyncio
+import importlib
+import zlib
+
+import orjson
+import pytest
+from conftest import patch_async_redis
+
+from shared_lib.payload_utils import (
+    decode_player_pubsub_message,
+    encode_player_pubsub_message,
+)
+
+
+class _RecordingManager:
+    def __init__(self, connected=()):
+        self.active_connections = {player_id: {} for player_id in connected}
+        self.broadcasts = []
+        self.completed = []
+
+    async def broadcast_player_data(self, message, player_id, **kwargs):
+        self.broadcasts.append((message, player_id, kwargs))
+
+    def fetch_completed(self, player_id):
+        self.completed.append(player_id)
+
+
+@pytest.fixture()
+def pubsub_mod(monkeypatch):
+    for name, value in {
+        "DB_HOST": "localhost",
+        "DB_PORT": "5432",
+        "DB_USER": "user",
+        "DB_PASSWORD": "pass",
+        "DB_NAME": "db",
+        "RANKINGS_DB_NAME": "db",
+    }.items():
+        monkeypatch.setenv(name, value)
+    return importlib.import_module("fast_api_app.pubsub")
+
+
+def test_player_pubsub_message_round_trips_header_and_body():
+    body = orjson.dumps({"player_id": "p1", "phase": "complete"})
+    message = encode_player_pubsub_message(
+        "p1", "complete", body, "player_latest_data_v2:p1"
+    )
+
+    assert decode_player_pubsub_message(message) == (
+        "p1",
+        "complete",
+        "player_latest_data_v2:p1",
+        body,
+        False,
+    )
+    assert decode_player_pubsub_message(
+        encode_player_pubsub_message("p1", "snapshot", body)
+    ) == ("p1", "snapshot", None, body, False)
+    frame = zlib.compress(body)
+    assert decode_player_pubsub_message(
+        encode_player_pubsub_message("p1", "analysis", frame, compressed=True)
+    ) == ("p1", "analysis", None, frame, True)
+    assert decode_player_pubsub_message(body) is None
+
+
+def test_route_pubsub_message_forwards_body_without_parsing(
+    pubsub_mod, monkeypatch
+):
+    manager = _RecordingManager(connected=["p1"])
+    monkeypatch.setattr(pubsub_mod, "connection_manager", manager)
+
+    def _no_parse(_raw):
+        raise AssertionError("headered messages must not be parsed")
+
+    monkeypatch.setattr(pubsub_mod.orjson, "loads", _no_parse)
+    body = b'{"player_id":"p1","phase":"snapshot","payload":{}}'
+
+    asyncio.run(
+        pubsub_mod.route_pubsub_message(
+            encode_player_pubsub_message("p1", "snapshot", body)
+        )
+    )
+
+    assert manager.broadcasts == [
+        (body, "p1", {"progressive_only": True, "precompressed": False})
+    ]
+    assert manager.completed == []
+
+
+def test_route_pubsub_message_forwards_compressed_frames_as_is(
+    pubsub_mod, monkeypatch
+):
+    manager = _RecordingManager(connected=["p1"])
+    monkeypatch.setattr(pubsub_mod, "connection_manager", manager)
+    frame = zlib.compress(b'{"player_id":"p1","phase":"analysis"}')
+
+    asyncio.run(
+        pubsub_mod.route_pubsub_message(
+            encode_player_pubsub_message(
+                "p1", "analysis", frame, compressed=True
+            )
+        )
+    )
+
+    assert manager.broadcasts == [
+        (frame, "p1", {"progressive_only": True, "precompressed": True})
+    ]
+
+
+def test_complete_chunk_for_unhosted_player_skips_cache_reads(
+    pubsub_mod, fake_redis, monkeypatch
+):
+    manager = _RecordingManager()
+    monkeypatch.setattr(pubsub_mod, "connection_manager", manager)
+    async_redis = patch_async_redis(monkeypatch, pubsub_mod, fake_redis)
+    reads = []
+
+    async def _get(key):
+        reads.append(key)
+
+    monkeypatch.setattr(async_redis, "get", _get)
+
+    asyncio.run(
+        pubsub_mod.route_pubsub_message(
+            encode_player_pubsub_message(
+                "p1", "complete", b"{}", "player_latest_data_v2:p1"
+            )
+        )
+    )
+
+    assert manager.completed == ["p1"]
+    assert reads == []
+
+
+def test_complete_chunk_broadcasts_compact_then_legacy_frames(
+    pubsub_mod, fake_redis, monkeypatch
+):
+    manager = _RecordingManager(connected=["p1"])
+    monkeypatch.setattr(pubsub_mod, "connection_manager", manager)
+    patch_async_redis(monkeypatch, pubsub_mod, fake_redis)
+    fake_redis.set("player_latest_data_v3:p1", b"compact")
+    fake_redis.set("player_latest_frame_v2:p1", b"frame")
+    fake_redis.set("player_latest_data_v2:p1", b"legacy")
+
+    asyncio.run(
+        pubsub_mod.route_pubsub_message(
+            encode_player_pubsub_message(
+                "p1",
+                "complete",
+                b"{}",
+                "player_latest_data_v2:p1",
+                compressed=True,
+            )
+        )
+    )
+
+    assert manager.broadcasts == [
+        (b"{}", "p1", {"progressive_only": True, "precompressed": True}),
+        (b"compact", "p1", {"compact_only": True, "precompressed": True}),
+        (b"frame", "p1", {"legacy_only": True, "precompressed": True}),
+    ]
+
+
+def test_complete_chunk_without_legacy_frame_falls_back_to_json_cache(
+    pubsub_mod, fake_redis, monkeypatch
+):
+    manager = _RecordingManager(connected=["p1"])
+    monkeypatch.setattr(pubsub_mod, "connection_manager", manager)
+    patch_async_redis(monkeypatch, pubsub_mod, fake_redis)
+    fake_redis.set("player_latest_data_v2:p1", b"legacy")
+
+    asyncio.run(
+        pubsub_mod.route_pubsub_message(
+            encode_player_pubsub_message(
+                "p1", "complete", b"{}", "player_latest_data_v2:p1"
+            )
+        )
+    )
+
+    assert manager.broadcasts[-1] == (b"legacy", "p1", {"legacy_only": True})
+
+
+def test_process_pubsub_message_routes_bare_json_from_older_publishers(
+    pubsub_mod, monkeypatch
+):
+    manager = _RecordingManager(connected=["p1"])
+    monkeypatch.setattr(pubsub_mod, "connection_manager", manager)
+    legacy = orjson.dumps(
+        {"player_id": "p1", "type": "player_chunk", "phase": "analysis"}
+    )
+
+    class _FakePubSub:
+        async def listen(self):
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": legacy}
+
+    asyncio.run(pubsub_mod.process_pubsub_message(_FakePubSub()))
+
+    assert manager.broadcasts == [
+        (legacy, "p1", {"progressive_only": True, "precompressed": False})
+    ]
+
+
+class _RecordingPubSub:
+    def __init__(self):
+        self.calls = []
+
+    async def subscribe(self, *channels):
+        self.calls.append(("subscribe", *channels))
+
+    async def unsubscribe(self, *channels):
+        self.calls.append(("unsubscribe", *channels))
+
+
+class _DummyWebSocket:
+    async def accept(self):
+        return None
+
+
+def _per_player_manager(monkeypatch, fake_redis):
+    monkeypatch.setenv("PLAYER_PUBSUB_PER_PLAYER_CHANNELS", "1")
+    conn_mod = importlib.import_module("fast_api_app.connections")
+    patch_async_redis(monkeypatch, conn_mod, fake_redis)
+
+    async def _send(player_id):
+        return None
+
+    monkeypatch.setattr(
+        conn_mod.ConnectionManager, "_send_player_fetch", staticmethod(_send)
+    )
+    return conn_mod.ConnectionManager()
+
+
+def test_per_player_channel_follows_first_and_last_socket(
+    pubsub_mod, fake_redis, monkeypatch
+):
+    manager = _per_player_manager(monkeypatch, fake_redis)
+    pubsub = _RecordingPubSub()
+
+    async def _scenario():
+        await manager.attach_pubsub(pubsub)
+        await manager.connect(_DummyWebSocket(), "p1", "conn-1")
+        await manager.connect(_DummyWebSocket(), "p1", "conn-2")
+        await manager.disconnect("p1", "conn-1")
+        await manager.disconnect("p1", "conn-2")
+
+    asyncio.run(_scenario())
+
+    assert pubsub.calls == [
+        ("subscribe", "player_data_channel:p1"),
+        ("unsubscribe", "player_data_channel:p1"),
+    ]
+
+
+def test_attach_pubsub_resubscribes_hosted_players(
+    pubsub_mod, fake_redis, monkeypatch
+):
+    manager = _per_player_manager(monkeypatch, fake_redis)
+
+    async def _scenario():
+        await manager.connect(_DummyWebSocket(), "p1", "conn-1")
+        await manager.connect(_DummyWebSocket(), "p2", "conn-2")
+        pubsub = _RecordingPubSub()
+        await manager.attach_pubsub(pubsub)
+        return pubsub
+
+    pubsub = asyncio.run(_scenario())
+
+    assert pubsub.calls == [
+        ("subscribe", "player_data_channel:p1", "player_data_channel:p2")
+    ]
+
+
+def test_shared_channel_mode_does_not_subscribe_per_player(
+    pubsub_mod, fake_redis, monkeypatch
+):
+    manager = _per_player_manager(monkeypatch, fake_redis)
+    monkeypatch.setenv("PLAYER_PUBSUB_PER_PLAYER_CHANNELS", "0")
+    pubsub = _RecordingPubSub()
+
+    async def _scenario():
+        await manager.attach_pubsub(pubsub)
+        await manager.connect(_DummyWebSocket(), "p1", "conn-1")
+        await manager.disconnect("p1", "conn-1")
+
+    asyncio.run(_scenario())
+
+    assert pubsub.calls == []
@@ -3,6 +3,7 @@ import os
 
 import orjson
 import pandas as pd
+from conftest import patch_async_redis
 
 from shared_lib.constants import RACE_TO_5000_REDIS_KEY
 
@@ -114,7 +115,7 @@ def test_build_race_to_5000_payload_groups_and_sorts_runs():
 def test_race_to_5000_route_returns_cached_payload(client, fake_redis, monkeypatch):
     import fast_api_app.routes.front_page as front_page_mod
 
-    monkeypatch.setattr(front_page_mod, "redis_conn", fake_redis, raising=False)
+    patch_async_redis(monkeypatch, front_page_mod, fake_redis)
     fake_redis.set(
         RACE_TO_5000_REDIS_KEY,
         orjson.dumps(
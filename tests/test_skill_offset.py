@@ -2,6 +2,7 @@ import importlib
 
 import numpy as np
 import orjson
+from conftest import patch_async_redis
 
 from shared_lib.constants import SKILL_OFFSET_REDIS_KEY
 
@@ -11,9 +12,7 @@ def test_skill_offset_selects_mode_and_region_slices(
 ):
     import fast_api_app.routes.weapon_info as weapon_info_mod
 
-    monkeypatch.setattr(
-        weapon_info_mod, "redis_conn", fake_redis, raising=False
-    )
+    patch_async_redis(monkeypatch, weapon_info_mod, fake_redis)
 
     payload = {
         "all": {
@@ -49,9 +48,7 @@ def test_skill_offset_selects_mode_and_region_slices(
 def test_skill_offset_rejects_unknown_slices(client, fake_redis, monkeypatch):
     import fast_api_app.routes.weapon_info as weapon_info_mod
 
-    monkeypatch.setattr(
-        weapon_info_mod, "redis_conn", fake_redis, raising=False
-    )
+    patch_async_redis(monkeypatch, weapon_info_mod, fake_redis)
     fake_redis.set(SKILL_OFFSET_REDIS_KEY, orjson.dumps({"all": {"all": []}}))
 
     response = client.get("/api/skill-offset?mode=Unknown")